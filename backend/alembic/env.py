@@ -0,0 +1,68 @@
+"""
+Alembic environment.
+
+Tables are created from the models: ``Base.metadata.create_all`` runs first
+and only adds tables that are missing. Revisions carry what create_all cannot
+do to an existing database - new columns and indexes on existing tables -
+and check before they alter, so on a database create_all has just built they
+are no-ops.
+
+The app applies this on startup (init_db in app/database.py). From the
+command line, in backend/:
+
+    alembic upgrade head
+    alembic revision -m "add widgets.color"
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+
+config = context.config
+target_metadata = Base.metadata
+
+# Leave the app's logging alone when it runs the migrations itself
+if config.config_file_name and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+
+def _upgrading() -> bool:
+    """Only ``upgrade`` creates tables; ``current``, ``history`` etc. must not touch the schema."""
+    if config.cmd_opts is None:  # Called from code: init_db upgrades
+        return True
+    return config.cmd_opts.cmd[0].__name__ == "upgrade"
+
+
+def _run_migrations(connection):
+    if _upgrading():
+        Base.metadata.create_all(connection)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",  # SQLite cannot ALTER most things in place
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def _run_migrations_async():
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.begin() as connection:
+        await connection.run_sync(_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    context.configure(url=settings.DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+elif config.attributes.get("connection") is not None:
+    _run_migrations(config.attributes["connection"])
+else:
+    asyncio.run(_run_migrations_async())
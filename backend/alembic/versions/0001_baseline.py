@@ -0,0 +1,24 @@
+"""Baseline: the schema create_all built before migrations were introduced
+
+Databases created by the original ``init_db`` (create_all only) have every
+table at this revision. Later revisions add what each change brought to
+existing tables; new tables come from create_all (see alembic/env.py).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,39 @@
+"""Generation progress on tests
+
+Tests are created before their questions are generated by a background
+job; the test records the job and per-section progress.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("tests", sa.Column("generation_job_id", sa.Integer, nullable=True)),
+    ("tests", sa.Column("generation_progress", sa.JSON, nullable=True)),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
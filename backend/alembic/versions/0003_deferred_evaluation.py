@@ -0,0 +1,41 @@
+"""Deferred evaluation status and job priority
+
+Answers and challenge task responses record whether their evaluation is
+queued, done or failed; jobs get a priority so candidate-facing work runs
+first.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("answers", sa.Column("evaluation_status", sa.String(20), nullable=True)),
+    ("task_responses", sa.Column("evaluation_status", sa.String(20), nullable=True)),
+    ("jobs", sa.Column("priority", sa.Integer, nullable=False, server_default="100")),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
@@ -0,0 +1,40 @@
+"""Speculative draft evaluation on answers
+
+A stable draft's score is kept with the hash of the content it scored, to
+be reused when the same content is submitted.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("answers", sa.Column("speculative_hash", sa.String(64), nullable=True)),
+    ("answers", sa.Column("speculative_evaluation", sa.JSON, nullable=True)),
+    ("answers", sa.Column("speculative_evaluated_at", sa.DateTime, nullable=True)),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
@@ -0,0 +1,42 @@
+"""Screening question pool state on competitions
+
+Competitions track the provisioning of their pre-generated screening
+question variants (the variants live in the new competition_questions
+table).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("competitions", sa.Column("screening_pool_status", sa.String(20), nullable=True)),
+    ("competitions", sa.Column("screening_pool_variants", sa.Integer, nullable=True)),
+    ("competitions", sa.Column("screening_pool_seed", sa.String(64), nullable=True)),
+    ("competitions", sa.Column("screening_pool_ready_at", sa.DateTime, nullable=True)),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
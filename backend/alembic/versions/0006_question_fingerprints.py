@@ -0,0 +1,43 @@
+"""Near-duplicate index entries on questions
+
+Generated questions point at their entry in the MinHash index
+(question_fingerprints).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("questions", sa.Column("fingerprint_id", sa.Integer, nullable=True)),
+    ("question_pool", sa.Column("fingerprint_id", sa.Integer, nullable=True)),
+    ("competition_questions", sa.Column("fingerprint_id", sa.Integer, nullable=True)),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+    op.create_index("ix_questions_fingerprint_id", "questions", ["fingerprint_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_questions_fingerprint_id", table_name="questions", if_exists=True)
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
@@ -0,0 +1,39 @@
+"""Copied-answer signals on behavioral metrics
+
+Behavioral metrics keep the risk from timing and anti-cheat signals apart
+from the count of answers matching other candidates'.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("behavioral_metrics", sa.Column("behavior_risk_score", sa.Float, nullable=True)),
+    ("behavioral_metrics", sa.Column("similar_answer_count", sa.Integer, nullable=True, server_default="0")),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {}
+    for table, column in COLUMNS:
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column.name not in existing[table]:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column.name)
@@ -0,0 +1,65 @@
+"""Indexes for hot foreign keys, filters and list ordering
+
+Found with scripts/check_query_plans.py: without these, loading a test by
+token (selectinload of questions and answers), competition rankings and
+every admin list endpoint scanned whole tables. New databases get them from
+the model definitions; this adds them to existing ones.
+
+On a large PostgreSQL database, create them by hand with CREATE INDEX
+CONCURRENTLY first to avoid blocking writes; the IF NOT EXISTS here then
+skips them.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Test loading: selectinload(Test.questions).selectinload(Question.answer)
+    ("ix_questions_test_order", "questions", ["test_id", "section_order", "question_order"]),
+    ("ix_answers_question_id", "answers", ["question_id"]),
+    ("ix_reports_test_id", "reports", ["test_id"]),
+    ("ix_task_responses_challenge_submission_id", "task_responses", ["challenge_submission_id"]),
+    ("ix_deliverables_challenge_submission_id", "deliverables", ["challenge_submission_id"]),
+    # Tests by candidate, by status, and the cheating log order
+    ("ix_tests_candidate_created", "tests", ["candidate_id", "created_at"]),
+    ("ix_tests_status_created", "tests", ["status", "created_at"]),
+    ("ix_tests_created_at", "tests", ["created_at"]),
+    ("ix_tests_updated_at", "tests", ["updated_at"]),
+    # Competition rankings and counts
+    ("ix_competition_registrations_ranking", "competition_registrations",
+     ["competition_id", "screening_completed", "screening_score"]),
+    ("ix_competition_registrations_qualified", "competition_registrations", ["competition_id", "is_qualified"]),
+    ("ix_competition_registrations_candidate_id", "competition_registrations", ["candidate_id"]),
+    ("ix_competition_registrations_test_id", "competition_registrations", ["test_id"]),
+    ("ix_behavioral_metrics_registration_id", "behavioral_metrics", ["registration_id"]),
+    ("ix_behavioral_metrics_test_id", "behavioral_metrics", ["test_id"]),
+    ("ix_skill_assessments_application_id", "skill_assessments", ["application_id"]),
+    # Admin list endpoints, newest first
+    ("ix_candidates_created_at", "candidates", ["created_at"]),
+    ("ix_reports_generated_at", "reports", ["generated_at"]),
+    ("ix_certificates_created_at", "certificates", ["created_at"]),
+    ("ix_competitions_created_at", "competitions", ["created_at"]),
+    ("ix_applications_created_at", "applications", ["created_at"]),
+    ("ix_specialization_results_created_at", "specialization_results", ["created_at"]),
+    ("ix_improvement_suggestions_created_at", "improvement_suggestions", ["created_at"]),
+    ("ix_improvement_suggestions_status_created", "improvement_suggestions", ["status", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,54 @@
+"""Registration counters on competitions
+
+registration_count, completed_count and qualified_registration_count
+replace the COUNT(*) queries the competition routes ran on every call. When
+the columns are added to an existing database they are filled from
+competition_registrations.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    sa.Column("registration_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("completed_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("qualified_registration_count", sa.Integer, nullable=False, server_default="0"),
+]
+
+BACKFILL = """
+UPDATE competitions SET
+    registration_count = (
+        SELECT COUNT(*) FROM competition_registrations r WHERE r.competition_id = competitions.id),
+    completed_count = (
+        SELECT COUNT(*) FROM competition_registrations r
+        WHERE r.competition_id = competitions.id AND r.screening_completed = :true),
+    qualified_registration_count = (
+        SELECT COUNT(*) FROM competition_registrations r
+        WHERE r.competition_id = competitions.id AND r.is_qualified = :true)
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = {c["name"] for c in sa.inspect(bind).get_columns("competitions")}
+    added = [column for column in COLUMNS if column.name not in existing]
+    for column in added:
+        op.add_column("competitions", column)
+    if added:
+        bind.execute(sa.text(BACKFILL), {"true": True})
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("competitions") as batch:
+        for column in reversed(COLUMNS):
+            batch.drop_column(column.name)
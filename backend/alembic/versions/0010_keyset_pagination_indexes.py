@@ -0,0 +1,52 @@
+"""Indexes for keyset pagination of the admin lists
+
+Keyset pages are read with ORDER BY <sort column> DESC, id DESC and a
+(sort column, id) bound, so each list's index gets id as its last column.
+The new indexes replace the ones they extend.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+# (new index, table, columns, index it replaces, that index's columns)
+INDEXES = [
+    ("ix_tests_created_id", "tests", ["created_at", "id"], "ix_tests_created_at", ["created_at"]),
+    ("ix_tests_updated_id", "tests", ["updated_at", "id"], "ix_tests_updated_at", ["updated_at"]),
+    ("ix_tests_status_created_id", "tests", ["status", "created_at", "id"],
+     "ix_tests_status_created", ["status", "created_at"]),
+    ("ix_reports_generated_id", "reports", ["generated_at", "id"], "ix_reports_generated_at", ["generated_at"]),
+    ("ix_candidates_created_id", "candidates", ["created_at", "id"], "ix_candidates_created_at", ["created_at"]),
+    ("ix_certificates_created_id", "certificates", ["created_at", "id"], "ix_certificates_created_at", ["created_at"]),
+    ("ix_applications_created_id", "applications", ["created_at", "id"], "ix_applications_created_at", ["created_at"]),
+    ("ix_applications_status_created_id", "applications", ["status", "created_at", "id"], None, None),
+    ("ix_improvement_suggestions_created_id", "improvement_suggestions", ["created_at", "id"],
+     "ix_improvement_suggestions_created_at", ["created_at"]),
+    ("ix_improvement_suggestions_status_created_id", "improvement_suggestions", ["status", "created_at", "id"],
+     "ix_improvement_suggestions_status_created", ["status", "created_at"]),
+    ("ix_competition_registrations_ranking_id", "competition_registrations",
+     ["competition_id", "screening_completed", "screening_score", "id"],
+     "ix_competition_registrations_ranking", ["competition_id", "screening_completed", "screening_score"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, replaces, _ in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+        if replaces:
+            op.drop_index(replaces, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _, replaces, replaced_columns in reversed(INDEXES):
+        if replaces:
+            op.create_index(replaces, table, replaced_columns, if_not_exists=True)
+        op.drop_index(name, table_name=table, if_exists=True)
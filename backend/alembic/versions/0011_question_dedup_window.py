@@ -0,0 +1,29 @@
+"""When each question fingerprint was last accepted
+
+Near-duplicate rejection only counts questions accepted within
+QUESTION_DEDUP_WINDOW_DAYS; fingerprints from before this revision count
+as outside the window.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("question_fingerprints")}
+    if "accepted_at" not in columns:
+        op.add_column("question_fingerprints", sa.Column("accepted_at", sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("question_fingerprints") as batch:
+        batch.drop_column("accepted_at")
@@ -0,0 +1,24 @@
+"""Drop the tests (updated_at, id) index
+
+The cheating logs are now paged by (created_at, id), which
+ix_tests_created_id serves; nothing else reads tests by updated_at.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_tests_updated_id", table_name="tests", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_tests_updated_id", "tests", ["updated_at", "id"], if_not_exists=True)
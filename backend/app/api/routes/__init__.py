@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.routes import candidates, tests, questions, answers, reports, challenges, feedback, code, certificates, roles, competitions, tracks, applications, specialization, sync
+from app.api.routes import candidates, tests, questions, answers, reports, challenges, feedback, code, certificates, roles, competitions, tracks, applications, specialization, sync, jobs, question_pool, database
 
 api_router = APIRouter()
 
@@ -17,4 +17,7 @@ api_router.include_router(competitions.router, prefix="/competitions", tags=["co
 api_router.include_router(tracks.router, prefix="/tracks", tags=["tracks"])
 api_router.include_router(applications.router, prefix="/applications", tags=["applications"])
 api_router.include_router(specialization.router, prefix="/specialization", tags=["specialization"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(question_pool.router, prefix="/question-pool", tags=["question-pool"])
+api_router.include_router(database.router, prefix="/database", tags=["database"])
 api_router.include_router(sync.router)
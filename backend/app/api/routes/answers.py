@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from datetime import datetime
 import hashlib
 import time
-from typing import Dict, Tuple, Any
-from app.database import get_db
+from typing import AsyncIterator, Dict, Optional, Tuple, Any
+from app.database import get_db, async_session_maker
 from app.models import Answer, Question, Test, Candidate
 from app.models.test import TestStatus
 from app.schemas.answer import (
@@ -14,8 +15,18 @@ from app.schemas.answer import (
     BatchAnswerSubmit, BatchAnswerResponse, BatchAnswerResultItem,
     BatchDraftSave, BatchDraftResponse, BatchDraftResultItem,
     FeedbackRequest, FeedbackResponse,
+    CandidateQuestionRequest, CandidateQuestionResponse,
+    EvaluationStatusResponse,
 )
 from app.services.ai_service import ai_service
+from app.services.deferred_evaluation import (
+    EVALUATION_DONE, enqueue_answer_evaluation, evaluation_events,
+)
+from app.services.llm_streaming import sse_event
+from app.services.write_queue import write_queue
+from app.services.speculative_evaluation import (
+    schedule_speculative_evaluation, speculative_evaluation_for,
+)
 
 router = APIRouter()
 
@@ -28,49 +39,70 @@ SUSPICIOUSLY_FAST_THRESHOLD = 30
 
 
 @router.post("/draft", response_model=DraftSaveResponse)
-async def save_draft(
-    draft_data: AnswerDraft,
-    db: AsyncSession = Depends(get_db)
-):
+async def save_draft(draft_data: AnswerDraft):
     """Auto-save a draft answer without AI evaluation.
 
     This endpoint is called frequently during typing (debounced).
-    It saves the answer content without triggering AI evaluation.
+    It saves the answer content without triggering AI evaluation; with
+    SPECULATIVE_EVALUATION_ENABLED the draft is scored in the background once
+    it stops changing, so a later submit of the same content is instant.
     Allows saving even after submission (for editing).
+
+    Saves go through the single-writer queue and are committed in groups
+    (see app/services/write_queue.py).
     """
-    # Get question with test info
-    query = (
-        select(Question)
-        .options(selectinload(Question.test))
-        .where(Question.id == draft_data.question_id)
-    )
-    result = await db.execute(query)
-    question = result.scalar_one_or_none()
+    async def _save(db: AsyncSession) -> int:
+        # Get question with test info
+        query = (
+            select(Question)
+            .options(selectinload(Question.test))
+            .where(Question.id == draft_data.question_id)
+        )
+        result = await db.execute(query)
+        question = result.scalar_one_or_none()
 
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found")
 
-    test = question.test
-    if test.status != TestStatus.IN_PROGRESS.value:
-        raise HTTPException(status_code=400, detail="Test is not in progress")
+        test = question.test
+        if test.status != TestStatus.IN_PROGRESS.value:
+            raise HTTPException(status_code=400, detail="Test is not in progress")
 
-    # Check if test is disqualified
-    if test.is_disqualified:
-        raise HTTPException(
-            status_code=403,
-            detail="Test has been disqualified. No further submissions are allowed."
+        # Check if test is disqualified
+        if test.is_disqualified:
+            raise HTTPException(
+                status_code=403,
+                detail="Test has been disqualified. No further submissions are allowed."
+            )
+
+        # Get or create answer
+        answer_result = await db.execute(
+            select(Answer).where(Answer.question_id == question.id)
         )
+        answer = answer_result.scalar_one_or_none()
 
-    # Get or create answer
-    answer_result = await db.execute(
-        select(Answer).where(Answer.question_id == question.id)
+        if not answer:
+            answer = Answer(question_id=question.id, version=1)
+            db.add(answer)
+
+        _apply_draft(answer, draft_data.candidate_answer, draft_data.candidate_code)
+
+        await schedule_speculative_evaluation(db, answer)
+        await db.flush()
+        return answer.version or 1
+
+    version = await write_queue.submit(_save)
+
+    return DraftSaveResponse(
+        success=True,
+        question_id=draft_data.question_id,
+        saved_at=datetime.utcnow(),
+        version=version
     )
-    answer = answer_result.scalar_one_or_none()
 
-    if not answer:
-        answer = Answer(question_id=question.id, version=1)
-        db.add(answer)
 
+def _apply_draft(answer: Answer, candidate_answer: Optional[str], candidate_code: Optional[str]):
+    """Store new draft content on ``answer``, versioning it if it was already submitted."""
     # Track if this is an edit to a submitted answer
     if answer.is_submitted:
         # Store previous version if not already stored
@@ -90,22 +122,13 @@ async def save_draft(
         answer.feedback = None
         answer.ai_evaluation = None
         answer.evaluated_at = None
+        answer.evaluation_status = None
 
     # Update content
-    answer.candidate_answer = draft_data.candidate_answer
-    answer.candidate_code = draft_data.candidate_code
+    answer.candidate_answer = candidate_answer
+    answer.candidate_code = candidate_code
     answer.updated_at = datetime.utcnow()
 
-    await db.commit()
-    await db.refresh(answer)
-
-    return DraftSaveResponse(
-        success=True,
-        question_id=question.id,
-        saved_at=datetime.utcnow(),
-        version=answer.version or 1
-    )
-
 
 @router.post("/submit", response_model=AnswerResponse)
 async def submit_answer(
@@ -115,6 +138,9 @@ async def submit_answer(
     """Submit an answer for a question.
 
     If already submitted, this is a re-submission which triggers re-evaluation.
+    With ``defer_evaluation`` the answer is saved and returned at once with
+    ``evaluation_status="pending"``; poll GET /answers/{id}/evaluation or
+    stream GET /answers/{id}/evaluation/stream for the score.
     """
     # Get question with test info
     query = (
@@ -174,21 +200,37 @@ async def submit_answer(
         answer.time_spent_seconds = answer_data.time_spent_seconds
         answer.is_suspiciously_fast = answer_data.time_spent_seconds < SUSPICIOUSLY_FAST_THRESHOLD
 
+    # The autosaved draft may already have been scored with exactly this content
+    evaluation = speculative_evaluation_for(answer, answer.candidate_answer, answer.candidate_code)
+    if evaluation is not None:
+        print(f"[Speculative] Reusing draft evaluation for answer {answer.id}")
+
+    if evaluation is None and answer_data.defer_evaluation:
+        await enqueue_answer_evaluation(db, answer)
+        await db.commit()
+        await db.refresh(answer)
+
+        response = AnswerResponse.model_validate(answer)
+        response.needs_resubmit = False
+        return response
+
     # Evaluate answer using AI
-    evaluation = await ai_service.evaluate_answer(
-        question_text=question.question_text,
-        question_code=question.question_code,
-        expected_answer=question.expected_answer or "",
-        candidate_answer=answer_data.candidate_answer or "",
-        candidate_code=answer_data.candidate_code or "",
-        category=question.category,
-        difficulty=test.candidate.difficulty
-    )
+    if evaluation is None:
+        evaluation = await ai_service.evaluate_answer(
+            question_text=question.question_text,
+            question_code=question.question_code,
+            expected_answer=question.expected_answer or "",
+            candidate_answer=answer_data.candidate_answer or "",
+            candidate_code=answer_data.candidate_code or "",
+            category=question.category,
+            difficulty=test.candidate.difficulty
+        )
 
     answer.score = evaluation.get("score", 0)
     answer.feedback = evaluation.get("feedback", "")
     answer.ai_evaluation = str(evaluation)
     answer.evaluated_at = datetime.utcnow()
+    answer.evaluation_status = EVALUATION_DONE
 
     await db.commit()
     await db.refresh(answer)
@@ -212,111 +254,114 @@ async def get_answer(answer_id: int, db: AsyncSession = Depends(get_db)):
     return answer
 
 
+async def _answer_evaluation_status(answer_id: int) -> Optional[Dict[str, Any]]:
+    """Current evaluation state of one answer, read in its own short session."""
+    async with async_session_maker() as db:
+        answer = await db.get(Answer, answer_id)
+        if not answer:
+            return None
+        return EvaluationStatusResponse.model_validate(answer).model_dump(mode="json")
+
+
+@router.get("/{answer_id}/evaluation", response_model=EvaluationStatusResponse)
+async def get_answer_evaluation(answer_id: int):
+    """Cheap poll for a deferred evaluation: status, and the score once ready."""
+    status = await _answer_evaluation_status(answer_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return status
+
+
+@router.get("/{answer_id}/evaluation/stream")
+async def stream_answer_evaluation(answer_id: int):
+    """SSE stream that emits "status" now and "result" when the score is stored."""
+    if await _answer_evaluation_status(answer_id) is None:
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return _event_stream(evaluation_events(lambda: _answer_evaluation_status(answer_id)))
+
+
 @router.post("/batch/draft", response_model=BatchDraftResponse)
-async def batch_save_drafts(
-    batch_data: BatchDraftSave,
-    db: AsyncSession = Depends(get_db)
-):
+async def batch_save_drafts(batch_data: BatchDraftSave):
     """Save multiple draft answers at once without AI evaluation.
 
     This is more efficient than multiple individual calls.
     Useful for periodic background syncing.
     """
-    results: list[BatchDraftResultItem] = []
-    successful = 0
-    failed = 0
-
-    for draft in batch_data.drafts:
-        try:
-            # Get question with test info
-            query = (
-                select(Question)
-                .options(selectinload(Question.test))
-                .where(Question.id == draft.question_id)
-            )
-            result = await db.execute(query)
-            question = result.scalar_one_or_none()
+    async def _save_all(db: AsyncSession) -> list[BatchDraftResultItem]:
+        results: list[BatchDraftResultItem] = []
+        for draft in batch_data.drafts:
+            try:
+                # Get question with test info
+                query = (
+                    select(Question)
+                    .options(selectinload(Question.test))
+                    .where(Question.id == draft.question_id)
+                )
+                result = await db.execute(query)
+                question = result.scalar_one_or_none()
+
+                if not question:
+                    results.append(BatchDraftResultItem(
+                        question_id=draft.question_id,
+                        success=False,
+                        error="Question not found"
+                    ))
+                    continue
+
+                test = question.test
+                if test.status != TestStatus.IN_PROGRESS.value:
+                    results.append(BatchDraftResultItem(
+                        question_id=draft.question_id,
+                        success=False,
+                        error="Test is not in progress"
+                    ))
+                    continue
+
+                # Check if test is disqualified
+                if test.is_disqualified:
+                    results.append(BatchDraftResultItem(
+                        question_id=draft.question_id,
+                        success=False,
+                        error="Test has been disqualified"
+                    ))
+                    continue
+
+                # Savepoint per draft, so one bad draft does not undo the others
+                async with db.begin_nested():
+                    # Get or create answer
+                    answer_result = await db.execute(
+                        select(Answer).where(Answer.question_id == question.id)
+                    )
+                    answer = answer_result.scalar_one_or_none()
+
+                    if not answer:
+                        answer = Answer(question_id=question.id, version=1)
+                        db.add(answer)
+
+                    _apply_draft(answer, draft.candidate_answer, draft.candidate_code)
+                    await schedule_speculative_evaluation(db, answer)
 
-            if not question:
                 results.append(BatchDraftResultItem(
                     question_id=draft.question_id,
-                    success=False,
-                    error="Question not found"
+                    success=True,
+                    version=answer.version or 1
                 ))
-                failed += 1
-                continue
 
-            test = question.test
-            if test.status != TestStatus.IN_PROGRESS.value:
+            except Exception as e:
                 results.append(BatchDraftResultItem(
                     question_id=draft.question_id,
                     success=False,
-                    error="Test is not in progress"
+                    error=str(e)
                 ))
-                failed += 1
-                continue
-
-            # Check if test is disqualified
-            if test.is_disqualified:
-                results.append(BatchDraftResultItem(
-                    question_id=draft.question_id,
-                    success=False,
-                    error="Test has been disqualified"
-                ))
-                failed += 1
-                continue
-
-            # Get or create answer
-            answer_result = await db.execute(
-                select(Answer).where(Answer.question_id == question.id)
-            )
-            answer = answer_result.scalar_one_or_none()
-
-            if not answer:
-                answer = Answer(question_id=question.id, version=1)
-                db.add(answer)
-
-            # Track if this is an edit to a submitted answer
-            if answer.is_submitted:
-                if not answer.previous_answer and answer.candidate_answer:
-                    answer.previous_answer = answer.candidate_answer
-                    answer.previous_code = answer.candidate_code
-                    answer.previous_score = answer.score
-
-                answer.edit_count = (answer.edit_count or 0) + 1
-                answer.version = (answer.version or 1) + 1
-                answer.last_edited_at = datetime.utcnow()
-                answer.score = None
-                answer.feedback = None
-                answer.ai_evaluation = None
-                answer.evaluated_at = None
-
-            # Update content
-            answer.candidate_answer = draft.candidate_answer
-            answer.candidate_code = draft.candidate_code
-            answer.updated_at = datetime.utcnow()
-
-            results.append(BatchDraftResultItem(
-                question_id=draft.question_id,
-                success=True,
-                version=answer.version or 1
-            ))
-            successful += 1
-
-        except Exception as e:
-            results.append(BatchDraftResultItem(
-                question_id=draft.question_id,
-                success=False,
-                error=str(e)
-            ))
-            failed += 1
+        return results
 
-    await db.commit()
+    results = await write_queue.submit(_save_all)
+    successful = sum(1 for item in results if item.success)
 
     return BatchDraftResponse(
         total=len(batch_data.drafts),
         successful=successful,
-        failed=failed,
+        failed=len(results) - successful,
         saved_at=datetime.utcnow(),
         results=results
     )
@@ -330,13 +375,15 @@ async def batch_submit_answers(
     """Submit multiple answers at once with AI evaluation.
 
     Each answer is evaluated by AI and scored.
-    More efficient than individual submissions for bulk operations.
+    More efficient than individual submissions for bulk operations:
+    questions and answers are loaded up front, evaluations run concurrently
+    with no transaction open, and all writes go out in one flush at the end.
     """
-    results: list[BatchAnswerResultItem] = []
-    successful = 0
-    failed = 0
+    results: Dict[int, BatchAnswerResultItem] = {}  # input position -> result
+    pending = []  # (position, answer_data, question, evaluation kwargs)
+    submitted_at = datetime.utcnow()
 
-    # First, load all questions we need
+    # Load all questions and their existing answers in two queries
     question_ids = [item.question_id for item in batch_data.answers]
     query = (
         select(Question)
@@ -346,111 +393,215 @@ async def batch_submit_answers(
     result = await db.execute(query)
     questions = {q.id: q for q in result.scalars().all()}
 
-    for answer_data in batch_data.answers:
-        try:
-            question = questions.get(answer_data.question_id)
-
-            if not question:
-                results.append(BatchAnswerResultItem(
-                    question_id=answer_data.question_id,
-                    success=False,
-                    error="Question not found"
-                ))
-                failed += 1
-                continue
-
-            test = question.test
-            if test.status != TestStatus.IN_PROGRESS.value:
-                results.append(BatchAnswerResultItem(
-                    question_id=answer_data.question_id,
-                    success=False,
-                    error="Test is not in progress"
-                ))
-                failed += 1
-                continue
+    answer_result = await db.execute(
+        select(Answer).where(Answer.question_id.in_(question_ids))
+    )
+    answers = {a.question_id: a for a in answer_result.scalars().all()}
+    # Content as loaded, to spot drafts autosaved while the LLM works
+    loaded_content = {qid: (a.candidate_answer, a.candidate_code) for qid, a in answers.items()}
 
-            # Check if test is disqualified
-            if test.is_disqualified:
-                results.append(BatchAnswerResultItem(
-                    question_id=answer_data.question_id,
-                    success=False,
-                    error="Test has been disqualified"
-                ))
-                failed += 1
-                continue
+    for position, answer_data in enumerate(batch_data.answers):
+        question = questions.get(answer_data.question_id)
 
-            # Get or create answer
-            answer_result = await db.execute(
-                select(Answer).where(Answer.question_id == question.id)
+        if not question:
+            results[position] = BatchAnswerResultItem(
+                question_id=answer_data.question_id,
+                success=False,
+                error="Question not found"
             )
-            answer = answer_result.scalar_one_or_none()
-
-            if not answer:
-                answer = Answer(question_id=question.id, version=1)
-                db.add(answer)
-
-            is_resubmission = answer.is_submitted
-
-            if is_resubmission:
-                if answer.candidate_answer != answer_data.candidate_answer or \
-                   answer.candidate_code != answer_data.candidate_code:
-                    if not answer.previous_answer:
-                        answer.previous_answer = answer.candidate_answer
-                        answer.previous_code = answer.candidate_code
-                    answer.previous_score = answer.score
-                    answer.version = (answer.version or 1) + 1
-                    answer.edit_count = (answer.edit_count or 0) + 1
-                    answer.last_edited_at = datetime.utcnow()
-
-            # Update answer and mark as submitted
-            answer.candidate_answer = answer_data.candidate_answer
-            answer.candidate_code = answer_data.candidate_code
-            answer.is_submitted = True
-            answer.submitted_at = datetime.utcnow()
-
-            if answer_data.time_spent_seconds is not None:
-                answer.time_spent_seconds = answer_data.time_spent_seconds
-                answer.is_suspiciously_fast = answer_data.time_spent_seconds < SUSPICIOUSLY_FAST_THRESHOLD
-
-            # Evaluate answer using AI
-            evaluation = await ai_service.evaluate_answer(
-                question_text=question.question_text,
-                question_code=question.question_code,
-                expected_answer=question.expected_answer or "",
-                candidate_answer=answer_data.candidate_answer or "",
-                candidate_code=answer_data.candidate_code or "",
-                category=question.category,
-                difficulty=test.candidate.difficulty
+            continue
+
+        test = question.test
+        closed = _closed_test_error(test)
+        if closed:
+            results[position] = BatchAnswerResultItem(
+                question_id=answer_data.question_id,
+                success=False,
+                error=closed
             )
+            continue
+
+        pending.append((position, answer_data, question, dict(
+            question_text=question.question_text,
+            question_code=question.question_code,
+            expected_answer=question.expected_answer or "",
+            candidate_answer=answer_data.candidate_answer or "",
+            candidate_code=answer_data.candidate_code or "",
+            category=question.category,
+            difficulty=test.candidate.difficulty
+        )))
+
+    # End the read transaction so no connection or lock is held while the
+    # LLM works (expire_on_commit=False keeps the loaded objects usable)
+    await db.commit()
 
-            answer.score = evaluation.get("score", 0)
-            answer.feedback = evaluation.get("feedback", "")
-            answer.ai_evaluation = str(evaluation)
-            answer.evaluated_at = datetime.utcnow()
+    # Drafts already scored speculatively with the same content need no LLM call
+    evaluations = [
+        speculative_evaluation_for(answers.get(question.id), answer_data.candidate_answer, answer_data.candidate_code)
+        for _, answer_data, question, _ in pending
+    ]
+    to_evaluate = [index for index, evaluation in enumerate(evaluations) if evaluation is None]
+
+    # Evaluate the rest together - a few concurrent LLM calls instead of one
+    # sequential call per answer
+    try:
+        fresh = await ai_service.evaluate_answers_batch([pending[index][3] for index in to_evaluate])
+    except Exception as e:
+        fresh = [e] * len(to_evaluate)
+    for index, evaluation in zip(to_evaluate, fresh):
+        evaluations[index] = evaluation
+
+    # Autosaves go through the write queue on another connection while the
+    # LLM works: re-read the answers so the write starts from their current
+    # rows (and answers created meanwhile are reused, not duplicated)
+    pending_ids = [question.id for _, _, question, _ in pending]
+    if pending_ids:
+        answer_result = await db.execute(
+            select(Answer)
+            .where(Answer.question_id.in_(pending_ids))
+            .execution_options(populate_existing=True)
+        )
+        answers.update({a.question_id: a for a in answer_result.scalars().all()})
+        # The test may also have been completed, expired or disqualified meanwhile
+        await db.execute(
+            select(Test)
+            .where(Test.id.in_({question.test_id for _, _, question, _ in pending}))
+            .execution_options(populate_existing=True)
+        )
 
-            results.append(BatchAnswerResultItem(
+    for (position, answer_data, question, _), evaluation in zip(pending, evaluations):
+        if isinstance(evaluation, Exception):
+            results[position] = BatchAnswerResultItem(
                 question_id=answer_data.question_id,
-                success=True,
-                score=answer.score,
-                feedback=answer.feedback
-            ))
-            successful += 1
-
-        except Exception as e:
-            results.append(BatchAnswerResultItem(
+                success=False,
+                error=str(evaluation)
+            )
+            continue
+
+        closed = _closed_test_error(question.test)
+        if closed:
+            results[position] = BatchAnswerResultItem(
                 question_id=answer_data.question_id,
                 success=False,
-                error=str(e)
-            ))
-            failed += 1
+                error=closed
+            )
+            continue
+
+        answer = answers.get(question.id)
+        submitted_content = (answer_data.candidate_answer, answer_data.candidate_code)
+        if answer and (answer.candidate_answer, answer.candidate_code) not in (
+            loaded_content.get(question.id, (None, None)), submitted_content
+        ):
+            # A newer draft was saved during evaluation; keep it rather than
+            # overwrite it with the submitted content and its score
+            results[position] = BatchAnswerResultItem(
+                question_id=answer_data.question_id,
+                success=False,
+                error="Answer was edited while it was being evaluated; submit it again"
+            )
+            continue
+        if not answer:
+            answer = Answer(question_id=question.id, version=1)
+            db.add(answer)
+            answers[question.id] = answer
+
+        is_resubmission = answer.is_submitted
+
+        if is_resubmission:
+            if answer.candidate_answer != answer_data.candidate_answer or \
+               answer.candidate_code != answer_data.candidate_code:
+                if not answer.previous_answer:
+                    answer.previous_answer = answer.candidate_answer
+                    answer.previous_code = answer.candidate_code
+                answer.previous_score = answer.score
+                answer.version = (answer.version or 1) + 1
+                answer.edit_count = (answer.edit_count or 0) + 1
+                answer.last_edited_at = submitted_at
+
+        # Update answer and mark as submitted
+        answer.candidate_answer = answer_data.candidate_answer
+        answer.candidate_code = answer_data.candidate_code
+        answer.is_submitted = True
+        answer.submitted_at = submitted_at
+
+        if answer_data.time_spent_seconds is not None:
+            answer.time_spent_seconds = answer_data.time_spent_seconds
+            answer.is_suspiciously_fast = answer_data.time_spent_seconds < SUSPICIOUSLY_FAST_THRESHOLD
+
+        answer.score = evaluation.get("score", 0)
+        answer.feedback = evaluation.get("feedback", "")
+        answer.ai_evaluation = str(evaluation)
+        answer.evaluated_at = datetime.utcnow()
+        answer.evaluation_status = EVALUATION_DONE
+
+        results[position] = BatchAnswerResultItem(
+            question_id=answer_data.question_id,
+            success=True,
+            score=answer.score,
+            feedback=answer.feedback
+        )
 
+    # All inserts and updates go out in a single flush
     await db.commit()
 
+    ordered_results = [results[position] for position in sorted(results)]
+    successful = sum(1 for item in ordered_results if item.success)
+    failed = len(ordered_results) - successful
+
     return BatchAnswerResponse(
         total=len(batch_data.answers),
         successful=successful,
         failed=failed,
-        results=results
+        results=ordered_results
+    )
+
+
+def _closed_test_error(test: Test) -> Optional[str]:
+    """Why answers to ``test`` can no longer be submitted, or None while it is open."""
+    if test.status != TestStatus.IN_PROGRESS.value:
+        return "Test is not in progress"
+    if test.is_disqualified:
+        return "Test has been disqualified"
+    return None
+
+
+async def _get_in_progress_question(question_id: int, db: AsyncSession) -> Question:
+    """Load a question whose test is in progress and not disqualified."""
+    query = (
+        select(Question)
+        .options(selectinload(Question.test).selectinload(Test.candidate))
+        .where(Question.id == question_id)
+    )
+    result = await db.execute(query)
+    question = result.scalar_one_or_none()
+
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    test = question.test
+    if test.status != TestStatus.IN_PROGRESS.value:
+        raise HTTPException(status_code=400, detail="Test is not in progress")
+
+    # Check if test is disqualified
+    if test.is_disqualified:
+        raise HTTPException(
+            status_code=403,
+            detail="Test has been disqualified. No further submissions are allowed."
+        )
+    return question
+
+
+def _event_stream(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Wrap {"event", "data"} stream items in a Server-Sent Events response."""
+    async def body():
+        async for item in events:
+            yield sse_event(item["event"], item["data"])
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so tokens reach the browser as they arrive
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -495,28 +646,7 @@ async def get_live_feedback(
                 status="cached"
             )
 
-    # Get question details
-    query = (
-        select(Question)
-        .options(selectinload(Question.test))
-        .where(Question.id == request.question_id)
-    )
-    result = await db.execute(query)
-    question = result.scalar_one_or_none()
-
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
-
-    test = question.test
-    if test.status != TestStatus.IN_PROGRESS.value:
-        raise HTTPException(status_code=400, detail="Test is not in progress")
-
-    # Check if test is disqualified
-    if test.is_disqualified:
-        raise HTTPException(
-            status_code=403,
-            detail="Test has been disqualified. No further submissions are allowed."
-        )
+    question = await _get_in_progress_question(request.question_id, db)
 
     # Call AI service for lightweight feedback
     feedback = await ai_service.generate_live_feedback(
@@ -537,3 +667,107 @@ async def get_live_feedback(
         strengths=feedback.get("strengths", []),
         status=feedback.get("status", "success")
     )
+
+
+@router.post("/feedback/stream")
+async def stream_live_feedback(
+    request: FeedbackRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Streaming variant of /feedback as Server-Sent Events.
+
+    Emits ``delta`` events with raw model output as it is generated and a
+    final ``result`` event shaped like FeedbackResponse, so the candidate sees
+    progress after the first token instead of after the full completion.
+    """
+    answer_text = request.candidate_answer or ""
+    code_text = request.candidate_code or ""
+
+    content_hash = hashlib.md5(
+        f"{answer_text}{code_text}".encode()
+    ).hexdigest()[:16]
+
+    cached = _feedback_cache.get(request.question_id)
+    if cached:
+        cached_feedback, cached_time, cached_hash = cached
+        if time.time() - cached_time < FEEDBACK_CACHE_TTL and cached_hash == content_hash:
+            async def cached_events():
+                yield {"event": "result", "data": {**cached_feedback, "status": "cached"}}
+            return _event_stream(cached_events())
+
+    question = await _get_in_progress_question(request.question_id, db)
+    question_fields = dict(
+        question_text=question.question_text,
+        question_code=question.question_code,
+        expected_answer=question.expected_answer or "",
+        candidate_answer=answer_text,
+        candidate_code=code_text if code_text else None,
+        category=question.category
+    )
+
+    async def events():
+        async for item in ai_service.stream_live_feedback(**question_fields):
+            if item["event"] == "result":
+                feedback = FeedbackResponse(**{
+                    key: item["data"].get(key, default)
+                    for key, default in (("hints", []), ("missing_points", []), ("strengths", []), ("status", "success"))
+                })
+                if feedback.status not in ("too_short", "ai_unavailable"):
+                    _feedback_cache[request.question_id] = (item["data"], time.time(), content_hash)
+                item = {"event": "result", "data": feedback.model_dump()}
+            yield item
+
+    return _event_stream(events())
+
+
+def _candidate_question_response(result: Dict[str, Any]) -> CandidateQuestionResponse:
+    """Normalize the model's JSON into the response schema."""
+    return CandidateQuestionResponse(
+        answer=str(result.get("answer") or "Could you rephrase your question?"),
+        source=result.get("source", "ai"),
+        is_hint=bool(result.get("is_hint")),
+        term_found=bool(result.get("term_found")),
+        related_terms=[str(term) for term in result.get("related_terms") or []],
+    )
+
+
+@router.post("/ask", response_model=CandidateQuestionResponse)
+async def ask_question(
+    request: CandidateQuestionRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Answer a candidate's clarifying question about the current question.
+
+    Explains technical terms (from the knowledge base when possible) or gives
+    a gentle hint without revealing the answer.
+    """
+    question = await _get_in_progress_question(request.question_id, db)
+    result = await ai_service.answer_candidate_question(
+        candidate_question=request.question,
+        context=question.question_text,
+        track_id=question.test.candidate.track if question.test.candidate else None
+    )
+    return _candidate_question_response(result)
+
+
+@router.post("/ask/stream")
+async def stream_ask_question(
+    request: CandidateQuestionRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Streaming variant of /ask as Server-Sent Events.
+
+    Emits ``answer`` events carrying the answer text decoded so far and a
+    final ``result`` event shaped like CandidateQuestionResponse.
+    """
+    question = await _get_in_progress_question(request.question_id, db)
+    context = question.question_text
+    track_id = question.test.candidate.track if question.test.candidate else None
+
+    async def events():
+        async for item in ai_service.stream_candidate_question(request.question, context, track_id):
+            if item["event"] == "result":
+                item = {"event": "result", "data": _candidate_question_response(item["data"]).model_dump()}
+            yield item
+
+    return _event_stream(events())
@@ -16,7 +16,8 @@ import secrets
 import os
 import aiofiles
 
-from app.database import get_db
+from app.api.routes.jobs import accepted_response
+from app.database import get_db, async_session_maker
 from app.models.application import (
     Application,
     SkillAssessment,
@@ -48,6 +49,10 @@ from app.schemas.application import (
 )
 from app.data.skill_categories import SKILL_CATEGORIES, get_all_skills
 from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue, PermanentJobError
+from app.services.question_pool import PoolDraws, pool_draws
+from app.services.question_similarity import question_index
+from app.utils.pagination import keyset_page
 
 router = APIRouter()
 
@@ -610,6 +615,9 @@ async def analyze_application(
     - Position fit score
     - Skill ratings based on resume evidence
     - Strengths and areas for growth
+
+    The analysis runs as a background job: this returns 202 with the job's
+    status URL and the result is stored on the application.
     """
     # Get application with skills
     query = (
@@ -650,7 +658,51 @@ async def analyze_application(
             analysis=None,
         )
 
-    try:
+    # One analysis per application at a time; a repeated click gets the same job
+    job, _ = await job_queue.enqueue(
+        db, "analyze_application", {"application_id": application.id},
+        dedup_key=f"analyze_application:{application.id}",
+    )
+    await db.commit()
+
+    return accepted_response(
+        job,
+        success=True,
+        message="Analysis started. Poll the status URL for the result.",
+        analysis=None,
+    )
+
+
+@job_queue.handler("analyze_application")
+async def _analyze_application_job(payload: dict) -> dict:
+    """Run the Kimi2 analysis queued by analyze_application."""
+    application_id = payload["application_id"]
+
+    async with async_session_maker() as db:
+        query = (
+            select(Application)
+            .options(selectinload(Application.skill_assessments))
+            .where(Application.id == application_id)
+        )
+        result = await db.execute(query)
+        application = result.scalar_one_or_none()
+
+        if not application:
+            raise PermanentJobError(f"Application {application_id} not found")
+
+        skill_assessments = [
+            {
+                "category": s.category.value,
+                "skill_name": s.skill_name,
+                "self_rating": s.self_rating,
+            }
+            for s in application.skill_assessments
+            if s.self_rating is not None
+        ]
+
+        # End the read transaction before the slow AI call
+        await db.commit()
+
         # Call Kimi2 for analysis
         analysis_result = await ai_service.analyze_application(
             name=application.full_name,
@@ -674,38 +726,13 @@ async def analyze_application(
 
         application.updated_at = datetime.utcnow()
         await db.commit()
-        await db.refresh(application)
-
-        return AnalyzeResponse(
-            success=True,
-            message="Application analyzed successfully.",
-            analysis={
-                "suggested_position": analysis_result.get("best_position"),
-                "position_fit_score": float(analysis_result.get("fit_score", 0)),
-                "skill_ratings": [
-                    {
-                        "skill_name": s.get("skill"),
-                        "rating": s.get("adjusted_rating"),
-                        "confidence": 1.0 if s.get("resume_evidence") == "strong" else 0.7 if s.get("resume_evidence") == "moderate" else 0.4,
-                        "evidence": s.get("notes"),
-                    }
-                    for s in analysis_result.get("skill_verification", [])
-                ],
-                "strengths": analysis_result.get("strengths", []),
-                "areas_for_growth": analysis_result.get("areas_for_growth", []),
-                "overall_assessment": analysis_result.get("overall_assessment", ""),
-                "recommendation": "strong_candidate" if analysis_result.get("fit_score", 0) >= 80 else "good_candidate" if analysis_result.get("fit_score", 0) >= 60 else "potential" if analysis_result.get("fit_score", 0) >= 40 else "not_recommended",
-                "analysis_timestamp": datetime.utcnow().isoformat(),
-            },
-        )
 
-    except Exception as e:
-        print(f"[Applications] Error during Kimi2 analysis: {e}")
-        return AnalyzeResponse(
-            success=False,
-            message=f"Analysis failed: {str(e)}. Please try again later.",
-            analysis=None,
-        )
+        print(f"[Applications] Analysis stored for application {application.id}: fit_score={application.position_fit_score}")
+        return {
+            "application_id": application.id,
+            "suggested_position": application.suggested_position,
+            "position_fit_score": application.position_fit_score,
+        }
 
 
 # =============================================================================
@@ -718,10 +745,11 @@ async def list_applications(
     search: Optional[str] = Query(None, description="Search by name or email"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page"),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    List all applications (admin endpoint).
+    List all applications (admin endpoint), newest first.
 
     Supports filtering by status and searching by name/email.
     """
@@ -749,11 +777,10 @@ async def list_applications(
     total = total_result.scalar() or 0
 
     # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(Application.created_at.desc())
-
-    result = await db.execute(query)
-    applications = result.scalars().all()
+    keyset = await keyset_page(
+        db, query, Application.created_at, Application.id, page_size, cursor=cursor, skip=(page - 1) * page_size
+    )
+    applications = keyset.items
 
     # Calculate total pages
     total_pages = (total + page_size - 1) // page_size
@@ -784,6 +811,7 @@ async def list_applications(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=keyset.next_cursor,
     )
 
 
@@ -994,6 +1022,7 @@ async def create_candidate_from_application(
     application_id: int,
     data: CreateCandidateRequest,
     db: AsyncSession = Depends(get_db),
+    draws: PoolDraws = Depends(pool_draws),
 ):
     """
     Convert an application to a candidate in the existing test system.
@@ -1097,30 +1126,40 @@ async def create_candidate_from_application(
     # =========================================================================
     print(f"[Applications] Generating personalized questions for {app_full_name}...")
 
-    # Generate questions using AI
-    questions_data = {}
-    try:
-        questions_data = await ai_service.generate_test_questions(
-            categories=categories,
-            difficulty=data.difficulty,
-            skills=all_skills,
-            resume_text=skill_context,
-            track_id=track_id
-        )
-    except Exception as e:
-        print(f"[Applications] Error generating questions: {e}")
+    # Generate questions using AI - the specialization questions are generated
+    # alongside the per-category questions rather than after them
+    async def generate_category_questions():
+        try:
+            return await ai_service.generate_test_questions(
+                categories=categories,
+                difficulty=data.difficulty,
+                skills=all_skills,
+                resume_text=skill_context,
+                track_id=track_id,
+                question_source=draws.draw,
+                question_filter=question_index.filter_generated
+            )
+        except Exception as e:
+            print(f"[Applications] Error generating questions: {e}")
+            return {}
 
-    # Generate specialization questions if candidate has a track
-    specialization_questions = []
-    if track_id and get_track_config(track_id):
+    async def generate_track_questions():
+        if not (track_id and get_track_config(track_id)):
+            return []
         print(f"[Applications] Generating specialization questions for track: {track_id}")
         try:
-            specialization_questions = await ai_service.generate_specialization_questions(
+            return await ai_service.generate_specialization_questions(
                 track_id=track_id,
                 difficulty=data.difficulty
             )
         except Exception as e:
             print(f"[Applications] Error generating specialization questions: {e}")
+            return []
+
+    questions_data, specialization_questions = await asyncio.gather(
+        generate_category_questions(),
+        generate_track_questions()
+    )
 
     # =========================================================================
     # PHASE 3: Quick database transaction to insert everything
@@ -1229,7 +1268,8 @@ async def create_candidate_from_application(
                 expected_answer=q_data.get("expected_answer"),
                 hints=q_data.get("hints"),
                 max_score=100,
-                language=language
+                language=language,
+                fingerprint_id=q_data.get("fingerprint_id")
             )
             db.add(question)
             created_questions.append(question)
@@ -1263,7 +1303,8 @@ async def create_candidate_from_application(
                 expected_answer=q_data.get("expected_answer"),
                 hints=q_data.get("hints"),
                 max_score=100,
-                language=language
+                language=language,
+                fingerprint_id=q_data.get("fingerprint_id")
             )
             db.add(question)
             created_questions.append(question)
@@ -1283,6 +1324,9 @@ async def create_candidate_from_application(
         app_to_update.status = ApplicationStatus.TEST_GENERATED
 
     await db.commit()
+    # Pooled questions not saved here (e.g. the request failed) go back to stock
+    for category in sections:
+        draws.keep(questions_data.get(category, []))
 
     question_count = len(created_questions)
     print(f"[Applications] Created test with {question_count} personalized questions for {app_full_name}")
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional, Set
 import asyncio
 from app.database import get_db
-from app.models import Candidate, Test, Report
+from app.models import Candidate, CompetitionRegistration, Test, Report
 from app.schemas.candidate import CandidateCreate, CandidateResponse, CandidateUpdate, CandidateWithTests
 from app.services.ai_service import ai_service
+from app.services.competition_counters import repair_counters
 from app.services.resume_service import resume_service
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter()
 
@@ -20,22 +22,23 @@ _lock = asyncio.Lock()  # Protects access to _candidate_creation_locks
 
 @router.get("", response_model=List[CandidateWithTests])
 async def list_candidates(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all candidates with their test summaries."""
-    query = (
-        select(Candidate)
-        .options(selectinload(Candidate.tests).selectinload(Test.report))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Candidate.created_at.desc())
-    )
-    result = await db.execute(query)
-    candidates = result.scalars().all()
+    """List all candidates with their test summaries, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page.
+    """
+    query = select(Candidate).options(selectinload(Candidate.tests).selectinload(Test.report))
+    page = await keyset_page(db, query, Candidate.created_at, Candidate.id, limit, cursor=cursor, skip=skip)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    candidates = page.items
 
-    response = []
+    items = []
     for candidate in candidates:
         tests_summary = []
         # Sort tests by created_at descending (newest first)
@@ -55,7 +58,7 @@ async def list_candidates(
                 "disqualified_at": test.disqualified_at
             })
 
-        response.append(CandidateWithTests(
+        items.append(CandidateWithTests(
             id=candidate.id,
             name=candidate.name,
             email=candidate.email,
@@ -69,7 +72,7 @@ async def list_candidates(
             tests=tests_summary
         ))
 
-    return response
+    return items
 
 
 @router.post("", response_model=CandidateResponse)
@@ -231,7 +234,19 @@ async def delete_candidate(candidate_id: int, db: AsyncSession = Depends(get_db)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
+    # The candidate's competition registrations are deleted with it; recount
+    # those competitions in the same transaction
+    result = await db.execute(
+        select(CompetitionRegistration.competition_id)
+        .where(CompetitionRegistration.candidate_id == candidate_id)
+        .distinct()
+    )
+    competition_ids = result.scalars().all()
+
     await db.delete(candidate)
+    await db.flush()
+    for competition_id in competition_ids:
+        await repair_counters(db, competition_id)
     await db.commit()
 
     return {"message": "Candidate deleted"}
@@ -3,13 +3,14 @@ from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from app.database import get_db
 from app.models import Report, Test, Candidate, Certificate, get_score_tier
 from app.schemas.certificate import CertificateResponse, CertificateVerification
 from app.services.certificate_service import certificate_service
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter()
 
@@ -181,19 +182,20 @@ async def verify_certificate(certificate_id: str, db: AsyncSession = Depends(get
 
 @router.get("", response_model=List[CertificateResponse])
 async def list_certificates(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all certificates (admin)."""
-    query = (
-        select(Certificate)
-        .offset(skip)
-        .limit(limit)
-        .order_by(Certificate.created_at.desc())
-    )
-    result = await db.execute(query)
-    certificates = result.scalars().all()
+    """List all certificates, newest first (admin).
+
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page.
+    """
+    page = await keyset_page(db, select(Certificate), Certificate.created_at, Certificate.id, limit, cursor=cursor, skip=skip)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    certificates = page.items
 
     return [
         CertificateResponse(
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 import os
 import uuid
 
-from app.database import get_db
+from app.api.routes.jobs import job_status_url
+from app.database import get_db, async_session_maker
 from app.models import Test, ChallengeSubmission, TaskResponse, Deliverable
 from app.models.test import TestStatus
 from app.challenges import Track, build_challenge_spec, get_track_display_name
@@ -23,7 +25,13 @@ from app.schemas.challenge import (
     ChallengeTaskSpec,
     AutoPresentationSpec,
 )
+from app.schemas.answer import EvaluationStatusResponse
 from app.services.ai_service import ai_service
+from app.services.deferred_evaluation import (
+    EVALUATION_DONE, enqueue_task_evaluation, evaluation_events,
+)
+from app.services.llm_streaming import sse_event
+from app.services.job_queue import job_queue, PermanentJobError
 
 router = APIRouter()
 
@@ -146,6 +154,7 @@ async def save_task_draft(
         task_response.feedback = None
         task_response.ai_evaluation = None
         task_response.evaluated_at = None
+        task_response.evaluation_status = None
 
     # Update content
     task_response.response_text = draft_data.response_text
@@ -169,7 +178,12 @@ async def submit_task_response(
     submit_data: TaskResponseSubmit,
     db: AsyncSession = Depends(get_db)
 ):
-    """Submit a task response for AI evaluation."""
+    """Submit a task response for AI evaluation.
+
+    With ``defer_evaluation`` the response is saved and returned at once with
+    ``evaluation_status="pending"``; poll GET /challenges/task/{id}/evaluation
+    or stream GET /challenges/task/{id}/evaluation/stream for the score.
+    """
     # Get test with challenge submission and candidate
     query = (
         select(Test)
@@ -239,6 +253,15 @@ async def submit_task_response(
     task_response.is_submitted = True
     task_response.submitted_at = datetime.utcnow()
 
+    if submit_data.defer_evaluation:
+        await enqueue_task_evaluation(db, task_response)
+        await db.commit()
+        await db.refresh(task_response)
+
+        response = TaskResponseResponse.model_validate(task_response)
+        response.needs_resubmit = False
+        return response
+
     # Evaluate with AI
     evaluation = await ai_service.evaluate_challenge_task(
         task_title=task_spec.title,
@@ -254,6 +277,7 @@ async def submit_task_response(
     task_response.feedback = evaluation.get("feedback", "")
     task_response.ai_evaluation = evaluation
     task_response.evaluated_at = datetime.utcnow()
+    task_response.evaluation_status = EVALUATION_DONE
 
     await db.commit()
     await db.refresh(task_response)
@@ -263,6 +287,41 @@ async def submit_task_response(
     return response
 
 
+async def _task_evaluation_status(task_response_id: int) -> Optional[Dict[str, Any]]:
+    """Current evaluation state of one task response, read in its own short session."""
+    async with async_session_maker() as db:
+        task_response = await db.get(TaskResponse, task_response_id)
+        if not task_response:
+            return None
+        return EvaluationStatusResponse.model_validate(task_response).model_dump(mode="json")
+
+
+@router.get("/task/{task_response_id}/evaluation", response_model=EvaluationStatusResponse)
+async def get_task_evaluation(task_response_id: int):
+    """Cheap poll for a deferred task evaluation: status, and the score once ready."""
+    status = await _task_evaluation_status(task_response_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task response not found")
+    return status
+
+
+@router.get("/task/{task_response_id}/evaluation/stream")
+async def stream_task_evaluation(task_response_id: int):
+    """SSE stream that emits "status" now and "result" when the score is stored."""
+    if await _task_evaluation_status(task_response_id) is None:
+        raise HTTPException(status_code=404, detail="Task response not found")
+
+    async def body():
+        async for item in evaluation_events(lambda: _task_evaluation_status(task_response_id)):
+            yield sse_event(item["event"], item["data"])
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/deliverable/upload")
 async def upload_deliverable(
     test_id: int,
@@ -436,11 +495,56 @@ async def submit_challenge(
     submission.submitted_at = datetime.utcnow()
     submission.overall_score = overall_score
 
-    # Generate presentation data
-    try:
-        track_enum = Track(submission.track)
+    # Presentation generation is slow; it runs as a background job
+    job, _ = await job_queue.enqueue(
+        db, "generate_challenge_presentation", {"test_id": test_id},
+        dedup_key=f"challenge_presentation:{test_id}",
+    )
+
+    await db.commit()
+
+    return {
+        "success": True,
+        "overall_score": overall_score,
+        "presentation_generated": False,
+        "job_id": job.id,
+        "status_url": job_status_url(job),
+    }
+
+
+@job_queue.handler("generate_challenge_presentation")
+async def _generate_challenge_presentation_job(payload: dict) -> dict:
+    """Generate the auto-presentation for a submitted challenge."""
+    test_id = payload["test_id"]
+
+    async with async_session_maker() as db:
+        query = (
+            select(Test)
+            .options(
+                selectinload(Test.challenge_submission)
+                .selectinload(ChallengeSubmission.task_responses),
+                selectinload(Test.challenge_submission)
+                .selectinload(ChallengeSubmission.deliverables),
+                selectinload(Test.candidate),
+            )
+            .where(Test.id == test_id)
+        )
+        result = await db.execute(query)
+        test = result.scalar_one_or_none()
+
+        if not test or not test.challenge_submission:
+            raise PermanentJobError(f"No challenge submission for test {test_id}")
+
+        submission = test.challenge_submission
+        try:
+            track_enum = Track(submission.track)
+        except ValueError:
+            raise PermanentJobError(f"Unknown challenge track: {submission.track}")
         challenge_spec = build_challenge_spec(track_enum)
 
+        # End the read transaction before the slow AI call
+        await db.commit()
+
         presentation_data = await ai_service.generate_challenge_presentation(
             candidate_name=test.candidate.name,
             track=submission.track,
@@ -450,17 +554,9 @@ async def submit_challenge(
         )
         submission.presentation_data = presentation_data
         submission.presentation_generated_at = datetime.utcnow()
-    except Exception as e:
-        print(f"Error generating presentation: {e}")
-
-    await db.commit()
-    await db.refresh(submission)
+        await db.commit()
 
-    return {
-        "success": True,
-        "overall_score": overall_score,
-        "presentation_generated": submission.presentation_data is not None
-    }
+        return {"test_id": test_id, "presentation_generated": presentation_data is not None}
 
 
 @router.get("/presentation/{test_id}")
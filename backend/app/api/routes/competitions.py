@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime
 import secrets
 import statistics
 
+from app.config import settings
 from app.database import get_db
 from app.models import Candidate, Test, Question, Answer
 from app.models.competition import Competition, CompetitionRegistration, BehavioralMetrics, CompetitionStatus
@@ -16,9 +17,23 @@ from app.schemas.competition import (
     RegistrationCreate, RegistrationResponse, RegistrationWithToken,
     ScreeningTestResponse, ScreeningSubmission, ScreeningResult,
     BehavioralMetricsResponse, RankingEntry, RankingsResponse, QualifyResponse,
-    RegistrationSummary
+    RegistrationSummary, ScreeningPoolProvision, ScreeningPoolStatus, AnswerSimilarityReport
 )
 from app.services.ai_service import ai_service, detect_programming_language
+from app.services.competition_counters import (
+    claim_registration_slot, enqueue_repair, mark_screening_completed, refresh_qualified_count,
+)
+from app.services.answer_similarity import (
+    answer_similarity, enqueue_registration_index, enqueue_scan, scan_dedup_key, update_risk_score,
+)
+from app.services.job_queue import job_queue
+from app.services.question_pool import PoolDraws, question_pool
+from app.services.question_similarity import question_index
+from app.services.screening_pool import (
+    SCREENING_POOL_READY, SCREENING_SECTIONS, deal_screening_questions, pool_sections, request_provisioning,
+)
+from app.api.routes.jobs import accepted_response
+from app.utils.pagination import keyset_page
 
 router = APIRouter()
 
@@ -60,6 +75,7 @@ async def create_competition(
         test_duration_minutes=competition.test_duration_minutes,
         questions_count=competition.questions_count,
         passing_percentile=competition.passing_percentile,
+        screening_pool_status=competition.screening_pool_status,
         created_at=competition.created_at,
         updated_at=competition.updated_at,
         registration_count=0,
@@ -84,23 +100,6 @@ async def list_competitions(
 
     response = []
     for comp in competitions:
-        # Count registrations
-        reg_count = await db.execute(
-            select(func.count(CompetitionRegistration.id))
-            .where(CompetitionRegistration.competition_id == comp.id)
-        )
-        registration_count = reg_count.scalar() or 0
-
-        # Count completed screenings
-        completed_count_result = await db.execute(
-            select(func.count(CompetitionRegistration.id))
-            .where(
-                CompetitionRegistration.competition_id == comp.id,
-                CompetitionRegistration.screening_completed == True
-            )
-        )
-        completed_count = completed_count_result.scalar() or 0
-
         response.append(CompetitionResponse(
             id=comp.id,
             name=comp.name,
@@ -114,10 +113,11 @@ async def list_competitions(
             test_duration_minutes=comp.test_duration_minutes,
             questions_count=comp.questions_count,
             passing_percentile=comp.passing_percentile,
+            screening_pool_status=comp.screening_pool_status,
             created_at=comp.created_at,
             updated_at=comp.updated_at,
-            registration_count=registration_count,
-            completed_count=completed_count
+            registration_count=comp.registration_count,
+            completed_count=comp.completed_count
         ))
 
     return response
@@ -155,10 +155,6 @@ async def get_competition(competition_id: int, db: AsyncSession = Depends(get_db
             qualification_rank=reg.qualification_rank
         ))
 
-    # Count stats
-    registration_count = len(registrations)
-    completed_count = sum(1 for r in registrations if r.screening_completed)
-
     return CompetitionDetail(
         id=competition.id,
         name=competition.name,
@@ -172,10 +168,11 @@ async def get_competition(competition_id: int, db: AsyncSession = Depends(get_db
         test_duration_minutes=competition.test_duration_minutes,
         questions_count=competition.questions_count,
         passing_percentile=competition.passing_percentile,
+        screening_pool_status=competition.screening_pool_status,
         created_at=competition.created_at,
         updated_at=competition.updated_at,
-        registration_count=registration_count,
-        completed_count=completed_count,
+        registration_count=competition.registration_count,
+        completed_count=competition.completed_count,
         registrations=registrations
     )
 
@@ -199,22 +196,6 @@ async def update_competition(
     await db.commit()
     await db.refresh(competition)
 
-    # Get counts
-    reg_count = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(CompetitionRegistration.competition_id == competition.id)
-    )
-    registration_count = reg_count.scalar() or 0
-
-    completed_count_result = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(
-            CompetitionRegistration.competition_id == competition.id,
-            CompetitionRegistration.screening_completed == True
-        )
-    )
-    completed_count = completed_count_result.scalar() or 0
-
     return CompetitionResponse(
         id=competition.id,
         name=competition.name,
@@ -228,13 +209,70 @@ async def update_competition(
         test_duration_minutes=competition.test_duration_minutes,
         questions_count=competition.questions_count,
         passing_percentile=competition.passing_percentile,
+        screening_pool_status=competition.screening_pool_status,
         created_at=competition.created_at,
         updated_at=competition.updated_at,
-        registration_count=registration_count,
-        completed_count=completed_count
+        registration_count=competition.registration_count,
+        completed_count=competition.completed_count
     )
 
 
+async def _screening_pool_status(db: AsyncSession, competition: Competition) -> ScreeningPoolStatus:
+    job = await job_queue.find_active(db, f"provision_screening_pool:{competition.id}")
+    return ScreeningPoolStatus(
+        competition_id=competition.id,
+        status=competition.screening_pool_status,
+        variants=competition.screening_pool_variants,
+        ready_at=competition.screening_pool_ready_at,
+        sections=await pool_sections(db, competition),
+        job_id=job.id if job else None,
+    )
+
+
+@router.post("/{competition_id}/screening-pool")
+async def provision_screening_pool(
+    competition_id: int,
+    data: ScreeningPoolProvision,
+    db: AsyncSession = Depends(get_db)
+):
+    """Pre-generate the competition's screening question pool (admin only).
+
+    Run this before screening_start_date: K variants of every question slot
+    are generated in the background, after which screening tests are dealt
+    from the pool instead of generated per registrant. Returns 202 with the
+    provisioning job, or the current status if the pool is already ready.
+    """
+    result = await db.execute(select(Competition).where(Competition.id == competition_id))
+    competition = result.scalar_one_or_none()
+
+    if not competition:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    variants = data.variants or competition.screening_pool_variants or settings.SCREENING_POOL_VARIANTS
+    if variants < 1:
+        raise HTTPException(status_code=400, detail="variants must be at least 1")
+
+    if (competition.screening_pool_status == SCREENING_POOL_READY and not data.rebuild
+            and variants == competition.screening_pool_variants):
+        return await _screening_pool_status(db, competition)
+
+    job = await request_provisioning(db, competition, variants, rebuild=data.rebuild)
+    await db.commit()
+    return accepted_response(job, competition_id=competition.id, variants=variants)
+
+
+@router.get("/{competition_id}/screening-pool", response_model=ScreeningPoolStatus)
+async def get_screening_pool(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Provisioning progress of the competition's screening question pool (admin only)."""
+    result = await db.execute(select(Competition).where(Competition.id == competition_id))
+    competition = result.scalar_one_or_none()
+
+    if not competition:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    return await _screening_pool_status(db, competition)
+
+
 # ============== Public Registration Endpoints ==============
 
 @router.post("/{competition_id}/register", response_model=RegistrationWithToken)
@@ -255,13 +293,8 @@ async def register_for_competition(
     if competition.status not in [CompetitionStatus.REGISTRATION_OPEN.value, CompetitionStatus.SCREENING_ACTIVE.value]:
         raise HTTPException(status_code=400, detail="Registration is not open for this competition")
 
-    # Check max participants
-    reg_count = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(CompetitionRegistration.competition_id == competition_id)
-    )
-    current_count = reg_count.scalar() or 0
-    if current_count >= competition.max_participants:
+    # Cheap early rejection; the slot itself is claimed atomically below
+    if competition.max_participants is not None and competition.registration_count >= competition.max_participants:
         raise HTTPException(status_code=400, detail="Competition has reached maximum participants")
 
     # Check if email already registered for this competition
@@ -292,6 +325,11 @@ async def register_for_competition(
         db.add(candidate)
         await db.flush()
 
+    # Claim a slot: check and increment in one statement, so concurrent registrations cannot overshoot
+    if not await claim_registration_slot(db, competition_id):
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Competition has reached maximum participants")
+
     # Generate unique registration token
     registration_token = secrets.token_urlsafe(32)
 
@@ -388,8 +426,7 @@ async def get_screening_test(
             # Check if expired
             if time_remaining <= 0:
                 test.status = TestStatus.EXPIRED.value
-                registration.screening_completed = True
-                registration.screening_completed_at = datetime.utcnow()
+                await mark_screening_completed(db, registration)
                 await db.commit()
 
         # Build questions by section
@@ -435,11 +472,14 @@ async def get_screening_test(
             test_status=test.status,
             test_access_token=test.access_token,
             time_remaining_seconds=time_remaining,
-            questions_by_section=questions_by_section
+            questions_by_section=questions_by_section,
+            # Live generation still running: the page polls until "ready"
+            generation_status=test.generation_status
         )
 
-    # No test yet - create one
-    test = await _create_screening_test(db, registration, competition, candidate)
+    # No test yet - create one (pooled questions it does not save go back to stock)
+    async with question_pool.draws() as draws:
+        test = await _create_screening_test(db, registration, competition, candidate, draws)
 
     return ScreeningTestResponse(
         registration_id=registration.id,
@@ -452,7 +492,8 @@ async def get_screening_test(
         screening_completed=False,
         test_id=test.id,
         test_status=test.status,
-        test_access_token=test.access_token
+        test_access_token=test.access_token,
+        generation_status=test.generation_status
     )
 
 
@@ -460,9 +501,16 @@ async def _create_screening_test(
     db: AsyncSession,
     registration: CompetitionRegistration,
     competition: Competition,
-    candidate: Candidate
+    candidate: Candidate,
+    draws: PoolDraws
 ) -> Test:
-    """Create a screening test for a competition registration."""
+    """Create a screening test for a competition registration.
+
+    With a provisioned screening pool this is only inserts; otherwise the
+    questions are generated for this registrant, with the Test row already
+    committed so no write transaction stays open while the LLM works. Its
+    generation_progress keeps the test from being started until then.
+    """
     access_token = secrets.token_urlsafe(32)
 
     # Calculate break time (shorter for 1-hour test)
@@ -485,64 +533,91 @@ async def _create_screening_test(
     # Link test to registration
     registration.test_id = test.id
 
-    # Generate screening questions using AI
-    # For screening, we use a mix of brain teasers and general engineering
-    sections = ["brain_teaser", "general_engineering", "coding"]
+    # Deal one variant per slot from the pre-provisioned pool
+    dealt = await deal_screening_questions(db, competition, registration.id)
 
-    questions_data = await ai_service.generate_test_questions(
-        categories=sections,
-        difficulty="mid",
-        skills=candidate.extracted_skills or [],
-        resume_text=candidate.resume_text
-    )
-    # Note: generate_test_questions returns ~3-4 questions per category
-    # We limit to competition.questions_count when creating questions below
+    if dealt is None:
+        # Generate screening questions using AI
+        # For screening, we use a mix of brain teasers and general engineering
+        # (drawn from the question pool when it has stock)
+        sections = [category for category, _ in SCREENING_SECTIONS]
 
-    # Create questions
-    created_questions = []
-    question_count = 0
-    for section_order, category in enumerate(sections):
-        category_questions = questions_data.get(category, [])
-        for q_order, q_data in enumerate(category_questions):
-            if question_count >= competition.questions_count:
-                break
-
-            question_text = q_data.get("question_text", "")
-            question_code = q_data.get("question_code")
-
-            language = None
-            if category in ["coding", "code_review"]:
-                language = detect_programming_language(
-                    text=question_text,
-                    code=question_code,
-                    category=category
-                )
-
-            question = Question(
-                test_id=test.id,
-                category=category,
-                section_order=section_order,
-                question_order=q_order,
-                question_text=question_text,
-                question_code=question_code,
-                expected_answer=q_data.get("expected_answer"),
-                hints=q_data.get("hints"),
-                max_score=100,
-                language=language
+        test.generation_progress = [
+            {"category": category, "section_order": section_order, "status": "pending", "questions": 0}
+            for section_order, category in enumerate(sections)
+        ]
+        await db.commit()
+        try:
+            questions_data = await ai_service.generate_test_questions(
+                categories=sections,
+                difficulty="mid",
+                skills=candidate.extracted_skills or [],
+                resume_text=candidate.resume_text,
+                question_source=draws.draw,
+                question_filter=question_index.filter_generated
             )
-            db.add(question)
-            created_questions.append(question)
-            question_count += 1
+        except Exception:
+            # Drop the empty test so the next visit generates again
+            registration.test_id = None
+            await db.delete(test)
+            await db.commit()
+            raise
+        # Note: generate_test_questions returns ~3-4 questions per category
+        # We limit to competition.questions_count here
+        dealt = []
+        for section_order, category in enumerate(sections):
+            for q_order, q_data in enumerate(questions_data.get(category, [])):
+                if len(dealt) >= competition.questions_count:
+                    break
+                language = None
+                if category in ["coding", "code_review"]:
+                    language = detect_programming_language(
+                        text=q_data.get("question_text", ""),
+                        code=q_data.get("question_code"),
+                        category=category
+                    )
+                dealt.append({
+                    **q_data,
+                    "category": category,
+                    "section_order": section_order,
+                    "question_order": q_order,
+                    "language": language,
+                })
 
-        if question_count >= competition.questions_count:
-            break
+        # A section without questions is only fine when earlier ones already filled the test
+        full = len(dealt) >= competition.questions_count
+        test.generation_progress = [
+            dict(
+                section,
+                status="ready" if count or full else "failed",
+                questions=count,
+            )
+            for section in test.generation_progress
+            for count in [sum(1 for q in dealt if q["category"] == section["category"])]
+        ]
 
+    # Create questions
+    created_questions = [
+        Question(
+            test_id=test.id,
+            category=q_data["category"],
+            section_order=q_data["section_order"],
+            question_order=q_data["question_order"],
+            question_text=q_data.get("question_text", ""),
+            question_code=q_data.get("question_code"),
+            expected_answer=q_data.get("expected_answer"),
+            hints=q_data.get("hints"),
+            max_score=100,
+            language=q_data.get("language"),
+            fingerprint_id=q_data.get("fingerprint_id")
+        )
+        for q_data in dealt
+    ]
+    db.add_all(created_questions)
     await db.flush()
 
     # Create answer records
-    for question in created_questions:
-        answer = Answer(question_id=question.id)
-        db.add(answer)
+    db.add_all([Answer(question_id=question.id) for question in created_questions])
 
     # Create behavioral metrics record
     behavioral_metrics = BehavioralMetrics(
@@ -552,6 +627,7 @@ async def _create_screening_test(
     db.add(behavioral_metrics)
 
     await db.commit()
+    draws.keep(dealt)
     await db.refresh(test)
 
     return test
@@ -589,6 +665,14 @@ async def start_screening_test(
     if test.status != TestStatus.PENDING.value:
         raise HTTPException(status_code=400, detail="Test already started or completed")
 
+    if test.generation_status == "failed":
+        raise HTTPException(
+            status_code=409,
+            detail="Test questions could not be prepared. Please contact the assessment administrator."
+        )
+    if test.generation_status != "ready":
+        raise HTTPException(status_code=409, detail="Test questions are still being generated. Please try again shortly.")
+
     # Start the test
     test.status = TestStatus.IN_PROGRESS.value
     test.start_time = datetime.utcnow()
@@ -639,18 +723,7 @@ async def submit_screening_test(
 
     if registration.screening_completed:
         # Return existing result
-        return ScreeningResult(
-            registration_id=registration.id,
-            competition_name=registration.competition.name,
-            candidate_name=registration.candidate.name,
-            screening_completed=True,
-            screening_score=registration.screening_score,
-            screening_percentile=registration.screening_percentile,
-            is_qualified=registration.is_qualified,
-            qualification_rank=registration.qualification_rank,
-            total_questions=len(registration.test.questions) if registration.test else 0,
-            questions_answered=sum(1 for q in registration.test.questions if q.answer and q.answer.is_submitted) if registration.test else 0
-        )
+        return _completed_screening_result(registration)
 
     test = registration.test
     if not test:
@@ -662,6 +735,7 @@ async def submit_screening_test(
     questions_answered = 0
     time_per_question_data = []
 
+    pending = []  # (answer, evaluation kwargs)
     for answer_data in submission.answers:
         question = question_map.get(answer_data.question_id)
         if not question or not question.answer:
@@ -678,22 +752,29 @@ async def submit_screening_test(
         if answer_data.time_spent_seconds < 30 and question.category in ["coding", "system_design"]:
             answer.is_suspiciously_fast = True
 
-        # Evaluate answer using AI
-        try:
-            evaluation = await ai_service.evaluate_answer(
-                question_text=question.question_text,
-                question_code=question.question_code,
-                expected_answer=question.expected_answer or "",
-                candidate_answer=answer.candidate_answer or "",
-                candidate_code=answer.candidate_code,
-                category=question.category,
-                difficulty="mid"
-            )
+        pending.append((answer, dict(
+            question_text=question.question_text,
+            question_code=question.question_code,
+            expected_answer=question.expected_answer or "",
+            candidate_answer=answer.candidate_answer or "",
+            candidate_code=answer.candidate_code,
+            category=question.category,
+            difficulty="mid"
+        )))
+
+    # Evaluate all answers with batched AI calls
+    try:
+        evaluations = await ai_service.evaluate_answers_batch([item for _, item in pending])
+    except Exception:
+        evaluations = [None] * len(pending)
+
+    for (answer, _), evaluation in zip(pending, evaluations):
+        if evaluation is not None:
             answer.score = evaluation.get("score", 0)
             answer.feedback = evaluation.get("feedback", "")
             answer.ai_evaluation = str(evaluation)
             answer.evaluated_at = datetime.utcnow()
-        except Exception:
+        else:
             answer.score = 0  # Default score if AI fails (don't give unearned points)
 
         total_score += answer.score
@@ -720,14 +801,20 @@ async def submit_screening_test(
     final_score = total_score / questions_answered if questions_answered > 0 else 0
 
     # Update registration
-    registration.screening_completed = True
-    registration.screening_completed_at = datetime.utcnow()
+    if not await mark_screening_completed(db, registration):
+        # A concurrent submit completed this screening first - keep its score and answers
+        await db.rollback()
+        result = await db.execute(query.execution_options(populate_existing=True))
+        return _completed_screening_result(result.scalar_one())
     registration.screening_score = final_score
 
     # Mark test as completed
     test.status = TestStatus.COMPLETED.value
     test.end_time = datetime.utcnow()
 
+    if answer_similarity.enabled:
+        await enqueue_registration_index(db, registration.id)
+
     await db.commit()
     await db.refresh(registration)
 
@@ -747,7 +834,8 @@ async def submit_screening_test(
             consistency_score=behavioral_metrics.consistency_score,
             anomaly_flags=behavioral_metrics.anomaly_flags or [],
             risk_score=behavioral_metrics.risk_score,
-            risk_factors=behavioral_metrics.risk_factors or []
+            risk_factors=behavioral_metrics.risk_factors or [],
+            similar_answer_count=behavioral_metrics.similar_answer_count or 0
         )
 
     return ScreeningResult(
@@ -764,6 +852,22 @@ async def submit_screening_test(
     )
 
 
+def _completed_screening_result(registration: CompetitionRegistration) -> ScreeningResult:
+    """Result of an already completed screening."""
+    return ScreeningResult(
+        registration_id=registration.id,
+        competition_name=registration.competition.name,
+        candidate_name=registration.candidate.name,
+        screening_completed=True,
+        screening_score=registration.screening_score,
+        screening_percentile=registration.screening_percentile,
+        is_qualified=registration.is_qualified,
+        qualification_rank=registration.qualification_rank,
+        total_questions=len(registration.test.questions) if registration.test else 0,
+        questions_answered=sum(1 for q in registration.test.questions if q.answer and q.answer.is_submitted) if registration.test else 0
+    )
+
+
 async def _calculate_behavioral_metrics(
     metrics: BehavioralMetrics,
     time_per_question: list,
@@ -851,8 +955,9 @@ async def _calculate_behavioral_metrics(
             risk_factors.append("Inconsistent response times")
             risk_score += 10
 
-        metrics.risk_score = min(100, risk_score)
+        metrics.behavior_risk_score = min(100, risk_score)
         metrics.risk_factors = risk_factors
+        update_risk_score(metrics)  # Adds the answer-similarity penalty, if any
 
     return metrics
 
@@ -903,7 +1008,8 @@ async def get_screening_results(
             consistency_score=bm.consistency_score,
             anomaly_flags=bm.anomaly_flags or [],
             risk_score=bm.risk_score,
-            risk_factors=bm.risk_factors or []
+            risk_factors=bm.risk_factors or [],
+            similar_answer_count=bm.similar_answer_count or 0
         )
 
     questions_answered = 0
@@ -937,9 +1043,14 @@ async def get_rankings(
     competition_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get competition rankings (admin only)."""
+    """Get competition rankings (admin only).
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page; every page
+    costs the same however deep it is.
+    """
     # Get competition
     result = await db.execute(select(Competition).where(Competition.id == competition_id))
     competition = result.scalar_one_or_none()
@@ -958,46 +1069,26 @@ async def get_rankings(
             CompetitionRegistration.competition_id == competition_id,
             CompetitionRegistration.screening_completed == True
         )
-        .order_by(CompetitionRegistration.screening_score.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    result = await db.execute(query)
-    registrations = result.scalars().all()
-
-    # Count totals
-    total_reg = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(CompetitionRegistration.competition_id == competition_id)
     )
-    total_registrations = total_reg.scalar() or 0
-
-    completed_count = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(
-            CompetitionRegistration.competition_id == competition_id,
-            CompetitionRegistration.screening_completed == True
-        )
+    page = await keyset_page(
+        db, query, CompetitionRegistration.screening_score, CompetitionRegistration.id, limit, cursor=cursor, skip=skip
     )
-    completed_screenings = completed_count.scalar() or 0
+    registrations = page.items
 
-    qualified_count_result = await db.execute(
-        select(func.count(CompetitionRegistration.id))
-        .where(
-            CompetitionRegistration.competition_id == competition_id,
-            CompetitionRegistration.is_qualified == True
-        )
-    )
-    qualified_count = qualified_count_result.scalar() or 0
+    total_registrations = competition.registration_count
+    completed_screenings = competition.completed_count
+    qualified_count = competition.qualified_registration_count
 
     # Build rankings
     rankings = []
-    for idx, reg in enumerate(registrations, start=skip + 1):
+    for idx, reg in enumerate(registrations, start=page.offset + 1):
         risk_score = 0
         consistency_score = 100
+        similar_answer_count = 0
         if reg.behavioral_metrics:
             risk_score = reg.behavioral_metrics.risk_score or 0
             consistency_score = reg.behavioral_metrics.consistency_score or 100
+            similar_answer_count = reg.behavioral_metrics.similar_answer_count or 0
 
         rankings.append(RankingEntry(
             rank=idx,
@@ -1009,7 +1100,8 @@ async def get_rankings(
             screening_completed_at=reg.screening_completed_at,
             is_qualified=reg.is_qualified,
             risk_score=risk_score,
-            consistency_score=consistency_score
+            consistency_score=consistency_score,
+            similar_answer_count=similar_answer_count
         ))
 
     # Calculate cutoff score if enough completed
@@ -1036,10 +1128,40 @@ async def get_rankings(
         completed_screenings=completed_screenings,
         qualified_count=qualified_count,
         rankings=rankings,
-        cutoff_score=cutoff_score
+        cutoff_score=cutoff_score,
+        next_cursor=page.next_cursor
     )
 
 
+@router.post("/{competition_id}/answer-similarity/scan")
+async def scan_answer_similarity(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Rebuild the competition's copied-answer clusters from all submissions (admin only).
+
+    Answers are indexed incrementally as screenings are submitted; run this
+    after screening closes, or after changing the similarity settings, for
+    an authoritative pass. Returns 202 with the scan job.
+    """
+    result = await db.execute(select(Competition.id).where(Competition.id == competition_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    job = await enqueue_scan(db, competition_id)
+    await db.commit()
+    return accepted_response(job, competition_id=competition_id)
+
+
+@router.get("/{competition_id}/answer-similarity", response_model=AnswerSimilarityReport)
+async def get_answer_similarity(competition_id: int, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    """Largest clusters of closely matching answers in the competition (admin only)."""
+    result = await db.execute(select(Competition.id).where(Competition.id == competition_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    report = await answer_similarity.report(db, competition_id, limit=limit)
+    job = await job_queue.find_active(db, scan_dedup_key(competition_id))
+    return AnswerSimilarityReport(**report, scan_job_id=job.id if job else None)
+
+
 @router.post("/{competition_id}/qualify", response_model=QualifyResponse)
 async def qualify_top_candidates(
     competition_id: int,
@@ -1099,6 +1221,7 @@ async def qualify_top_candidates(
 
     # Update competition status
     competition.status = CompetitionStatus.SCREENING_CLOSED.value
+    await refresh_qualified_count(db, competition_id)
 
     await db.commit()
 
@@ -1110,6 +1233,30 @@ async def qualify_top_candidates(
     )
 
 
+@router.post("/counters/repair")
+async def repair_all_competition_counters(db: AsyncSession = Depends(get_db)):
+    """Recompute every competition's registration counters from the registrations (admin only).
+
+    The counters are maintained as registrations change; this is for repairs
+    after manual edits or imports. Returns 202 with the repair job.
+    """
+    job = await enqueue_repair(db)
+    await db.commit()
+    return accepted_response(job)
+
+
+@router.post("/{competition_id}/counters/repair")
+async def repair_competition_counters(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Recompute one competition's registration counters (admin only). Returns 202 with the job."""
+    result = await db.execute(select(Competition.id).where(Competition.id == competition_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    job = await enqueue_repair(db, competition_id)
+    await db.commit()
+    return accepted_response(job, competition_id=competition_id)
+
+
 @router.delete("/{competition_id}")
 async def delete_competition(competition_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a competition and all its registrations (admin only)."""
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from app.database import pool_stats
+from app.services.write_queue import write_queue
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """Connection pool occupancy and counters for this process (size the pool against these)."""
+    return {
+        "pool": pool_stats(),
+        "write_queue": write_queue.stats(),
+    }
@@ -17,6 +17,7 @@ from app.schemas.feedback import (
     AutoImplementResult
 )
 from app.services.ai_service import ai_service
+from app.utils.pagination import keyset_page
 
 router = APIRouter()
 
@@ -137,15 +138,16 @@ async def list_suggestions(
     priority: Optional[str] = Query(None, description="Filter by priority"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    List all improvement suggestions for admin review.
+    List all improvement suggestions for admin review, newest first.
 
     Supports filtering by status, category, and priority.
     """
     # Build base query
-    query = select(ImprovementSuggestion).order_by(ImprovementSuggestion.created_at.desc())
+    query = select(ImprovementSuggestion)
 
     # Apply filters
     if status:
@@ -180,10 +182,10 @@ async def list_suggestions(
     auto_count = auto_result.scalar() or 0
 
     # Apply pagination
-    query = query.offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    suggestions = result.scalars().all()
+    page = await keyset_page(
+        db, query, ImprovementSuggestion.created_at, ImprovementSuggestion.id, limit, cursor=cursor, skip=skip
+    )
+    suggestions = page.items
 
     return SuggestionListResponse(
         suggestions=[
@@ -205,7 +207,8 @@ async def list_suggestions(
         ],
         total=total,
         pending_count=pending_count,
-        auto_implemented_count=auto_count
+        auto_implemented_count=auto_count,
+        next_cursor=page.next_cursor
     )
 
 
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models import Job
+from app.schemas.job import JobResponse, JobAccepted
+from app.services.job_queue import job_queue
+
+router = APIRouter()
+
+
+def job_status_url(job: Job) -> str:
+    return f"/api/jobs/{job.id}"
+
+
+def accepted_response(job: Job, **extra) -> JSONResponse:
+    """202 Accepted pointing at the job's status endpoint.
+
+    Extra keyword arguments are merged into the body so endpoints can keep
+    returning the fields their clients already read (test_id, success, ...).
+    """
+    body = JobAccepted(job_id=job.id, status=job.status, status_url=job_status_url(job)).model_dump()
+    body.update(extra)
+    return JSONResponse(status_code=202, content=body, headers={"Location": job_status_url(job)})
+
+
+@router.get("/stats")
+async def get_job_stats(db: AsyncSession = Depends(get_db)):
+    """Queue depth by status and this process's worker counters."""
+    return await job_queue.stats(db)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Status of a background job; poll until status is succeeded or failed."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.schemas.question_pool import PoolLevelsResponse, PoolRefillRequest
+from app.services.ai_service import QUESTION_CATEGORY_PROMPTS
+from app.services.question_pool import question_pool
+from app.api.routes.jobs import accepted_response
+
+router = APIRouter()
+
+
+@router.get("/levels", response_model=PoolLevelsResponse)
+async def get_pool_levels(db: AsyncSession = Depends(get_db)):
+    """Stock per (category, difficulty, track) and draw hit/miss counters (admin)."""
+    return PoolLevelsResponse(
+        enabled=question_pool.enabled,
+        target=question_pool.target,
+        refill_below=question_pool.refill_below,
+        levels=await question_pool.levels(db),
+        counters=question_pool.counters,
+    )
+
+
+@router.post("/refill", status_code=202)
+async def refill_pool(data: PoolRefillRequest, db: AsyncSession = Depends(get_db)):
+    """Queue a top-up of one pool key to the target stock (admin)."""
+    if data.category not in QUESTION_CATEGORY_PROMPTS:
+        raise HTTPException(status_code=400, detail=f"Unknown category: {data.category}")
+
+    job = await question_pool.request_refill(db, data.category, data.difficulty, data.track_id)
+    await db.commit()
+    return accepted_response(job, category=data.category, difficulty=data.difficulty, track_id=data.track_id)
@@ -2,14 +2,67 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models import Question, Test
-from app.schemas.question import QuestionResponse, QuestionWithAnswer
+from app.schemas.question import (
+    QuestionResponse, QuestionWithAnswer,
+    SimilarQuestion, SimilarQuestionsQuery, SimilarQuestionsResponse,
+)
+from app.services.question_similarity import (
+    enqueue_backfill, fingerprint_usage, question_content_hash, question_index,
+)
+from app.api.routes.jobs import accepted_response
 
 router = APIRouter()
 
 
+async def _similar_questions(
+    db: AsyncSession,
+    question_text: str,
+    question_code: Optional[str],
+    threshold: Optional[float],
+    limit: int,
+    exclude_own: bool = False,
+) -> SimilarQuestionsResponse:
+    threshold = question_index.threshold if threshold is None else threshold
+    matches = await question_index.find_similar(db, question_text, question_code, threshold=threshold, limit=limit + 1)
+    if exclude_own:
+        own_hash = question_content_hash(question_text, question_code)
+        matches = [(fingerprint, score) for fingerprint, score in matches if fingerprint.content_hash != own_hash]
+    matches = matches[:limit]
+
+    usage = await fingerprint_usage(db, [fingerprint.id for fingerprint, _ in matches])
+    return SimilarQuestionsResponse(
+        threshold=threshold,
+        matches=[
+            SimilarQuestion(
+                fingerprint_id=fingerprint.id,
+                similarity=round(score, 3),
+                sample_text=fingerprint.sample_text,
+                source=fingerprint.source,
+                question_count=usage.get(fingerprint.id, (0, None))[0],
+                first_question_id=usage.get(fingerprint.id, (0, None))[1],
+            )
+            for fingerprint, score in matches
+        ],
+    )
+
+
+@router.post("/similar", response_model=SimilarQuestionsResponse)
+async def find_similar_questions(query: SimilarQuestionsQuery, db: AsyncSession = Depends(get_db)):
+    """Near-duplicates of the given text among all indexed questions (admin)."""
+    return await _similar_questions(db, query.question_text, query.question_code, query.threshold, query.limit)
+
+
+@router.post("/similarity-index/rebuild", status_code=202)
+async def rebuild_similarity_index(db: AsyncSession = Depends(get_db)):
+    """Index every question that has no fingerprint yet, in the background (admin)."""
+    job = await enqueue_backfill(db)
+    await db.commit()
+    return accepted_response(job)
+
+
 @router.get("/test/{test_id}", response_model=List[QuestionWithAnswer])
 async def get_questions_by_test(test_id: int, db: AsyncSession = Depends(get_db)):
     """Get all questions for a test (admin view with answers)."""
@@ -63,3 +116,22 @@ async def get_question(question_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Question not found")
 
     return question
+
+
+@router.get("/{question_id}/similar", response_model=SimilarQuestionsResponse)
+async def get_similar_questions(
+    question_id: int,
+    threshold: Optional[float] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db)
+):
+    """Indexed questions that near-duplicate this one, most similar first (admin)."""
+    result = await db.execute(select(Question).where(Question.id == question_id))
+    question = result.scalar_one_or_none()
+
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    return await _similar_questions(
+        db, question.question_text, question.question_code, threshold, limit, exclude_own=True
+    )
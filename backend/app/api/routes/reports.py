@@ -1,43 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Set
+from typing import List, Optional
 from datetime import datetime
-import asyncio
-from app.database import get_db
+from app.api.routes.jobs import accepted_response
+from app.database import get_db, async_session_maker
 from app.models import Report, Test, Question, Answer, Candidate
 from app.models.test import TestStatus
 from app.schemas.report import ReportResponse, ReportWithCandidate, BreakHistoryEntry
 from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue, PermanentJobError
 from app.config.tracks import is_valid_track, get_track_name
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter()
 
-# CRITICAL: In-memory lock to prevent duplicate report generation
-# When report generation is in progress for a test, block additional requests
-_report_generation_locks: Set[int] = set()  # Set of test_ids currently generating
-_lock = asyncio.Lock()  # Protects access to _report_generation_locks
-
 
 @router.get("", response_model=List[ReportWithCandidate])
 async def list_reports(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all reports."""
-    query = (
-        select(Report)
-        .options(selectinload(Report.test).selectinload(Test.candidate))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Report.generated_at.desc())
-    )
-    result = await db.execute(query)
-    reports = result.scalars().all()
+    """List all reports, newest first.
 
-    response = []
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page.
+    """
+    query = select(Report).options(selectinload(Report.test).selectinload(Test.candidate))
+    page = await keyset_page(db, query, Report.generated_at, Report.id, limit, cursor=cursor, skip=skip)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    reports = page.items
+
+    results = []
     for report in reports:
         # Build break history entries
         break_history = []
@@ -48,7 +46,7 @@ async def list_reports(
                 duration_seconds=entry.get("duration_seconds", 0)
             ))
 
-        response.append(ReportWithCandidate(
+        results.append(ReportWithCandidate(
             id=report.id,
             test_id=report.test_id,
             overall_score=report.overall_score,
@@ -84,23 +82,47 @@ async def list_reports(
             break_history=break_history
         ))
 
-    return response
+    return results
 
 
 @router.post("/generate/{test_id}", response_model=ReportResponse)
 async def generate_report(test_id: int, db: AsyncSession = Depends(get_db)):
-    """Generate assessment report for a completed test."""
-    # CRITICAL: Check if report generation is already in progress for this test
-    async with _lock:
-        if test_id in _report_generation_locks:
-            raise HTTPException(
-                status_code=409,  # Conflict
-                detail="Report generation already in progress for this test. Please wait for it to complete."
-            )
-        # Acquire the lock for this test
-        _report_generation_locks.add(test_id)
+    """Generate assessment report for a completed test.
+
+    Returns the existing report if there is one; otherwise queues generation
+    and returns 202 with the job's status URL.
+    """
+    result = await db.execute(
+        select(Test).options(selectinload(Test.report)).where(Test.id == test_id)
+    )
+    test = result.scalars().first()
+
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not found")
+
+    if test.status not in [TestStatus.COMPLETED.value, TestStatus.EXPIRED.value]:
+        raise HTTPException(status_code=400, detail="Test not completed yet")
+
+    # Check if report already exists (idempotent - return existing)
+    if test.report:
+        return test.report
+
+    # CRITICAL: the dedup key allows one generation per test across all processes;
+    # repeated requests get the job that is already queued or running
+    job, _ = await job_queue.enqueue(
+        db, "generate_report", {"test_id": test_id}, dedup_key=f"report:{test_id}"
+    )
+    await db.commit()
+
+    return accepted_response(job, test_id=test_id)
 
-    try:
+
+@job_queue.handler("generate_report")
+async def _generate_report_job(payload: dict) -> dict:
+    """Build the report for a completed test (the AI summary takes 1-2 minutes)."""
+    test_id = payload["test_id"]
+
+    async with async_session_maker() as db:
         # Get test with all related data
         query = (
             select(Test)
@@ -115,14 +137,11 @@ async def generate_report(test_id: int, db: AsyncSession = Depends(get_db)):
         test = result.scalars().first()
 
         if not test:
-            raise HTTPException(status_code=404, detail="Test not found")
-
-        if test.status not in [TestStatus.COMPLETED.value, TestStatus.EXPIRED.value]:
-            raise HTTPException(status_code=400, detail="Test not completed yet")
+            raise PermanentJobError(f"Test {test_id} not found")
 
-        # Check if report already exists (idempotent - return existing)
+        # An earlier attempt may have committed before its lease expired
         if test.report:
-            return test.report
+            return {"report_id": test.report.id}
 
         # Calculate section scores
         section_scores = {}
@@ -193,6 +212,9 @@ async def generate_report(test_id: int, db: AsyncSession = Depends(get_db)):
         else:
             specialist_recommendation = "consider"
 
+        # End the read transaction before the slow AI call
+        await db.commit()
+
         # Generate AI report (this is the slow part - 1-2 minutes)
         ai_report = await ai_service.generate_report(
             candidate_name=test.candidate.name,
@@ -227,14 +249,92 @@ async def generate_report(test_id: int, db: AsyncSession = Depends(get_db)):
 
         db.add(report)
         await db.commit()
-        await db.refresh(report)
 
-        return report
+        return {"report_id": report.id}
+
+
+@router.get("/cheating-logs")
+async def get_cheating_logs(
+    skip: int = 0,
+    limit: int = 100,
+    severity: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all cheating/integrity violation logs across tests, newest first.
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page. The severity
+    filter applies within each page, so a page may hold fewer than ``limit``
+    logs while more follow.
+    """
+    query = (
+        select(Test)
+        .options(selectinload(Test.candidate))
+        .where(
+            (Test.tab_switch_count > 0) |
+            (Test.paste_attempt_count > 0) |
+            (Test.copy_attempt_count > 0) |
+            (Test.right_click_count > 0) |
+            (Test.dev_tools_open_count > 0) |
+            (Test.is_disqualified == True)
+        )
+    )
+    # Keyed on created_at: updated_at changes with every autosave and would reshuffle pages
+    page = await keyset_page(db, query, Test.created_at, Test.id, limit, cursor=cursor, skip=skip)
+    tests = page.items
+
+    logs = []
+    for test in tests:
+        # Calculate total violations
+        total_violations = (
+            (test.tab_switch_count or 0) +
+            (test.paste_attempt_count or 0) +
+            (test.copy_attempt_count or 0) +
+            (test.right_click_count or 0) +
+            (test.dev_tools_open_count or 0)
+        )
+
+        # Determine severity
+        if test.is_disqualified:
+            test_severity = "critical"
+        elif total_violations >= 5:
+            test_severity = "high"
+        elif total_violations >= 3:
+            test_severity = "medium"
+        else:
+            test_severity = "low"
+
+        # Filter by severity if specified
+        if severity and test_severity != severity:
+            continue
+
+        logs.append({
+            "test_id": test.id,
+            "candidate_name": test.candidate.name,
+            "candidate_email": test.candidate.email,
+            "test_status": test.status,
+            "tab_switch_count": test.tab_switch_count or 0,
+            "paste_attempt_count": test.paste_attempt_count or 0,
+            "copy_attempt_count": test.copy_attempt_count or 0,
+            "right_click_count": test.right_click_count or 0,
+            "dev_tools_open_count": test.dev_tools_open_count or 0,
+            "focus_loss_count": test.focus_loss_count or 0,
+            "total_violations": total_violations,
+            "warning_count": test.warning_count or 0,
+            "is_disqualified": test.is_disqualified or False,
+            "disqualification_reason": test.disqualification_reason,
+            "disqualified_at": test.disqualified_at.isoformat() if test.disqualified_at else None,
+            "violation_events": test.violation_events or [],
+            "severity": test_severity,
+            "created_at": test.created_at.isoformat(),
+            "updated_at": test.updated_at.isoformat(),
+        })
 
-    finally:
-        # CRITICAL: Always release the lock, even if an error occurred
-        async with _lock:
-            _report_generation_locks.discard(test_id)
+    return {
+        "total": len(logs),
+        "logs": logs,
+        "next_cursor": page.next_cursor
+    }
 
 
 @router.get("/{report_id}", response_model=ReportWithCandidate)
@@ -535,82 +635,3 @@ async def get_role_fit_recommendations(report_id: int, db: AsyncSession = Depend
         "candidate_name": report.test.candidate.name,
         **role_fit
     }
-
-
-@router.get("/cheating-logs")
-async def get_cheating_logs(
-    skip: int = 0,
-    limit: int = 100,
-    severity: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get all cheating/integrity violation logs across tests."""
-    query = (
-        select(Test)
-        .options(selectinload(Test.candidate))
-        .where(
-            (Test.tab_switch_count > 0) |
-            (Test.paste_attempt_count > 0) |
-            (Test.copy_attempt_count > 0) |
-            (Test.right_click_count > 0) |
-            (Test.dev_tools_open_count > 0) |
-            (Test.is_disqualified == True)
-        )
-        .offset(skip)
-        .limit(limit)
-        .order_by(Test.updated_at.desc())
-    )
-    result = await db.execute(query)
-    tests = result.scalars().all()
-
-    logs = []
-    for test in tests:
-        # Calculate total violations
-        total_violations = (
-            (test.tab_switch_count or 0) +
-            (test.paste_attempt_count or 0) +
-            (test.copy_attempt_count or 0) +
-            (test.right_click_count or 0) +
-            (test.dev_tools_open_count or 0)
-        )
-
-        # Determine severity
-        if test.is_disqualified:
-            test_severity = "critical"
-        elif total_violations >= 5:
-            test_severity = "high"
-        elif total_violations >= 3:
-            test_severity = "medium"
-        else:
-            test_severity = "low"
-
-        # Filter by severity if specified
-        if severity and test_severity != severity:
-            continue
-
-        logs.append({
-            "test_id": test.id,
-            "candidate_name": test.candidate.name,
-            "candidate_email": test.candidate.email,
-            "test_status": test.status,
-            "tab_switch_count": test.tab_switch_count or 0,
-            "paste_attempt_count": test.paste_attempt_count or 0,
-            "copy_attempt_count": test.copy_attempt_count or 0,
-            "right_click_count": test.right_click_count or 0,
-            "dev_tools_open_count": test.dev_tools_open_count or 0,
-            "focus_loss_count": test.focus_loss_count or 0,
-            "total_violations": total_violations,
-            "warning_count": test.warning_count or 0,
-            "is_disqualified": test.is_disqualified or False,
-            "disqualification_reason": test.disqualification_reason,
-            "disqualified_at": test.disqualified_at.isoformat() if test.disqualified_at else None,
-            "violation_events": test.violation_events or [],
-            "severity": test_severity,
-            "created_at": test.created_at.isoformat(),
-            "updated_at": test.updated_at.isoformat(),
-        })
-
-    return {
-        "total": len(logs),
-        "logs": logs
-    }
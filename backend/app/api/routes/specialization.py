@@ -9,12 +9,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Set
+from typing import List, Optional
 from datetime import datetime
-import asyncio
 import secrets
 
-from app.database import get_db
+from app.api.routes.jobs import accepted_response
+from app.database import get_db, async_session_maker
 from app.models import (
     Candidate, Test, Question, Answer, Report,
     SpecializationResult, Application, SkillAssessment,
@@ -33,13 +33,10 @@ from app.schemas.specialization import (
     TeamCompositionSuggestion,
 )
 from app.services.ai_service import ai_service, detect_programming_language
+from app.services.job_queue import job_queue, PermanentJobError
 
 router = APIRouter()
 
-# In-memory lock to prevent duplicate specialization test generation
-_specialization_locks: Set[int] = set()  # Set of candidate_ids currently generating
-_lock = asyncio.Lock()
-
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -226,7 +223,8 @@ async def generate_specialization_test(
     This creates a 1-hour deep-dive test that identifies the candidate's
     exact sub-specialty within their focus area.
 
-    Uses Kimi2 to analyze:
+    The test record is created immediately and 202 is returned with the
+    job's status URL; a background job uses Kimi2 to analyze:
     - Previous test results
     - Resume highlights
     - Self-assessed skills
@@ -245,26 +243,112 @@ async def generate_specialization_test(
             detail=f"Invalid focus area: {focus_area}. Use /specialization/focus-areas to see available options."
         )
 
-    # Check lock
-    async with _lock:
-        if candidate_id in _specialization_locks:
-            raise HTTPException(
-                status_code=409,
-                detail="Specialization test generation already in progress for this candidate."
-            )
-        _specialization_locks.add(candidate_id)
+    # One generation per candidate at a time, across all processes
+    dedup_key = f"generate_specialization_test:{candidate_id}"
+    if await job_queue.find_active(db, dedup_key):
+        raise HTTPException(
+            status_code=409,
+            detail="Specialization test generation already in progress for this candidate."
+        )
+
+    # Get candidate
+    result = await db.execute(
+        select(Candidate).where(Candidate.id == candidate_id)
+    )
+    candidate = result.scalar_one_or_none()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    # Resolve the parent test now; the job rebuilds the full context
+    context = await get_candidate_context(candidate_id, db, data.parent_test_id)
+
+    # Create test record
+    duration_hours = duration_minutes / 60
+    test = Test(
+        candidate_id=candidate_id,
+        access_token=secrets.token_urlsafe(32),
+        status=TestStatus.PENDING.value,
+        duration_hours=int(duration_hours) or 1,
+        test_type=TestType.SPECIALIZATION.value,
+        specialization_focus=focus_area,
+        parent_test_id=context.get("previous_test_id"),
+        total_break_time_seconds=15 * 60,  # 15 min break for 1hr test
+        used_break_time_seconds=0,
+        break_count=0,
+        break_history=[],
+        generation_progress=[{
+            "category": f"specialization_{focus_area}", "section_order": 0, "status": "pending", "questions": 0,
+        }],
+    )
+    db.add(test)
+    await db.flush()
+
+    # Create SpecializationResult record (to be populated after test completion)
+    spec_result = SpecializationResult(
+        test_id=test.id,
+        candidate_id=candidate_id,
+        focus_area=focus_area,
+    )
+    db.add(spec_result)
+
+    job, created = await job_queue.enqueue(
+        db,
+        "generate_specialization_test",
+        {"test_id": test.id, "parent_test_id": data.parent_test_id},
+        dedup_key=dedup_key,
+    )
+    if not created:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Specialization test generation already in progress for this candidate."
+        )
+    test.generation_job_id = job.id
+
+    await db.commit()
+
+    print(f"[Specialization] Created test {test.id} for {candidate.name}, generating {focus_area} questions in job {job.id}")
 
-    try:
-        # Get candidate
+    return accepted_response(
+        job,
+        success=True,
+        message=f"Specialization test for {focus_config['name']} is being generated",
+        test_id=test.id,
+        access_token=test.access_token,
+        questions_generated=0,
+    )
+
+
+@job_queue.handler("generate_specialization_test")
+async def _generate_specialization_test_job(payload: dict) -> dict:
+    """Generate the questions of a specialization test created by the endpoint above."""
+    test_id = payload["test_id"]
+
+    async with async_session_maker() as db:
         result = await db.execute(
-            select(Candidate).where(Candidate.id == candidate_id)
+            select(Test)
+            .options(selectinload(Test.candidate), selectinload(Test.questions))
+            .where(Test.id == test_id)
         )
-        candidate = result.scalar_one_or_none()
-        if not candidate:
-            raise HTTPException(status_code=404, detail="Candidate not found")
+        test = result.scalar_one_or_none()
+        if not test or not test.candidate:
+            raise PermanentJobError(f"Specialization test {test_id} not found")
+
+        # An earlier attempt committed its questions before losing the lease
+        if test.questions:
+            return {"test_id": test.id, "questions_generated": len(test.questions)}
+
+        candidate = test.candidate
+        focus_area = test.specialization_focus
+        focus_config = get_focus_area_config(focus_area)
+        if not focus_config:
+            raise PermanentJobError(f"Invalid focus area: {focus_area}")
 
         # Get comprehensive context for question generation
-        context = await get_candidate_context(candidate_id, db, data.parent_test_id)
+        context = await get_candidate_context(candidate.id, db, payload.get("parent_test_id"))
+
+        # End the read transaction; generation takes minutes
+        await db.commit()
 
         print(f"[Specialization] Generating {focus_area} test for {candidate.name}")
         print(f"[Specialization] Context: previous_score={context.get('previous_score')}, skills={context.get('top_skills', [])[:5]}")
@@ -293,28 +377,8 @@ async def generate_specialization_test(
         )
 
         if not questions_data:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate specialization questions. Please try again."
-            )
-
-        # Create test record
-        duration_hours = duration_minutes / 60
-        test = Test(
-            candidate_id=candidate_id,
-            access_token=secrets.token_urlsafe(32),
-            status=TestStatus.PENDING.value,
-            duration_hours=int(duration_hours) or 1,
-            test_type=TestType.SPECIALIZATION.value,
-            specialization_focus=focus_area,
-            parent_test_id=context.get("previous_test_id"),
-            total_break_time_seconds=15 * 60,  # 15 min break for 1hr test
-            used_break_time_seconds=0,
-            break_count=0,
-            break_history=[],
-        )
-        db.add(test)
-        await db.flush()
+            # Retried by the job queue
+            raise RuntimeError("Failed to generate specialization questions")
 
         # Create Question records
         created_questions = []
@@ -356,37 +420,14 @@ async def generate_specialization_test(
             answer = Answer(question_id=question.id)
             db.add(answer)
 
-        # Create SpecializationResult record (to be populated after test completion)
-        spec_result = SpecializationResult(
-            test_id=test.id,
-            candidate_id=candidate_id,
-            focus_area=focus_area,
-        )
-        db.add(spec_result)
-
+        test.generation_progress = [{
+            "category": f"specialization_{focus_area}", "section_order": 0,
+            "status": "ready", "questions": len(created_questions),
+        }]
         await db.commit()
 
         print(f"[Specialization] Created test {test.id} with {len(created_questions)} questions")
-
-        return GenerateSpecializationTestResponse(
-            success=True,
-            message=f"Specialization test generated for {focus_config['name']}",
-            test_id=test.id,
-            access_token=test.access_token,
-            questions_generated=len(created_questions),
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[Specialization] Error generating test: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate specialization test: {str(e)}"
-        )
-    finally:
-        async with _lock:
-            _specialization_locks.discard(candidate_id)
+        return {"test_id": test.id, "questions_generated": len(created_questions)}
 
 
 @router.get("/{test_id}/results", response_model=SpecializationResultResponse)
@@ -476,30 +517,32 @@ async def analyze_specialization_test(
     if not test.specialization_result:
         raise HTTPException(status_code=404, detail="Specialization result record not found")
 
-    # Score any unscored answers first
-    unscored_count = 0
-    for question in test.questions:
-        if question.answer and question.answer.score is None:
-            unscored_count += 1
-            try:
-                # Score the answer using AI
-                print(f"[Specialization] Scoring unscored answer for question {question.id}")
-                evaluation = await ai_service.evaluate_answer(
+    # Score any unscored answers first, in batched AI calls
+    unscored = [q for q in test.questions if q.answer and q.answer.score is None]
+    unscored_count = len(unscored)
+    if unscored:
+        print(f"[Specialization] Scoring {unscored_count} unscored answers")
+        difficulty = test.candidate.difficulty if test.candidate else "mid"
+        try:
+            evaluations = await ai_service.evaluate_answers_batch([
+                dict(
                     question_text=question.question_text,
                     question_code=question.question_code,
-                    expected_answer=question.expected_answer,
-                    candidate_answer=question.answer.candidate_answer,
+                    expected_answer=question.expected_answer or "",
+                    candidate_answer=question.answer.candidate_answer or "",
                     candidate_code=question.answer.candidate_code,
-                    max_score=question.max_score,
                     category=question.category,
+                    difficulty=difficulty,
                 )
-                if evaluation:
-                    question.answer.score = evaluation.get("score", 0)
-                    question.answer.feedback = evaluation.get("feedback", "")
-                    question.answer.ai_evaluation = evaluation
-            except Exception as e:
-                print(f"[Specialization] Error scoring question {question.id}: {e}")
-                # Continue with other questions even if one fails
+                for question in unscored
+            ])
+            for question, evaluation in zip(unscored, evaluations):
+                question.answer.score = evaluation.get("score", 0)
+                question.answer.feedback = evaluation.get("feedback", "")
+                question.answer.ai_evaluation = str(evaluation)
+        except Exception as e:
+            print(f"[Specialization] Error scoring answers for test {test.id}: {e}")
+            # Continue with the analysis using whatever scores exist
 
     if unscored_count > 0:
         print(f"[Specialization] Scored {unscored_count} previously unscored answers")
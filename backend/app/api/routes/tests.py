@@ -4,12 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
-from typing import List, Dict, Set
+from typing import Any, List, Dict, Optional
 from datetime import datetime, timedelta
 import secrets
 import asyncio
-from app.database import get_db
-from app.models import Candidate, Test, Question, Answer, Report, get_focus_area_config
+from app.database import get_db, async_session_maker
+from app.models import Candidate, Test, Question, Answer, Report, Job, JobStatus, get_focus_area_config
 from app.models.test import TestStatus, TestType
 from app.models.application import Application, ApplicationStatus
 from app.schemas.test import (
@@ -17,19 +17,37 @@ from app.schemas.test import (
     BreakStartResponse, BreakEndResponse, BreakHistoryEntry
 )
 from app.services.ai_service import ai_service, detect_programming_language
+from app.services.job_queue import job_queue, PermanentJobError
+from app.services.llm_profiles import profiles_as_dict
 from app.services.nda_service import nda_service
+from app.services.question_pool import question_pool
+from app.services.question_similarity import question_index
+from app.services.write_queue import write_queue
+from app.utils.pagination import NEXT_CURSOR_HEADER, keyset_page
 
 router = APIRouter()
 
 
+async def _enqueue_specialization_analysis(db: AsyncSession, test_id: int):
+    """Queue analysis of a completed specialization test (committed with the caller)."""
+    await job_queue.enqueue(
+        db, "analyze_specialization_test", {"test_id": test_id},
+        dedup_key=f"analyze_specialization_test:{test_id}",
+    )
+
+
+@job_queue.handler("analyze_specialization_test")
+async def _analyze_specialization_test_job(payload: dict):
+    await _analyze_specialization_test_background(payload["test_id"])
+
+
 async def _analyze_specialization_test_background(test_id: int):
     """
-    Background task to analyze a completed specialization test.
-    Called automatically after a specialization test is submitted.
+    Analyze a completed specialization test.
+    Runs as a queued job after a specialization test is submitted; errors
+    are re-raised so the job queue retries them.
     """
-    from app.database import async_session_maker
     from app.models.specialization import SpecializationResult
-    from datetime import datetime
 
     print(f"[Specialization] Starting background analysis for test {test_id}")
 
@@ -64,28 +82,31 @@ async def _analyze_specialization_test_background(test_id: int):
                 print(f"[Specialization] No specialization result record for test {test_id}")
                 return
 
-            # Score any unscored answers first
-            unscored_count = 0
-            for question in test.questions:
-                if question.answer and question.answer.score is None:
-                    unscored_count += 1
-                    try:
-                        print(f"[Specialization] Scoring unscored answer for question {question.id}")
-                        evaluation = await ai_service.evaluate_answer(
+            # Score any unscored answers first, in batched AI calls
+            unscored = [q for q in test.questions if q.answer and q.answer.score is None]
+            unscored_count = len(unscored)
+            if unscored:
+                print(f"[Specialization] Scoring {unscored_count} unscored answers")
+                difficulty = test.candidate.difficulty if test.candidate else "mid"
+                try:
+                    evaluations = await ai_service.evaluate_answers_batch([
+                        dict(
                             question_text=question.question_text,
                             question_code=question.question_code,
-                            expected_answer=question.expected_answer,
-                            candidate_answer=question.answer.candidate_answer,
+                            expected_answer=question.expected_answer or "",
+                            candidate_answer=question.answer.candidate_answer or "",
                             candidate_code=question.answer.candidate_code,
-                            max_score=question.max_score,
                             category=question.category,
+                            difficulty=difficulty,
                         )
-                        if evaluation:
-                            question.answer.score = evaluation.get("score", 0)
-                            question.answer.feedback = evaluation.get("feedback", "")
-                            question.answer.ai_evaluation = evaluation
-                    except Exception as e:
-                        print(f"[Specialization] Error scoring question {question.id}: {e}")
+                        for question in unscored
+                    ])
+                    for question, evaluation in zip(unscored, evaluations):
+                        question.answer.score = evaluation.get("score", 0)
+                        question.answer.feedback = evaluation.get("feedback", "")
+                        question.answer.ai_evaluation = str(evaluation)
+                except Exception as e:
+                    print(f"[Specialization] Error scoring answers for test {test_id}: {e}")
 
             if unscored_count > 0:
                 print(f"[Specialization] Scored {unscored_count} previously unscored answers")
@@ -136,12 +157,7 @@ async def _analyze_specialization_test_background(test_id: int):
         except Exception as e:
             print(f"[Specialization] Error analyzing test {test_id}: {e}")
             await db.rollback()
-
-
-# CRITICAL: In-memory lock to prevent duplicate test creation
-# When test generation is in progress for a candidate, block additional requests
-_test_generation_locks: Set[int] = set()  # Set of candidate_ids currently generating
-_lock = asyncio.Lock()  # Protects access to _test_generation_locks
+            raise
 
 
 def calculate_break_time(duration_hours: int) -> tuple[int, int]:
@@ -173,199 +189,311 @@ def calculate_break_time(duration_hours: int) -> tuple[int, int]:
 
 @router.get("", response_model=List[TestResponse])
 async def list_tests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: str = None,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all tests."""
-    query = select(Test).offset(skip).limit(limit).order_by(Test.created_at.desc())
+    """List all tests, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` for the next page.
+    """
+    query = select(Test)
     if status:
         query = query.where(Test.status == status)
 
-    result = await db.execute(query)
-    return result.scalars().all()
+    page = await keyset_page(db, query, Test.created_at, Test.id, limit, cursor=cursor, skip=skip)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+def _plan_test_sections(candidate: Candidate) -> List[Dict]:
+    """Sections of a new test, in order, as the initial generation progress."""
+    # Map frontend categories to internal categories
+    category_mapping = {
+        "backend": "coding",
+        "ml": "coding",
+        "fullstack": "coding",
+        "python": "coding",
+        "react": "coding",
+        "signal_processing": "signal_processing"
+    }
 
+    # Determine which sections to include
+    sections = ["brain_teaser"]  # Always include
+
+    # Define category groups for question type mapping
+    # BUG 5 FIX: Include "frontend" in the technical categories for coding sections
+    coding_categories = ["backend", "ml", "fullstack", "python", "react", "frontend", "javascript", "typescript"]
+
+    if candidate.categories:
+        # Add coding/code_review/system_design for any technical software role
+        if any(cat in coding_categories for cat in candidate.categories):
+            sections.extend(["coding", "code_review", "system_design"])
+        if "signal_processing" in candidate.categories:
+            sections.append("signal_processing")
+        # Add general engineering for all technical candidates
+        if any(cat in coding_categories + ["signal_processing"] for cat in candidate.categories):
+            sections.append("general_engineering")
+    else:
+        sections.extend(["coding", "code_review", "system_design", "general_engineering"])
 
-@router.post("", response_model=TestResponse)
-async def create_test(test_data: TestCreate, db: AsyncSession = Depends(get_db)):
-    """Create a new test for a candidate and generate questions."""
-    candidate_id = test_data.candidate_id
+    sections = list(set(sections))  # Remove duplicates
 
-    # CRITICAL: Check if test generation is already in progress for this candidate
-    async with _lock:
-        if candidate_id in _test_generation_locks:
-            raise HTTPException(
-                status_code=409,  # Conflict
-                detail="Test generation already in progress for this candidate. Please wait for it to complete."
-            )
-        # Acquire the lock for this candidate
-        _test_generation_locks.add(candidate_id)
+    # Specialization questions go after all other sections, with the track ID as category
+    if candidate.track:
+        sections.append(candidate.track)
 
-    try:
-        # Get candidate
-        result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
-        candidate = result.scalar_one_or_none()
-
-        if not candidate:
-            raise HTTPException(status_code=404, detail="Candidate not found")
-
-        # Generate unique access token
-        access_token = secrets.token_urlsafe(32)
-
-        # Calculate break time allowance
-        total_break, max_single_break = calculate_break_time(candidate.test_duration_hours)
-
-        # Create test
-        test = Test(
-            candidate_id=candidate.id,
-            access_token=access_token,
-            duration_hours=candidate.test_duration_hours,
-            status=TestStatus.PENDING.value,
-            total_break_time_seconds=total_break,
-            used_break_time_seconds=0,
-            break_count=0,
-            break_history=[]
-        )
-        db.add(test)
-        await db.flush()
+    return [
+        {"category": category, "section_order": section_order, "status": "pending", "questions": 0}
+        for section_order, category in enumerate(sections)
+    ]
 
-        # Map frontend categories to internal categories
-        category_mapping = {
-            "backend": "coding",
-            "ml": "coding",
-            "fullstack": "coding",
-            "python": "coding",
-            "react": "coding",
-            "signal_processing": "signal_processing"
-        }
 
-        # Determine which sections to include
-        sections = ["brain_teaser"]  # Always include
-
-        # Define category groups for question type mapping
-        # BUG 5 FIX: Include "frontend" in the technical categories for coding sections
-        coding_categories = ["backend", "ml", "fullstack", "python", "react", "frontend", "javascript", "typescript"]
-
-        if candidate.categories:
-            # Add coding/code_review/system_design for any technical software role
-            if any(cat in coding_categories for cat in candidate.categories):
-                sections.extend(["coding", "code_review", "system_design"])
-            if "signal_processing" in candidate.categories:
-                sections.append("signal_processing")
-            # Add general engineering for all technical candidates
-            if any(cat in coding_categories + ["signal_processing"] for cat in candidate.categories):
-                sections.append("general_engineering")
-        else:
-            sections.extend(["coding", "code_review", "system_design", "general_engineering"])
-
-        sections = list(set(sections))  # Remove duplicates
-
-        # Generate questions using AI (this is the slow part - 2-4 minutes)
-        questions_data = await ai_service.generate_test_questions(
-            categories=sections,
-            difficulty=candidate.difficulty,
-            skills=candidate.extracted_skills or [],
-            resume_text=candidate.resume_text
+@router.post("", response_model=TestResponse, status_code=202)
+async def create_test(test_data: TestCreate, response: Response, db: AsyncSession = Depends(get_db)):
+    """Create a new test for a candidate and queue question generation.
+
+    Returns 202 with the PENDING test as soon as it is inserted. Questions are
+    generated in the background and committed one section at a time; poll the
+    URL in the Location header (GET /tests/{id}) for per-section progress.
+    """
+    candidate_id = test_data.candidate_id
+
+    # CRITICAL: one generation per candidate at a time, across all processes
+    dedup_key = f"generate_test:{candidate_id}"
+    if await job_queue.find_active(db, dedup_key):
+        raise HTTPException(
+            status_code=409,  # Conflict
+            detail="Test generation already in progress for this candidate. Please wait for it to complete."
         )
 
-        # STEP 1: Create all questions first and collect them
-        created_questions = []
-        for section_order, category in enumerate(sections):
-            category_questions = questions_data.get(category, [])
-            for q_order, q_data in enumerate(category_questions):
-                question_text = q_data.get("question_text", "")
-                question_code = q_data.get("question_code")
-
-                # Detect programming language for code-related questions
-                language = None
-                if category in ["coding", "code_review"]:
-                    language = detect_programming_language(
-                        text=question_text,
-                        code=question_code,
-                        category=category
-                    )
+    # Get candidate
+    result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
+    candidate = result.scalar_one_or_none()
+
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    # Generate unique access token
+    access_token = secrets.token_urlsafe(32)
+
+    # Calculate break time allowance
+    total_break, max_single_break = calculate_break_time(candidate.test_duration_hours)
+
+    # Create test
+    test = Test(
+        candidate_id=candidate.id,
+        access_token=access_token,
+        duration_hours=candidate.test_duration_hours,
+        status=TestStatus.PENDING.value,
+        total_break_time_seconds=total_break,
+        used_break_time_seconds=0,
+        break_count=0,
+        break_history=[],
+        generation_progress=_plan_test_sections(candidate),
+    )
+    db.add(test)
+    await db.flush()
 
-                question = Question(
-                    test_id=test.id,
-                    category=category,
-                    section_order=section_order,
-                    question_order=q_order,
-                    question_text=question_text,
-                    question_code=question_code,
-                    expected_answer=q_data.get("expected_answer"),
-                    hints=q_data.get("hints"),
-                    max_score=100,
-                    language=language
-                )
-                db.add(question)
-                created_questions.append(question)
-
-        # STEP 1.5: Generate specialization questions if candidate has a track
-        if candidate.track:
-            specialization_questions = await ai_service.generate_specialization_questions(
-                track_id=candidate.track,
-                difficulty=candidate.difficulty
-            )
+    await _queue_question_generation(db, test, candidate.id)
 
-            # Add specialization questions with track as category
-            specialization_section_order = len(sections)  # After all other sections
-            for q_order, q_data in enumerate(specialization_questions):
-                question_text = q_data.get("question_text", "")
-                question_code = q_data.get("question_code")
-
-                # Detect programming language for code-related questions
-                language = None
-                if question_code:
-                    language = detect_programming_language(
-                        text=question_text,
-                        code=question_code,
-                        category=candidate.track
-                    )
+    await db.commit()
+    await db.refresh(test)
 
-                question = Question(
-                    test_id=test.id,
-                    category=candidate.track,  # Use track ID as category
-                    section_order=specialization_section_order,
-                    question_order=q_order,
-                    question_text=question_text,
-                    question_code=question_code,
-                    expected_answer=q_data.get("expected_answer"),
-                    hints=q_data.get("hints"),
-                    max_score=100,
-                    language=language
-                )
-                db.add(question)
-                created_questions.append(question)
+    response.headers["Location"] = f"/api/tests/{test.id}"
+    return test
+
+
+async def _generate_test_questions_failed(payload: dict, error: str):
+    """Mark the sections a failed generation job left unfinished, so the test reports "failed"."""
+    async with async_session_maker() as db:
+        test = await db.get(Test, payload["test_id"])
+        if not test or not test.generation_progress:
+            return
+        test.generation_progress = [
+            dict(section, status="failed") if section.get("status") != "ready" else dict(section)
+            for section in test.generation_progress
+        ]
+        flag_modified(test, "generation_progress")
+        await db.commit()
+    print(f"[Tests] Question generation for test {payload['test_id']} failed: {error}")
+
+
+async def _queue_question_generation(db: AsyncSession, test: Test, candidate_id: int) -> Job:
+    """Queue generation of the test's unfinished sections; 409 if the candidate already has one queued."""
+    job, created = await job_queue.enqueue(
+        db, "generate_test_questions", {"test_id": test.id}, dedup_key=f"generate_test:{candidate_id}"
+    )
+    if not created:
+        # Another request won the race to queue generation for this candidate
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Test generation already in progress for this candidate. Please wait for it to complete."
+        )
+    test.generation_job_id = job.id
+    return job
 
-        # Flush to get question IDs assigned
-        await db.flush()
 
-        # STEP 2: Now create answer records with valid question IDs
-        for question in created_questions:
-            answer = Answer(question_id=question.id)
-            db.add(answer)
+@job_queue.handler("generate_test_questions", on_failure=_generate_test_questions_failed)
+async def _generate_test_questions_job(payload: dict) -> dict:
+    """Generate the questions of a test created by create_test.
 
+    Each section is committed as soon as its questions arrive, so get_test
+    shows progress and a retried job only regenerates unfinished sections.
+    """
+    test_id = payload["test_id"]
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Test).options(selectinload(Test.candidate)).where(Test.id == test_id)
+        )
+        test = result.scalar_one_or_none()
+        if not test:
+            raise PermanentJobError(f"Test {test_id} not found")
+
+        candidate = test.candidate
+        progress = [dict(section) for section in (test.generation_progress or _plan_test_sections(candidate))]
+        sections = {section["category"]: section for section in progress}
+        remaining = [section["category"] for section in progress if section["status"] != "ready"]
+
+        # End the read transaction; generation takes minutes
         await db.commit()
-        await db.refresh(test)
 
-        return test
+        save_lock = asyncio.Lock()  # Sections complete concurrently but share this session
 
-    finally:
-        # CRITICAL: Always release the lock, even if an error occurred
-        async with _lock:
-            _test_generation_locks.discard(candidate_id)
+        async def save_section(category: str, category_questions: List[Dict]):
+            section = sections.get(category)
+            if section is None or section["status"] == "ready":
+                return
+            async with save_lock:
+                created_questions = []
+                for q_order, q_data in enumerate(category_questions):
+                    question_text = q_data.get("question_text", "")
+                    question_code = q_data.get("question_code")
+
+                    # Detect programming language for code-related questions
+                    language = None
+                    if category in ["coding", "code_review"] or (category == candidate.track and question_code):
+                        language = detect_programming_language(
+                            text=question_text,
+                            code=question_code,
+                            category=category
+                        )
+
+                    question = Question(
+                        test_id=test.id,
+                        category=category,
+                        section_order=section["section_order"],
+                        question_order=q_order,
+                        question_text=question_text,
+                        question_code=question_code,
+                        expected_answer=q_data.get("expected_answer"),
+                        hints=q_data.get("hints"),
+                        max_score=100,
+                        language=language,
+                        fingerprint_id=q_data.get("fingerprint_id")
+                    )
+                    db.add(question)
+                    created_questions.append(question)
+
+                # Flush to get question IDs assigned, then create answer records
+                await db.flush()
+                for question in created_questions:
+                    db.add(Answer(question_id=question.id))
+
+                # An empty section must not pass as ready; failed lets regenerate-questions retry it
+                section["status"] = "ready" if created_questions else "failed"
+                section["questions"] = len(created_questions)
+                test.generation_progress = [dict(s) for s in progress]
+                flag_modified(test, "generation_progress")
+                await db.commit()
+                draws.keep(category_questions)
+                print(f"[Tests] Test {test.id}: {category} {section['status']} ({len(created_questions)} questions)")
+
+        async def generate_specialization_section():
+            if candidate.track and candidate.track in remaining:
+                questions = await ai_service.generate_specialization_questions(
+                    track_id=candidate.track,
+                    difficulty=candidate.difficulty
+                )
+                await save_section(candidate.track, questions)
+
+        # Generate questions using AI (this is the slow part). Categories are
+        # generated concurrently, and the specialization questions run alongside them.
+        # Pooled questions that never get saved (a failed attempt) go back to stock
+        async with question_pool.draws() as draws:
+            await asyncio.gather(
+                ai_service.generate_test_questions(
+                    categories=[category for category in remaining if category != candidate.track],
+                    difficulty=candidate.difficulty,
+                    skills=candidate.extracted_skills or [],
+                    resume_text=candidate.resume_text,
+                    on_category=save_section,
+                    question_source=draws.draw,
+                    question_filter=question_index.filter_generated,
+                ),
+                generate_specialization_section(),
+            )
+
+            # Sections the generator skipped (unknown category) end up failed
+            for category in remaining:
+                if sections[category]["status"] != "failed":
+                    await save_section(category, [])
+
+        total = sum(section["questions"] for section in progress)
+        print(f"[Tests] Generated {total} questions for test {test.id}")
+        return {"test_id": test.id, "questions_generated": total}
 
 
 @router.get("/{test_id}", response_model=TestResponse)
 async def get_test(test_id: int, db: AsyncSession = Depends(get_db)):
-    """Get test by ID."""
+    """Get test by ID, including question generation progress per section."""
     result = await db.execute(select(Test).where(Test.id == test_id))
     test = result.scalar_one_or_none()
 
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
 
+    response = TestResponse.model_validate(test)
+    if test.generation_job_id and response.generation_status != "ready":
+        job = await db.get(Job, test.generation_job_id)
+        if job and job.status == JobStatus.FAILED.value:
+            response.generation_status = "failed"
+            response.generation_error = job.error
+
+    return response
+
+
+@router.post("/{test_id}/regenerate-questions", response_model=TestResponse, status_code=202)
+async def regenerate_test_questions(test_id: int, response: Response, db: AsyncSession = Depends(get_db)):
+    """Queue question generation again for a test whose generation failed (admin).
+
+    Sections that are already ready are kept; failed and unfinished sections
+    are generated again. Poll GET /tests/{id} as after create_test.
+    """
+    test = await db.get(Test, test_id)
+    if not test:
+        raise HTTPException(status_code=404, detail="Test not found")
+    if test.status != TestStatus.PENDING.value:
+        raise HTTPException(status_code=400, detail="Questions can only be regenerated before the test starts")
+    if test.generation_status == "ready":
+        raise HTTPException(status_code=400, detail="All questions are already generated")
+
+    test.generation_progress = [
+        dict(section, status="pending") if section.get("status") == "failed" else dict(section)
+        for section in test.generation_progress
+    ]
+    flag_modified(test, "generation_progress")
+    await _queue_question_generation(db, test, test.candidate_id)
+    await db.commit()
+    await db.refresh(test)
+
+    response.headers["Location"] = f"/api/tests/{test.id}"
     return test
 
 
@@ -673,8 +801,8 @@ async def get_test_by_token(access_token: str, db: AsyncSession = Depends(get_db
                 
                 # Auto-trigger Kimi analysis for specialization tests
                 if test.test_type == TestType.SPECIALIZATION.value:
-                    print(f"[Specialization] Test {test.id} expired with answers, triggering background analysis")
-                    asyncio.create_task(_analyze_specialization_test_background(test.id))
+                    print(f"[Specialization] Test {test.id} expired with answers, queueing analysis")
+                    await _enqueue_specialization_analysis(db, test.id)
             else:
                 # No submitted answers - safe to expire
                 test.status = TestStatus.EXPIRED.value
@@ -794,6 +922,10 @@ async def get_test_by_token(access_token: str, db: AsyncSession = Depends(get_db
         nda_signature=test.nda_signature,
         nda_signed_at=test.nda_signed_at,
         integrity_agreed=test.integrity_agreed or False,
+        # Questions still being generated: the candidate page polls until "ready"
+        # and explains the delay when generation "failed"
+        generation_status=test.generation_status,
+        generation_progress=test.generation_progress,
     )
 
 
@@ -809,6 +941,14 @@ async def start_test(access_token: str, db: AsyncSession = Depends(get_db)):
     if test.status != TestStatus.PENDING.value:
         raise HTTPException(status_code=400, detail="Test already started or completed")
 
+    if test.generation_status == "failed":
+        raise HTTPException(
+            status_code=409,
+            detail="Test questions could not be prepared. Please contact the assessment administrator."
+        )
+    if test.generation_status != "ready":
+        raise HTTPException(status_code=409, detail="Test questions are still being generated. Please try again shortly.")
+
     test.status = TestStatus.IN_PROGRESS.value
     test.start_time = datetime.utcnow()
     test.current_section = "brain_teaser"
@@ -849,14 +989,14 @@ async def complete_test(access_token: str, db: AsyncSession = Depends(get_db)):
     test.status = TestStatus.COMPLETED.value
     test.end_time = datetime.utcnow()
 
+    # If this is a specialization test, queue its analysis in the same transaction
+    if test.test_type == TestType.SPECIALIZATION.value:
+        print(f"[Specialization] Test {test.id} completed, queueing analysis")
+        await _enqueue_specialization_analysis(db, test.id)
+
     await db.commit()
     await db.refresh(test)
 
-    # If this is a specialization test, trigger analysis in the background
-    if test.test_type == TestType.SPECIALIZATION.value:
-        print(f"[Specialization] Test {test.id} completed, triggering background analysis")
-        asyncio.create_task(_analyze_specialization_test_background(test.id))
-
     return test
 
 
@@ -1020,100 +1160,107 @@ async def get_anti_cheat_config():
 async def log_anti_cheat_event(
     access_token: str,
     event: AntiCheatEvent,
-    db: AsyncSession = Depends(get_db)
 ):
-    """Log an anti-cheat event (tab switch, paste attempt, code copy/paste, dev tools, etc.)."""
-    result = await db.execute(select(Test).where(Test.access_token == access_token))
-    test = result.scalar_one_or_none()
+    """Log an anti-cheat event (tab switch, paste attempt, code copy/paste, dev tools, etc.).
 
-    if not test:
-        raise HTTPException(status_code=404, detail="Test not found")
+    Events go through the write queue (see app/services/write_queue.py); with
+    the SQLite single writer, concurrent events for one test are applied one
+    after another, so no counter increment is lost.
+    """
+    async def _log(db: AsyncSession) -> Dict[str, Any]:
+        result = await db.execute(select(Test).where(Test.access_token == access_token))
+        test = result.scalar_one_or_none()
 
-    if test.status not in [TestStatus.IN_PROGRESS.value, TestStatus.ON_BREAK.value]:
-        # Test already completed - silently ignore anti-cheat events instead of error
-        return {
-            "success": False,
-            "message": "Test is not in progress",
-            "is_disqualified": test.is_disqualified or False,
-            "disqualification_reason": test.disqualification_reason
-        }
+        if not test:
+            raise HTTPException(status_code=404, detail="Test not found")
 
-    # Check if already disqualified
-    if test.is_disqualified:
-        return {
-            "success": False,
-            "is_disqualified": True,
-            "disqualification_reason": test.disqualification_reason
-        }
+        if test.status not in [TestStatus.IN_PROGRESS.value, TestStatus.ON_BREAK.value]:
+            # Test already completed - silently ignore anti-cheat events instead of error
+            return {
+                "success": False,
+                "message": "Test is not in progress",
+                "is_disqualified": test.is_disqualified or False,
+                "disqualification_reason": test.disqualification_reason
+            }
 
-    # Log violation event
-    violation_events = list(test.violation_events or [])
-    violation_events.append({
-        "type": event.event_type,
-        "timestamp": event.timestamp,
-        "details": event.details or "",
-        "chars": event.chars,
-        "lines": event.lines
-    })
-    test.violation_events = violation_events
-
-    # Update counters based on event type
-    if event.event_type == "tab_switch":
-        test.tab_switch_count = (test.tab_switch_count or 0) + 1
-        timestamps = list(test.tab_switch_timestamps or [])
-        timestamps.append(event.timestamp)
-        test.tab_switch_timestamps = timestamps
-    elif event.event_type in ["paste_attempt", "code_paste"]:
-        test.paste_attempt_count = (test.paste_attempt_count or 0) + 1
-    elif event.event_type in ["copy_attempt", "code_copy"]:
-        test.copy_attempt_count = (test.copy_attempt_count or 0) + 1
-    elif event.event_type == "right_click":
-        test.right_click_count = (test.right_click_count or 0) + 1
-    elif event.event_type == "dev_tools_open":
-        test.dev_tools_open_count = (test.dev_tools_open_count or 0) + 1
-    elif event.event_type == "focus_loss":
-        test.focus_loss_count = (test.focus_loss_count or 0) + 1
-
-    # Calculate weighted violation score
-    violation_score = (
-        (test.tab_switch_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["tab_switch"] +
-        (test.paste_attempt_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["paste_attempt"] +
-        (test.copy_attempt_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["copy_attempt"] +
-        (test.right_click_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["right_click"] +
-        (test.dev_tools_open_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["dev_tools_open"] +
-        (test.focus_loss_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["focus_loss"]
-    )
+        # Check if already disqualified
+        if test.is_disqualified:
+            return {
+                "success": False,
+                "is_disqualified": True,
+                "disqualification_reason": test.disqualification_reason
+            }
 
-    # Determine if warning or disqualification is needed
-    should_warn = False
-    should_disqualify = False
-    warning_count = test.warning_count or 0
+        # Log violation event
+        violation_events = list(test.violation_events or [])
+        violation_events.append({
+            "type": event.event_type,
+            "timestamp": event.timestamp,
+            "details": event.details or "",
+            "chars": event.chars,
+            "lines": event.lines
+        })
+        test.violation_events = violation_events
+
+        # Update counters based on event type
+        if event.event_type == "tab_switch":
+            test.tab_switch_count = (test.tab_switch_count or 0) + 1
+            timestamps = list(test.tab_switch_timestamps or [])
+            timestamps.append(event.timestamp)
+            test.tab_switch_timestamps = timestamps
+        elif event.event_type in ["paste_attempt", "code_paste"]:
+            test.paste_attempt_count = (test.paste_attempt_count or 0) + 1
+        elif event.event_type in ["copy_attempt", "code_copy"]:
+            test.copy_attempt_count = (test.copy_attempt_count or 0) + 1
+        elif event.event_type == "right_click":
+            test.right_click_count = (test.right_click_count or 0) + 1
+        elif event.event_type == "dev_tools_open":
+            test.dev_tools_open_count = (test.dev_tools_open_count or 0) + 1
+        elif event.event_type == "focus_loss":
+            test.focus_loss_count = (test.focus_loss_count or 0) + 1
+
+        # Calculate weighted violation score
+        violation_score = (
+            (test.tab_switch_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["tab_switch"] +
+            (test.paste_attempt_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["paste_attempt"] +
+            (test.copy_attempt_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["copy_attempt"] +
+            (test.right_click_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["right_click"] +
+            (test.dev_tools_open_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["dev_tools_open"] +
+            (test.focus_loss_count or 0) * ANTI_CHEAT_CONFIG["violation_weights"]["focus_loss"]
+        )
 
-    if violation_score >= ANTI_CHEAT_CONFIG["disqualification_threshold"]:
-        should_disqualify = True
-        test.is_disqualified = True
-        test.disqualified_at = datetime.utcnow()
-        test.disqualification_reason = f"Exceeded violation threshold (score: {violation_score:.1f})"
-    elif violation_score >= ANTI_CHEAT_CONFIG["warning_threshold"] * (warning_count + 1) / ANTI_CHEAT_CONFIG["warning_threshold"]:
-        should_warn = True
-        test.warning_count = warning_count + 1
+        # Determine if warning or disqualification is needed
+        should_warn = False
+        should_disqualify = False
+        warning_count = test.warning_count or 0
 
-    await db.commit()
+        if violation_score >= ANTI_CHEAT_CONFIG["disqualification_threshold"]:
+            should_disqualify = True
+            test.is_disqualified = True
+            test.disqualified_at = datetime.utcnow()
+            test.disqualification_reason = f"Exceeded violation threshold (score: {violation_score:.1f})"
+        elif violation_score >= ANTI_CHEAT_CONFIG["warning_threshold"] * (warning_count + 1) / ANTI_CHEAT_CONFIG["warning_threshold"]:
+            should_warn = True
+            test.warning_count = warning_count + 1
 
-    return {
-        "success": True,
-        "tab_switch_count": test.tab_switch_count,
-        "paste_attempt_count": test.paste_attempt_count,
-        "copy_attempt_count": test.copy_attempt_count,
-        "right_click_count": test.right_click_count,
-        "dev_tools_open_count": test.dev_tools_open_count,
-        "focus_loss_count": test.focus_loss_count,
-        "violation_score": violation_score,
-        "warning_count": test.warning_count,
-        "should_warn": should_warn,
-        "is_disqualified": test.is_disqualified,
-        "disqualification_reason": test.disqualification_reason if test.is_disqualified else None
-    }
+        await db.flush()
+
+        return {
+            "success": True,
+            "tab_switch_count": test.tab_switch_count,
+            "paste_attempt_count": test.paste_attempt_count,
+            "copy_attempt_count": test.copy_attempt_count,
+            "right_click_count": test.right_click_count,
+            "dev_tools_open_count": test.dev_tools_open_count,
+            "focus_loss_count": test.focus_loss_count,
+            "violation_score": violation_score,
+            "warning_count": test.warning_count,
+            "should_warn": should_warn,
+            "is_disqualified": test.is_disqualified,
+            "disqualification_reason": test.disqualification_reason if test.is_disqualified else None
+        }
+
+    return await write_queue.submit(_log)
 
 
 @router.get("/kimi/test")
@@ -1128,7 +1275,7 @@ async def test_kimi_connection():
             {"role": "user", "content": "Say 'Hello, Kimi2 is working!' in exactly those words."}
         ]
 
-        response = await ai_service._call_kimi_with_retry(messages, temperature=0.1)
+        response = await ai_service._call_kimi_with_retry(messages, operation="connection_test")
         elapsed = time.time() - start_time
 
         return {
@@ -1137,7 +1284,7 @@ async def test_kimi_connection():
             "response_length": len(response) if response else 0,
             "elapsed_seconds": round(elapsed, 2),
             "api_url": ai_service.api_url,
-            "timeout": ai_service.timeout
+            "timeout": ai_service.profile_for("connection_test").timeout
         }
     except Exception as e:
         elapsed = time.time() - start_time
@@ -1147,10 +1294,38 @@ async def test_kimi_connection():
             "error_type": type(e).__name__,
             "elapsed_seconds": round(elapsed, 2),
             "api_url": ai_service.api_url,
-            "timeout": ai_service.timeout
+            "timeout": ai_service.profile_for("connection_test").timeout
         }
 
 
+@router.get("/kimi/stats")
+async def get_kimi_stats():
+    """Kimi2 endpoint pool, scheduler, cache, request coalescing and circuit breaker statistics."""
+    return {
+        "api_url": ai_service.api_url,
+        "backends": ai_service.backends.stats(),
+        "profiles": profiles_as_dict(ai_service.profiles),
+        "prompt_prefixes": ai_service.prompts.stats(),
+        "latency": ai_service.latency.stats(
+            {operation: profile.timeout for operation, profile in ai_service.profiles.items()}
+        ),
+        "circuit_breaker": ai_service.breaker.stats(),
+        "scheduler": ai_service.scheduler.stats(),
+        "cache": ai_service.cache.stats() if ai_service.cache else None,
+        "single_flight": ai_service.single_flight.stats(),
+    }
+
+
+@router.delete("/kimi/cache")
+async def clear_kimi_cache(operation: str = None):
+    """Clear the LLM response cache, optionally only for one operation (e.g. evaluate_answer)."""
+    if not ai_service.cache:
+        return {"success": False, "message": "LLM cache is disabled", "removed": 0}
+
+    removed = await ai_service.cache.clear(operation)
+    return {"success": True, "removed": removed, "operation": operation}
+
+
 @router.post("/{test_id}/reevaluate")
 async def reevaluate_test(test_id: int, db: AsyncSession = Depends(get_db)):
     """Re-evaluate all answers for a test using AI.
@@ -1185,6 +1360,7 @@ async def reevaluate_test(test_id: int, db: AsyncSession = Depends(get_db)):
     skipped_count = 0
     error_count = 0
 
+    pending = []  # (question, answer, evaluation kwargs)
     for question in test.questions:
         total_questions += 1
         answer = question.answer
@@ -1200,43 +1376,74 @@ async def reevaluate_test(test_id: int, db: AsyncSession = Depends(get_db)):
             })
             continue
 
-        try:
-            # Call AI to evaluate
-            evaluation = await ai_service.evaluate_answer(
-                question_text=question.question_text,
-                question_code=question.question_code,
-                expected_answer=question.expected_answer or "",
-                candidate_answer=answer.candidate_answer or "",
-                candidate_code=answer.candidate_code,
-                category=question.category,
-                difficulty=difficulty
-            )
+        pending.append((question, answer, dict(
+            question_text=question.question_text,
+            question_code=question.question_code,
+            expected_answer=question.expected_answer or "",
+            candidate_answer=answer.candidate_answer or "",
+            candidate_code=answer.candidate_code,
+            category=question.category,
+            difficulty=difficulty
+        )))
+
+    # Nothing is written until the evaluations are back - end the read
+    # transaction so it is not held open while the LLM works
+    await db.commit()
 
-            # Update answer with new evaluation
-            answer.score = evaluation.get("score", 50)
-            answer.feedback = evaluation.get("feedback", "")
-            answer.ai_evaluation = str(evaluation)
-            answer.evaluated_at = datetime.utcnow()
+    # Call AI to evaluate all answers in a few concurrent batched requests;
+    # fresh, so unchanged answers are re-scored rather than served from the cache
+    try:
+        evaluations = await ai_service.evaluate_answers_batch([item for _, _, item in pending], fresh=True)
+    except Exception as e:
+        evaluations = [e] * len(pending)
+
+    # The candidate or another request may have written these answers while
+    # the LLM worked: re-read them so the scores land on their current rows
+    if pending:
+        await db.execute(
+            select(Answer)
+            .where(Answer.id.in_([answer.id for _, answer, _ in pending]))
+            .execution_options(populate_existing=True)
+        )
 
-            evaluated_count += 1
+    for (question, answer, item), evaluation in zip(pending, evaluations):
+        if isinstance(evaluation, Exception):
+            error_count += 1
             results.append({
                 "question_id": question.id,
                 "category": question.category,
-                "status": "evaluated",
-                "new_score": answer.score,
-                "feedback_preview": (evaluation.get("feedback", "")[:100] + "..."
-                                     if len(evaluation.get("feedback", "")) > 100
-                                     else evaluation.get("feedback", ""))
+                "status": "error",
+                "error": str(evaluation)
             })
+            continue
 
-        except Exception as e:
-            error_count += 1
+        if (answer.candidate_answer or "", answer.candidate_code) != (item["candidate_answer"], item["candidate_code"]):
+            # The evaluation is of content the answer no longer has
+            skipped_count += 1
             results.append({
                 "question_id": question.id,
                 "category": question.category,
-                "status": "error",
-                "error": str(e)
+                "status": "skipped",
+                "reason": "Answer changed while it was being re-evaluated"
             })
+            continue
+
+        # Update answer with new evaluation
+        answer.score = evaluation.get("score", 50)
+        answer.feedback = evaluation.get("feedback", "")
+        answer.ai_evaluation = str(evaluation)
+        answer.evaluated_at = datetime.utcnow()
+
+        evaluated_count += 1
+        results.append({
+            "question_id": question.id,
+            "category": question.category,
+            "status": "evaluated",
+            "new_score": answer.score,
+            "feedback_preview": (evaluation.get("feedback", "")[:100] + "..."
+                                 if len(evaluation.get("feedback", "")) > 100
+                                 else evaluation.get("feedback", ""))
+        })
 
     await db.commit()
 
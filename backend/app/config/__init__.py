@@ -1,4 +1,5 @@
 # Config module
+from typing import Any, Dict
 from pydantic_settings import BaseSettings
 
 
@@ -7,11 +8,108 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     DATABASE_URL: str = "sqlite+aiosqlite:///./kos_assess.db"
     KIMI_API_URL: str = "http://localhost:8080/v1/chat/completions"
+    KIMI_API_URLS: str = ""  # Comma-separated replica URLs; overrides KIMI_API_URL when set
+    KIMI_MODEL: str = "kimi"
     UPLOAD_DIR: str = "uploads"
     SECRET_KEY: str = "kos-engineer-assess-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     FRONTEND_URL: str = "http://localhost:3000"
 
+    # SQLite production profile (see app/database.py and app/services/write_queue.py); enable it in deployment
+    SQLITE_PRODUCTION_MODE: bool = False  # WAL + pragmas below on every connection
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Durable in WAL mode; FULL also syncs every commit
+    SQLITE_MMAP_SIZE_MB: int = 256  # Memory-mapped reads of the database file
+    SQLITE_CACHE_SIZE_MB: int = 64  # Page cache per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 30000  # A writer waits this long for the write lock before failing
+    WRITE_QUEUE_ENABLED: bool = False  # Hot-path writes go through one writer connection (SQLite only)
+    WRITE_QUEUE_MAX_BATCH: int = 64  # Writes committed together in one transaction
+    WRITE_QUEUE_MAX_WAIT_MS: float = 2.0  # How long the writer waits for a batch to fill
+
+    # Connection pool and PostgreSQL profile (see app/database.py and scripts/benchmark_database.py)
+    DB_POOL_SIZE: int = 20  # Connections kept open per process (PostgreSQL, and SQLite in production mode)
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under bursts, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing the request
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Reconnect older connections (load balancers drop idle ones)
+    DB_STATEMENT_CACHE_SIZE: int = 500  # Prepared statements cached per asyncpg connection (0 behind pgbouncer transaction pooling)
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # Per statement in request sessions; background jobs are not limited (0 = off)
+
+    # Kimi2 LLM concurrency (see app/services/llm_scheduler.py).
+    # Limits are per endpoint and scale with the number of KIMI_API_URLS.
+    KIMI_MAX_CONCURRENCY: int = 8  # Total in-flight calls across all lanes
+    KIMI_INTERACTIVE_RESERVED: int = 2  # Slots only the interactive lane may use
+    KIMI_INTERACTIVE_CONCURRENCY: int = 4  # Live feedback, candidate Q&A
+    KIMI_EVALUATION_CONCURRENCY: int = 4  # Answer and challenge task evaluation
+    KIMI_GENERATION_CONCURRENCY: int = 3  # Question generation
+    KIMI_ANALYSIS_CONCURRENCY: int = 2  # Reports, application and specialization analysis
+    QUESTION_GENERATION_FANOUT: int = 6  # Categories generated concurrently per test
+    LLM_BATCH_EVALUATION_SIZE: int = 8  # Answers scored per batched evaluate call
+    LLM_EVALUATION_FANOUT: int = 4  # Batched evaluate calls in flight per request
+
+    # Kimi2 circuit breaker (see app/services/llm_circuit_breaker.py)
+    KIMI_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures before failing fast
+    KIMI_BREAKER_RECOVERY_SECONDS: float = 30.0  # Time open before half-open probing
+    KIMI_BREAKER_HALF_OPEN_CALLS: int = 1  # Concurrent probe requests while half-open
+    KIMI_ENDPOINT_FAILURE_THRESHOLD: int = 3  # Consecutive failures before a replica is ejected (see app/services/llm_backend_pool.py)
+
+    # Per-operation max_tokens/timeout/temperature/max_retries/retry_delay
+    # overrides (see app/services/llm_profiles.py), JSON in the environment
+    LLM_PROFILE_OVERRIDES: Dict[str, Dict[str, Any]] = {}
+
+    # Adaptive timeouts and retry backoff (see app/services/llm_latency.py)
+    LLM_ADAPTIVE_TIMEOUTS: bool = True  # Derive attempt timeouts from observed latency
+    LLM_TIMEOUT_P99_FACTOR: float = 2.0  # Timeout = p99 x factor ...
+    LLM_TIMEOUT_FLOOR_SECONDS: float = 10.0  # ... but never below this (profile timeout is the ceiling)
+    LLM_LATENCY_WINDOW: int = 200  # Recent samples kept per operation
+    LLM_LATENCY_MIN_SAMPLES: int = 20  # Samples needed before the timeout adapts
+    LLM_BACKOFF_MAX_SECONDS: float = 30.0  # Cap for jittered exponential backoff
+    LLM_RETRY_AFTER_MAX_SECONDS: float = 120.0  # Longest Retry-After we will honour
+
+    # LLM response cache (see app/services/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 2048  # In-memory LRU size
+    LLM_CACHE_TTL_SECONDS: int = 24 * 3600  # Default TTL for operations without their own policy
+    LLM_CACHE_DB_PATH: str = ""  # SQLite file for the persistent tier, e.g. "llm_cache.db" (empty = memory only)
+
+    # Durable background jobs (see app/services/job_queue.py)
+    JOB_WORKERS: int = 8  # Worker coroutines per process (0 = enqueue only, run workers elsewhere)
+    JOB_LEASE_SECONDS: float = 120.0  # A claimed job is re-queued if not heartbeated for this long
+    JOB_HEARTBEAT_SECONDS: float = 30.0  # How often a running job extends its lease
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0  # Idle workers poll this often (enqueues in-process wake them at once)
+    JOB_MAX_ATTEMPTS: int = 3  # Attempts before a job is marked failed
+    JOB_RETRY_DELAY_SECONDS: float = 10.0  # Base of the jittered backoff between attempts
+    JOB_RETRY_MAX_DELAY_SECONDS: float = 300.0
+
+    # Deferred answer evaluation (see app/api/routes/answers.py)
+    EVALUATION_STREAM_POLL_SECONDS: float = 1.0  # How often the SSE stream checks for the score
+    EVALUATION_STREAM_TIMEOUT_SECONDS: float = 600.0  # Stream gives up (client falls back to polling)
+
+    # Speculative draft evaluation (see app/services/speculative_evaluation.py)
+    SPECULATIVE_EVALUATION_ENABLED: bool = False  # Opt-in: score stable drafts with idle LLM capacity
+    SPECULATIVE_STABLE_SECONDS: float = 45.0  # Draft must be unchanged this long before it is scored
+    SPECULATIVE_IDLE_RETRY_SECONDS: float = 20.0  # Re-check this often while the LLM lanes are busy
+    SPECULATIVE_MIN_FREE_SLOTS: int = 2  # Free non-interactive LLM slots required to count as idle
+
+    # Pre-generated question pool (see app/services/question_pool.py)
+    QUESTION_POOL_ENABLED: bool = False  # Opt-in: deal generic category questions from the pool before generating live
+    QUESTION_POOL_TARGET: int = 40  # Unused questions kept in stock per (category, difficulty, track)
+    QUESTION_POOL_REFILL_BELOW: int = 20  # Queue a refill once stock drops below this
+    QUESTION_POOL_BATCH_SIZE: int = 8  # Questions requested per LLM call while refilling
+
+    # Competition screening pools (see app/services/screening_pool.py)
+    SCREENING_POOL_VARIANTS: int = 5  # Default variants generated per screening question slot
+
+    # Near-duplicate question detection (see app/services/question_similarity.py)
+    QUESTION_DEDUP_ENABLED: bool = True  # Reject generated questions that near-duplicate indexed ones
+    QUESTION_DEDUP_THRESHOLD: float = 0.7  # Estimated Jaccard similarity of 3-token shingles
+    QUESTION_DEDUP_WINDOW_DAYS: int = 30  # Only questions indexed this recently reject new ones (0 = all)
+
+    # Cross-candidate answer similarity (see app/services/answer_similarity.py)
+    ANSWER_SIMILARITY_ENABLED: bool = True  # Index competition answers as screenings are submitted
+    ANSWER_SIMILARITY_THRESHOLD: float = 0.8  # Estimated Jaccard similarity for two answers to match
+    ANSWER_SIMILARITY_MIN_TOKENS: int = 20  # Shorter answers are too generic to compare
+    ANSWER_SIMILARITY_COMMON_SHARE: float = 0.05  # Clusters above this share of a question's answers are common answers, not copying
+    ANSWER_SIMILARITY_RISK_PER_MATCH: float = 25.0  # Risk score added per flagged answer
+
     class Config:
         env_file = ".env"
 
@@ -1,66 +1,148 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import event
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
-import asyncio
-import random
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
 
 
 # Check if using PostgreSQL or SQLite
 is_postgres = settings.DATABASE_URL.startswith("postgresql")
 
 if is_postgres:
-    # PostgreSQL connection settings
+    # PostgreSQL connection settings: a sized pool and prepared statements cached per connection
     engine = create_async_engine(
         settings.DATABASE_URL,
         echo=settings.DEBUG,
         pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,  # SQLAlchemy's asyncpg adapter
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,  # asyncpg's own cache
+            "server_settings": {"application_name": settings.APP_NAME},
+        },
     )
 else:
     # SQLite connection settings
+    pooling = {}
+    if settings.SQLITE_PRODUCTION_MODE and ":memory:" not in settings.DATABASE_URL:
+        # Keep connections (and their page cache and mmap) instead of reopening the file per session
+        pooling = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        }
     engine = create_async_engine(
         settings.DATABASE_URL,
         echo=settings.DEBUG,
         connect_args={
-            "timeout": 120,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000 if settings.SQLITE_PRODUCTION_MODE else 120,
             "check_same_thread": False,
         },
         pool_pre_ping=True,
+        **pooling,
     )
 
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
+    if settings.SQLITE_PRODUCTION_MODE:
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            """WAL lets readers run alongside the writer; NORMAL sync is durable in WAL mode."""
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+            cursor.execute(f"PRAGMA cache_size={-settings.SQLITE_CACHE_SIZE_MB * 1024}")  # Negative = KiB
+            cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
 
-async def retry_on_lock(func, max_retries=5, base_delay=0.5):
-    """Retry a database operation with exponential backoff on lock errors."""
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            return await func()
-        except OperationalError as e:
-            if "database is locked" in str(e).lower():
-                last_error = e
-                delay = base_delay * (2 ** attempt) + random.uniform(0, 0.5)
-                print(f"[Database] Lock detected, retry {attempt + 1}/{max_retries} after {delay:.2f}s")
-                await asyncio.sleep(delay)
-            else:
-                raise
-    raise last_error
+async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _set_statement_timeout(session, transaction, connection):
+    # SET LOCAL lasts until the transaction ends, so it is re-applied to each one
+    if transaction.nested:
+        return
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+
+
 async def get_db():
     async with async_session_maker() as session:
+        if is_postgres and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            # Request sessions only: a runaway query fails the request instead of holding a pooled connection
+            event.listen(session.sync_session, "after_begin", _set_statement_timeout)
         try:
             yield session
         finally:
             await session.close()
 
 
+_pool_counters = {"connects": 0, "checkouts": 0, "invalidated": 0, "peak_checked_out": 0}
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _count_connect(dbapi_connection, connection_record):
+    _pool_counters["connects"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    _pool_counters["checkouts"] += 1
+    if hasattr(engine.pool, "checkedout"):
+        _pool_counters["peak_checked_out"] = max(_pool_counters["peak_checked_out"], engine.pool.checkedout())
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _count_invalidate(dbapi_connection, connection_record, exception):
+    _pool_counters["invalidated"] += 1
+
+
+def pool_stats() -> dict:
+    """Connection pool occupancy, configuration and counters for this process."""
+    pool = engine.pool
+    stats = {
+        "backend": engine.dialect.name,
+        "pool_class": type(pool).__name__,
+        **_pool_counters,
+    }
+    if hasattr(pool, "checkedout"):  # QueuePool and its async variant
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": pool.timeout(),
+        })
+    if is_postgres:
+        stats["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        stats["statement_timeout_ms"] = settings.DB_STATEMENT_TIMEOUT_MS
+    return stats
+
+
+def run_migrations(connection):
+    """Create missing tables and apply pending Alembic revisions on ``connection``."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
 async def init_db():
+    """Bring the database up to date with the models (see alembic/env.py)."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
@@ -6,9 +6,13 @@ from app.models.report import Report
 from app.models.certificate import Certificate, get_score_tier
 from app.models.challenge import ChallengeSubmission, TaskResponse, Deliverable
 from app.models.improvement_suggestion import ImprovementSuggestion, SuggestionStatus, SuggestionCategory, SuggestionPriority
-from app.models.competition import Competition, CompetitionRegistration, BehavioralMetrics, CompetitionStatus
+from app.models.competition import Competition, CompetitionRegistration, CompetitionQuestion, BehavioralMetrics, CompetitionStatus
 from app.models.application import Application, SkillAssessment, ApplicationStatus, AvailabilityChoice, SkillCategory
 from app.models.specialization import SpecializationResult, SPECIALIZATION_FOCUS_AREAS, get_focus_area_config, get_all_focus_areas
+from app.models.job import Job, JobStatus
+from app.models.question_pool import PooledQuestion
+from app.models.question_fingerprint import QuestionFingerprint, QuestionLSHBucket
+from app.models.answer_signature import AnswerSignature, AnswerLSHBucket
 
 __all__ = [
     "Candidate",
@@ -28,6 +32,7 @@ __all__ = [
     "SuggestionPriority",
     "Competition",
     "CompetitionRegistration",
+    "CompetitionQuestion",
     "BehavioralMetrics",
     "CompetitionStatus",
     "Application",
@@ -39,4 +44,11 @@ __all__ = [
     "SPECIALIZATION_FOCUS_AREAS",
     "get_focus_area_config",
     "get_all_focus_areas",
+    "Job",
+    "JobStatus",
+    "PooledQuestion",
+    "QuestionFingerprint",
+    "QuestionLSHBucket",
+    "AnswerSignature",
+    "AnswerLSHBucket",
 ]
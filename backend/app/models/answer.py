@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -8,7 +8,7 @@ class Answer(Base):
     __tablename__ = "answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
 
     candidate_answer = Column(Text, nullable=True)
     candidate_code = Column(Text, nullable=True)  # For coding questions
@@ -21,6 +21,13 @@ class Answer(Base):
     is_submitted = Column(Boolean, default=False)  # True when finally submitted, False for drafts
     submitted_at = Column(DateTime, nullable=True)
     evaluated_at = Column(DateTime, nullable=True)
+    evaluation_status = Column(String(20), nullable=True)  # pending (queued), evaluated, failed; null until submitted
+
+    # Speculative evaluation of the autosaved draft, reused at submit when the
+    # submitted content still hashes to speculative_hash
+    speculative_hash = Column(String(64), nullable=True)  # sha256 of the content that was scored
+    speculative_evaluation = Column(JSON, nullable=True)
+    speculative_evaluated_at = Column(DateTime, nullable=True)
 
     # Version tracking for editable submissions
     version = Column(Integer, default=1)  # Incremented on each edit after submission
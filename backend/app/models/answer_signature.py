@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, BigInteger, Index
+from datetime import datetime
+from app.database import Base
+
+
+class AnswerSignature(Base):
+    """MinHash signature of one submitted competition answer.
+
+    Answers to the same question template whose signatures are similar end
+    up in the same cluster (cluster_id = smallest answer id in it); see
+    app/services/answer_similarity.py.
+    """
+    __tablename__ = "answer_signatures"
+    __table_args__ = (
+        Index("ix_answer_signatures_template", "competition_id", "template_key"),
+        Index("ix_answer_signatures_cluster", "competition_id", "cluster_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    answer_id = Column(Integer, ForeignKey("answers.id"), unique=True, nullable=False)
+    competition_id = Column(Integer, ForeignKey("competitions.id"), nullable=False)
+    registration_id = Column(Integer, ForeignKey("competition_registrations.id"), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+
+    template_key = Column(String(64), nullable=False)  # Question fingerprint id, or hash of the question content
+    signature = Column(LargeBinary, nullable=False)  # MinHash signature, little-endian uint32 x NUM_PERM
+    cluster_id = Column(Integer, nullable=True)  # Null until the answer matches another one
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnswerLSHBucket(Base):
+    """LSH band bucket membership: one row per (band bucket, answer signature).
+
+    Bucket keys are scoped to the competition and question template.
+    """
+    __tablename__ = "answer_lsh_buckets"
+
+    bucket = Column(BigInteger, primary_key=True)
+    signature_id = Column(Integer, ForeignKey("answer_signatures.id"), primary_key=True)
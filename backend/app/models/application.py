@@ -17,6 +17,7 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -63,6 +64,11 @@ class Application(Base):
     receive a unique token, and can track their application status.
     """
     __tablename__ = "applications"
+    __table_args__ = (
+        # Keyset pagination (see app/utils/pagination.py): sort column, then id
+        Index("ix_applications_status_created_id", "status", "created_at", "id"),  # Admin list filtered by status
+        Index("ix_applications_created_id", "created_at", "id"),  # Admin list
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -57,7 +57,8 @@ class TaskResponse(Base):
     challenge_submission_id = Column(
         Integer,
         ForeignKey("challenge_submissions.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # Task identification
@@ -76,6 +77,7 @@ class TaskResponse(Base):
     feedback = Column(Text, nullable=True)
     ai_evaluation = Column(JSON, nullable=True)
     evaluated_at = Column(DateTime, nullable=True)
+    evaluation_status = Column(String(20), nullable=True)  # pending (queued), evaluated, failed; null until submitted
 
     # Version tracking for edits
     version = Column(Integer, default=1)
@@ -102,7 +104,8 @@ class Deliverable(Base):
     challenge_submission_id = Column(
         Integer,
         ForeignKey("challenge_submissions.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # Deliverable type
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -37,19 +37,36 @@ class Competition(Base):
     questions_count = Column(Integer, default=20)  # Number of questions
     passing_percentile = Column(Float, default=98.33)  # Top 500 out of 30000 = ~98.33 percentile
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Pre-provisioned screening question pool (see app/services/screening_pool.py)
+    screening_pool_status = Column(String(20), nullable=True)  # provisioning, ready, failed; null = generate per registrant
+    screening_pool_variants = Column(Integer, nullable=True)  # K variants generated per question slot
+    screening_pool_seed = Column(String(64), nullable=True)  # Seeds the variant assignment permutations
+    screening_pool_ready_at = Column(DateTime, nullable=True)
+
+    # Registration counters, kept in step with competition_registrations (see app/services/competition_counters.py)
+    registration_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")  # Screenings completed
+    qualified_registration_count = Column(Integer, nullable=False, default=0, server_default="0")  # Registrations marked qualified
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     registrations = relationship("CompetitionRegistration", back_populates="competition", cascade="all, delete-orphan")
+    screening_questions = relationship("CompetitionQuestion", back_populates="competition", cascade="all, delete-orphan")
 
 
 class CompetitionRegistration(Base):
     __tablename__ = "competition_registrations"
+    __table_args__ = (
+        # Rankings: completed registrations of a competition by score, then id (keyset pagination)
+        Index("ix_competition_registrations_ranking_id", "competition_id", "screening_completed", "screening_score", "id"),
+        Index("ix_competition_registrations_qualified", "competition_id", "is_qualified"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     competition_id = Column(Integer, ForeignKey("competitions.id"), nullable=False)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False, index=True)
 
     # Unique registration token for screening test access
     registration_token = Column(String(255), unique=True, nullable=False, index=True)
@@ -69,7 +86,7 @@ class CompetitionRegistration(Base):
     qualification_rank = Column(Integer, nullable=True)  # 1-500 for qualified candidates
 
     # Test reference (links to the actual Test model for this screening)
-    test_id = Column(Integer, ForeignKey("tests.id"), nullable=True)
+    test_id = Column(Integer, ForeignKey("tests.id"), nullable=True, index=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -81,12 +98,40 @@ class CompetitionRegistration(Base):
     behavioral_metrics = relationship("BehavioralMetrics", back_populates="registration", uselist=False, cascade="all, delete-orphan")
 
 
+class CompetitionQuestion(Base):
+    """One variant of one screening question slot in a competition's pool.
+
+    Every screening test gets exactly one variant per (category, slot).
+    """
+    __tablename__ = "competition_questions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    competition_id = Column(Integer, ForeignKey("competitions.id"), nullable=False, index=True)
+
+    category = Column(String(100), nullable=False)
+    section_order = Column(Integer, default=0)
+    slot = Column(Integer, nullable=False)  # Question position within the section
+    variant = Column(Integer, nullable=False)  # 0..K-1
+
+    question_text = Column(Text, nullable=False)
+    question_code = Column(Text, nullable=True)
+    expected_answer = Column(Text, nullable=True)
+    hints = Column(JSON, nullable=True)
+    language = Column(String(50), nullable=True)
+    fingerprint_id = Column(Integer, ForeignKey("question_fingerprints.id"), nullable=True)  # Near-duplicate index entry
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    competition = relationship("Competition", back_populates="screening_questions")
+
+
 class BehavioralMetrics(Base):
     __tablename__ = "behavioral_metrics"
 
     id = Column(Integer, primary_key=True, index=True)
-    registration_id = Column(Integer, ForeignKey("competition_registrations.id"), nullable=False)
-    test_id = Column(Integer, ForeignKey("tests.id"), nullable=True)
+    registration_id = Column(Integer, ForeignKey("competition_registrations.id"), nullable=False, index=True)
+    test_id = Column(Integer, ForeignKey("tests.id"), nullable=True, index=True)
 
     # Time tracking per question (JSON array of {question_id, time_seconds, question_category, question_complexity})
     time_per_question = Column(JSON, default=list)
@@ -110,6 +155,8 @@ class BehavioralMetrics(Base):
 
     # Overall risk assessment
     risk_score = Column(Float, default=0.0)  # 0-100, higher = more suspicious
+    behavior_risk_score = Column(Float, nullable=True)  # Risk from timing and anti-cheat signals alone
+    similar_answer_count = Column(Integer, default=0)  # Answers closely matching other candidates' (see app/services/answer_similarity.py)
     risk_factors = Column(JSON, default=list)  # List of factors contributing to risk
 
     # Additional behavioral signals
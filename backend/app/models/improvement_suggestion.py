@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -31,6 +31,11 @@ class SuggestionPriority(str, enum.Enum):
 
 class ImprovementSuggestion(Base):
     __tablename__ = "improvement_suggestions"
+    __table_args__ = (
+        # Keyset pagination (see app/utils/pagination.py): sort column, then id
+        Index("ix_improvement_suggestions_status_created_id", "status", "created_at", "id"),  # Admin list filtered by status
+        Index("ix_improvement_suggestions_created_id", "created_at", "id"),  # Admin list
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=True)
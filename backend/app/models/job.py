@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from datetime import datetime
+from app.database import Base
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """A unit of background work, claimed by workers through a lease.
+
+    See app/services/job_queue.py for the claim/heartbeat/retry protocol.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(100), nullable=False, index=True)  # Handler name, e.g. "generate_report"
+    status = Column(String(20), default=JobStatus.QUEUED.value, nullable=False, index=True)
+
+    payload = Column(JSON, nullable=True)  # Handler arguments
+    result = Column(JSON, nullable=True)  # Whatever the handler returned
+    error = Column(Text, nullable=True)  # Last failure
+
+    # Deduplication: dedup_key is kept for reference; active_key mirrors it while the
+    # job is queued/running and is cleared when it finishes, so the unique
+    # constraint allows one active job per key across every process
+    dedup_key = Column(String(255), nullable=True, index=True)
+    active_key = Column(String(255), nullable=True, unique=True)
+
+    priority = Column(Integer, default=100, nullable=False)  # Lower runs first; candidate-facing work jumps the queue
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Retry backoff
+
+    # Lease held by the worker currently running the job
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
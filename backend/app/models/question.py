@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -6,6 +6,10 @@ from app.database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # A test's questions in display order; also serves selectinload(Test.questions)
+        Index("ix_questions_test_order", "test_id", "section_order", "question_order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     test_id = Column(Integer, ForeignKey("tests.id"), nullable=False)
@@ -20,6 +24,7 @@ class Question(Base):
     hints = Column(JSON, nullable=True)
     max_score = Column(Integer, default=100)
     language = Column(String(50), nullable=True)  # Programming language for code questions (python, javascript, c, etc.)
+    fingerprint_id = Column(Integer, ForeignKey("question_fingerprints.id"), nullable=True, index=True)  # Near-duplicate index entry
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary, BigInteger
+from datetime import datetime
+from app.database import Base
+
+
+class QuestionFingerprint(Base):
+    """MinHash signature of one distinct question text (+ code).
+
+    Questions, pooled questions and competition pool questions point at their
+    fingerprint; see app/services/question_similarity.py.
+    """
+    __tablename__ = "question_fingerprints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, nullable=False)  # sha256 of the normalized text + code
+    signature = Column(LargeBinary, nullable=False)  # MinHash signature, little-endian uint32 x NUM_PERM
+    source = Column(String(30), nullable=True)  # test, pool, competition, backfill
+    sample_text = Column(Text, nullable=True)  # Start of the question text, for admin listings
+    accepted_at = Column(DateTime, nullable=True)  # Last accepted for a test or pool (dedup window)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class QuestionLSHBucket(Base):
+    """LSH band bucket membership: one row per (band bucket, fingerprint)."""
+    __tablename__ = "question_lsh_buckets"
+
+    bucket = Column(BigInteger, primary_key=True)  # Band hash from app/services/minhash.py
+    fingerprint_id = Column(Integer, ForeignKey("question_fingerprints.id"), primary_key=True)
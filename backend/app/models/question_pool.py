@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index
+from datetime import datetime
+from app.database import Base
+
+
+class PooledQuestion(Base):
+    """A pre-generated, candidate-independent question waiting to be dealt into a test.
+
+    Each row is used once: drawing it sets drawn_at. See app/services/question_pool.py.
+    """
+    __tablename__ = "question_pool"
+    __table_args__ = (
+        # Draws and stock counts filter on the pool key and on drawn_at IS NULL
+        Index("ix_question_pool_key", "category", "difficulty", "track_id", "drawn_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Pool key
+    category = Column(String(100), nullable=False)  # brain_teaser, coding, general_engineering, ...
+    difficulty = Column(String(50), nullable=False)  # As passed to generate_test_questions (junior, mid, senior, ...)
+    track_id = Column(String(100), nullable=True)  # Engineer track the prompt was specialised for, if any
+
+    question_text = Column(Text, nullable=False)
+    question_code = Column(Text, nullable=True)
+    expected_answer = Column(Text, nullable=True)
+    hints = Column(JSON, nullable=True)
+    fingerprint_id = Column(Integer, ForeignKey("question_fingerprints.id"), nullable=True)  # Near-duplicate index entry
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    drawn_at = Column(DateTime, nullable=True)  # Set when dealt into a test; null while in stock
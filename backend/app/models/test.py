@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, JSON, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, JSON, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -21,6 +21,12 @@ class TestType(str, enum.Enum):
 
 class Test(Base):
     __tablename__ = "tests"
+    __table_args__ = (
+        Index("ix_tests_candidate_created", "candidate_id", "created_at"),  # A candidate's tests, newest first
+        # Keyset pagination (see app/utils/pagination.py): sort column, then id
+        Index("ix_tests_status_created_id", "status", "created_at", "id"),  # list_tests filtered by status
+        Index("ix_tests_created_id", "created_at", "id"),  # list_tests and the cheating logs
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
@@ -70,6 +76,10 @@ class Test(Base):
     integrity_agreed = Column(Boolean, default=False)
     integrity_agreed_at = Column(DateTime, nullable=True)
 
+    # Background question generation (see create_test in app/api/routes/tests.py)
+    generation_job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    generation_progress = Column(JSON, nullable=True)  # List of {category, section_order, status (pending, ready, failed), questions}; null if generated inline
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -89,3 +99,13 @@ class Test(Base):
 
     # Self-referential relationship for specialization tests
     parent_test = relationship("Test", remote_side=[id], foreign_keys=[parent_test_id], backref="child_tests")
+
+    @property
+    def generation_status(self) -> str:
+        """"failed" (the generation job gave up on a section), "generating" or "ready"."""
+        progress = self.generation_progress or []
+        if any(section.get("status") == "failed" for section in progress):
+            return "failed"
+        if any(section.get("status") != "ready" for section in progress):
+            return "generating"
+        return "ready"
@@ -14,6 +14,9 @@ class AnswerSubmit(BaseModel):
     candidate_answer: Optional[str] = None
     candidate_code: Optional[str] = None
     time_spent_seconds: Optional[int] = None
+    # Return as soon as the answer is saved; the score arrives via
+    # GET /answers/{id}/evaluation or its /stream variant
+    defer_evaluation: bool = False
 
 
 class AnswerDraft(BaseModel):
@@ -34,6 +37,7 @@ class AnswerResponse(BaseModel):
     is_submitted: Optional[bool] = False
     submitted_at: Optional[datetime] = None
     evaluated_at: Optional[datetime] = None
+    evaluation_status: Optional[str] = None  # pending, evaluated, failed
     time_spent_seconds: Optional[int] = None
     is_suspiciously_fast: Optional[bool] = None
     # Version tracking
@@ -46,6 +50,19 @@ class AnswerResponse(BaseModel):
         from_attributes = True
 
 
+class EvaluationStatusResponse(BaseModel):
+    """State of a deferred evaluation (answer or challenge task response)"""
+    id: int
+    evaluation_status: Optional[str] = None  # pending, evaluated, failed
+    score: Optional[float] = None
+    feedback: Optional[str] = None
+    evaluated_at: Optional[datetime] = None
+    version: Optional[int] = 1
+
+    class Config:
+        from_attributes = True
+
+
 class DraftSaveResponse(BaseModel):
     """Response for draft save operations"""
     success: bool
@@ -126,3 +143,18 @@ class FeedbackResponse(BaseModel):
     missing_points: list[str] = []
     strengths: list[str] = []
     status: str = "success"  # success, too_short, ai_unavailable, cached
+
+
+class CandidateQuestionRequest(BaseModel):
+    """A candidate's clarifying question about the question they are on"""
+    question_id: int
+    question: str
+
+
+class CandidateQuestionResponse(BaseModel):
+    """Answer to a candidate's clarifying question"""
+    answer: str
+    source: str = "ai"  # ai, ai_raw, knowledge_base, fallback
+    is_hint: bool = False
+    term_found: bool = False
+    related_terms: list[str] = []
@@ -215,6 +215,7 @@ class ApplicationListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
 
 
 # =============================================================================
@@ -17,6 +17,9 @@ class TaskResponseSubmit(BaseModel):
     task_id: str
     response_text: Optional[str] = None
     response_code: Optional[str] = None
+    # Return as soon as the response is saved; the score arrives via
+    # GET /challenges/task/{id}/evaluation or its /stream variant
+    defer_evaluation: bool = False
 
 
 class TaskResponseResponse(BaseModel):
@@ -29,6 +32,7 @@ class TaskResponseResponse(BaseModel):
     submitted_at: Optional[datetime] = None
     score: Optional[float] = None
     feedback: Optional[str] = None
+    evaluation_status: Optional[str] = None  # pending, evaluated, failed
     version: int = 1
     edit_count: int = 0
     previous_score: Optional[float] = None
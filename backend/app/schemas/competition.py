@@ -46,6 +46,7 @@ class CompetitionResponse(BaseModel):
     updated_at: datetime
     registration_count: int = 0
     completed_count: int = 0
+    screening_pool_status: Optional[str] = None  # provisioning, ready, failed; null = questions generated per registrant
 
     class Config:
         from_attributes = True
@@ -121,6 +122,7 @@ class ScreeningTestResponse(BaseModel):
     test_access_token: Optional[str] = None
     time_remaining_seconds: Optional[int] = None
     questions_by_section: Optional[dict] = None
+    generation_status: Optional[str] = None  # generating, ready, failed (see Test.generation_status)
 
     class Config:
         from_attributes = True
@@ -176,6 +178,7 @@ class BehavioralMetricsResponse(BaseModel):
     anomaly_flags: List[Any]
     risk_score: float
     risk_factors: List[Any]
+    similar_answer_count: int = 0
 
     class Config:
         from_attributes = True
@@ -193,6 +196,7 @@ class RankingEntry(BaseModel):
     is_qualified: bool
     risk_score: float
     consistency_score: float
+    similar_answer_count: int = 0  # Answers flagged as closely matching other candidates'
 
     class Config:
         from_attributes = True
@@ -206,6 +210,45 @@ class RankingsResponse(BaseModel):
     qualified_count: int
     rankings: List[RankingEntry]
     cutoff_score: Optional[float] = None
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
+
+
+class ScreeningPoolProvision(BaseModel):
+    variants: Optional[int] = None  # Variants per question slot (default SCREENING_POOL_VARIANTS)
+    rebuild: bool = False  # Discard a ready pool and generate a new one
+
+
+class ScreeningPoolSection(BaseModel):
+    category: str
+    section_order: int
+    slots: int  # Questions per screening test in this section
+    questions_ready: int  # Generated so far, out of slots x variants
+
+
+class ScreeningPoolStatus(BaseModel):
+    competition_id: int
+    status: Optional[str] = None
+    variants: Optional[int] = None
+    ready_at: Optional[datetime] = None
+    sections: List[ScreeningPoolSection] = []
+    job_id: Optional[int] = None
+
+
+class AnswerSimilarityCluster(BaseModel):
+    cluster_id: int
+    question_id: int  # One of the clustered answers' questions
+    size: int
+    common: bool  # Too widespread to be copying (a common answer); not flagged
+    registration_ids: List[int]  # First 50 members
+
+
+class AnswerSimilarityReport(BaseModel):
+    competition_id: int
+    threshold: float
+    indexed_answers: int
+    flagged_registrations: int
+    clusters: List[AnswerSimilarityCluster]
+    scan_job_id: Optional[int] = None  # Queued or running full scan, if any
 
 
 class QualifyResponse(BaseModel):
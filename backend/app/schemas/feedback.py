@@ -45,6 +45,7 @@ class SuggestionListResponse(BaseModel):
     total: int
     pending_count: int
     auto_implemented_count: int
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
 
 
 class SuggestionUpdate(BaseModel):
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    dedup_key: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    run_after: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobAccepted(BaseModel):
+    """Returned with 202 when work has been queued instead of run inline."""
+    job_id: int
+    status: str
+    status_url: str
@@ -46,3 +46,25 @@ class AnswerSummary(BaseModel):
 class QuestionWithAnswer(QuestionResponse):
     expected_answer: Optional[str] = None
     answer: Optional[AnswerSummary] = None
+
+
+class SimilarQuestionsQuery(BaseModel):
+    """Look up indexed questions similar to arbitrary text (admin)."""
+    question_text: str
+    question_code: Optional[str] = None
+    threshold: Optional[float] = None  # Default QUESTION_DEDUP_THRESHOLD
+    limit: int = 20
+
+
+class SimilarQuestion(BaseModel):
+    fingerprint_id: int
+    similarity: float  # Estimated Jaccard similarity, 0-1
+    sample_text: Optional[str] = None
+    source: Optional[str] = None  # test, pool, competition, backfill
+    question_count: int = 0  # Test questions using this exact content
+    first_question_id: Optional[int] = None
+
+
+class SimilarQuestionsResponse(BaseModel):
+    threshold: float
+    matches: List[SimilarQuestion]
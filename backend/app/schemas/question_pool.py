@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+
+
+class PoolLevel(BaseModel):
+    category: str
+    difficulty: str
+    track_id: Optional[str] = None
+    available: int  # Unused questions in stock
+    drawn: int  # Questions already dealt into tests
+    target: int
+    refill_pending: bool
+
+
+class PoolLevelsResponse(BaseModel):
+    enabled: bool
+    target: int
+    refill_below: int
+    levels: List[PoolLevel]
+    counters: Dict[str, int]  # This process: hits, misses, drawn, generated
+
+
+class PoolRefillRequest(BaseModel):
+    """Stock a pool key ahead of demand (e.g. before a hiring push)."""
+    category: str
+    difficulty: str
+    track_id: Optional[str] = None
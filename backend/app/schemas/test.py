@@ -13,6 +13,13 @@ class BreakHistoryEntry(BaseModel):
     duration_seconds: int
 
 
+class SectionGenerationProgress(BaseModel):
+    category: str
+    section_order: int
+    status: str  # pending, ready, failed
+    questions: int = 0
+
+
 class TestResponse(BaseModel):
     id: int
     candidate_id: int
@@ -39,6 +46,12 @@ class TestResponse(BaseModel):
     nda_signed_at: Optional[datetime] = None
     integrity_agreed: bool = False
 
+    # Background question generation
+    generation_status: str = "ready"  # generating, ready, failed
+    generation_progress: Optional[List[SectionGenerationProgress]] = None
+    generation_job_id: Optional[int] = None
+    generation_error: Optional[str] = None
+
     class Config:
         from_attributes = True
 
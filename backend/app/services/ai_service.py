@@ -6,8 +6,24 @@ import time
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Any, Tuple
 from app.config import settings
+from app.services.llm_scheduler import (
+    LLMScheduler,
+    LANE_INTERACTIVE,
+    LANE_EVALUATION,
+    LANE_GENERATION,
+    LANE_ANALYSIS,
+    lane_for_operation,
+)
+from app.services.llm_cache import LLMResponseCache, make_cache_key
+from app.services.llm_singleflight import SingleFlight
+from app.services.llm_circuit_breaker import CircuitBreaker
+from app.services.llm_backend_pool import LLMBackendPool, parse_endpoint_urls
+from app.services.prompt_registry import PromptPrefixRegistry
+from app.services.llm_latency import LatencyTracker, backoff_delay, parse_retry_after
+from app.services.llm_profiles import DEFAULT_PROFILE, GenerationProfile, build_profiles
+from app.services.llm_streaming import STREAM_DONE, parse_stream_line, partial_json_string
 
 
 # KOS AI Company Context - included in all question generation prompts
@@ -389,6 +405,203 @@ class ResumeAnalyzer:
 
 
 # Default questions for each category when AI fails - KOS AI specific
+QUESTION_CATEGORY_PROMPTS = {
+    "brain_teaser": "Logic puzzles and problem-solving questions that test analytical thinking",
+    "coding": "Programming challenges that require writing code to solve problems",
+    "code_review": "Buggy code snippets that need to be identified and fixed",
+    "system_design": "Architecture and system design questions",
+    "signal_processing": "Digital signal processing questions (filters, FFT, DSP algorithms)",
+    "general_engineering": "General software engineering concepts: algorithms, data structures, design patterns, testing strategies, debugging approaches, version control, APIs, databases, and software development best practices"
+}
+
+# Supplies ready-made questions for (category, difficulty, track_id, count), or None
+QuestionSource = Callable[[str, str, Optional[str], int], Awaitable[Optional[List[Dict[str, Any]]]]]
+# Returns the subset of freshly generated (category, questions) that may be used
+QuestionFilter = Callable[[str, List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]
+
+QUESTION_DIFFICULTY_GUIDANCE = {
+    "junior": "Entry-level questions suitable for 0-2 years experience. Focus on fundamentals.",
+    "mid": "Intermediate questions for 2-5 years experience. Include some complexity.",
+    "senior": "Advanced questions for 5+ years experience. Focus on architecture, optimization, and edge cases.",
+    "easy": "Entry-level questions suitable for 0-2 years experience. Focus on fundamentals.",
+    "medium": "Intermediate questions for 2-5 years experience. Include some complexity.",
+    "hard": "Advanced questions for 5+ years experience. Focus on architecture, optimization, and edge cases."
+}
+
+HINT_GUIDELINES = """UX 3 FIX - HINT GUIDELINES:
+- Hints should be DIRECTIONAL, not revealing (guide thinking, don't give answers)
+- Good hints: "Consider X", "Think about Y", "What happens when Z?"
+- Bad hints: "The answer is X", "Use Y formula", "The solution involves Z"
+- Hints should help a stuck candidate take one step forward
+- 1-2 hints per question is ideal, keep them SHORT (1 sentence each)"""
+
+# Static system prompts. These never contain per-call values so every request
+# for an operation starts with the same bytes and hits the inference server's
+# prefix cache; call-specific context goes in the user message.
+GENERATE_QUESTIONS_PREFIX = f"""You are an expert technical interviewer creating assessment questions for KOS AI.
+
+{KOS_COMPANY_CONTEXT}
+
+The request gives the category, difficulty, candidate skills, engineer track and optional rubric, and how many questions to generate.
+Questions should be relevant to KOS AI's work when the category allows:
+- For signal_processing: Focus on PPG, biomedical signals, motion artifact removal, multi-wavelength analysis
+- For system_design: Consider real-time embedded systems, HIPAA compliance, BLE protocols, edge ML
+- For coding: Include problems related to signal processing, time-series data, or embedded constraints
+- For brain_teaser: Use scenarios involving sensors, signals, or health-tech concepts
+- For code_review: Include code with issues common in embedded/signal processing contexts
+
+Return a JSON array of question objects with this structure:
+{{
+  "question_text": "The question prompt",
+  "question_code": "Code snippet if applicable (for coding/code_review), null otherwise",
+  "expected_answer": "Brief description of expected answer or solution approach",
+  "hints": ["Hint 1", "Hint 2"]
+}}
+
+{HINT_GUIDELINES}
+
+Return ONLY the JSON array, no other text."""
+
+SPECIALIZATION_QUESTIONS_PREFIX = """You are an expert technical interviewer creating assessment questions for KOS AI.
+
+Generate 5 expert-level questions for the specialization track described in the request (track, description, topics, difficulty).
+
+Each question should test deep expertise in the track. The questions should be:
+- Specific to the track's domain
+- Challenging enough to differentiate specialists from generalists
+- Cover different aspects from the topics list
+- Include real-world scenarios when possible
+
+Return a JSON array of 5 question objects with this structure:
+{
+  "question_text": "The question prompt",
+  "question_code": "Code snippet if applicable, null otherwise",
+  "expected_answer": "Brief description of expected answer or solution approach",
+  "hints": ["Hint 1", "Hint 2"],
+  "max_score": 100
+}
+
+Return ONLY the JSON array, no other text."""
+
+EVALUATE_ANSWER_PREFIX = """You are an expert technical interviewer evaluating candidate responses.
+
+The request gives the category, difficulty level, engineer track, an optional scoring rubric, the question and the candidate's answer.
+
+Evaluate the candidate's answer and provide:
+1. A score from 0-100 (or 0-10 if using rubric, then multiply by 10)
+2. Detailed feedback explaining the score
+3. What was good about the answer
+4. What could be improved
+5. If a scoring rubric is given: breakdown of points per rubric category
+
+Return a JSON object:
+{
+  "score": <number 0-100>,
+  "feedback": "Detailed feedback",
+  "strengths": ["What was good"],
+  "improvements": ["What could be better"],
+  "rubric_scores": {"category_name": points},  (only when a scoring rubric is given)
+  "meets_passing_threshold": <true if score >= 70>
+}
+
+Be fair but rigorous. Consider:
+- Correctness of the solution
+- Code quality (if applicable)
+- Problem-solving approach
+- Communication clarity
+- Edge case handling
+
+Return ONLY the JSON object."""
+
+EVALUATE_ANSWERS_BATCH_PREFIX = """You are an expert technical interviewer evaluating several candidate responses from the same assessment.
+
+The request contains numbered sections "### Answer N", each with the category, difficulty level, engineer track, an optional scoring rubric, the question and the candidate's answer. Evaluate every answer independently - do not let one answer influence the score of another.
+
+For each answer provide:
+1. A score from 0-100 (or 0-10 if using its rubric, then multiply by 10)
+2. Detailed feedback explaining the score
+3. What was good about the answer
+4. What could be improved
+5. If a scoring rubric is given: breakdown of points per rubric category
+
+Return a JSON array with exactly one object per answer, in order:
+[
+  {
+    "id": <N from "### Answer N">,
+    "score": <number 0-100>,
+    "feedback": "Detailed feedback",
+    "strengths": ["What was good"],
+    "improvements": ["What could be better"],
+    "rubric_scores": {"category_name": points},  (only when a scoring rubric is given)
+    "meets_passing_threshold": <true if score >= 70>
+  }
+]
+
+Be fair but rigorous. Consider:
+- Correctness of the solution
+- Code quality (if applicable)
+- Problem-solving approach
+- Communication clarity
+- Edge case handling
+
+Return ONLY the JSON array."""
+
+EVALUATE_CHALLENGE_TASK_PREFIX = """You are an expert technical interviewer evaluating a candidate's challenge response.
+
+The request gives the track, difficulty level, the task with its requirements, and the candidate's response.
+
+Evaluate the candidate's response against each requirement. Consider:
+- Technical accuracy and depth
+- Completeness of the solution
+- Quality of explanation
+- Code quality (if applicable)
+- Practical applicability
+- Innovation and creativity
+
+Return a JSON object:
+{
+  "score": <number 0-100>,
+  "feedback": "Detailed feedback",
+  "requirement_scores": {
+    "requirement_1": <0-100>,
+    ...
+  },
+  "strengths": ["What was good"],
+  "improvements": ["What could be better"]
+}
+
+Be fair but rigorous. This is a real-world challenge that will be discussed in a presentation.
+
+Return ONLY the JSON object."""
+
+LIVE_FEEDBACK_PREFIX = """You are a helpful mentor providing real-time feedback on a candidate's answer.
+Your goal is to GUIDE, not GRADE. Be encouraging and constructive.
+
+IMPORTANT - UX 2 FIX: First assess the answer quality:
+- EXCELLENT (80%+ of key concepts, deep understanding): Praise them! Return mostly STRENGTHS, minimal/no hints.
+- GOOD (50-80% coverage): Balanced feedback with both strengths and gentle guidance.
+- NEEDS WORK (<50%): Focus on constructive hints to guide improvement.
+
+For EXCELLENT answers, say things like "Excellent coverage!", "Great approach!", "You've nailed the key concepts!"
+Do NOT give unnecessary hints for already strong answers - it can be discouraging.
+
+Provide quick, actionable feedback:
+1. STRENGTHS: What's good about the answer (ALWAYS include if answer has any merit)
+2. HINTS: Subtle suggestions to improve (ONLY if genuinely needed - skip for excellent answers)
+3. MISSING: Key points to address (ONLY if significant gaps exist)
+
+Keep feedback SHORT (1 sentence each). Be encouraging.
+Do NOT give away the answer directly - just guide them.
+
+Return a JSON object:
+{
+  "hints": ["Short hint if needed"],
+  "missing_points": ["Missing concept if any"],
+  "strengths": ["Strength 1", "Strength 2"]
+}
+
+Return ONLY the JSON object. Keep it brief and helpful."""
+
 DEFAULT_QUESTIONS = {
     "brain_teaser": [
         {
@@ -534,47 +747,250 @@ DEFAULT_QUESTIONS = {
 
 class AIService:
     def __init__(self):
-        self.api_url = settings.KIMI_API_URL
+        self.model = settings.KIMI_MODEL
         self.timeout = 300.0  # 300 seconds for Kimi2 671B model
         self.client = httpx.AsyncClient(timeout=self.timeout)
-        self.max_retries = 3
-        self.retry_delay = 2  # seconds
+
+        # Token budget, timeout, temperature and retry policy per operation
+        self.profiles = build_profiles(settings.LLM_PROFILE_OVERRIDES)
+
+        # Rolling latency per operation; attempt timeouts follow observed p99
+        self.latency = LatencyTracker(
+            enabled=settings.LLM_ADAPTIVE_TIMEOUTS,
+            window=settings.LLM_LATENCY_WINDOW,
+            min_samples=settings.LLM_LATENCY_MIN_SAMPLES,
+            p99_factor=settings.LLM_TIMEOUT_P99_FACTOR,
+            floor=settings.LLM_TIMEOUT_FLOOR_SECONDS,
+        )
+
+        # Replicas of the model server; each attempt goes to the least-loaded
+        # healthy one and failing replicas are ejected
+        self.backends = LLMBackendPool(
+            parse_endpoint_urls(settings.KIMI_API_URLS, settings.KIMI_API_URL),
+            failure_threshold=settings.KIMI_ENDPOINT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.KIMI_BREAKER_RECOVERY_SECONDS,
+            half_open_max_calls=settings.KIMI_BREAKER_HALF_OPEN_CALLS,
+        )
+        self.api_url = self.backends.urls[0]
+
+        # Priority lanes in front of the LLM so interactive calls are never
+        # stuck behind a batch of evaluations or question generation.
+        # Capacity scales with the number of replicas.
+        replicas = len(self.backends)
+        self.scheduler = LLMScheduler(
+            total_limit=settings.KIMI_MAX_CONCURRENCY * replicas,
+            lane_limits={
+                LANE_INTERACTIVE: settings.KIMI_INTERACTIVE_CONCURRENCY * replicas,
+                LANE_EVALUATION: settings.KIMI_EVALUATION_CONCURRENCY * replicas,
+                LANE_GENERATION: settings.KIMI_GENERATION_CONCURRENCY * replicas,
+                LANE_ANALYSIS: settings.KIMI_ANALYSIS_CONCURRENCY * replicas,
+            },
+            reserved_interactive=settings.KIMI_INTERACTIVE_RESERVED * replicas,
+        )
+
+        # Content-addressed response cache for deterministic operations
+        self.cache = LLMResponseCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            default_ttl=settings.LLM_CACHE_TTL_SECONDS,
+            db_path=settings.LLM_CACHE_DB_PATH or None,
+        ) if settings.LLM_CACHE_ENABLED else None
+
+        # Identical prompts already in flight share one Kimi2 request
+        self.single_flight = SingleFlight()
+
+        # Fail fast while the Kimi2 endpoint is down instead of pinning every
+        # caller on timeouts and retries
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.KIMI_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.KIMI_BREAKER_RECOVERY_SECONDS,
+            half_open_max_calls=settings.KIMI_BREAKER_HALF_OPEN_CALLS,
+        )
 
         # Initialize knowledge base and resume analyzer
         self.knowledge_base = InterviewKnowledgeBase()
         self.resume_analyzer = ResumeAnalyzer()
 
-        print(f"[AIService] Initialized with API URL: {self.api_url}, timeout: {self.timeout}s")
+        # Static system prompts, built once so every call for an operation
+        # shares the same prefix in the inference server's KV cache
+        self.prompts = PromptPrefixRegistry()
+        self.prompts.register("generate_questions", lambda: GENERATE_QUESTIONS_PREFIX)
+        self.prompts.register("generate_specialization_questions", lambda: SPECIALIZATION_QUESTIONS_PREFIX)
+        self.prompts.register("evaluate_answer", lambda: EVALUATE_ANSWER_PREFIX)
+        self.prompts.register("evaluate_answers_batch", lambda: EVALUATE_ANSWERS_BATCH_PREFIX)
+        self.prompts.register("evaluate_challenge_task", lambda: EVALUATE_CHALLENGE_TASK_PREFIX)
+        self.prompts.register("live_feedback", lambda: LIVE_FEEDBACK_PREFIX)
+        self.prompts.register("candidate_question", self._build_candidate_question_prefix)
+        self.prompts.rebuild()
+
+        print(f"[AIService] Initialized with API URLs: {', '.join(self.backends.urls)}, timeout: {self.timeout}s")
         if self.knowledge_base.loaded:
             print(f"[AIService] Knowledge base loaded with tracks: {self.knowledge_base.get_available_tracks()}")
 
-    async def _call_kimi_with_retry(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
-        """Make a call to the Kimi2 LLM API with retry logic (OpenAI format)."""
-        last_error = None
+    def profile_for(self, operation: str) -> GenerationProfile:
+        """Generation profile for an operation (DEFAULT_PROFILE if it has none)."""
+        return self.profiles.get(operation, DEFAULT_PROFILE)
+
+    async def _call_kimi_with_retry(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        operation: str = "default",
+        cache: Optional[bool] = None,
+        fresh: bool = False,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Make a call to the Kimi2 LLM API with retry logic (OpenAI format).
+
+        Responses for operations listed in the cache policies are served from
+        the response cache when the exact same prompt was answered before.
+        Pass ``cache=True``/``cache=False`` to opt a single call in or out.
+        Only responses the caller can parse are cached: ``validate`` parses
+        the response the way the caller will (default: any JSON payload) and
+        a response it rejects - raising or returning an empty value - is
+        neither stored nor served from the cache.
+        Identical requests of the same operation that are already in flight
+        are coalesced. ``fresh=True`` always makes a new request (neither the
+        cache nor an in-flight call is reused) and replaces the cached
+        response. ``temperature`` defaults to the operation's generation profile.
+        """
+        profile = self.profile_for(operation)
+        if temperature is None:
+            temperature = profile.temperature
+        use_cache = self.cache is not None and (
+            cache if cache is not None else self.cache.is_cacheable(operation)
+        )
+        request_key = make_cache_key(self.model, messages, temperature, operation, profile.max_tokens)
+        validate = validate or self._json_payload
+        if use_cache and not fresh:
+            cached = await self.cache.get(request_key, operation)
+            if cached and self._is_valid_response(cached, validate):
+                print(f"[Kimi2] Cache hit for {operation} ({len(cached)} chars)")
+                return cached
+            if cached:
+                await self.cache.invalidate(request_key)
+
+        if fresh:
+            result = await self._post_with_retry(messages, temperature, operation)
+        else:
+            # Concurrent callers with the same prompt await a single HTTP call
+            result = await self.single_flight.do(
+                request_key,
+                operation,
+                lambda: self._post_with_retry(messages, temperature, operation)
+            )
+
+        # Failures and truncated or malformed output must stay retryable
+        if use_cache and result and self._is_valid_response(result, validate):
+            await self.cache.set(request_key, operation, result)
+        return result
+
+    @staticmethod
+    def _json_payload(response: str) -> Any:
+        """Parse the JSON object or array in a model response, tolerating surrounding text."""
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            match = re.search(r'[\[{].*[\]}]', response, re.DOTALL)
+            if not match:
+                raise
+            return json.loads(match.group())
 
-        for attempt in range(self.max_retries):
+    @staticmethod
+    def _is_valid_response(response: str, validate: Callable[[str], Any]) -> bool:
+        try:
+            return bool(validate(response))
+        except (ValueError, TypeError):
+            return False
+
+    async def _post_with_retry(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        operation: str
+    ) -> str:
+        """POST the chat completion, retrying on errors.
+
+        Each attempt holds a slot in the scheduler lane for ``operation``, so
+        the slot is free for other callers while we back off between retries.
+        Attempts go to the least-loaded healthy replica, and a retry prefers a
+        replica this request has not tried yet.
+        """
+        last_error = None
+        lane = lane_for_operation(operation)
+        profile = self.profile_for(operation)
+        tried: List[str] = []
+        retry_after: Optional[float] = None
+
+        for attempt in range(profile.max_retries):
+            if self.breaker.is_open or not self.backends.has_healthy():
+                print(f"[Kimi2] Circuit breaker open - failing fast for {operation}")
+                self.breaker.record_rejected()
+                return ""
+
+            start_time = time.time()
             try:
                 # Calculate total message content length for logging
                 total_content = sum(len(m.get("content", "")) for m in messages)
-                print(f"[Kimi2] API call attempt {attempt + 1}/{self.max_retries}")
-                print(f"[Kimi2] URL: {self.api_url}, Timeout: {self.timeout}s")
+                print(f"[Kimi2] API call attempt {attempt + 1}/{profile.max_retries} ({operation}, lane: {lane})")
                 print(f"[Kimi2] Messages: {len(messages)}, Total content: {total_content} chars")
 
-                start_time = time.time()
-
-                response = await self.client.post(
-                    self.api_url,
-                    json={
-                        "model": "kimi",
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 4096
-                    },
-                    timeout=self.timeout
-                )
+                async with self.scheduler.slot(lane):
+                    queued = time.time() - start_time
+                    if queued >= 1:
+                        print(f"[Kimi2] Waited {queued:.1f}s in {lane} lane")
+
+                    # The breaker may have tripped while we were queued
+                    if not self.breaker.allow_request():
+                        print(f"[Kimi2] Circuit breaker open - failing fast for {operation}")
+                        return ""
+
+                    endpoint = self.backends.acquire(exclude=tried)
+                    if endpoint is None:
+                        print(f"[Kimi2] No healthy endpoint - failing fast for {operation}")
+                        self.breaker.record_cancelled()
+                        return ""
+                    tried.append(endpoint.url)
+                    timeout = self.latency.timeout_for(operation, profile.timeout)
+                    print(f"[Kimi2] URL: {endpoint.url}, Timeout: {timeout:.1f}s")
+
+                    start_time = time.time()
+                    try:
+                        response = await self.client.post(
+                            endpoint.url,
+                            json={
+                                "model": self.model,
+                                "messages": messages,
+                                "temperature": temperature,
+                                "max_tokens": profile.max_tokens
+                            },
+                            timeout=timeout
+                        )
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as e:
+                        retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                        # Client errors are about the request, not endpoint health
+                        healthy = not (e.response.status_code >= 500 or e.response.status_code == 429)
+                        self.backends.release(endpoint, healthy, time.time() - start_time, e)
+                        if healthy:
+                            self.breaker.record_success()
+                        else:
+                            self.breaker.record_failure(e)
+                        raise
+                    except asyncio.CancelledError:
+                        self.backends.release(endpoint, None)
+                        self.breaker.record_cancelled()
+                        raise
+                    except Exception as e:
+                        if isinstance(e, httpx.TimeoutException):
+                            self.latency.record(operation, time.time() - start_time, timed_out=True)
+                        self.backends.release(endpoint, False, time.time() - start_time, e)
+                        self.breaker.record_failure(e)
+                        raise
+                    self.latency.record(operation, time.time() - start_time)
+                    self.backends.release(endpoint, True, time.time() - start_time)
+                    self.breaker.record_success()
 
                 elapsed = time.time() - start_time
-                response.raise_for_status()
                 data = response.json()
                 result = data.get("choices", [{}])[0].get("message", {}).get("content", "")
                 print(f"[Kimi2] Response received in {elapsed:.1f}s: {len(result)} chars")
@@ -582,20 +998,137 @@ class AIService:
             except httpx.TimeoutException as e:
                 last_error = e
                 elapsed = time.time() - start_time
-                print(f"[Kimi2] TIMEOUT after {elapsed:.1f}s (attempt {attempt + 1}/{self.max_retries}): {e}")
+                print(f"[Kimi2] TIMEOUT after {elapsed:.1f}s (attempt {attempt + 1}/{profile.max_retries}): {e}")
             except httpx.HTTPStatusError as e:
                 last_error = e
-                print(f"[Kimi2] HTTP error (attempt {attempt + 1}/{self.max_retries}): {e}")
+                print(f"[Kimi2] HTTP error (attempt {attempt + 1}/{profile.max_retries}): {e}")
             except Exception as e:
                 last_error = e
-                print(f"[Kimi2] Error (attempt {attempt + 1}/{self.max_retries}): {type(e).__name__}: {e}")
+                print(f"[Kimi2] Error (attempt {attempt + 1}/{profile.max_retries}): {type(e).__name__}: {e}")
 
-            if attempt < self.max_retries - 1:
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
+            # Back off only when the retry would hit a replica we already tried
+            if attempt < profile.max_retries - 1 and not self.backends.has_healthy(exclude=tried):
+                await asyncio.sleep(self._retry_delay(profile, attempt, retry_after))
+            retry_after = None
 
-        print(f"All {self.max_retries} retries failed. Last error: {last_error}")
+        print(f"All {profile.max_retries} retries failed. Last error: {last_error}")
         return ""
 
+    async def _stream_kimi(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        operation: str = "default"
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive.
+
+        Uses the same lanes, breaker and replica pool as _post_with_retry.
+        Attempts are retried only until the first token has been yielded; a
+        stream that breaks after that simply ends early and the caller parses
+        what it received. Streamed calls bypass the response cache.
+        """
+        last_error = None
+        lane = lane_for_operation(operation)
+        profile = self.profile_for(operation)
+        if temperature is None:
+            temperature = profile.temperature
+        tried: List[str] = []
+        retry_after: Optional[float] = None
+
+        for attempt in range(profile.max_retries):
+            if self.breaker.is_open or not self.backends.has_healthy():
+                print(f"[Kimi2] Circuit breaker open - failing fast for {operation} (stream)")
+                self.breaker.record_rejected()
+                return
+
+            yielded = False
+            start_time = time.time()
+            try:
+                async with self.scheduler.slot(lane):
+                    if not self.breaker.allow_request():
+                        print(f"[Kimi2] Circuit breaker open - failing fast for {operation} (stream)")
+                        return
+
+                    endpoint = self.backends.acquire(exclude=tried)
+                    if endpoint is None:
+                        print(f"[Kimi2] No healthy endpoint - failing fast for {operation} (stream)")
+                        self.breaker.record_cancelled()
+                        return
+                    tried.append(endpoint.url)
+                    print(f"[Kimi2] Streaming {operation} from {endpoint.url} (attempt {attempt + 1}/{profile.max_retries})")
+
+                    timeout = self.latency.timeout_for(operation, profile.timeout)
+                    start_time = time.time()
+                    try:
+                        async with self.client.stream(
+                            "POST",
+                            endpoint.url,
+                            json={
+                                "model": self.model,
+                                "messages": messages,
+                                "temperature": temperature,
+                                "max_tokens": profile.max_tokens,
+                                "stream": True
+                            },
+                            timeout=timeout
+                        ) as response:
+                            response.raise_for_status()
+                            async for line in response.aiter_lines():
+                                delta = parse_stream_line(line)
+                                if delta is STREAM_DONE:
+                                    break
+                                if delta:
+                                    if not yielded:
+                                        print(f"[Kimi2] First token for {operation} after {time.time() - start_time:.2f}s")
+                                    yielded = True
+                                    yield delta
+                    except httpx.HTTPStatusError as e:
+                        retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                        healthy = not (e.response.status_code >= 500 or e.response.status_code == 429)
+                        self.backends.release(endpoint, healthy, time.time() - start_time, e)
+                        if healthy:
+                            self.breaker.record_success()
+                        else:
+                            self.breaker.record_failure(e)
+                        raise
+                    except (asyncio.CancelledError, GeneratorExit):
+                        # Client went away mid-stream
+                        self.backends.release(endpoint, None)
+                        self.breaker.record_cancelled()
+                        raise
+                    except Exception as e:
+                        if isinstance(e, httpx.TimeoutException):
+                            self.latency.record(operation, time.time() - start_time, timed_out=True)
+                        self.backends.release(endpoint, False, time.time() - start_time, e)
+                        self.breaker.record_failure(e)
+                        raise
+                    self.latency.record(operation, time.time() - start_time)
+                    self.backends.release(endpoint, True, time.time() - start_time)
+                    self.breaker.record_success()
+
+                print(f"[Kimi2] Stream for {operation} finished in {time.time() - start_time:.1f}s")
+                return
+            except Exception as e:
+                last_error = e
+                print(f"[Kimi2] Stream error (attempt {attempt + 1}/{profile.max_retries}): {type(e).__name__}: {e}")
+                if yielded:
+                    # The caller already has part of the answer; a retry would repeat it
+                    return
+
+            if attempt < profile.max_retries - 1 and not self.backends.has_healthy(exclude=tried):
+                await asyncio.sleep(self._retry_delay(profile, attempt, retry_after))
+            retry_after = None
+
+        print(f"All {profile.max_retries} stream attempts failed. Last error: {last_error}")
+
+    def _retry_delay(self, profile: GenerationProfile, attempt: int, retry_after: Optional[float]) -> float:
+        """Jittered exponential backoff, stretched to honour a server's Retry-After."""
+        delay = backoff_delay(attempt, profile.retry_delay, settings.LLM_BACKOFF_MAX_SECONDS)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, settings.LLM_RETRY_AFTER_MAX_SECONDS))
+            print(f"[Kimi2] Server asked to retry after {retry_after:.1f}s")
+        return delay
+
     def analyze_resume_difficulty(self, resume_text: str, skills: List[str] = None) -> Dict[str, Any]:
         """
         Analyze resume to determine appropriate difficulty level.
@@ -705,7 +1238,7 @@ Example output: ["Python", "FastAPI", "PostgreSQL", "AWS", "Machine Learning", "
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="extract_skills")
 
         if not response:
             return []
@@ -731,9 +1264,28 @@ Example output: ["Python", "FastAPI", "PostgreSQL", "AWS", "Machine Learning", "
         difficulty: str,
         skills: List[str],
         resume_text: Optional[str] = None,
-        track_id: Optional[str] = None
+        track_id: Optional[str] = None,
+        on_category: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None,
+        question_source: Optional[QuestionSource] = None,
+        question_filter: Optional[QuestionFilter] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Generate personalized test questions based on candidate profile."""
+        """Generate personalized test questions based on candidate profile.
+
+        If ``on_category`` is given it is awaited with (category, questions) as
+        each category completes - one at a time, in completion order - so the
+        caller can persist sections without waiting for the slowest one.
+
+        ``question_source(category, difficulty, track_id, count)`` is asked
+        first for every category that would otherwise go to the LLM (e.g. the
+        pre-generated pool in app/services/question_pool.py); categories it
+        returns None for are generated live.
+
+        ``question_filter(category, questions)`` screens live-generated
+        questions (e.g. near-duplicate rejection in
+        app/services/question_similarity.py); a category that loses questions
+        to it is generated once more, and padded with the rejected ones if it
+        is still short.
+        """
 
         # Auto-detect difficulty if resume provided
         if resume_text and difficulty == "auto":
@@ -741,29 +1293,10 @@ Example output: ["Python", "FastAPI", "PostgreSQL", "AWS", "Machine Learning", "
             difficulty = analysis["difficulty"]
             print(f"[AIService] Auto-detected difficulty: {difficulty} (confidence: {analysis['confidence']:.2f})")
 
-        # Map difficulty to difficulty level
-        difficulty_map = {"easy": "junior", "medium": "mid", "hard": "senior"}
-        difficulty_label = difficulty_map.get(difficulty, difficulty)
-
-        category_prompts = {
-            "brain_teaser": "Logic puzzles and problem-solving questions that test analytical thinking",
-            "coding": "Programming challenges that require writing code to solve problems",
-            "code_review": "Buggy code snippets that need to be identified and fixed",
-            "system_design": "Architecture and system design questions",
-            "signal_processing": "Digital signal processing questions (filters, FFT, DSP algorithms)",
-            "general_engineering": "General software engineering concepts: algorithms, data structures, design patterns, testing strategies, debugging approaches, version control, APIs, databases, and software development best practices"
-        }
-
-        difficulty_guidance = {
-            "junior": "Entry-level questions suitable for 0-2 years experience. Focus on fundamentals.",
-            "mid": "Intermediate questions for 2-5 years experience. Include some complexity.",
-            "senior": "Advanced questions for 5+ years experience. Focus on architecture, optimization, and edge cases.",
-            "easy": "Entry-level questions suitable for 0-2 years experience. Focus on fundamentals.",
-            "medium": "Intermediate questions for 2-5 years experience. Include some complexity.",
-            "hard": "Advanced questions for 5+ years experience. Focus on architecture, optimization, and edge cases."
-        }
+        category_prompts = QUESTION_CATEGORY_PROMPTS
 
         questions_by_category = {}
+        llm_requests = []  # (category, num_questions, messages) to generate concurrently
 
         # Try to get questions from knowledge base first for relevant categories
         kb_questions = self.get_questions_from_knowledge_base(
@@ -811,95 +1344,157 @@ Example output: ["Python", "FastAPI", "PostgreSQL", "AWS", "Machine Learning", "
                     } for q in matching_kb[:num_questions]]
                     continue
 
-            # Build rubric context if we have track-specific questions
-            rubric_context = ""
-            if track_id:
-                track_questions = self.knowledge_base.get_track_questions(track_id, difficulty)
-                if track_questions:
-                    sample_q = track_questions[0]
-                    rubric_context = f"\n\nUse this rubric structure for evaluation:\n{self.knowledge_base.format_rubric_for_prompt(sample_q)}"
+            if question_source:
+                pooled = await question_source(category, difficulty, track_id, num_questions)
+                if pooled:
+                    questions_by_category[category] = pooled
+                    continue
 
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"""You are an expert technical interviewer creating assessment questions for KOS AI.
+            messages = self._category_question_messages(
+                category, difficulty, num_questions, skills, track_id, resume_text
+            )
+            llm_requests.append((category, num_questions, messages))
+
+        # Knowledge base and pooled sections are ready immediately
+        if on_category:
+            for category, questions in questions_by_category.items():
+                await on_category(category, questions)
+
+        # Categories are independent - generate them concurrently (bounded fan-out)
+        # so test creation takes as long as the slowest category, not the sum
+        if llm_requests:
+            fanout = asyncio.Semaphore(max(1, settings.QUESTION_GENERATION_FANOUT))
+
+            async def generate_filtered(category: str, num_questions: int, messages: List[Dict[str, str]]):
+                questions = await self._generate_category_questions(category, num_questions, messages)
+                if not question_filter:
+                    return questions
+                wanted = min(num_questions, len(questions))
+                accepted = await question_filter(category, questions)
+                if len(accepted) < wanted:
+                    print(f"[AIService] {wanted - len(accepted)} {category} questions rejected, generating replacements")
+                    extra = await self._generate_category_questions(category, num_questions, messages)
+                    accepted += await question_filter(category, extra)
+                if len(accepted) < wanted:
+                    # Better a familiar question than a short section
+                    accepted_texts = {q.get("question_text") for q in accepted}
+                    accepted += [q for q in questions if q.get("question_text") not in accepted_texts]
+                return accepted[:num_questions]
+
+            async def generate_bounded(category: str, num_questions: int, messages: List[Dict[str, str]]):
+                try:
+                    async with fanout:
+                        questions = await generate_filtered(category, num_questions, messages)
+                except Exception as e:
+                    print(f"[AIService] Error generating {category} questions, using defaults: {e}")
+                    questions = DEFAULT_QUESTIONS.get(category, [])[:num_questions]
+                return category, questions
+
+            print(f"[AIService] Generating {len(llm_requests)} categories concurrently: {[r[0] for r in llm_requests]}")
+            tasks = [asyncio.ensure_future(generate_bounded(*request)) for request in llm_requests]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    category, questions = await next_done
+                    questions_by_category[category] = questions
+                    if on_category:
+                        await on_category(category, questions)
+            finally:
+                # A failing callback must not leave orphaned generations running
+                for task in tasks:
+                    task.cancel()
 
-{KOS_COMPANY_CONTEXT}
+        # Keep the caller's category order
+        return {c: questions_by_category[c] for c in categories if c in questions_by_category}
+
+    def _category_question_messages(
+        self,
+        category: str,
+        difficulty: str,
+        num_questions: int,
+        skills: List[str],
+        track_id: Optional[str] = None,
+        resume_text: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Prompt asking for ``num_questions`` questions of one category."""
+        # Map difficulty to difficulty level
+        difficulty_map = {"easy": "junior", "medium": "mid", "hard": "senior"}
+        difficulty_label = difficulty_map.get(difficulty, difficulty)
 
-Category: {category_prompts.get(category, category)}
-Difficulty: {difficulty_guidance.get(difficulty_label, difficulty)}
+        # Build rubric context if we have track-specific questions
+        rubric_context = ""
+        if track_id:
+            track_questions = self.knowledge_base.get_track_questions(track_id, difficulty)
+            if track_questions:
+                sample_q = track_questions[0]
+                rubric_context = f"\n\nUse this rubric structure for evaluation:\n{self.knowledge_base.format_rubric_for_prompt(sample_q)}"
+
+        # Static instructions first (shared KV prefix), request specifics last
+        return self.prompts.messages(
+            "generate_questions",
+            f"""Category: {QUESTION_CATEGORY_PROMPTS.get(category, category)}
+Difficulty: {QUESTION_DIFFICULTY_GUIDANCE.get(difficulty_label, difficulty)}
 Candidate Skills: {', '.join(skills) if skills else 'General'}
 {f'Engineer Track: {track_id}' if track_id else ''}
 {rubric_context}
 
-Generate {num_questions} questions for this category. Questions should be relevant to KOS AI's work when the category allows:
-- For signal_processing: Focus on PPG, biomedical signals, motion artifact removal, multi-wavelength analysis
-- For system_design: Consider real-time embedded systems, HIPAA compliance, BLE protocols, edge ML
-- For coding: Include problems related to signal processing, time-series data, or embedded constraints
-- For brain_teaser: Use scenarios involving sensors, signals, or health-tech concepts
-- For code_review: Include code with issues common in embedded/signal processing contexts
-
-Return a JSON array of question objects with this structure:
-{{
-  "question_text": "The question prompt",
-  "question_code": "Code snippet if applicable (for coding/code_review), null otherwise",
-  "expected_answer": "Brief description of expected answer or solution approach",
-  "hints": ["Hint 1", "Hint 2"]
-}}
-
-UX 3 FIX - HINT GUIDELINES:
-- Hints should be DIRECTIONAL, not revealing (guide thinking, don't give answers)
-- Good hints: "Consider X", "Think about Y", "What happens when Z?"
-- Bad hints: "The answer is X", "Use Y formula", "The solution involves Z"
-- Hints should help a stuck candidate take one step forward
-- 1-2 hints per question is ideal, keep them SHORT (1 sentence each)
+Generate {num_questions} {difficulty} level {category} questions."""
+            + (f"\n\nCandidate background:\n{resume_text[:2000]}" if resume_text else "")
+        )
 
-Return ONLY the JSON array, no other text."""
-                },
-                {
-                    "role": "user",
-                    "content": f"Generate {num_questions} {difficulty} level {category} questions."
-                    + (f"\n\nCandidate background:\n{resume_text[:2000]}" if resume_text else "")
-                }
-            ]
+    async def _generate_category_questions(
+        self,
+        category: str,
+        num_questions: int,
+        messages: List[Dict[str, str]],
+        operation: str = "generate_questions",
+        use_defaults: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Generate questions for one category, falling back to DEFAULT_QUESTIONS
+        (or an empty list when ``use_defaults`` is False)."""
+        response = await self._call_kimi_with_retry(messages, operation=operation)
+        fallback = DEFAULT_QUESTIONS.get(category, [])[:num_questions] if use_defaults else []
 
-            response = await self._call_kimi_with_retry(messages, temperature=0.7)
+        if not response:
+            print(f"Using default questions for category: {category}")
+            return fallback
 
-            if not response:
-                print(f"Using default questions for category: {category}")
-                if category in DEFAULT_QUESTIONS:
-                    questions_by_category[category] = DEFAULT_QUESTIONS[category][:num_questions]
-                else:
-                    questions_by_category[category] = []
-                continue
+        try:
+            questions = json.loads(response)
+            if isinstance(questions, list) and len(questions) > 0:
+                return questions
+            return fallback
+        except json.JSONDecodeError:
+            match = re.search(r'\[.*\]', response, re.DOTALL)
+            if match:
+                try:
+                    questions = json.loads(match.group())
+                    if isinstance(questions, list) and len(questions) > 0:
+                        return questions
+                except:
+                    pass
 
-            try:
-                questions = json.loads(response)
-                if isinstance(questions, list) and len(questions) > 0:
-                    questions_by_category[category] = questions
-                else:
-                    if category in DEFAULT_QUESTIONS:
-                        questions_by_category[category] = DEFAULT_QUESTIONS[category][:num_questions]
-                    else:
-                        questions_by_category[category] = []
-            except json.JSONDecodeError:
-                match = re.search(r'\[.*\]', response, re.DOTALL)
-                if match:
-                    try:
-                        questions = json.loads(match.group())
-                        if isinstance(questions, list) and len(questions) > 0:
-                            questions_by_category[category] = questions
-                            continue
-                    except:
-                        pass
+            print(f"Failed to parse AI response for {category}, using defaults")
+            return fallback
 
-                print(f"Failed to parse AI response for {category}, using defaults")
-                if category in DEFAULT_QUESTIONS:
-                    questions_by_category[category] = DEFAULT_QUESTIONS[category][:num_questions]
-                else:
-                    questions_by_category[category] = []
+    async def generate_pool_questions(
+        self,
+        category: str,
+        difficulty: str,
+        track_id: Optional[str],
+        count: int
+    ) -> List[Dict[str, Any]]:
+        """Generate candidate-independent questions to stock the question pool.
 
-        return questions_by_category
+        Runs as the low-priority "refill_question_pool" operation and returns
+        an empty list (never DEFAULT_QUESTIONS) when generation fails.
+        """
+        if category not in QUESTION_CATEGORY_PROMPTS:
+            return []
+        messages = self._category_question_messages(category, difficulty, count, [], track_id)
+        questions = await self._generate_category_questions(
+            category, count, messages, operation="refill_question_pool", use_defaults=False
+        )
+        return [q for q in questions if isinstance(q, dict) and q.get("question_text")]
 
     async def generate_specialization_questions(
         self,
@@ -931,42 +1526,17 @@ Return ONLY the JSON array, no other text."""
             "senior": "Advanced questions for 5+ years experience. Focus on deep expertise and edge cases."
         }
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are an expert technical interviewer creating assessment questions for KOS AI.
-
-Generate 5 expert-level {track_name} questions for a technical assessment.
-
-Track: {track_name}
+        messages = self.prompts.messages(
+            "generate_specialization_questions",
+            f"""Track: {track_name}
 Description: {track_config.get('description', '')}
 Topics to cover: {', '.join(question_topics)}
 Difficulty: {difficulty_guidance.get(difficulty, difficulty_guidance['mid'])}
 
-Each question should test deep expertise in {track_name}. The questions should be:
-- Specific to the {track_name} domain
-- Challenging enough to differentiate specialists from generalists
-- Cover different aspects from the topics list
-- Include real-world scenarios when possible
-
-Return a JSON array of 5 question objects with this structure:
-{{
-  "question_text": "The question prompt",
-  "question_code": "Code snippet if applicable, null otherwise",
-  "expected_answer": "Brief description of expected answer or solution approach",
-  "hints": ["Hint 1", "Hint 2"],
-  "max_score": 100
-}}
-
-Return ONLY the JSON array, no other text."""
-            },
-            {
-                "role": "user",
-                "content": f"Generate 5 expert-level {track_name} questions covering: {', '.join(question_topics)}"
-            }
-        ]
+Generate 5 expert-level {track_name} questions covering: {', '.join(question_topics)}"""
+        )
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.7)
+        response = await self._call_kimi_with_retry(messages, operation="generate_specialization_questions")
 
         if not response:
             print(f"[AIService] Failed to generate specialization questions for {track_id}")
@@ -1005,62 +1575,29 @@ Return ONLY the JSON array, no other text."""
         category: str,
         difficulty: str,
         rubric: Optional[Dict] = None,
-        track_id: Optional[str] = None
+        track_id: Optional[str] = None,
+        operation: str = "evaluate_answer",
+        fresh: bool = False
     ) -> Dict[str, Any]:
-        """Evaluate a candidate's answer using AI with optional rubric."""
+        """Evaluate a candidate's answer using AI with optional rubric.
 
-        # Build rubric context
-        rubric_context = ""
-        if rubric:
-            rubric_context = "\n\nScoring Rubric (10 points total):\n"
-            for cat_name, details in rubric.items():
-                points = details.get("points", 0)
-                rubric_context += f"\n{cat_name.replace('_', ' ').title()} ({points} points):\n"
-                for criterion in details.get("criteria", []):
-                    desc = criterion.get("description", "")
-                    pts = criterion.get("points", 0)
-                    rubric_context += f"  - {desc} ({pts} pt{'s' if pts != 1 else ''})\n"
-            rubric_context += "\nScore the answer against each criterion and sum for total."
+        ``operation`` selects the scheduler lane and profile; speculative draft
+        scoring passes "speculative_evaluate_answer" to run at lowest priority.
+        ``fresh=True`` re-scores instead of reusing a cached evaluation.
+        When the answer cannot be scored, a neutral placeholder evaluation with
+        ``manual_review=True`` is returned.
+        """
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are an expert technical interviewer evaluating candidate responses.
+        rubric_context = self._format_rubric(rubric)
 
-Category: {category}
+        messages = self.prompts.messages(
+            "evaluate_answer",
+            f"""Category: {category}
 Difficulty Level: {difficulty}
 {f'Engineer Track: {track_id}' if track_id else ''}
 {rubric_context}
 
-Evaluate the candidate's answer and provide:
-1. A score from 0-100 (or 0-10 if using rubric, then multiply by 10)
-2. Detailed feedback explaining the score
-3. What was good about the answer
-4. What could be improved
-{f'5. Breakdown of points per rubric category' if rubric else ''}
-
-Return a JSON object:
-{{
-  "score": <number 0-100>,
-  "feedback": "Detailed feedback",
-  "strengths": ["What was good"],
-  "improvements": ["What could be better"],
-  {'"rubric_scores": {"category_name": points},' if rubric else ''}
-  "meets_passing_threshold": <true if score >= 70>
-}}
-
-Be fair but rigorous. Consider:
-- Correctness of the solution
-- Code quality (if applicable)
-- Problem-solving approach
-- Communication clarity
-- Edge case handling
-
-Return ONLY the JSON object."""
-            },
-            {
-                "role": "user",
-                "content": f"""Question: {question_text}
+Question: {question_text}
 {f'Question Code: {question_code}' if question_code else ''}
 
 Expected Answer: {expected_answer}
@@ -1069,19 +1606,12 @@ Candidate's Answer: {candidate_answer}
 {f'Candidate Code: {candidate_code}' if candidate_code else ''}
 
 Evaluate this response."""
-            }
-        ]
+        )
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation=operation, fresh=fresh)
 
         if not response:
-            return {
-                "score": 50,
-                "feedback": "Unable to evaluate automatically. Manual review required.",
-                "strengths": [],
-                "improvements": [],
-                "meets_passing_threshold": False
-            }
+            return self._manual_review_evaluation()
 
         try:
             evaluation = json.loads(response)
@@ -1099,13 +1629,156 @@ Evaluate this response."""
                     return evaluation
                 except:
                     pass
-            return {
-                "score": 50,
-                "feedback": "Unable to evaluate automatically. Manual review required.",
-                "strengths": [],
-                "improvements": [],
-                "meets_passing_threshold": False
-            }
+            return self._manual_review_evaluation()
+
+    @staticmethod
+    def _manual_review_evaluation() -> Dict[str, Any]:
+        """Neutral placeholder for an answer that could not be scored automatically."""
+        return {
+            "score": 50,
+            "feedback": "Unable to evaluate automatically. Manual review required.",
+            "strengths": [],
+            "improvements": [],
+            "meets_passing_threshold": False,
+            "manual_review": True
+        }
+
+    def _format_rubric(self, rubric: Optional[Dict]) -> str:
+        """Render a knowledge-base rubric as prompt text ("" when there is none)."""
+        if not rubric:
+            return ""
+        rubric_context = "\n\nScoring Rubric (10 points total):\n"
+        for cat_name, details in rubric.items():
+            points = details.get("points", 0)
+            rubric_context += f"\n{cat_name.replace('_', ' ').title()} ({points} points):\n"
+            for criterion in details.get("criteria", []):
+                desc = criterion.get("description", "")
+                pts = criterion.get("points", 0)
+                rubric_context += f"  - {desc} ({pts} pt{'s' if pts != 1 else ''})\n"
+        rubric_context += "\nScore the answer against each criterion and sum for total."
+        return rubric_context
+
+    async def evaluate_answers_batch(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Evaluate several answers with one LLM call per chunk instead of one per answer.
+
+        Each item takes the same keyword arguments as evaluate_answer
+        (question_text, question_code, expected_answer, candidate_answer,
+        candidate_code, category, difficulty, optional rubric and track_id).
+        Items are sent in chunks of LLM_BATCH_EVALUATION_SIZE; at most
+        ``concurrency`` chunks (default LLM_EVALUATION_FANOUT) are in flight
+        at once. Any item whose result is missing or unparseable in an
+        otherwise parsed batch response is re-evaluated on its own with
+        evaluate_answer, under the same fan-out limit. When the batch call
+        fails outright (no response, e.g. the breaker is open) every item in
+        the chunk gets the manual-review placeholder instead.
+        ``fresh=True`` bypasses the response cache (re-evaluation).
+
+        Returns one evaluation dict per item, in input order.
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            return [await self.evaluate_answer(**items[0], fresh=fresh)]
+
+        size = max(1, settings.LLM_BATCH_EVALUATION_SIZE)
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        fanout = asyncio.Semaphore(max(1, concurrency or settings.LLM_EVALUATION_FANOUT))
+
+        print(f"[AIService] Batch evaluating {len(items)} answers in {len(chunks)} call(s)")
+        results = await asyncio.gather(*(self._evaluate_chunk(chunk, fanout, fresh) for chunk in chunks))
+        return [evaluation for chunk_result in results for evaluation in chunk_result]
+
+    async def _evaluate_chunk(
+        self,
+        items: List[Dict[str, Any]],
+        fanout: asyncio.Semaphore,
+        fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """One batched evaluation call, with per-item fallback to evaluate_answer.
+
+        Every LLM call made here - the batch call and each fallback - holds a
+        ``fanout`` slot; the slot is released between them so fallbacks cannot
+        deadlock behind their own chunk.
+        """
+        parts = []
+        for index, item in enumerate(items, start=1):
+            parts.append(f"""### Answer {index}
+Category: {item.get('category')}
+Difficulty Level: {item.get('difficulty')}
+{f"Engineer Track: {item['track_id']}" if item.get('track_id') else ''}{self._format_rubric(item.get('rubric'))}
+
+Question: {item.get('question_text')}
+{f"Question Code: {item['question_code']}" if item.get('question_code') else ''}
+
+Expected Answer: {item.get('expected_answer') or ''}
+
+Candidate's Answer: {item.get('candidate_answer') or ''}
+{f"Candidate Code: {item['candidate_code']}" if item.get('candidate_code') else ''}""")
+
+        messages = self.prompts.messages(
+            "evaluate_answers_batch",
+            "\n\n".join(parts) + f"\n\nEvaluate all {len(items)} answers."
+        )
+        async with fanout:
+            response = await self._call_kimi_with_retry(
+                messages, operation="evaluate_answers_batch", fresh=fresh, validate=self._parse_json_array
+            )
+
+        if not response:
+            # The endpoint is down or the breaker is open - per-item calls would fail the same way
+            print(f"[AIService] Batch evaluation failed, marking {len(items)} items for manual review")
+            return [self._manual_review_evaluation() for _ in items]
+
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for entry in self._parse_json_array(response):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                entry_id = int(entry.get("id"))
+                entry["score"] = float(entry["score"])
+            except (TypeError, ValueError, KeyError):
+                continue
+            entry.pop("id", None)
+            entry.setdefault("feedback", "")
+            entry.setdefault("strengths", [])
+            entry.setdefault("improvements", [])
+            entry.setdefault("meets_passing_threshold", entry["score"] >= 70)
+            by_id[entry_id] = entry
+
+        missing = [index for index in range(1, len(items) + 1) if index not in by_id]
+        if missing:
+            print(f"[AIService] Batch evaluation missing {len(missing)}/{len(items)} items, evaluating them individually")
+
+            async def evaluate_single(item: Dict[str, Any]) -> Dict[str, Any]:
+                async with fanout:
+                    return await self.evaluate_answer(**item, fresh=fresh)
+
+            fallbacks = await asyncio.gather(*(evaluate_single(items[index - 1]) for index in missing))
+            by_id.update(zip(missing, fallbacks))
+
+        return [by_id[index] for index in range(1, len(items) + 1)]
+
+    def _parse_json_array(self, response: str) -> List[Any]:
+        """Parse a JSON array from a model response, tolerating surrounding text."""
+        if not response:
+            return []
+        try:
+            parsed = json.loads(response)
+            return parsed if isinstance(parsed, list) else []
+        except json.JSONDecodeError:
+            match = re.search(r'\[.*\]', response, re.DOTALL)
+            if match:
+                try:
+                    parsed = json.loads(match.group())
+                    return parsed if isinstance(parsed, list) else []
+                except json.JSONDecodeError:
+                    pass
+        return []
 
     async def answer_candidate_question(
         self,
@@ -1117,7 +1790,44 @@ Evaluate this response."""
         Answer a candidate's question during the interview.
         Can explain technical terms, clarify questions, or provide hints.
         """
+        kb_answer = self._knowledge_base_answer(candidate_question)
+        if kb_answer:
+            return kb_answer
+
+        messages = self._candidate_question_messages(candidate_question, context, track_id)
+        response = await self._call_kimi_with_retry(messages, operation="candidate_question")
+        return self._parse_candidate_answer(response)
+
+    async def stream_candidate_question(
+        self,
+        candidate_question: str,
+        context: Optional[str] = None,
+        track_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of answer_candidate_question.
 
+        Yields ``{"event": "answer", "data": {"text": ...}}`` with the answer
+        text decoded so far as tokens arrive, then one ``result`` event with the
+        same payload answer_candidate_question returns.
+        """
+        kb_answer = self._knowledge_base_answer(candidate_question)
+        if kb_answer:
+            yield {"event": "result", "data": kb_answer}
+            return
+
+        messages = self._candidate_question_messages(candidate_question, context, track_id)
+        response = ""
+        shown = ""
+        async for delta in self._stream_kimi(messages, operation="candidate_question"):
+            response += delta
+            partial = partial_json_string(response, "answer")
+            if partial and partial != shown:
+                yield {"event": "answer", "data": {"text": partial}}
+                shown = partial
+        yield {"event": "result", "data": self._parse_candidate_answer(response)}
+
+    def _knowledge_base_answer(self, candidate_question: str) -> Optional[Dict[str, Any]]:
+        """Answer "what is X" style questions straight from the knowledge base."""
         # First check if this is asking about a term we know
         # Look for patterns like "what is X", "what does X mean", "explain X"
         term_patterns = [
@@ -1140,7 +1850,25 @@ Evaluate this response."""
                         "related_terms": []
                     }
 
-        # Build context with terminology for AI
+        return None
+
+    def _candidate_question_messages(
+        self,
+        candidate_question: str,
+        context: Optional[str],
+        track_id: Optional[str]
+    ) -> List[Dict[str, str]]:
+        return self.prompts.messages(
+            "candidate_question",
+            f"""Candidate's question: {candidate_question}
+{f'Current question context: {context}' if context else ''}
+{f'Candidate is on track: {track_id}' if track_id else ''}
+
+Please help the candidate."""
+        )
+
+    def _build_candidate_question_prefix(self) -> str:
+        """Static Q&A system prompt, including knowledge-base terminology."""
         terminology_context = "Technical terms you can reference:\n"
         all_terms = self.knowledge_base.get_all_terminology()
         for term_key, term_data in list(all_terms.items())[:15]:  # Limit to 15 terms
@@ -1148,10 +1876,7 @@ Evaluate this response."""
             definition = (term_data.get('definition') or '')[:100]
             terminology_context += f"- {term}: {definition}...\n"
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are a helpful technical interview assistant at KOS AI.
+        return f"""You are a helpful technical interview assistant at KOS AI.
 A candidate is asking a question during their interview. Help them understand concepts without giving away answers.
 
 {KOS_COMPANY_CONTEXT}
@@ -1173,19 +1898,8 @@ Return a JSON object:
 }}
 
 Return ONLY the JSON object."""
-            },
-            {
-                "role": "user",
-                "content": f"""Candidate's question: {candidate_question}
-{f'Current question context: {context}' if context else ''}
-{f'Candidate is on track: {track_id}' if track_id else ''}
-
-Please help the candidate."""
-            }
-        ]
-
-        response = await self._call_kimi_with_retry(messages, temperature=0.5)
 
+    def _parse_candidate_answer(self, response: str) -> Dict[str, Any]:
         if not response:
             return {
                 "answer": "I'd be happy to help! Could you rephrase your question?",
@@ -1265,7 +1979,7 @@ Generate a comprehensive assessment report."""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.5)
+        response = await self._call_kimi_with_retry(messages, operation="generate_report")
 
         avg_score = sum(section_scores.values()) / len(section_scores) if section_scores else 0
         if avg_score >= 85:
@@ -1358,7 +2072,7 @@ Which track should this candidate take?"""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="determine_track")
 
         if not response:
             # Default to LLM track if unable to determine
@@ -1390,12 +2104,9 @@ Which track should this candidate take?"""
 
         requirements_text = "\n".join(f"- {req}" for req in task_requirements)
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are an expert technical interviewer evaluating a candidate's challenge response.
-
-Track: {track}
+        messages = self.prompts.messages(
+            "evaluate_challenge_task",
+            f"""Track: {track}
 Difficulty Level: {difficulty}
 
 Task: {task_title}
@@ -1404,49 +2115,23 @@ Description: {task_description}
 Requirements:
 {requirements_text}
 
-Evaluate the candidate's response against each requirement. Consider:
-- Technical accuracy and depth
-- Completeness of the solution
-- Quality of explanation
-- Code quality (if applicable)
-- Practical applicability
-- Innovation and creativity
-
-Return a JSON object:
-{{
-  "score": <number 0-100>,
-  "feedback": "Detailed feedback",
-  "requirement_scores": {{
-    "requirement_1": <0-100>,
-    ...
-  }},
-  "strengths": ["What was good"],
-  "improvements": ["What could be better"]
-}}
-
-Be fair but rigorous. This is a real-world challenge that will be discussed in a presentation.
-
-Return ONLY the JSON object."""
-            },
-            {
-                "role": "user",
-                "content": f"""Candidate's Response:
+Candidate's Response:
 {candidate_response}
 
 {"Candidate Code:" + chr(10) + candidate_code if candidate_code else ""}
 
 Evaluate this response against the task requirements."""
-            }
-        ]
+        )
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="evaluate_challenge_task")
 
         if not response:
             return {
                 "score": 50,
                 "feedback": "Unable to evaluate automatically. Manual review required.",
                 "strengths": [],
-                "improvements": []
+                "improvements": [],
+                "manual_review": True
             }
 
         try:
@@ -1463,7 +2148,8 @@ Evaluate this response against the task requirements."""
                 "score": 50,
                 "feedback": "Unable to evaluate automatically. Manual review required.",
                 "strengths": [],
-                "improvements": []
+                "improvements": [],
+                "manual_review": True
             }
 
     async def generate_challenge_presentation(
@@ -1546,7 +2232,7 @@ Generate the presentation slides."""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.5)
+        response = await self._call_kimi_with_retry(messages, operation="generate_presentation")
 
         if not response:
             # Return basic presentation structure
@@ -1612,42 +2298,60 @@ Generate the presentation slides."""
                 "status": "too_short"
             }
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are a helpful mentor providing real-time feedback on a candidate's answer.
-Your goal is to GUIDE, not GRADE. Be encouraging and constructive.
-
-Category: {category}
-
-IMPORTANT - UX 2 FIX: First assess the answer quality:
-- EXCELLENT (80%+ of key concepts, deep understanding): Praise them! Return mostly STRENGTHS, minimal/no hints.
-- GOOD (50-80% coverage): Balanced feedback with both strengths and gentle guidance.
-- NEEDS WORK (<50%): Focus on constructive hints to guide improvement.
+        messages = self._live_feedback_messages(
+            question_text, question_code, expected_answer, candidate_answer, candidate_code, category
+        )
+        # Use lower temperature for more consistent feedback
+        response = await self._call_kimi_with_retry(messages, operation="live_feedback")
+        return self._parse_live_feedback(response)
 
-For EXCELLENT answers, say things like "Excellent coverage!", "Great approach!", "You've nailed the key concepts!"
-Do NOT give unnecessary hints for already strong answers - it can be discouraging.
+    async def stream_live_feedback(
+        self,
+        question_text: str,
+        question_code: Optional[str],
+        expected_answer: str,
+        candidate_answer: str,
+        candidate_code: Optional[str],
+        category: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of generate_live_feedback.
 
-Provide quick, actionable feedback:
-1. STRENGTHS: What's good about the answer (ALWAYS include if answer has any merit)
-2. HINTS: Subtle suggestions to improve (ONLY if genuinely needed - skip for excellent answers)
-3. MISSING: Key points to address (ONLY if significant gaps exist)
+        Yields ``{"event": "delta", "data": {"text": ...}}`` for each chunk the
+        model produces, then one ``result`` event with the parsed feedback.
+        """
+        # Skip if answer is too short
+        if len(candidate_answer.strip()) < 20 and not candidate_code:
+            yield {"event": "result", "data": {
+                "hints": [],
+                "missing_points": [],
+                "strengths": [],
+                "status": "too_short"
+            }}
+            return
 
-Keep feedback SHORT (1 sentence each). Be encouraging.
-Do NOT give away the answer directly - just guide them.
+        messages = self._live_feedback_messages(
+            question_text, question_code, expected_answer, candidate_answer, candidate_code, category
+        )
+        response = ""
+        async for delta in self._stream_kimi(messages, operation="live_feedback"):
+            response += delta
+            yield {"event": "delta", "data": {"text": delta}}
+        yield {"event": "result", "data": self._parse_live_feedback(response)}
 
-Return a JSON object:
-{{
-  "hints": ["Short hint if needed"],
-  "missing_points": ["Missing concept if any"],
-  "strengths": ["Strength 1", "Strength 2"]
-}}
+    def _live_feedback_messages(
+        self,
+        question_text: str,
+        question_code: Optional[str],
+        expected_answer: str,
+        candidate_answer: str,
+        candidate_code: Optional[str],
+        category: str
+    ) -> List[Dict[str, str]]:
+        return self.prompts.messages(
+            "live_feedback",
+            f"""Category: {category}
 
-Return ONLY the JSON object. Keep it brief and helpful."""
-            },
-            {
-                "role": "user",
-                "content": f"""Question: {question_text}
+Question: {question_text}
 {f'Code Context: {question_code[:500]}' if question_code else ''}
 
 Expected topics: {expected_answer[:300]}
@@ -1656,12 +2360,9 @@ Current Answer: {candidate_answer[:1000]}
 {f'Current Code: {candidate_code[:500]}' if candidate_code else ''}
 
 Provide brief, encouraging feedback."""
-            }
-        ]
-
-        # Use lower temperature for more consistent feedback
-        response = await self._call_kimi_with_retry(messages, temperature=0.4)
+        )
 
+    def _parse_live_feedback(self, response: str) -> Dict[str, Any]:
         if not response:
             return {
                 "hints": [],
@@ -1795,7 +2496,7 @@ Analyze this suggestion."""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="analyze_suggestion")
 
         # Default fallback response
         fallback = {
@@ -2023,6 +2724,7 @@ Please review the original feedback and take appropriate action."""
 
             # Reload knowledge base in memory
             self.knowledge_base._load_knowledge_base()
+            self.prompts.rebuild("candidate_question")
 
             return {
                 "success": True,
@@ -2158,7 +2860,7 @@ Provide a role fit recommendation."""
                 }
             ]
 
-            response = await self._call_kimi_with_retry(messages, temperature=0.5)
+            response = await self._call_kimi_with_retry(messages, operation="role_fit")
 
             if response:
                 try:
@@ -2288,7 +2990,7 @@ Please analyze this candidate and provide your assessment as JSON."""
         ]
 
         # Call Kimi2
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="analyze_application")
 
         if not response:
             print("[AIService] Empty response from Kimi2 for application analysis")
@@ -2529,7 +3231,7 @@ Return ONLY the JSON array, no other text."""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.7)
+        response = await self._call_kimi_with_retry(messages, operation="generate_specialization_test")
 
         if not response:
             print(f"[AIService] Failed to generate specialization test questions for {focus_area}")
@@ -2705,7 +3407,7 @@ Identify their exact sub-specialty within {focus_area}."""
             }
         ]
 
-        response = await self._call_kimi_with_retry(messages, temperature=0.3)
+        response = await self._call_kimi_with_retry(messages, operation="analyze_specialization")
 
         if not response:
             print(f"[AIService] Failed to analyze specialization results")
@@ -2773,6 +3475,8 @@ Identify their exact sub-specialty within {focus_area}."""
 
     async def close(self):
         await self.client.aclose()
+        if self.cache:
+            self.cache.close()
 
 
 # Singleton instance
@@ -0,0 +1,530 @@
+"""
+Cross-candidate answer similarity (copied answers) for competitions.
+
+Comparing every pair of answers to a question is O(n^2): for a 30,000
+candidate screening that is hundreds of millions of comparisons per
+question. Instead every submitted answer is reduced to a MinHash signature
+of its shingles (app/services/minhash.py), minus the shingles of the question
+itself so pasted starter code does not count as copying, and only answers
+that share an LSH bucket are compared. Buckets are scoped to the competition
+and the question template: the question fingerprint, which dealt screening
+questions share across candidates (app/services/screening_pool.py).
+
+Answers whose estimated similarity reaches ANSWER_SIMILARITY_THRESHOLD are
+joined into clusters (connected components; ``cluster_id`` is the smallest
+answer id). A cluster holding more than ANSWER_SIMILARITY_COMMON_SHARE of a
+question's answers is a common answer - the obvious solution - rather than
+copying, and is not flagged. Every other cluster adds a "similar_answer"
+entry to the members' ``BehavioralMetrics.anomaly_flags`` and raises their
+``risk_score``, which get_rankings reports.
+
+- Incremental: submitting a screening queues "index_competition_answers",
+  which indexes that registration's answers against the persisted buckets.
+- Batch: "scan_answer_similarity" rebuilds a competition's index and clusters
+  in memory and rewrites them in one transaction. It is authoritative -
+  concurrent incremental jobs can miss a pair that the scan will find - and
+  incremental jobs for the competition wait while a scan is queued or running.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import (
+    Answer, AnswerLSHBucket, AnswerSignature, BehavioralMetrics, CompetitionRegistration, Question,
+)
+from app.services.job_queue import job_queue, PermanentJobError, RetryJobLater
+from app.services.minhash import (
+    LSHIndex, band_keys, minhasher, normalize_tokens, shingles,
+    signature_from_bytes, signature_to_bytes, similarity,
+)
+from app.services.question_similarity import question_content_hash
+
+
+FLAG_TYPE = "similar_answer"
+RISK_FACTOR_PREFIX = "Answers closely match other candidates'"
+
+INDEX_JOB_PRIORITY = 400
+COMMON_MIN_SIZE = 5  # Clusters up to this size are always flagged, however few answers a question has
+MAX_CANDIDATES = 500  # Signatures compared per answer on the incremental path
+MAX_BUCKET_SIZE = 200  # In-memory bucket cap for the batch scan (see LSHIndex)
+WRITE_CHUNK = 2000
+REFRESH_CHUNK = 500
+
+
+def template_key(fingerprint_id: Optional[int], question_text: Optional[str], question_code: Optional[str]) -> str:
+    """Key shared by every copy of the same question."""
+    if fingerprint_id:
+        return f"f{fingerprint_id}"
+    return "h" + question_content_hash(question_text, question_code)[:40]
+
+
+def _salt(competition_id: int, template: str) -> bytes:
+    return f"{competition_id}:{template}:".encode("utf-8")
+
+
+def _answer_rows():
+    """(answer id, answer text, answer code, question id, fingerprint id, question text, question code, registration id)."""
+    return (
+        select(
+            Answer.id, Answer.candidate_answer, Answer.candidate_code,
+            Question.id, Question.fingerprint_id, Question.question_text, Question.question_code,
+            CompetitionRegistration.id,
+        )
+        .join(Question, Question.id == Answer.question_id)
+        .join(CompetitionRegistration, CompetitionRegistration.test_id == Question.test_id)
+        .where(Answer.is_submitted == True)
+    )
+
+
+class AnswerSimilarityIndex:
+    """Signatures, clustering and flagging of competition answers."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        threshold: float = 0.8,
+        min_tokens: int = 20,
+        common_share: float = 0.05,
+        risk_per_match: float = 25.0,
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.common_share = common_share
+        self.risk_per_match = risk_per_match
+
+    def signature(
+        self,
+        answer_text: Optional[str],
+        answer_code: Optional[str],
+        question_shingles: Set[str],
+    ) -> Optional[np.ndarray]:
+        """Signature of an answer, or None when it is too short to tell copying from coincidence."""
+        content = f"{answer_text or ''}\n{answer_code or ''}"
+        if len(normalize_tokens(content)) < self.min_tokens:
+            return None
+        items = shingles(content) - question_shingles
+        if not items:
+            return None
+        return minhasher.signature(items)
+
+    def _signatures(self, rows: Iterable[Tuple], question_cache: Dict[str, Set[str]]) -> Iterable[Dict[str, Any]]:
+        for answer_id, answer_text, answer_code, question_id, fingerprint_id, question_text, question_code, registration_id in rows:
+            template = template_key(fingerprint_id, question_text, question_code)
+            if template not in question_cache:
+                question_cache[template] = shingles(f"{question_text or ''}\n{question_code or ''}")
+            signature = self.signature(answer_text, answer_code, question_cache[template])
+            if signature is not None:
+                yield {
+                    "answer_id": answer_id,
+                    "registration_id": registration_id,
+                    "question_id": question_id,
+                    "template_key": template,
+                    "signature": signature,
+                }
+
+    def is_common(self, cluster_size: int, template_total: int) -> bool:
+        return cluster_size > max(COMMON_MIN_SIZE, self.common_share * template_total)
+
+    def apply_flags(self, metrics: BehavioralMetrics, flags: List[Dict[str, Any]]):
+        """Replace the metrics' answer-similarity flags and recompute its risk score."""
+        metrics.anomaly_flags = [
+            flag for flag in (metrics.anomaly_flags or []) if flag.get("type") != FLAG_TYPE
+        ] + flags
+        risk_factors = [
+            factor for factor in (metrics.risk_factors or []) if not factor.startswith(RISK_FACTOR_PREFIX)
+        ]
+        if flags:
+            risk_factors.append(f"{RISK_FACTOR_PREFIX} on {len(flags)} questions")
+        metrics.risk_factors = risk_factors
+        metrics.similar_answer_count = len(flags)
+        update_risk_score(metrics)
+
+    # ------------------------------------------------------------------
+    # Incremental indexing
+    # ------------------------------------------------------------------
+
+    async def index_registration(self, registration_id: int) -> Dict[str, Any]:
+        """Index one registration's unindexed answers and merge them into matching clusters."""
+        async with async_session_maker() as db:
+            registration = await db.get(CompetitionRegistration, registration_id)
+            if not registration or not registration.test_id:
+                raise PermanentJobError(f"Registration {registration_id} has no screening test")
+            competition_id = registration.competition_id
+
+            indexed = select(AnswerSignature.answer_id).where(AnswerSignature.registration_id == registration_id)
+            result = await db.execute(
+                _answer_rows().where(CompetitionRegistration.id == registration_id, Answer.id.not_in(indexed))
+            )
+            signatures = [
+                AnswerSignature(
+                    competition_id=competition_id,
+                    registration_id=registration_id,
+                    answer_id=item["answer_id"],
+                    question_id=item["question_id"],
+                    template_key=item["template_key"],
+                    signature=signature_to_bytes(item["signature"]),
+                )
+                for item in self._signatures(result.all(), {})
+            ]
+            db.add_all(signatures)
+            await db.flush()
+            db.add_all([
+                AnswerLSHBucket(bucket=bucket, signature_id=row.id)
+                for row in signatures
+                for bucket in set(band_keys(signature_from_bytes(row.signature), salt=_salt(competition_id, row.template_key)))
+            ])
+            # Committed before matching, so of two concurrent registrations the later one sees the other
+            await db.commit()
+
+        affected = {registration_id}
+        clustered = 0
+        async with async_session_maker() as db:
+            for row in signatures:
+                signature = signature_from_bytes(row.signature)
+                result = await db.execute(
+                    select(AnswerLSHBucket.signature_id)
+                    .where(AnswerLSHBucket.bucket.in_(band_keys(signature, salt=_salt(competition_id, row.template_key))))
+                    .distinct()
+                    .limit(MAX_CANDIDATES)
+                )
+                candidate_ids = result.scalars().all()
+                result = await db.execute(
+                    select(AnswerSignature).where(
+                        AnswerSignature.id.in_(candidate_ids),
+                        AnswerSignature.registration_id != registration_id,
+                    )
+                )
+                matches = [
+                    candidate for candidate in result.scalars().all()
+                    if similarity(signature, signature_from_bytes(candidate.signature)) >= self.threshold
+                ]
+                if not matches:
+                    continue
+
+                clustered += 1
+                roots = {match.cluster_id or match.answer_id for match in matches}
+                cluster_id = min(roots | {row.cluster_id or row.answer_id})
+                await db.execute(
+                    update(AnswerSignature)
+                    .where(
+                        AnswerSignature.competition_id == competition_id,
+                        (AnswerSignature.cluster_id.in_(roots))
+                        | (AnswerSignature.answer_id.in_([match.answer_id for match in matches]))
+                        | (AnswerSignature.id == row.id),
+                    )
+                    .values(cluster_id=cluster_id)
+                    .execution_options(synchronize_session=False)
+                )
+                row.cluster_id = cluster_id
+                members = await db.execute(
+                    select(AnswerSignature.registration_id).where(
+                        AnswerSignature.competition_id == competition_id,
+                        AnswerSignature.cluster_id == cluster_id,
+                    )
+                )
+                affected.update(members.scalars().all())
+
+            flagged = await self.refresh_flags(db, competition_id, affected)
+            await db.commit()
+
+        return {"indexed": len(signatures), "clustered": clustered, "flagged_registrations": flagged}
+
+    # ------------------------------------------------------------------
+    # Batch scan
+    # ------------------------------------------------------------------
+
+    async def scan_competition(self, competition_id: int) -> Dict[str, Any]:
+        """Rebuild the competition's signatures, buckets and clusters from scratch."""
+        started = datetime.utcnow()
+        templates: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        question_cache: Dict[str, Set[str]] = {}
+        async with async_session_maker() as db:
+            result = await db.stream(
+                _answer_rows()
+                .where(
+                    CompetitionRegistration.competition_id == competition_id,
+                    CompetitionRegistration.screening_completed == True,
+                )
+                .execution_options(yield_per=WRITE_CHUNK)
+            )
+            async for rows in result.partitions():
+                for item in self._signatures(rows, question_cache):
+                    templates[item.pop("template_key")].append(item)
+            registration_result = await db.execute(
+                select(CompetitionRegistration.id).where(
+                    CompetitionRegistration.competition_id == competition_id,
+                    CompetitionRegistration.screening_completed == True,
+                )
+            )
+            registration_ids = registration_result.scalars().all()
+
+        indexed = clusters = 0
+        async with async_session_maker() as db:
+            # Core statements on the tables: the ORM's per-row bookkeeping dominates at this volume
+            signatures, lsh_buckets = AnswerSignature.__table__, AnswerLSHBucket.__table__
+            old = select(signatures.c.id).where(signatures.c.competition_id == competition_id)
+            await db.execute(delete(lsh_buckets).where(lsh_buckets.c.signature_id.in_(old)))
+            await db.execute(delete(signatures).where(signatures.c.competition_id == competition_id))
+
+            for template, items in templates.items():
+                parent = {item["answer_id"]: item["answer_id"] for item in items}
+
+                def find(answer_id: int) -> int:
+                    while parent[answer_id] != answer_id:
+                        parent[answer_id] = parent[parent[answer_id]]
+                        answer_id = parent[answer_id]
+                    return answer_id
+
+                lsh = LSHIndex(salt=_salt(competition_id, template), max_bucket_size=MAX_BUCKET_SIZE)
+                buckets: Dict[int, List[int]] = {}
+                for item in items:
+                    answer_id, signature = item["answer_id"], item["signature"]
+                    buckets[answer_id] = lsh.keys(signature)
+                    for candidate in lsh.candidates(signature, buckets[answer_id]):
+                        # Already in the same cluster: no need to compare
+                        if find(candidate) == find(answer_id):
+                            continue
+                        if similarity(signature, lsh.signatures[candidate]) >= self.threshold:
+                            a, b = find(candidate), find(answer_id)
+                            parent[max(a, b)] = min(a, b)
+                    lsh.add(answer_id, signature, buckets[answer_id])
+
+                sizes: Dict[int, int] = defaultdict(int)
+                for answer_id in parent:
+                    sizes[find(answer_id)] += 1
+                clusters += sum(1 for size in sizes.values() if size > 1)
+
+                for start in range(0, len(items), WRITE_CHUNK):
+                    chunk = items[start:start + WRITE_CHUNK]
+                    await db.execute(insert(signatures), [
+                        {
+                            "competition_id": competition_id,
+                            "registration_id": item["registration_id"],
+                            "answer_id": item["answer_id"],
+                            "question_id": item["question_id"],
+                            "template_key": template,
+                            "signature": signature_to_bytes(item["signature"]),
+                            # The smallest id is always the root, so this is the cluster's smallest answer id
+                            "cluster_id": find(item["answer_id"]) if sizes[find(item["answer_id"])] > 1 else None,
+                            "created_at": started,
+                        }
+                        for item in chunk
+                    ])
+                    result = await db.execute(
+                        select(signatures.c.id, signatures.c.answer_id).where(
+                            signatures.c.answer_id.in_([item["answer_id"] for item in chunk])
+                        )
+                    )
+                    bucket_rows = [
+                        {"bucket": bucket, "signature_id": signature_id}
+                        for signature_id, answer_id in result.all()
+                        for bucket in set(buckets[answer_id])
+                    ]
+                    await db.execute(insert(lsh_buckets), bucket_rows)
+                indexed += len(items)
+            await db.commit()
+
+        flagged = 0
+        for start in range(0, len(registration_ids), REFRESH_CHUNK):
+            async with async_session_maker() as db:
+                flagged += await self.refresh_flags(db, competition_id, registration_ids[start:start + REFRESH_CHUNK])
+                await db.commit()
+
+        seconds = (datetime.utcnow() - started).total_seconds()
+        print(f"[AnswerSimilarity] Competition {competition_id}: indexed {indexed} answers across "
+              f"{len(templates)} questions, {clusters} clusters, {flagged} registrations flagged in {seconds:.1f}s")
+        return {
+            "indexed": indexed,
+            "questions": len(templates),
+            "clusters": clusters,
+            "flagged_registrations": flagged,
+            "seconds": round(seconds, 1),
+        }
+
+    # ------------------------------------------------------------------
+    # Flags and reporting
+    # ------------------------------------------------------------------
+
+    async def _cluster_stats(
+        self,
+        db: AsyncSession,
+        competition_id: int,
+        cluster_ids: Set[int],
+    ) -> Tuple[Dict[int, Tuple[str, int]], Dict[str, int]]:
+        """cluster id -> (template key, size), and template key -> indexed answers."""
+        if not cluster_ids:
+            return {}, {}
+        result = await db.execute(
+            select(AnswerSignature.cluster_id, AnswerSignature.template_key, func.count(AnswerSignature.id))
+            .where(AnswerSignature.competition_id == competition_id, AnswerSignature.cluster_id.in_(cluster_ids))
+            .group_by(AnswerSignature.cluster_id, AnswerSignature.template_key)
+        )
+        clusters = {cluster_id: (template, size) for cluster_id, template, size in result.all()}
+        result = await db.execute(
+            select(AnswerSignature.template_key, func.count(AnswerSignature.id))
+            .where(
+                AnswerSignature.competition_id == competition_id,
+                AnswerSignature.template_key.in_({template for template, _ in clusters.values()}),
+            )
+            .group_by(AnswerSignature.template_key)
+        )
+        return clusters, dict(result.all())
+
+    async def _cluster_members(self, db: AsyncSession, competition_id: int, cluster_ids: Set[int]) -> Dict[int, List[int]]:
+        members: Dict[int, List[int]] = defaultdict(list)
+        if cluster_ids:
+            result = await db.execute(
+                select(AnswerSignature.cluster_id, AnswerSignature.registration_id)
+                .where(AnswerSignature.competition_id == competition_id, AnswerSignature.cluster_id.in_(cluster_ids))
+                .order_by(AnswerSignature.registration_id)
+            )
+            for cluster_id, registration_id in result.all():
+                members[cluster_id].append(registration_id)
+        return members
+
+    async def refresh_flags(self, db: AsyncSession, competition_id: int, registration_ids: Iterable[int]) -> int:
+        """Recompute the similarity flags of these registrations. Returns how many are flagged."""
+        registration_ids = list(registration_ids)
+        if not registration_ids:
+            return 0
+        result = await db.execute(
+            select(AnswerSignature.registration_id, AnswerSignature.question_id, AnswerSignature.cluster_id)
+            .where(AnswerSignature.registration_id.in_(registration_ids), AnswerSignature.cluster_id.isnot(None))
+        )
+        clustered = result.all()
+        clusters, template_totals = await self._cluster_stats(db, competition_id, {row[2] for row in clustered})
+        suspicious = {
+            cluster_id for cluster_id, (template, size) in clusters.items()
+            if size > 1 and not self.is_common(size, template_totals.get(template, size))
+        }
+        members = await self._cluster_members(db, competition_id, suspicious)
+
+        flags: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for registration_id, question_id, cluster_id in clustered:
+            if cluster_id not in suspicious:
+                continue
+            others = [other for other in members[cluster_id] if other != registration_id]
+            flags[registration_id].append({
+                "type": FLAG_TYPE,
+                "question_id": question_id,
+                "cluster_id": cluster_id,
+                "cluster_size": clusters[cluster_id][1],
+                "matching_registration_ids": others[:10],
+                "description": f"Answer closely matches {len(others)} other candidate(s)",
+                "severity": "high",
+            })
+
+        result = await db.execute(
+            select(BehavioralMetrics).where(BehavioralMetrics.registration_id.in_(registration_ids))
+        )
+        for metrics in result.scalars().all():
+            if flags.get(metrics.registration_id) or metrics.similar_answer_count:
+                self.apply_flags(metrics, flags.get(metrics.registration_id, []))
+        return len(flags)
+
+    async def report(self, db: AsyncSession, competition_id: int, limit: int = 100) -> Dict[str, Any]:
+        """Indexed answer count and the largest clusters of the competition."""
+        result = await db.execute(
+            select(func.count(AnswerSignature.id)).where(AnswerSignature.competition_id == competition_id)
+        )
+        indexed = result.scalar() or 0
+
+        result = await db.execute(
+            select(AnswerSignature.cluster_id, func.min(AnswerSignature.question_id), func.count(AnswerSignature.id))
+            .where(AnswerSignature.competition_id == competition_id, AnswerSignature.cluster_id.isnot(None))
+            .group_by(AnswerSignature.cluster_id)
+            .order_by(func.count(AnswerSignature.id).desc())
+            .limit(limit)
+        )
+        top = result.all()
+        clusters, template_totals = await self._cluster_stats(db, competition_id, {row[0] for row in top})
+        members = await self._cluster_members(db, competition_id, {row[0] for row in top})
+
+        result = await db.execute(
+            select(func.count(BehavioralMetrics.id))
+            .join(CompetitionRegistration, CompetitionRegistration.id == BehavioralMetrics.registration_id)
+            .where(CompetitionRegistration.competition_id == competition_id, BehavioralMetrics.similar_answer_count > 0)
+        )
+        flagged = result.scalar() or 0
+
+        return {
+            "competition_id": competition_id,
+            "threshold": self.threshold,
+            "indexed_answers": indexed,
+            "flagged_registrations": flagged,
+            "clusters": [
+                {
+                    "cluster_id": cluster_id,
+                    "question_id": question_id,
+                    "size": size,
+                    "common": self.is_common(size, template_totals.get(clusters[cluster_id][0], size)),
+                    "registration_ids": members[cluster_id][:50],
+                }
+                for cluster_id, question_id, size in top
+            ],
+        }
+
+
+def update_risk_score(metrics: BehavioralMetrics):
+    """risk_score = behavior_risk_score plus the answer-similarity penalty, capped at 100."""
+    if metrics.behavior_risk_score is None:
+        # Metrics computed before answer similarity existed
+        metrics.behavior_risk_score = metrics.risk_score or 0.0
+    penalty = (metrics.similar_answer_count or 0) * answer_similarity.risk_per_match
+    metrics.risk_score = min(100, metrics.behavior_risk_score + penalty)
+
+
+answer_similarity = AnswerSimilarityIndex(
+    enabled=settings.ANSWER_SIMILARITY_ENABLED,
+    threshold=settings.ANSWER_SIMILARITY_THRESHOLD,
+    min_tokens=settings.ANSWER_SIMILARITY_MIN_TOKENS,
+    common_share=settings.ANSWER_SIMILARITY_COMMON_SHARE,
+    risk_per_match=settings.ANSWER_SIMILARITY_RISK_PER_MATCH,
+)
+
+
+def scan_dedup_key(competition_id: int) -> str:
+    return f"scan_answer_similarity:{competition_id}"
+
+
+async def enqueue_registration_index(db: AsyncSession, registration_id: int):
+    """Queue indexing of a submitted screening's answers (committed by the caller)."""
+    job, _ = await job_queue.enqueue(
+        db, "index_competition_answers", {"registration_id": registration_id},
+        dedup_key=f"index_competition_answers:{registration_id}",
+        priority=INDEX_JOB_PRIORITY,
+    )
+    return job
+
+
+async def enqueue_scan(db: AsyncSession, competition_id: int):
+    """Queue a full rebuild of the competition's answer index (committed by the caller)."""
+    job, _ = await job_queue.enqueue(
+        db, "scan_answer_similarity", {"competition_id": competition_id},
+        dedup_key=scan_dedup_key(competition_id),
+        priority=INDEX_JOB_PRIORITY,
+    )
+    return job
+
+
+@job_queue.handler("index_competition_answers")
+async def _index_competition_answers_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    async with async_session_maker() as db:
+        registration = await db.get(CompetitionRegistration, payload["registration_id"])
+        scanning = registration and await job_queue.find_active(db, scan_dedup_key(registration.competition_id))
+        await db.commit()
+    if scanning:
+        raise RetryJobLater(30, "answer similarity scan in progress")
+    return await answer_similarity.index_registration(payload["registration_id"])
+
+
+@job_queue.handler("scan_answer_similarity")
+async def _scan_answer_similarity_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await answer_similarity.scan_competition(payload["competition_id"])
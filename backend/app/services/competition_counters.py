@@ -0,0 +1,143 @@
+"""
+Registration counters on ``competitions``.
+
+The competition routes used to COUNT(*) ``competition_registrations`` on
+every call - twice per competition in the listing, three times per rankings
+page, once per registration to enforce ``max_participants``. The counts now
+live on the competition row:
+
+- ``registration_count``: incremented by ``claim_registration_slot`` with a
+  conditional UPDATE (``... WHERE registration_count < max_participants``),
+  so the check and the increment are one statement. Concurrent registrations
+  serialize on the competition row and the cap cannot be overshot.
+- ``completed_count``: incremented by ``mark_screening_completed``, which
+  flips ``screening_completed`` with a compare-and-set so a screening that
+  is submitted twice (or expires while being submitted) counts once.
+- ``qualified_registration_count``: recomputed from the registrations by
+  ``refresh_qualified_count`` when qualification runs.
+
+Every change is made in the caller's transaction, together with the
+registration change it counts, and committed by the caller. The
+``repair_competition_counters`` job recomputes all three from the
+registrations, e.g. after rows were edited by hand.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.database import async_session_maker
+from app.models.competition import Competition, CompetitionRegistration
+from app.services.job_queue import job_queue
+
+
+def _count(*conditions):
+    return (
+        select(func.count(CompetitionRegistration.id))
+        .where(CompetitionRegistration.competition_id == Competition.id, *conditions)
+        .scalar_subquery()
+    )
+
+
+async def claim_registration_slot(db: AsyncSession, competition_id: int) -> bool:
+    """Count one more registration if the competition has room; False when it is full."""
+    result = await db.execute(
+        update(Competition)
+        .where(
+            Competition.id == competition_id,
+            or_(Competition.max_participants.is_(None), Competition.registration_count < Competition.max_participants),
+        )
+        .values(registration_count=Competition.registration_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def mark_screening_completed(
+    db: AsyncSession,
+    registration: CompetitionRegistration,
+    completed_at: Optional[datetime] = None,
+) -> bool:
+    """Mark the registration's screening completed and count it, once; False if it already was."""
+    completed_at = completed_at or datetime.utcnow()
+    result = await db.execute(
+        update(CompetitionRegistration)
+        .where(
+            CompetitionRegistration.id == registration.id,
+            or_(CompetitionRegistration.screening_completed.is_(None), CompetitionRegistration.screening_completed == False),
+        )
+        .values(screening_completed=True, screening_completed_at=completed_at)
+        .execution_options(synchronize_session=False)
+    )
+    # The row is written; keep the loaded object in step without a second UPDATE
+    set_committed_value(registration, "screening_completed", True)
+    if result.rowcount != 1:
+        return False
+    set_committed_value(registration, "screening_completed_at", completed_at)
+    await db.execute(
+        update(Competition)
+        .where(Competition.id == registration.competition_id)
+        .values(completed_count=Competition.completed_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+
+async def refresh_qualified_count(db: AsyncSession, competition_id: int):
+    """Recount qualified registrations after qualification flags changed (flushes first)."""
+    await db.flush()
+    await db.execute(
+        update(Competition)
+        .where(Competition.id == competition_id)
+        .values(qualified_registration_count=_count(CompetitionRegistration.is_qualified == True))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def repair_counters(db: AsyncSession, competition_id: Optional[int] = None) -> int:
+    """Recompute every counter from the registrations; returns the competitions updated."""
+    statement = update(Competition).values(
+        registration_count=_count(),
+        completed_count=_count(CompetitionRegistration.screening_completed == True),
+        qualified_registration_count=_count(CompetitionRegistration.is_qualified == True),
+    )
+    if competition_id is not None:
+        statement = statement.where(Competition.id == competition_id)
+    result = await db.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount
+
+
+async def counters_drift(db: AsyncSession, competition_id: Optional[int] = None) -> int:
+    """Competitions whose stored counters differ from the registrations."""
+    query = select(func.count(Competition.id)).where(or_(
+        Competition.registration_count != _count(),
+        Competition.completed_count != _count(CompetitionRegistration.screening_completed == True),
+        Competition.qualified_registration_count != _count(CompetitionRegistration.is_qualified == True),
+    ))
+    if competition_id is not None:
+        query = query.where(Competition.id == competition_id)
+    result = await db.execute(query)
+    return result.scalar() or 0
+
+
+async def enqueue_repair(db: AsyncSession, competition_id: Optional[int] = None):
+    """Queue a counter repair for one competition, or all when ``competition_id`` is None."""
+    key = f"repair_competition_counters:{competition_id if competition_id is not None else 'all'}"
+    job, _ = await job_queue.enqueue(
+        db, "repair_competition_counters", {"competition_id": competition_id}, dedup_key=key,
+    )
+    return job
+
+
+@job_queue.handler("repair_competition_counters")
+async def _repair_competition_counters_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    competition_id = payload.get("competition_id")
+    async with async_session_maker() as db:
+        drifted = await counters_drift(db, competition_id)
+        repaired = await repair_counters(db, competition_id)
+        await db.commit()
+    if drifted:
+        print(f"[CompetitionCounters] Repaired counters of {drifted} competition(s) that had drifted")
+    return {"competition_id": competition_id, "competitions": repaired, "drifted": drifted}
@@ -0,0 +1,235 @@
+"""
+Deferred evaluation of submitted answers and challenge task responses.
+
+With ``defer_evaluation`` the submit endpoints only persist the content, mark
+it ``evaluation_status="pending"`` and enqueue a job, so they respond in
+DB-write time instead of LLM time. The job scores whatever content is stored
+when it runs; if the candidate resubmits while the LLM call is in flight, the
+stale result is discarded and the new content is scored instead. When the
+LLM cannot score it (the manual-review placeholder) the job is retried with
+backoff, and the status becomes ``failed`` once the retries run out.
+
+Clients learn the outcome from a cheap status poll or from
+``evaluation_events``, which backs the SSE ``/evaluation/stream`` endpoints.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.challenges import Track, build_challenge_spec
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Answer, ChallengeSubmission, Question, TaskResponse, Test
+from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue, PermanentJobError
+
+
+EVALUATION_PENDING = "pending"
+EVALUATION_DONE = "evaluated"
+EVALUATION_FAILED = "failed"
+
+# Candidate-facing: claimed ahead of report and test generation jobs
+EVALUATION_JOB_PRIORITY = 10
+
+# How many times a job re-scores content that changed under it before retrying later
+MAX_CONTENT_CHANGES = 3
+
+
+async def enqueue_answer_evaluation(db: AsyncSession, answer: Answer):
+    """Mark ``answer`` pending and queue its evaluation (committed by the caller)."""
+    answer.score = None
+    answer.feedback = None
+    answer.ai_evaluation = None
+    answer.evaluated_at = None
+    answer.evaluation_status = EVALUATION_PENDING
+    await db.flush()
+    await job_queue.enqueue(
+        db, "evaluate_answer", {"answer_id": answer.id},
+        dedup_key=f"evaluate_answer:{answer.id}", priority=EVALUATION_JOB_PRIORITY,
+    )
+
+
+async def enqueue_task_evaluation(db: AsyncSession, task_response: TaskResponse):
+    """Mark ``task_response`` pending and queue its evaluation (committed by the caller)."""
+    task_response.score = None
+    task_response.feedback = None
+    task_response.ai_evaluation = None
+    task_response.evaluated_at = None
+    task_response.evaluation_status = EVALUATION_PENDING
+    await db.flush()
+    await job_queue.enqueue(
+        db, "evaluate_challenge_task", {"task_response_id": task_response.id},
+        dedup_key=f"evaluate_challenge_task:{task_response.id}", priority=EVALUATION_JOB_PRIORITY,
+    )
+
+
+async def _mark_answer_failed(payload: Dict[str, Any], error: str):
+    async with async_session_maker() as db:
+        answer = await db.get(Answer, payload["answer_id"])
+        if answer and answer.evaluation_status == EVALUATION_PENDING:
+            answer.evaluation_status = EVALUATION_FAILED
+            await db.commit()
+
+
+async def _mark_task_failed(payload: Dict[str, Any], error: str):
+    async with async_session_maker() as db:
+        task_response = await db.get(TaskResponse, payload["task_response_id"])
+        if task_response and task_response.evaluation_status == EVALUATION_PENDING:
+            task_response.evaluation_status = EVALUATION_FAILED
+            await db.commit()
+
+
+@job_queue.handler("evaluate_answer", on_failure=_mark_answer_failed)
+async def _evaluate_answer_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    answer_id = payload["answer_id"]
+
+    for _ in range(MAX_CONTENT_CHANGES):
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Answer)
+                .options(selectinload(Answer.question).selectinload(Question.test).selectinload(Test.candidate))
+                .where(Answer.id == answer_id)
+            )
+            answer = result.scalar_one_or_none()
+            if not answer:
+                raise PermanentJobError(f"Answer {answer_id} not found")
+            if answer.evaluation_status != EVALUATION_PENDING:
+                # Edited back into a draft, or already scored by a later inline submit
+                return {"answer_id": answer_id, "evaluation_status": answer.evaluation_status}
+
+            question = answer.question
+            content = (answer.candidate_answer, answer.candidate_code)
+            await db.commit()
+
+        evaluation = await ai_service.evaluate_answer(
+            question_text=question.question_text,
+            question_code=question.question_code,
+            expected_answer=question.expected_answer or "",
+            candidate_answer=content[0] or "",
+            candidate_code=content[1] or "",
+            category=question.category,
+            difficulty=question.test.candidate.difficulty if question.test.candidate else "mid",
+        )
+        if evaluation.get("manual_review"):
+            # Placeholder score: retry with backoff, the job's failure hook marks it failed
+            raise RuntimeError(f"Answer {answer_id} could not be evaluated (LLM unavailable)")
+
+        async with async_session_maker() as db:
+            answer = await db.get(Answer, answer_id)
+            if not answer or answer.evaluation_status != EVALUATION_PENDING:
+                return {"answer_id": answer_id, "evaluation_status": answer.evaluation_status if answer else None}
+            if (answer.candidate_answer, answer.candidate_code) != content:
+                continue  # Resubmitted while we were scoring - score the new content
+
+            answer.score = evaluation.get("score", 0)
+            answer.feedback = evaluation.get("feedback", "")
+            answer.ai_evaluation = str(evaluation)
+            answer.evaluated_at = datetime.utcnow()
+            answer.evaluation_status = EVALUATION_DONE
+            await db.commit()
+            return {"answer_id": answer_id, "evaluation_status": EVALUATION_DONE, "score": answer.score}
+
+    raise RuntimeError(f"Answer {answer_id} kept changing during evaluation")
+
+
+@job_queue.handler("evaluate_challenge_task", on_failure=_mark_task_failed)
+async def _evaluate_challenge_task_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    task_response_id = payload["task_response_id"]
+
+    for _ in range(MAX_CONTENT_CHANGES):
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(TaskResponse)
+                .options(
+                    selectinload(TaskResponse.challenge_submission)
+                    .selectinload(ChallengeSubmission.test)
+                    .selectinload(Test.candidate)
+                )
+                .where(TaskResponse.id == task_response_id)
+            )
+            task_response = result.scalar_one_or_none()
+            if not task_response:
+                raise PermanentJobError(f"Task response {task_response_id} not found")
+            if task_response.evaluation_status != EVALUATION_PENDING:
+                return {"task_response_id": task_response_id, "evaluation_status": task_response.evaluation_status}
+
+            submission = task_response.challenge_submission
+            try:
+                challenge_spec = build_challenge_spec(Track(submission.track))
+            except ValueError:
+                raise PermanentJobError(f"Invalid track: {submission.track}")
+            task_spec = next((t for t in challenge_spec.tasks if t.id == task_response.task_id), None)
+            if not task_spec:
+                raise PermanentJobError(f"Unknown task: {task_response.task_id}")
+
+            candidate = submission.test.candidate if submission.test else None
+            content = (task_response.response_text, task_response.response_code)
+            await db.commit()
+
+        evaluation = await ai_service.evaluate_challenge_task(
+            task_title=task_spec.title,
+            task_description=task_spec.description,
+            task_requirements=task_spec.requirements,
+            candidate_response=content[0] or "",
+            candidate_code=content[1] or "",
+            track=submission.track,
+            difficulty=candidate.difficulty if candidate else "mid",
+        )
+        if evaluation.get("manual_review"):
+            raise RuntimeError(f"Task response {task_response_id} could not be evaluated (LLM unavailable)")
+
+        async with async_session_maker() as db:
+            task_response = await db.get(TaskResponse, task_response_id)
+            if not task_response or task_response.evaluation_status != EVALUATION_PENDING:
+                return {"task_response_id": task_response_id, "evaluation_status": task_response.evaluation_status if task_response else None}
+            if (task_response.response_text, task_response.response_code) != content:
+                continue
+
+            task_response.score = evaluation.get("score", 0)
+            task_response.feedback = evaluation.get("feedback", "")
+            task_response.ai_evaluation = evaluation
+            task_response.evaluated_at = datetime.utcnow()
+            task_response.evaluation_status = EVALUATION_DONE
+            await db.commit()
+            return {"task_response_id": task_response_id, "evaluation_status": EVALUATION_DONE, "score": task_response.score}
+
+    raise RuntimeError(f"Task response {task_response_id} kept changing during evaluation")
+
+
+async def evaluation_events(
+    load: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    poll_interval: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream events for one deferred evaluation.
+
+    ``load`` returns the current status dict (with an ``evaluation_status``
+    key) or None if the row is gone. Yields a "status" event right away, then
+    a single "result" once the evaluation is no longer pending, or "timeout".
+    Each poll is one primary-key read in a short-lived session.
+    """
+    poll_interval = poll_interval or settings.EVALUATION_STREAM_POLL_SECONDS
+    deadline = time.monotonic() + (timeout or settings.EVALUATION_STREAM_TIMEOUT_SECONDS)
+
+    status = await load()
+    if status is None:
+        yield {"event": "error", "data": {"detail": "Not found"}}
+        return
+    yield {"event": "status", "data": status}
+
+    while status["evaluation_status"] == EVALUATION_PENDING:
+        if time.monotonic() >= deadline:
+            yield {"event": "timeout", "data": status}
+            return
+        await asyncio.sleep(poll_interval)
+        status = await load()
+        if status is None:
+            yield {"event": "error", "data": {"detail": "Not found"}}
+            return
+
+    yield {"event": "result", "data": status}
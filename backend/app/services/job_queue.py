@@ -0,0 +1,415 @@
+"""
+Durable background job queue backed by the ``jobs`` table.
+
+Long AI work (question generation, reports, analyses) used to run inline in
+request handlers or as fire-and-forget ``asyncio.create_task`` calls that
+vanished on restart. Handlers now enqueue a Job row and return at once;
+worker coroutines in every API process claim jobs and run them:
+
+- Claiming is a compare-and-set UPDATE on (status, lease), so any number of
+  processes can share the table without double-running a job.
+- A running job holds a lease that its worker extends every
+  JOB_HEARTBEAT_SECONDS. If the process dies the lease expires and another
+  worker (or this one after a restart) picks the job up again. A worker that
+  finds its lease taken over cancels its handler, but whatever the handler
+  committed before the cancellation landed stays - so a job can run more
+  than once, and handlers must be safe to re-run.
+- Failures are retried with jittered exponential backoff up to
+  ``max_attempts``; handlers raise PermanentJobError for failures a retry
+  cannot fix, or RetryJobLater to be re-queued without using an attempt
+  when they are merely not ready to run yet.
+- ``dedup_key`` allows one queued/running job per key (enforced by a unique
+  column), replacing the old per-process in-memory lock sets.
+- Lower ``priority`` values are claimed first, so a candidate waiting on a
+  score is not queued behind minutes-long report generation. Workers are
+  cheap coroutines; actual LLM concurrency is bounded by the scheduler lanes.
+
+Handlers are registered by kind and receive the job payload::
+
+    @job_queue.handler("generate_report")
+    async def _generate_report_job(payload: dict) -> dict:
+        ...
+
+They open their own DB sessions and should not hold a transaction open
+across LLM calls.
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, event, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.job import Job, JobStatus
+from app.services.llm_latency import backoff_delay
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+FailureHook = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for failures that retrying cannot fix."""
+
+
+class RetryJobLater(Exception):
+    """Raised by a job handler that cannot make progress yet.
+
+    The job goes back to the queue for ``delay`` seconds and the attempt is
+    not counted, so a job may be postponed any number of times.
+    """
+
+    def __init__(self, delay: float, reason: str = ""):
+        super().__init__(reason or f"postponed for {delay:.0f}s")
+        self.delay = delay
+
+
+class JobQueue:
+    """Enqueue API plus the worker pool that drains the jobs table."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        lease_seconds: float = 120.0,
+        heartbeat_seconds: float = 30.0,
+        poll_interval: float = 2.0,
+        max_attempts: int = 3,
+        retry_delay: float = 10.0,
+        retry_max_delay: float = 300.0,
+    ):
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+
+        # Unique per process so leases identify who holds them
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._failure_hooks: Dict[str, FailureHook] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: Dict[int, str] = {}  # job id -> kind, for jobs running in this process
+        self.counters = {"claimed": 0, "succeeded": 0, "retried": 0, "postponed": 0, "failed": 0, "lease_lost": 0}
+
+    # ------------------------------------------------------------------
+    # Registration and enqueueing
+    # ------------------------------------------------------------------
+
+    def handler(self, kind: str, on_failure: Optional[FailureHook] = None):
+        """Decorator registering the coroutine that runs jobs of ``kind``.
+
+        ``on_failure(payload, error)`` is awaited once a job of this kind has
+        failed for good, e.g. to flag the row it was working on.
+        """
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            if on_failure:
+                self._failure_hooks[kind] = on_failure
+            return func
+        return decorator
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        dedup_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+        priority: int = 100,
+    ) -> Tuple[Job, bool]:
+        """Add a job to the caller's transaction.
+
+        Returns ``(job, created)``. When ``dedup_key`` matches a job that is
+        still queued or running, that job is returned with ``created=False``
+        and nothing is inserted. The job becomes visible to workers when the
+        caller commits.
+        """
+        if dedup_key:
+            existing = await self.find_active(db, dedup_key)
+            if existing:
+                return existing, False
+
+        job = Job(
+            kind=kind,
+            status=JobStatus.QUEUED.value,
+            payload=payload or {},
+            dedup_key=dedup_key,
+            active_key=dedup_key,
+            priority=priority,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            run_after=datetime.utcnow() + timedelta(seconds=delay),
+        )
+        try:
+            # Savepoint, so losing a dedup race does not roll back the caller's work
+            async with db.begin_nested():
+                db.add(job)
+        except IntegrityError:
+            existing = await self.find_active(db, dedup_key) if dedup_key else None
+            if existing is None:
+                raise
+            return existing, False
+
+        # Wake this process's idle workers as soon as the job is committed
+        event.listen(db.sync_session, "after_commit", lambda session: self._wake(), once=True)
+        return job, True
+
+    async def find_active(self, db: AsyncSession, dedup_key: str) -> Optional[Job]:
+        """The queued or running job holding ``dedup_key``, if any."""
+        result = await db.execute(select(Job).where(Job.active_key == dedup_key))
+        return result.scalar_one_or_none()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start the worker coroutines (called from the app lifespan)."""
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        print(f"[JobQueue] Started {self.workers} workers as {self.owner} ({len(self._handlers)} job kinds)")
+
+    async def stop(self):
+        """Stop the workers and hand their leases back for immediate pickup."""
+        running = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if running:
+            try:
+                await self._release(running)
+                print(f"[JobQueue] Released {len(running)} running jobs on shutdown")
+            except Exception as e:
+                print(f"[JobQueue] Could not release jobs on shutdown (leases will expire): {e}")
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[JobQueue] Worker {index} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._run(job)
+
+    def _claimable(self, now: datetime):
+        # Queued and due, or running under a lease nobody renewed (its worker died)
+        return or_(
+            and_(Job.status == JobStatus.QUEUED.value, Job.run_after <= now),
+            and_(Job.status == JobStatus.RUNNING.value, Job.lease_expires_at < now),
+        )
+
+    async def _claim(self) -> Optional[Job]:
+        now = datetime.utcnow()
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Job.id)
+                .where(self._claimable(now))
+                .order_by(Job.priority, Job.run_after, Job.id)
+                .limit(max(1, self.workers))
+            )
+            candidate_ids = result.scalars().all()
+            await db.commit()
+
+            for job_id in candidate_ids:
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, self._claimable(now))
+                    .values(
+                        status=JobStatus.RUNNING.value,
+                        lease_owner=self.owner,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        heartbeat_at=now,
+                        started_at=now,
+                        attempts=Job.attempts + 1,
+                        updated_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if result.rowcount == 1:
+                    self.counters["claimed"] += 1
+                    return await db.get(Job, job_id)
+        return None
+
+    async def _run(self, job: Job):
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            await self._finish(job, JobStatus.FAILED, error=f"No handler registered for job kind '{job.kind}'")
+            return
+        if job.attempts > job.max_attempts:
+            # Only reachable through expired leases - the worker keeps dying mid-job
+            await self._finish(job, JobStatus.FAILED, error=job.error or "Lease expired on every attempt")
+            return
+
+        print(f"[JobQueue] Running job {job.id} ({job.kind}), attempt {job.attempts}/{job.max_attempts}")
+        self._running[job.id] = job.kind
+        handler_task = asyncio.create_task(handler(dict(job.payload or {})))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, handler_task))
+        try:
+            result = await handler_task
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()):
+                raise
+            # The heartbeat lost the lease and stopped the handler; the job is someone else's now
+            print(f"[JobQueue] Job {job.id} ({job.kind}) cancelled after losing its lease")
+        except RetryJobLater as e:
+            await self._finish(job, JobStatus.QUEUED, retry_in=e.delay, refund_attempt=True)
+        except PermanentJobError as e:
+            print(f"[JobQueue] Job {job.id} ({job.kind}) failed permanently: {e}")
+            await self._finish(job, JobStatus.FAILED, error=str(e))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job.attempts < job.max_attempts:
+                delay = backoff_delay(job.attempts, self.retry_delay, self.retry_max_delay)
+                print(f"[JobQueue] Job {job.id} ({job.kind}) failed, retrying in {delay:.1f}s: {error}")
+                await self._finish(job, JobStatus.QUEUED, error=error, retry_in=delay)
+            else:
+                print(f"[JobQueue] Job {job.id} ({job.kind}) failed after {job.attempts} attempts: {error}")
+                await self._finish(job, JobStatus.FAILED, error=error)
+        else:
+            await self._finish(job, JobStatus.SUCCEEDED, result=result)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+
+    async def _heartbeat(self, job_id: int, handler_task: asyncio.Task) -> bool:
+        """Extend the job's lease until cancelled; on losing it, cancel the handler and return True."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                now = datetime.utcnow()
+                async with async_session_maker() as db:
+                    result = await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.lease_owner == self.owner, Job.status == JobStatus.RUNNING.value)
+                        .values(lease_expires_at=now + timedelta(seconds=self.lease_seconds), heartbeat_at=now)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                if result.rowcount == 0:
+                    # Someone else re-claimed it; stop duplicating their work
+                    self.counters["lease_lost"] += 1
+                    print(f"[JobQueue] Lost the lease on job {job_id}")
+                    handler_task.cancel()
+                    return True
+            except Exception as e:
+                print(f"[JobQueue] Heartbeat for job {job_id} failed: {e}")
+
+    async def _finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        retry_in: float = 0.0,
+        refund_attempt: bool = False,
+    ):
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {
+            "status": status.value,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+        if status == JobStatus.QUEUED:
+            values.update(error=error, run_after=now + timedelta(seconds=retry_in))
+            if refund_attempt:
+                values["attempts"] = Job.attempts - 1
+        else:
+            values.update(result=result, error=error, finished_at=now, active_key=None)
+
+        async with async_session_maker() as db:
+            outcome = await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.lease_owner == self.owner)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        if outcome.rowcount == 0:
+            self.counters["lease_lost"] += 1
+            print(f"[JobQueue] Job {job.id} was re-claimed elsewhere; dropping this outcome ({status.value})")
+            return
+        counter = {"queued": "retried", "succeeded": "succeeded", "failed": "failed"}[status.value]
+        self.counters["postponed" if refund_attempt else counter] += 1
+        if status == JobStatus.QUEUED and not refund_attempt:
+            self._wake()
+
+        hook = self._failure_hooks.get(job.kind)
+        if status == JobStatus.FAILED and hook:
+            try:
+                await hook(dict(job.payload or {}), error or "")
+            except Exception as e:
+                print(f"[JobQueue] Failure hook for job {job.id} ({job.kind}) raised: {e}")
+
+    async def _release(self, job_ids: List[int]):
+        """Put jobs this process was running back in the queue without penalty."""
+        async with async_session_maker() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids), Job.lease_owner == self.owner)
+                .values(
+                    status=JobStatus.QUEUED.value,
+                    attempts=Job.attempts - 1,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    run_after=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    async def stats(self, db: AsyncSession) -> Dict[str, Any]:
+        result = await db.execute(select(Job.status, func.count(Job.id)).group_by(Job.status))
+        return {
+            "owner": self.owner,
+            "workers": len(self._tasks),
+            "running_here": {str(job_id): kind for job_id, kind in self._running.items()},
+            "handlers": sorted(self._handlers),
+            "by_status": {status: count for status, count in result.all()},
+            **self.counters,
+        }
+
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_delay=settings.JOB_RETRY_DELAY_SECONDS,
+    retry_max_delay=settings.JOB_RETRY_MAX_DELAY_SECONDS,
+)
@@ -0,0 +1,168 @@
+"""
+Load balancing across several Kimi2 inference servers.
+
+``KIMI_API_URLS`` lists the replicas of the model. Each call is routed to the
+least-loaded healthy endpoint - scored by its in-flight count and recent
+latency - and every endpoint has its own circuit breaker, so a failing
+replica is ejected from rotation while the others keep serving. A request
+that fails on one replica is retried on a different one.
+"""
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.services.llm_circuit_breaker import CircuitBreaker
+
+
+def parse_endpoint_urls(urls: str, fallback: str) -> List[str]:
+    """Split a comma-separated URL list, dropping blanks and duplicates."""
+    result: List[str] = []
+    for url in (urls or "").split(","):
+        url = url.strip()
+        if url and url not in result:
+            result.append(url)
+    return result or [fallback]
+
+
+class LLMEndpoint:
+    """One inference server with its load, latency and health state."""
+
+    # Weight of the newest sample in the latency moving average
+    LATENCY_ALPHA = 0.3
+
+    def __init__(self, url: str, breaker: CircuitBreaker):
+        self.url = url
+        self.breaker = breaker
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.last_used = 0.0
+
+    def record_latency(self, seconds: float):
+        if self.ewma_latency is None:
+            self.ewma_latency = seconds
+        else:
+            self.ewma_latency += self.LATENCY_ALPHA * (seconds - self.ewma_latency)
+
+    def score(self, default_latency: float) -> float:
+        """Expected time to serve one more request - lower is better."""
+        latency = self.ewma_latency if self.ewma_latency is not None else default_latency
+        return (self.in_flight + 1) * max(latency, 0.001)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": not self.breaker.is_open,
+            "in_flight": self.in_flight,
+            "avg_latency_seconds": round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "circuit_breaker": self.breaker.stats(),
+        }
+
+
+class LLMBackendPool:
+    """Least-loaded, health-aware routing over a set of LLM endpoints."""
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.endpoints: List[LLMEndpoint] = [
+            LLMEndpoint(
+                url,
+                CircuitBreaker(
+                    failure_threshold=failure_threshold,
+                    recovery_timeout=recovery_timeout,
+                    half_open_max_calls=half_open_max_calls,
+                    name=url,
+                ),
+            )
+            for url in urls
+        ]
+        if not self.endpoints:
+            raise ValueError("LLMBackendPool needs at least one endpoint")
+        self.no_endpoint_available = 0
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    @property
+    def urls(self) -> List[str]:
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def healthy_endpoints(self) -> List[LLMEndpoint]:
+        return [endpoint for endpoint in self.endpoints if not endpoint.breaker.is_open]
+
+    def has_healthy(self, exclude: Iterable[str] = ()) -> bool:
+        """True if some healthy endpoint not in ``exclude`` could take a request."""
+        excluded = set(exclude)
+        return any(endpoint.url not in excluded for endpoint in self.healthy_endpoints())
+
+    def _default_latency(self) -> float:
+        # Endpoints without samples yet are scored like an average replica
+        known = [e.ewma_latency for e in self.endpoints if e.ewma_latency is not None]
+        return sum(known) / len(known) if known else 1.0
+
+    def acquire(self, exclude: Iterable[str] = ()) -> Optional[LLMEndpoint]:
+        """Pick the best endpoint and count the request against it.
+
+        Endpoints in ``exclude`` (already tried for this request) are only used
+        when no other healthy endpoint is left. Returns None when every
+        endpoint is ejected. Callers must pair this with :meth:`release`.
+        """
+        excluded = set(exclude)
+        default_latency = self._default_latency()
+        candidates = [e for e in self.healthy_endpoints() if e.url not in excluded]
+        if not candidates:
+            candidates = self.healthy_endpoints()
+
+        # Best score first; random tie-break so idle replicas share the load
+        candidates.sort(key=lambda e: (e.score(default_latency), random.random()))
+        for endpoint in candidates:
+            # allow_request takes the half-open probe slot for recovering replicas
+            if endpoint.breaker.allow_request():
+                endpoint.in_flight += 1
+                endpoint.requests += 1
+                endpoint.last_used = time.time()
+                return endpoint
+
+        self.no_endpoint_available += 1
+        return None
+
+    def release(
+        self,
+        endpoint: LLMEndpoint,
+        success: Optional[bool],
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ):
+        """Finish a request on ``endpoint``.
+
+        ``success`` is True/False for a completed request and None when it was
+        cancelled before the endpoint answered.
+        """
+        endpoint.in_flight = max(0, endpoint.in_flight - 1)
+        if success is None:
+            endpoint.breaker.record_cancelled()
+            return
+        if latency is not None:
+            endpoint.record_latency(latency)
+        if success:
+            endpoint.breaker.record_success()
+        else:
+            endpoint.failures += 1
+            endpoint.breaker.record_failure(error)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+            "healthy": len(self.healthy_endpoints()),
+            "total": len(self.endpoints),
+            "in_flight": sum(endpoint.in_flight for endpoint in self.endpoints),
+            "no_endpoint_available": self.no_endpoint_available,
+        }
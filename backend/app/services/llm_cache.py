@@ -0,0 +1,264 @@
+"""
+Content-addressed cache for Kimi2 LLM responses.
+
+Responses are keyed by a hash of (model, operation, messages, temperature,
+max_tokens), so identical prompts - e.g. re-evaluating an unchanged answer or generating specialization
+questions for the same track and difficulty - are answered without another
+LLM round trip. The cache has an in-memory LRU tier with TTL and an optional
+SQLite tier that survives restarts.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Per-operation cache policy: TTL in seconds. Operations not listed here are
+# not cached (candidate-specific generation, live feedback, Q&A, ...).
+CACHE_POLICIES = {
+    "evaluate_answer": 7 * 24 * 3600,
+    "speculative_evaluate_answer": 7 * 24 * 3600,
+    "evaluate_answers_batch": 7 * 24 * 3600,
+    "evaluate_challenge_task": 7 * 24 * 3600,
+    "generate_specialization_questions": 24 * 3600,
+    "extract_skills": 30 * 24 * 3600,
+    "determine_track": 30 * 24 * 3600,
+    "analyze_application": 24 * 3600,
+}
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    operation: str = "default",
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Stable hash of everything that determines an LLM response.
+
+    The operation is part of the key: operations with the same prompt (e.g.
+    evaluate_answer and speculative_evaluate_answer) run in different
+    scheduler lanes and must not share a cache entry or an in-flight call.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "operation": operation,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Small key/value store in its own SQLite file (not the app database)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    operation TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, operation: str, response: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, operation, response, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, operation, response, time.time(), expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self, operation: Optional[str] = None) -> int:
+        with self._lock:
+            if operation:
+                cursor = self._conn.execute("DELETE FROM llm_cache WHERE operation = ?", (operation,))
+            else:
+                cursor = self._conn.execute("DELETE FROM llm_cache")
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + optional SQLite) cache of raw LLM responses."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 24 * 3600,
+        db_path: Optional[str] = None,
+        policies: Optional[Dict[str, float]] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.policies = dict(CACHE_POLICIES if policies is None else policies)
+        # key -> (operation, response, expires_at)
+        self._memory: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._disk: Optional[_SQLiteTier] = None
+        if db_path:
+            try:
+                self._disk = _SQLiteTier(db_path)
+                print(f"[LLMCache] Disk tier enabled at {db_path}")
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Could not open disk tier at {db_path}: {e}")
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._op_counters: Dict[str, Dict[str, int]] = {}
+
+    def is_cacheable(self, operation: str) -> bool:
+        """True if the operation has opted in to caching."""
+        return operation in self.policies
+
+    def ttl_for(self, operation: str) -> float:
+        return self.policies.get(operation) or self.default_ttl
+
+    def _count(self, operation: str, field: str):
+        counters = self._op_counters.setdefault(operation, {"hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def _remember(self, key: str, operation: str, response: str, expires_at: float):
+        self._memory[key] = (operation, response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str, operation: str) -> Optional[str]:
+        """Look up a response, checking memory first and then the disk tier."""
+        entry = self._memory.get(key)
+        if entry:
+            _, response, expires_at = entry
+            if expires_at >= time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self._count(operation, "hits")
+                return response
+            del self._memory[key]
+
+        if self._disk:
+            try:
+                row = await asyncio.to_thread(self._disk.get, key)
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Disk read failed: {e}")
+                row = None
+            if row:
+                response, expires_at = row
+                self._remember(key, operation, response, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                self._count(operation, "hits")
+                return response
+
+        self.misses += 1
+        self._count(operation, "misses")
+        return None
+
+    async def set(self, key: str, operation: str, response: str, ttl: Optional[float] = None):
+        """Store a response in both tiers."""
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl_for(operation))
+        self._remember(key, operation, response, expires_at)
+        self.stores += 1
+        if self._disk:
+            try:
+                await asyncio.to_thread(self._disk.set, key, operation, response, expires_at)
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Disk write failed: {e}")
+
+    async def invalidate(self, key: str):
+        """Drop a single entry, e.g. when its response turned out to be unusable."""
+        self._memory.pop(key, None)
+        if self._disk:
+            try:
+                await asyncio.to_thread(self._disk.delete, key)
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Disk delete failed: {e}")
+
+    async def clear(self, operation: Optional[str] = None) -> int:
+        """Clear all entries, or only those for one operation. Returns entries removed."""
+        if operation:
+            keys = [k for k, v in self._memory.items() if v[0] == operation]
+        else:
+            keys = list(self._memory.keys())
+        for key in keys:
+            del self._memory[key]
+        removed = len(keys)
+        if self._disk:
+            try:
+                removed = max(removed, await asyncio.to_thread(self._disk.clear, operation))
+            except sqlite3.Error as e:
+                print(f"[LLMCache] Disk clear failed: {e}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        disk_entries = None
+        if self._disk:
+            try:
+                disk_entries = self._disk.count()
+            except sqlite3.Error:
+                pass
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": self._disk is not None,
+            "disk_entries": disk_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "operations": self._op_counters,
+            "policies": self.policies,
+        }
+
+    def close(self):
+        if self._disk:
+            self._disk.close()
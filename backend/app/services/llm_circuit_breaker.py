@@ -0,0 +1,136 @@
+"""
+Circuit breaker for the Kimi2 endpoint.
+
+After ``failure_threshold`` consecutive failures the breaker opens and every
+AIService call fails fast (callers fall back to their defaults immediately)
+instead of each one spending minutes on timeouts and retries. Once
+``recovery_timeout`` has passed the breaker goes half-open and lets a few
+probe requests through; a successful probe closes it again, a failed probe
+re-opens it.
+"""
+import time
+from typing import Any, Dict, Optional
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by all AIService methods."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        name: str = "kimi",
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._state = STATE_CLOSED
+        self._opened_at: Optional[float] = None
+        self._half_open_in_flight = 0
+        self.consecutive_failures = 0
+
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+        self.last_failure: Optional[str] = None
+        self.last_state_change = time.time()
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            print(f"[CircuitBreaker:{self.name}] {self._state} -> {state}")
+            self._state = state
+            self.last_state_change = time.time()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery timeout has passed."""
+        if self._state == STATE_OPEN and self._opened_at is not None:
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._set_state(STATE_HALF_OPEN)
+                self._half_open_in_flight = 0
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls should fail fast (does not consume a half-open probe)."""
+        state = self.state
+        if state == STATE_OPEN:
+            return True
+        return state == STATE_HALF_OPEN and self._half_open_in_flight >= self.half_open_max_calls
+
+    def allow_request(self) -> bool:
+        """Ask permission to send a request. In half-open state this takes a probe slot."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+            self._half_open_in_flight += 1
+            return True
+        self.rejected_calls += 1
+        return False
+
+    def record_rejected(self):
+        """Count a call that failed fast without asking for a probe slot."""
+        self.rejected_calls += 1
+
+    def record_success(self):
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        if self._state == STATE_HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+        if self._state != STATE_CLOSED:
+            self._set_state(STATE_CLOSED)
+            self._opened_at = None
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if error is not None:
+            self.last_failure = f"{type(error).__name__}: {error}"[:300]
+
+        if self._state == STATE_HALF_OPEN:
+            # Failed probe - back to open for another recovery period
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            self._trip()
+        elif self._state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def record_cancelled(self):
+        """Release a half-open probe slot whose request never completed."""
+        if self._state == STATE_HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _trip(self):
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._set_state(STATE_OPEN)
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker goes half-open (0 if not open)."""
+        if self.state != STATE_OPEN or self._opened_at is None:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout_seconds": self.recovery_timeout,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected_calls,
+            "total_failures": self.total_failures,
+            "total_successes": self.total_successes,
+            "last_failure": self.last_failure,
+            "last_state_change": self.last_state_change,
+        }
@@ -0,0 +1,147 @@
+"""
+Observed Kimi2 latency, adaptive timeouts and retry backoff.
+
+Each operation keeps a rolling window of recent call durations. Once enough
+samples exist its timeout becomes p99 x factor, clamped between a floor and
+the operation profile's timeout (the ceiling), so a stuck live-feedback call
+is abandoned after seconds while long question generation keeps its budget.
+Retries back off exponentially with full jitter and honour ``Retry-After``.
+"""
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, List, Optional
+
+
+# Upper bucket edges (seconds) used when exposing histograms
+BUCKET_EDGES = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 180, 300, 600)
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100.0 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[rank]
+
+
+class LatencyHistogram:
+    """Rolling window of call durations for one operation."""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=max(1, window))
+        self.count = 0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        # A timeout is a censored sample: the call took *at least* this long
+        self.samples.append(seconds)
+        self.count += 1
+        if timed_out:
+            self.timeouts += 1
+
+    def percentiles(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "p50": percentile(ordered, 50),
+            "p90": percentile(ordered, 90),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+    def buckets(self) -> Dict[str, int]:
+        counts = {f"le_{edge}": 0 for edge in BUCKET_EDGES}
+        counts["inf"] = 0
+        for sample in self.samples:
+            for edge in BUCKET_EDGES:
+                if sample <= edge:
+                    counts[f"le_{edge}"] += 1
+                    break
+            else:
+                counts["inf"] += 1
+        return counts
+
+
+class LatencyTracker:
+    """Per-operation latency histograms and the timeouts derived from them."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        window: int = 200,
+        min_samples: int = 20,
+        p99_factor: float = 2.0,
+        floor: float = 10.0,
+    ):
+        self.enabled = enabled
+        self.window = window
+        self.min_samples = max(1, min_samples)
+        self.p99_factor = p99_factor
+        self.floor = floor
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def _histogram(self, operation: str) -> LatencyHistogram:
+        histogram = self._histograms.get(operation)
+        if histogram is None:
+            histogram = self._histograms[operation] = LatencyHistogram(self.window)
+        return histogram
+
+    def record(self, operation: str, seconds: float, timed_out: bool = False):
+        self._histogram(operation).record(seconds, timed_out)
+
+    def timeout_for(self, operation: str, ceiling: float) -> float:
+        """Timeout for the next attempt: p99 x factor within [floor, ceiling].
+
+        Falls back to ``ceiling`` (the profile timeout) until the operation has
+        ``min_samples`` observations.
+        """
+        histogram = self._histograms.get(operation)
+        if not self.enabled or histogram is None or len(histogram.samples) < self.min_samples:
+            return ceiling
+        p99 = percentile(sorted(histogram.samples), 99)
+        return max(min(self.floor, ceiling), min(ceiling, p99 * self.p99_factor))
+
+    def stats(self, ceilings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        ceilings = ceilings or {}
+        operations = {}
+        for operation, histogram in self._histograms.items():
+            ceiling = ceilings.get(operation)
+            operations[operation] = {
+                "samples": len(histogram.samples),
+                "count": histogram.count,
+                "timeouts": histogram.timeouts,
+                **{k: round(v, 3) for k, v in histogram.percentiles().items()},
+                "current_timeout": round(self.timeout_for(operation, ceiling), 1) if ceiling else None,
+                "buckets": histogram.buckets(),
+            }
+        return {
+            "adaptive": self.enabled,
+            "p99_factor": self.p99_factor,
+            "floor_seconds": self.floor,
+            "min_samples": self.min_samples,
+            "window": self.window,
+            "operations": operations,
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    if base <= 0:
+        return 0.0
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
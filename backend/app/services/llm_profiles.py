@@ -0,0 +1,79 @@
+"""
+Per-operation generation profiles for Kimi2 calls.
+
+A three-hint live feedback blurb and a full question set should not reserve
+the same output budget or wait the same 300 s. Each AIService operation gets a
+profile with its own token cap, timeout, temperature, retry count and backoff.
+Any field can be overridden from Settings.LLM_PROFILE_OVERRIDES, e.g.
+
+    LLM_PROFILE_OVERRIDES='{"live_feedback": {"max_tokens": 256, "timeout": 20}}'
+"""
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Request budget and retry policy for one operation."""
+    max_tokens: int = 4096
+    timeout: float = 300.0  # seconds per attempt; the ceiling once timeouts adapt to observed latency
+    temperature: float = 0.7
+    max_retries: int = 3
+    retry_delay: float = 2.0  # base of the jittered exponential backoff, in seconds
+
+
+DEFAULT_PROFILE = GenerationProfile()
+
+DEFAULT_PROFILES: Dict[str, GenerationProfile] = {
+    # Interactive - small outputs, fail fast so the UI can fall back
+    "live_feedback": GenerationProfile(max_tokens=512, timeout=30.0, temperature=0.4, max_retries=1, retry_delay=0.5),
+    "candidate_question": GenerationProfile(max_tokens=768, timeout=45.0, temperature=0.5, max_retries=2, retry_delay=0.5),
+    "connection_test": GenerationProfile(max_tokens=64, timeout=30.0, temperature=0.1, max_retries=1, retry_delay=0.0),
+    # Evaluation
+    "evaluate_answer": GenerationProfile(max_tokens=1024, timeout=120.0, temperature=0.3),
+    "speculative_evaluate_answer": GenerationProfile(max_tokens=1024, timeout=120.0, temperature=0.3, max_retries=1),
+    "evaluate_answers_batch": GenerationProfile(max_tokens=4096, timeout=300.0, temperature=0.3),
+    "evaluate_challenge_task": GenerationProfile(max_tokens=1536, timeout=150.0, temperature=0.3),
+    # Generation - large structured outputs
+    "generate_questions": GenerationProfile(max_tokens=4096, timeout=300.0, temperature=0.7),
+    "generate_specialization_questions": GenerationProfile(max_tokens=4096, timeout=300.0, temperature=0.7),
+    "generate_specialization_test": GenerationProfile(max_tokens=4096, timeout=300.0, temperature=0.7),
+    "refill_question_pool": GenerationProfile(max_tokens=8192, timeout=420.0, temperature=0.8),
+    # Analysis
+    "generate_report": GenerationProfile(max_tokens=3072, timeout=240.0, temperature=0.5),
+    "generate_presentation": GenerationProfile(max_tokens=3072, timeout=240.0, temperature=0.5),
+    "analyze_application": GenerationProfile(max_tokens=2048, timeout=180.0, temperature=0.3),
+    "analyze_specialization": GenerationProfile(max_tokens=2048, timeout=180.0, temperature=0.3),
+    "analyze_suggestion": GenerationProfile(max_tokens=1024, timeout=120.0, temperature=0.3),
+    "extract_skills": GenerationProfile(max_tokens=1024, timeout=90.0, temperature=0.3),
+    "determine_track": GenerationProfile(max_tokens=512, timeout=60.0, temperature=0.3),
+    "role_fit": GenerationProfile(max_tokens=2048, timeout=180.0, temperature=0.5),
+}
+
+_PROFILE_FIELDS = {f.name: f.type for f in fields(GenerationProfile)}
+
+
+def build_profiles(
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    base: Optional[Dict[str, GenerationProfile]] = None,
+) -> Dict[str, GenerationProfile]:
+    """Merge Settings overrides into the default profiles.
+
+    Overrides may name operations that have no default profile (they start
+    from DEFAULT_PROFILE). Unknown fields are ignored with a warning.
+    """
+    profiles = dict(DEFAULT_PROFILES if base is None else base)
+    for operation, values in (overrides or {}).items():
+        profile = profiles.get(operation, DEFAULT_PROFILE)
+        changes = {}
+        for name, value in (values or {}).items():
+            if name not in _PROFILE_FIELDS:
+                print(f"[LLMProfiles] Ignoring unknown field '{name}' for {operation}")
+                continue
+            changes[name] = int(value) if name in ("max_tokens", "max_retries") else float(value)
+        profiles[operation] = replace(profile, **changes)
+    return profiles
+
+
+def profiles_as_dict(profiles: Dict[str, GenerationProfile]) -> Dict[str, Dict[str, Any]]:
+    return {operation: asdict(profile) for operation, profile in profiles.items()}
@@ -0,0 +1,200 @@
+"""
+Priority-aware concurrency scheduler for Kimi2 LLM calls.
+
+Every AIService call goes through a lane. Lanes are served in priority order
+(interactive first, analysis last) and each lane has its own in-flight limit,
+so a flood of answer evaluations can never push live feedback to the back of
+the line. Part of the global capacity is reserved for the interactive lane.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Any, Optional
+
+
+# Lanes in priority order - lower index is served first
+LANE_INTERACTIVE = "interactive"
+LANE_EVALUATION = "evaluation"
+LANE_GENERATION = "generation"
+LANE_ANALYSIS = "analysis"
+
+LANES = (LANE_INTERACTIVE, LANE_EVALUATION, LANE_GENERATION, LANE_ANALYSIS)
+
+# Map AIService operation names to scheduler lanes
+OPERATION_LANES = {
+    "live_feedback": LANE_INTERACTIVE,
+    "candidate_question": LANE_INTERACTIVE,
+    "connection_test": LANE_INTERACTIVE,
+    "evaluate_answer": LANE_EVALUATION,
+    "evaluate_answers_batch": LANE_EVALUATION,
+    "evaluate_challenge_task": LANE_EVALUATION,
+    "generate_questions": LANE_GENERATION,
+    "generate_specialization_questions": LANE_GENERATION,
+    "generate_specialization_test": LANE_GENERATION,
+    "generate_report": LANE_ANALYSIS,
+    "generate_presentation": LANE_ANALYSIS,
+    "analyze_application": LANE_ANALYSIS,
+    "analyze_specialization": LANE_ANALYSIS,
+    "analyze_suggestion": LANE_ANALYSIS,
+    "extract_skills": LANE_ANALYSIS,
+    "determine_track": LANE_ANALYSIS,
+    "role_fit": LANE_ANALYSIS,
+    # Background stock-keeping only ever uses leftover capacity
+    "refill_question_pool": LANE_ANALYSIS,
+    "speculative_evaluate_answer": LANE_ANALYSIS,
+}
+
+
+def lane_for_operation(operation: str) -> str:
+    """Get the scheduler lane for an AIService operation (defaults to analysis)."""
+    return OPERATION_LANES.get(operation, LANE_ANALYSIS)
+
+
+class _LaneState:
+    """Bookkeeping for a single lane."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.max_queue_depth = 0
+        self.started = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self.waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "started": self.started,
+            "completed": self.completed,
+            "avg_wait_seconds": round(self.total_wait / self.started, 3) if self.started else 0.0,
+            "max_wait_seconds": round(self.max_wait, 3),
+        }
+
+
+class LLMScheduler:
+    """Admission control for LLM calls with per-lane limits and strict lane priority.
+
+    A call may start when its lane is below its own limit and the global
+    in-flight count is below the total limit. Non-interactive lanes must also
+    leave ``reserved_interactive`` slots free, so background work soaks up the
+    remaining capacity without starving the candidate-facing lane.
+    """
+
+    def __init__(
+        self,
+        total_limit: int,
+        lane_limits: Dict[str, int],
+        reserved_interactive: int = 0,
+    ):
+        self.total_limit = max(1, total_limit)
+        self.reserved_interactive = max(0, min(reserved_interactive, self.total_limit - 1))
+        self.lanes: Dict[str, _LaneState] = {
+            lane: _LaneState(lane_limits.get(lane, self.total_limit)) for lane in LANES
+        }
+        self.in_flight = 0
+
+    def _can_start(self, lane: str) -> bool:
+        state = self.lanes[lane]
+        if state.in_flight >= state.limit:
+            return False
+        capacity = self.total_limit
+        if lane != LANE_INTERACTIVE:
+            capacity -= self.reserved_interactive
+        return self.in_flight < capacity
+
+    def _dispatch(self):
+        """Hand free slots to queued callers, highest-priority lane first."""
+        for lane in LANES:
+            state = self.lanes[lane]
+            while state.waiters and self._can_start(lane):
+                waiter = state.waiters.popleft()
+                if waiter.done():
+                    continue
+                # Reserve the slot now so later lanes see it as taken
+                state.in_flight += 1
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self, lane: str) -> float:
+        """Wait for a slot in ``lane``. Returns the time spent queued in seconds."""
+        if lane not in self.lanes:
+            lane = LANE_ANALYSIS
+        state = self.lanes[lane]
+        enqueued_at = time.monotonic()
+
+        # Queue first, then dispatch: this keeps strict lane priority even when
+        # a slot happens to be free at the moment we arrive
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self._dispatch()
+        if not waiter.done():
+            state.max_queue_depth = max(state.max_queue_depth, len(state.waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted just as we were cancelled - give it back
+                state.in_flight -= 1
+                self.in_flight -= 1
+                self._dispatch()
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+        # Slot counters were already bumped by _dispatch; record the wait
+        wait = time.monotonic() - enqueued_at
+        state.started += 1
+        state.total_wait += wait
+        state.max_wait = max(state.max_wait, wait)
+        return wait
+
+    def release(self, lane: str):
+        """Free a slot in ``lane`` and wake the next eligible caller."""
+        if lane not in self.lanes:
+            lane = LANE_ANALYSIS
+        state = self.lanes[lane]
+        state.in_flight -= 1
+        state.completed += 1
+        self.in_flight -= 1
+        self._dispatch()
+
+    def has_spare_capacity(self, free_slots: int = 1) -> bool:
+        """True when no lane has queued callers and at least ``free_slots``
+        non-interactive slots are free, i.e. optional work would delay nobody.
+
+        Reflects this process only; other API processes have their own scheduler.
+        """
+        if any(state.waiters for state in self.lanes.values()):
+            return False
+        return self.in_flight + free_slots <= self.total_limit - self.reserved_interactive
+
+    @asynccontextmanager
+    async def slot(self, lane: str):
+        """Async context manager holding one slot in ``lane`` for the duration of a call."""
+        if lane not in self.lanes:
+            lane = LANE_ANALYSIS
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def stats(self, lane: Optional[str] = None) -> Dict[str, Any]:
+        """Queue depth, in-flight and wait-time statistics per lane."""
+        if lane:
+            return self.lanes[lane].stats()
+        return {
+            "total_limit": self.total_limit,
+            "reserved_interactive": self.reserved_interactive,
+            "in_flight": self.in_flight,
+            "lanes": {name: state.stats() for name, state in self.lanes.items()},
+        }
@@ -0,0 +1,52 @@
+"""
+Single-flight coalescing for identical in-flight LLM requests.
+
+When the same prompt is requested again while the first request is still
+running (double-clicked submit, frontend retry of /answers/feedback, ...),
+the later callers await the first call's result instead of issuing their own
+HTTP request to Kimi2.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self._coalesced_by_operation: Dict[str, int] = {}
+
+    async def do(self, key: str, operation: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        The shared call runs as its own task, so a caller that is cancelled
+        (e.g. the client disconnected) does not cancel it for the others.
+        """
+        task = self._calls.get(key)
+        if task is not None and not task.done():
+            self.coalesced += 1
+            self._coalesced_by_operation[operation] = self._coalesced_by_operation.get(operation, 0) + 1
+            print(f"[SingleFlight] Coalesced duplicate {operation} request")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        self.leaders += 1
+
+        def _forget(finished: asyncio.Task):
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+
+        task.add_done_callback(_forget)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "leader_calls": self.leaders,
+            "coalesced_calls": self.coalesced,
+            "coalesced_by_operation": dict(self._coalesced_by_operation),
+        }
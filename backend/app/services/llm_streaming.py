@@ -0,0 +1,87 @@
+"""
+Helpers for streamed (``stream: true``) Kimi2 chat completions.
+
+The OpenAI-compatible endpoint sends Server-Sent Events whose ``data:`` lines
+carry ``choices[0].delta.content`` chunks and end with ``data: [DONE]``. These
+helpers parse that stream, pull a readable string field out of a JSON object
+that is still being generated, and format events for our own SSE endpoints.
+"""
+import json
+from typing import Any, Dict, Optional
+
+
+STREAM_DONE = object()
+
+
+def parse_stream_line(line: str) -> Any:
+    """Parse one line of an OpenAI-style SSE stream.
+
+    Returns the content delta (possibly ""), ``STREAM_DONE`` for the final
+    ``[DONE]`` marker, or None for blank lines, comments and non-data fields.
+    """
+    line = line.strip()
+    if not line.startswith("data:"):
+        return None
+    payload = line[len("data:"):].strip()
+    if payload == "[DONE]":
+        return STREAM_DONE
+    try:
+        chunk = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    choices = chunk.get("choices") or [{}]
+    delta = choices[0].get("delta") or {}
+    return delta.get("content") or ""
+
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def partial_json_string(buffer: str, field: str) -> Optional[str]:
+    """Decoded value of ``"field": "..."`` in a possibly incomplete JSON text.
+
+    Used to show the human-readable part of a JSON response (e.g. the
+    ``answer`` of a candidate Q&A reply) while the rest is still streaming.
+    Returns None until the field's opening quote has arrived.
+    """
+    key = f'"{field}"'
+    start = buffer.find(key)
+    if start < 0:
+        return None
+    i = start + len(key)
+    n = len(buffer)
+    while i < n and buffer[i] in " \t\r\n:":
+        i += 1
+    if i >= n or buffer[i] != '"':
+        return None
+    i += 1
+
+    out = []
+    while i < n:
+        ch = buffer[i]
+        if ch == '"':
+            break
+        if ch == "\\":
+            if i + 1 >= n:
+                break  # Escape split across chunks - wait for the rest
+            esc = buffer[i + 1]
+            if esc == "u":
+                if i + 6 > n:
+                    break
+                try:
+                    out.append(chr(int(buffer[i + 2:i + 6], 16)))
+                except ValueError:
+                    pass
+                i += 6
+                continue
+            out.append(_ESCAPES.get(esc, esc))
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event for a StreamingResponse."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
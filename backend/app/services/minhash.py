@@ -0,0 +1,138 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection.
+
+Comparing every new text with every stored one is O(n) per lookup and O(n^2)
+for a batch. Instead each text is reduced to a set of shingles and then to a
+fixed-size MinHash signature; the fraction of equal signature positions
+estimates the Jaccard similarity of the shingle sets. The signature is cut
+into ``bands`` bands of ``rows`` values and each band is hashed to a bucket
+key: two texts share at least one bucket with high probability when their
+similarity is above roughly (1/bands)^(1/rows), so only texts that share a
+bucket need to be compared.
+
+Hashing is deterministic (crc32 shingle hashes, fixed-seed permutations), so
+signatures and bucket keys can be stored and compared across processes.
+Used by app/services/question_similarity.py and app/services/answer_similarity.py.
+"""
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+import numpy as np
+
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidates from about 0.7 similarity upwards
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+|[^\sa-z0-9_]")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercased word and symbol tokens; whitespace and formatting are ignored."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    """Set of k-token shingles (the whole text as one shingle when shorter than k)."""
+    tokens = normalize_tokens(text)
+    if len(tokens) <= k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+class MinHasher:
+    """Computes MinHash signatures with ``num_perm`` fixed universal hash permutations."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        self.num_perm = num_perm
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: Iterable[str]) -> np.ndarray:
+        """uint32 signature of a shingle set (all-max for an empty set)."""
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode("utf-8")) for item in set(items)), dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, (1 << 32) - 1, dtype=np.uint32)
+        # uint64 arithmetic wraps on overflow, which is fine: it is still a fixed permutation
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def band_keys(signature: np.ndarray, bands: int = BANDS, salt: bytes = b"") -> List[int]:
+    """One signed 64-bit bucket key per band (fits a BigInteger column).
+
+    ``salt`` scopes the keys, so one bucket table can hold separate indexes.
+    """
+    rows = len(signature) // bands
+    data = signature.astype("<u4").tobytes()
+    width = rows * 4
+    keys = []
+    for band in range(bands):
+        digest = hashlib.blake2b(salt + bytes([band]) + data[band * width:(band + 1) * width], digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+class LSHIndex:
+    """In-memory LSH index for batch jobs: add signatures, query for candidates.
+
+    With ``max_bucket_size`` set, a full bucket stops accepting keys. Batch
+    clustering uses this to stay linear when thousands of texts are near
+    copies of each other: a newcomer still lands in the cluster through the
+    members already in the bucket.
+    """
+
+    def __init__(self, bands: int = BANDS, salt: bytes = b"", max_bucket_size: Optional[int] = None):
+        self.bands = bands
+        self.salt = salt
+        self.max_bucket_size = max_bucket_size
+        self._buckets: Dict[int, List[Hashable]] = defaultdict(list)
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+
+    def keys(self, signature: np.ndarray) -> List[int]:
+        return band_keys(signature, self.bands, self.salt)
+
+    def add(self, key: Hashable, signature: np.ndarray, buckets: Optional[List[int]] = None):
+        """Index ``signature`` under ``key`` (``buckets`` saves recomputing its keys)."""
+        self.signatures[key] = signature
+        for bucket in buckets if buckets is not None else self.keys(signature):
+            members = self._buckets[bucket]
+            if self.max_bucket_size is None or len(members) < self.max_bucket_size:
+                members.append(key)
+
+    def candidates(self, signature: np.ndarray, buckets: Optional[List[int]] = None) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for bucket in buckets if buckets is not None else self.keys(signature):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Hashable]:
+        """Indexed keys whose estimated similarity to ``signature`` is at least ``threshold``."""
+        return [
+            key for key in self.candidates(signature)
+            if similarity(signature, self.signatures[key]) >= threshold
+        ]
+
+
+minhasher = MinHasher()
@@ -0,0 +1,62 @@
+"""
+Registry of prebuilt static prompt prefixes.
+
+The inference server reuses its KV cache for a prompt prefix it has already
+seen, but only when the bytes are identical. Prompts are therefore laid out
+as a static system message, built once here and shared by every call, and a
+user message carrying everything call-specific (category, difficulty,
+rubric, the candidate's answer, ...).
+
+Builders run at startup; call ``rebuild()`` when their inputs change, e.g.
+after the knowledge base is reloaded.
+"""
+import hashlib
+from typing import Any, Callable, Dict, List
+
+
+class PromptPrefixRegistry:
+    """Named static system prompts, built once and reused verbatim."""
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], str]] = {}
+        self._prefixes: Dict[str, str] = {}
+        self.builds = 0
+
+    def register(self, name: str, builder: Callable[[], str]):
+        """Register a zero-argument builder for the prefix ``name``."""
+        self._builders[name] = builder
+        self._prefixes.pop(name, None)
+
+    def rebuild(self, name: str = None):
+        """(Re)build one prefix, or all of them."""
+        names = [name] if name else list(self._builders)
+        for prefix_name in names:
+            self._prefixes[prefix_name] = self._builders[prefix_name]()
+            self.builds += 1
+
+    def get(self, name: str) -> str:
+        prefix = self._prefixes.get(name)
+        if prefix is None:
+            self.rebuild(name)
+            prefix = self._prefixes[name]
+        return prefix
+
+    def messages(self, name: str, user_content: str) -> List[Dict[str, str]]:
+        """Chat messages with the static prefix first and the dynamic part last."""
+        return [
+            {"role": "system", "content": self.get(name)},
+            {"role": "user", "content": user_content},
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and fingerprint of each prefix - the fingerprint only changes on rebuild."""
+        return {
+            "builds": self.builds,
+            "prefixes": {
+                name: {
+                    "chars": len(prefix),
+                    "sha256": hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:12],
+                }
+                for name, prefix in self._prefixes.items()
+            },
+        }
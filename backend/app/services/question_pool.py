@@ -0,0 +1,313 @@
+"""
+Pre-generated question pool per (category, difficulty, track).
+
+Test creation used to call the LLM for every generic category section, so a
+new test cost minutes of LLM time. The ``question_pool`` table now holds a
+stock of candidate-independent questions per pool key:
+
+- ``PoolDraws.draw`` is passed to ``ai_service.generate_test_questions``
+  as its ``question_source``. It claims unused rows for a category with a
+  compare-and-set UPDATE (safe across processes) and returns them; when the
+  key is dry it returns None and that section is generated live as before.
+  Claims are committed at once (generation takes minutes, too long to hold
+  a write transaction), so the caller ``keep``s the questions it saved with
+  its test and every other drawn question is released back to stock when
+  the ``PoolDraws`` is closed - a failed test creation uses up nothing.
+- Whenever a draw leaves fewer than QUESTION_POOL_REFILL_BELOW questions (or
+  finds none), a deduplicated "refill_question_pool" job tops the key back up
+  to QUESTION_POOL_TARGET in batches, in the lowest-priority LLM lane.
+  Near-duplicates of indexed questions are rejected before insert
+  (app/services/question_similarity.py).
+
+Pooled questions are generic - they are not tailored to the candidate's
+skills or resume. Knowledge-base sections are unaffected. The pool is
+opt-in (QUESTION_POOL_ENABLED): filling it spends LLM capacity up front.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Job, PooledQuestion
+from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue
+from app.services.question_similarity import SOURCE_POOL, question_index
+
+
+# Behind candidate-facing work, ahead of speculative scoring
+REFILL_JOB_PRIORITY = 300
+
+
+def pool_key(category: str, difficulty: str, track_id: Optional[str]) -> str:
+    return f"{category}:{difficulty}:{track_id or '-'}"
+
+
+def _in_stock(category: str, difficulty: str, track_id: Optional[str]):
+    return and_(
+        PooledQuestion.category == category,
+        PooledQuestion.difficulty == difficulty,
+        PooledQuestion.track_id == track_id,  # IS NULL when track_id is None
+        PooledQuestion.drawn_at.is_(None),
+    )
+
+
+class QuestionPool:
+    """Draw and refill logic for the ``question_pool`` table."""
+
+    def __init__(self, enabled: bool = False, target: int = 40, refill_below: int = 20, batch_size: int = 8):
+        self.enabled = enabled
+        self.target = target
+        self.refill_below = min(refill_below, target)
+        self.batch_size = max(1, batch_size)
+        self.counters = {"hits": 0, "misses": 0, "drawn": 0, "released": 0, "generated": 0}
+
+    def draws(self) -> "PoolDraws":
+        """Track the questions one test creation draws; see PoolDraws."""
+        return PoolDraws(self)
+
+    async def draw(
+        self,
+        category: str,
+        difficulty: str,
+        track_id: Optional[str],
+        count: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Claim ``count`` unused questions for the key, or None if it cannot supply them all."""
+        if not self.enabled or count <= 0:
+            return None
+
+        async with async_session_maker() as db:
+            # Random order so concurrent draws rarely contend for the same rows
+            result = await db.execute(
+                select(PooledQuestion.id)
+                .where(_in_stock(category, difficulty, track_id))
+                .order_by(func.random())
+                .limit(count * 3)
+            )
+            candidate_ids = result.scalars().all()
+
+            claimed: List[int] = []
+            now = datetime.utcnow()
+            for question_id in candidate_ids:
+                outcome = await db.execute(
+                    update(PooledQuestion)
+                    .where(PooledQuestion.id == question_id, PooledQuestion.drawn_at.is_(None))
+                    .values(drawn_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                if outcome.rowcount == 1:
+                    claimed.append(question_id)
+                    if len(claimed) == count:
+                        break
+
+            if len(claimed) < count:
+                # Not enough stock: give back what we took and let the caller generate live
+                await db.rollback()
+                self.counters["misses"] += 1
+                await self.request_refill(db, category, difficulty, track_id)
+                await db.commit()
+                print(f"[QuestionPool] Miss for {pool_key(category, difficulty, track_id)} "
+                      f"(wanted {count}, {len(candidate_ids)} in stock)")
+                return None
+
+            result = await db.execute(select(PooledQuestion).where(PooledQuestion.id.in_(claimed)))
+            rows = {row.id: row for row in result.scalars().all()}
+            questions = [
+                {
+                    "question_text": row.question_text,
+                    "question_code": row.question_code,
+                    "expected_answer": row.expected_answer,
+                    "hints": row.hints or [],
+                    "pool_id": row.id,
+                    "fingerprint_id": row.fingerprint_id,
+                }
+                for row in (rows[question_id] for question_id in claimed)
+            ]
+
+            remaining = await self.available(db, category, difficulty, track_id)
+            if remaining < self.refill_below:
+                await self.request_refill(db, category, difficulty, track_id)
+            await db.commit()
+
+        self.counters["hits"] += 1
+        self.counters["drawn"] += len(questions)
+        return questions
+
+    async def release(self, pool_ids: Iterable[int]) -> int:
+        """Put drawn questions back in stock; returns how many were released."""
+        pool_ids = list(pool_ids)
+        if not pool_ids:
+            return 0
+        async with async_session_maker() as db:
+            result = await db.execute(
+                update(PooledQuestion)
+                .where(PooledQuestion.id.in_(pool_ids), PooledQuestion.drawn_at.is_not(None))
+                .values(drawn_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.counters["released"] += result.rowcount
+        return result.rowcount
+
+    async def available(self, db: AsyncSession, category: str, difficulty: str, track_id: Optional[str]) -> int:
+        result = await db.execute(
+            select(func.count(PooledQuestion.id)).where(_in_stock(category, difficulty, track_id))
+        )
+        return result.scalar() or 0
+
+    async def request_refill(
+        self,
+        db: AsyncSession,
+        category: str,
+        difficulty: str,
+        track_id: Optional[str],
+    ) -> Job:
+        """Queue a top-up of the key (deduplicated; committed by the caller)."""
+        job, _ = await job_queue.enqueue(
+            db, "refill_question_pool",
+            {"category": category, "difficulty": difficulty, "track_id": track_id},
+            dedup_key=f"refill_question_pool:{pool_key(category, difficulty, track_id)}",
+            priority=REFILL_JOB_PRIORITY,
+        )
+        return job
+
+    async def refill(self, category: str, difficulty: str, track_id: Optional[str]) -> int:
+        """Generate questions until the key holds ``target`` unused ones. Returns how many were added."""
+        key = pool_key(category, difficulty, track_id)
+        added = 0
+        # Bounded in case the model keeps returning short batches
+        for _ in range(self.target // self.batch_size + 3):
+            async with async_session_maker() as db:
+                missing = self.target - await self.available(db, category, difficulty, track_id)
+                await db.commit()
+            if missing <= 0:
+                break
+
+            questions = await ai_service.generate_pool_questions(
+                category, difficulty, track_id, min(self.batch_size, missing)
+            )
+            if not questions:
+                raise RuntimeError(f"No questions generated for {key}")
+            questions = await question_index.accept(questions, SOURCE_POOL)
+
+            async with async_session_maker() as db:
+                db.add_all([
+                    PooledQuestion(
+                        category=category,
+                        difficulty=difficulty,
+                        track_id=track_id,
+                        question_text=q["question_text"],
+                        question_code=q.get("question_code"),
+                        expected_answer=q.get("expected_answer"),
+                        hints=q.get("hints"),
+                        fingerprint_id=q.get("fingerprint_id"),
+                    )
+                    for q in questions
+                ])
+                await db.commit()
+            added += len(questions)
+            self.counters["generated"] += len(questions)
+
+        print(f"[QuestionPool] Refilled {key} with {added} questions")
+        return added
+
+    async def levels(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Stock per pool key: unused and drawn counts, and whether a refill is queued."""
+        result = await db.execute(
+            select(
+                PooledQuestion.category,
+                PooledQuestion.difficulty,
+                PooledQuestion.track_id,
+                func.count(PooledQuestion.id).filter(PooledQuestion.drawn_at.is_(None)),
+                func.count(PooledQuestion.drawn_at),
+            )
+            .group_by(PooledQuestion.category, PooledQuestion.difficulty, PooledQuestion.track_id)
+            .order_by(PooledQuestion.category, PooledQuestion.difficulty, PooledQuestion.track_id)
+        )
+        rows = result.all()
+
+        keys = [f"refill_question_pool:{pool_key(c, d, t)}" for c, d, t, _, _ in rows]
+        refilling = set()
+        if keys:
+            active = await db.execute(select(Job.active_key).where(Job.active_key.in_(keys)))
+            refilling = set(active.scalars().all())
+
+        return [
+            {
+                "category": category,
+                "difficulty": difficulty,
+                "track_id": track_id,
+                "available": available,
+                "drawn": drawn,
+                "target": self.target,
+                "refill_pending": f"refill_question_pool:{pool_key(category, difficulty, track_id)}" in refilling,
+            }
+            for category, difficulty, track_id, available, drawn in rows
+        ]
+
+
+class PoolDraws:
+    """The pooled questions drawn for one test, released unless the test keeps them.
+
+    Use as ``async with question_pool.draws() as draws`` (or through the
+    ``pool_draws`` dependency) and pass ``draws.draw`` as the question
+    source. Call ``keep`` with the questions once they are committed as part
+    of the test; on exit every other drawn question goes back to stock.
+    """
+
+    def __init__(self, pool: QuestionPool):
+        self.pool = pool
+        self._unsaved: Set[int] = set()
+
+    async def draw(
+        self,
+        category: str,
+        difficulty: str,
+        track_id: Optional[str],
+        count: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        questions = await self.pool.draw(category, difficulty, track_id, count)
+        if questions:
+            self._unsaved.update(q["pool_id"] for q in questions)
+        return questions
+
+    def keep(self, questions: Iterable[Dict[str, Any]]):
+        """Mark questions as saved with the test (questions not from the pool are ignored)."""
+        self._unsaved.difference_update(q.get("pool_id") for q in questions)
+
+    async def release(self) -> int:
+        """Return every drawn question that was not kept to stock."""
+        unsaved, self._unsaved = self._unsaved, set()
+        released = await self.pool.release(unsaved)
+        if released:
+            print(f"[QuestionPool] Released {released} drawn questions that were not used")
+        return released
+
+    async def __aenter__(self) -> "PoolDraws":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+
+async def pool_draws():
+    """FastAPI dependency: a PoolDraws released when the request ends."""
+    async with question_pool.draws() as draws:
+        yield draws
+
+
+question_pool = QuestionPool(
+    enabled=settings.QUESTION_POOL_ENABLED,
+    target=settings.QUESTION_POOL_TARGET,
+    refill_below=settings.QUESTION_POOL_REFILL_BELOW,
+    batch_size=settings.QUESTION_POOL_BATCH_SIZE,
+)
+
+
+@job_queue.handler("refill_question_pool")
+async def _refill_question_pool_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    added = await question_pool.refill(payload["category"], payload["difficulty"], payload.get("track_id"))
+    return {"added": added}
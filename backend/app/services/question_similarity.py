@@ -0,0 +1,235 @@
+"""
+Near-duplicate detection for questions.
+
+Every distinct question text (+ code) gets a ``question_fingerprints`` row
+with its MinHash signature, and one ``question_lsh_buckets`` row per LSH band
+(see app/services/minhash.py). Finding questions similar to a new one is an
+indexed lookup of its 16 band buckets followed by signature comparison with
+the few fingerprints found there, so it stays fast however many questions
+are stored.
+
+The index is maintained incrementally:
+
+- ``QuestionIndex.accept`` filters freshly generated questions - live test
+  generation (the ``question_filter`` of generate_test_questions), question
+  pool refills and competition pool provisioning - dropping those that
+  near-duplicate a question accepted within the last QUESTION_DEDUP_WINDOW_DAYS
+  (including earlier questions of the same batch) and indexing the rest.
+  The window keeps the check to the current cohort: older questions age out
+  instead of rejecting ever more of what the generator produces, and come
+  back into it when a copy of them is accepted again. Accepted
+  dicts carry ``fingerprint_id`` so the Question rows created from them link
+  back to the index.
+- The "index_questions" job backfills questions created before the index
+  existed, or by paths that do not generate (knowledge base, specialization).
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Question, QuestionFingerprint, QuestionLSHBucket
+from app.services.job_queue import job_queue
+from app.services.minhash import (
+    band_keys, minhasher, normalize_tokens, shingles, signature_from_bytes, signature_to_bytes, similarity,
+)
+
+
+SOURCE_TEST = "test"
+SOURCE_POOL = "pool"
+SOURCE_COMPETITION = "competition"
+SOURCE_BACKFILL = "backfill"
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _content(question_text: Optional[str], question_code: Optional[str]) -> str:
+    return f"{question_text or ''}\n{question_code or ''}"
+
+
+def question_content_hash(question_text: Optional[str], question_code: Optional[str]) -> str:
+    """Hash of the normalized text + code, identical for copies that differ only in formatting."""
+    normalized = " ".join(normalize_tokens(_content(question_text, question_code)))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class QuestionIndex:
+    """Lookup and maintenance of the persistent question LSH index."""
+
+    def __init__(self, enabled: bool = True, threshold: float = 0.7, window_days: int = 30):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.window_days = window_days
+        self.counters = {"indexed": 0, "rejected": 0}
+
+    async def find_similar(
+        self,
+        db: AsyncSession,
+        question_text: Optional[str],
+        question_code: Optional[str] = None,
+        threshold: Optional[float] = None,
+        limit: int = 20,
+        exclude_fingerprint_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Tuple[QuestionFingerprint, float]]:
+        """Indexed questions at or above ``threshold`` similarity, most similar first.
+
+        With ``since``, only fingerprints accepted at or after it are considered.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = minhasher.signature(shingles(_content(question_text, question_code)))
+
+        result = await db.execute(
+            select(QuestionLSHBucket.fingerprint_id)
+            .where(QuestionLSHBucket.bucket.in_(band_keys(signature)))
+            .distinct()
+        )
+        candidate_ids = [fid for fid in result.scalars().all() if fid != exclude_fingerprint_id]
+        if not candidate_ids:
+            return []
+
+        query = select(QuestionFingerprint).where(QuestionFingerprint.id.in_(candidate_ids))
+        if since is not None:
+            query = query.where(QuestionFingerprint.accepted_at >= since)
+        result = await db.execute(query)
+        matches = []
+        for fingerprint in result.scalars().all():
+            score = similarity(signature, signature_from_bytes(fingerprint.signature))
+            if score >= threshold:
+                matches.append((fingerprint, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+    async def index(
+        self,
+        db: AsyncSession,
+        question_text: Optional[str],
+        question_code: Optional[str],
+        source: str,
+    ) -> QuestionFingerprint:
+        """Fingerprint for this content, creating it (and its buckets) if new."""
+        content_hash = question_content_hash(question_text, question_code)
+        existing = await db.execute(
+            select(QuestionFingerprint).where(QuestionFingerprint.content_hash == content_hash)
+        )
+        fingerprint = existing.scalar_one_or_none()
+        if fingerprint:
+            return fingerprint
+
+        signature = minhasher.signature(shingles(_content(question_text, question_code)))
+        fingerprint = QuestionFingerprint(
+            content_hash=content_hash,
+            signature=signature_to_bytes(signature),
+            source=source,
+            sample_text=(question_text or "")[:500],
+            created_at=datetime.utcnow(),
+        )
+        try:
+            # Savepoint, so losing an insert race does not roll back the caller's work
+            async with db.begin_nested():
+                db.add(fingerprint)
+                await db.flush()
+                db.add_all([
+                    QuestionLSHBucket(bucket=bucket, fingerprint_id=fingerprint.id)
+                    for bucket in set(band_keys(signature))
+                ])
+        except IntegrityError:
+            existing = await db.execute(
+                select(QuestionFingerprint).where(QuestionFingerprint.content_hash == content_hash)
+            )
+            return existing.scalar_one()
+
+        self.counters["indexed"] += 1
+        return fingerprint
+
+    async def accept(self, questions: List[Dict[str, Any]], source: str) -> List[Dict[str, Any]]:
+        """Drop near-duplicates from freshly generated ``questions`` and index the rest.
+
+        Only questions accepted within the last ``window_days`` count; an
+        accepted copy of an older question reuses (and renews) its
+        fingerprint. Returns the accepted question dicts with ``fingerprint_id`` set.
+        """
+        if not self.enabled or not questions:
+            return questions
+
+        since = datetime.utcnow() - timedelta(days=self.window_days) if self.window_days > 0 else None
+        accepted = []
+        async with async_session_maker() as db:
+            for question in questions:
+                text, code = question.get("question_text"), question.get("question_code")
+                if not text:
+                    continue
+                matches = await self.find_similar(db, text, code, limit=1, since=since)
+                if matches:
+                    fingerprint, score = matches[0]
+                    self.counters["rejected"] += 1
+                    print(f"[QuestionIndex] Rejected {source} question ({score:.2f} similar to fingerprint {fingerprint.id}): {text[:60]!r}")
+                    continue
+                fingerprint = await self.index(db, text, code, source)
+                fingerprint.accepted_at = datetime.utcnow()
+                accepted.append({**question, "fingerprint_id": fingerprint.id})
+            await db.commit()
+        return accepted
+
+    async def filter_generated(self, category: str, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """``question_filter`` hook for generate_test_questions."""
+        return await self.accept(questions, SOURCE_TEST)
+
+
+question_index = QuestionIndex(
+    enabled=settings.QUESTION_DEDUP_ENABLED,
+    threshold=settings.QUESTION_DEDUP_THRESHOLD,
+    window_days=settings.QUESTION_DEDUP_WINDOW_DAYS,
+)
+
+
+async def enqueue_backfill(db: AsyncSession):
+    """Queue indexing of every question without a fingerprint (committed by the caller)."""
+    job, _ = await job_queue.enqueue(db, "index_questions", {}, dedup_key="index_questions", priority=400)
+    return job
+
+
+@job_queue.handler("index_questions")
+async def _index_questions_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fingerprint unindexed questions in id order, one committed batch at a time."""
+    indexed = 0
+    last_id = 0
+    while True:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Question)
+                .where(Question.fingerprint_id.is_(None), Question.id > last_id)
+                .order_by(Question.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            )
+            questions = result.scalars().all()
+            if not questions:
+                break
+            for question in questions:
+                fingerprint = await question_index.index(
+                    db, question.question_text, question.question_code, SOURCE_BACKFILL
+                )
+                question.fingerprint_id = fingerprint.id
+            last_id = questions[-1].id
+            indexed += len(questions)
+            await db.commit()
+
+    print(f"[QuestionIndex] Backfilled fingerprints for {indexed} questions")
+    return {"indexed": indexed}
+
+
+async def fingerprint_usage(db: AsyncSession, fingerprint_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """fingerprint id -> (number of questions using it, first such question id)."""
+    if not fingerprint_ids:
+        return {}
+    result = await db.execute(
+        select(Question.fingerprint_id, func.count(Question.id), func.min(Question.id))
+        .where(Question.fingerprint_id.in_(fingerprint_ids))
+        .group_by(Question.fingerprint_id)
+    )
+    return {fid: (count, first_id) for fid, count, first_id in result.all()}
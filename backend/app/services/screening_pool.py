@@ -0,0 +1,242 @@
+"""
+Pre-provisioned screening question pools for competitions.
+
+Screening tests used to be generated per registrant, lazily, the first time
+they opened their screening link - one LLM generation each for up to
+30,000 registrants, all arriving around the moment screening opens. Now an
+admin provisions the competition's pool ahead of ``screening_start_date``:
+K variants of every question slot (SCREENING_SECTIONS, capped at
+``questions_count``), generated by a background job into
+``competition_questions``.
+
+Once the pool is ready, creating a screening test is pure bulk inserts:
+``deal_screening_questions`` picks one variant per slot. For slot ``s`` the
+variant of registration ``r`` is position ``r mod K`` of a random
+permutation of the K variants seeded by (pool seed, s, r div K). So within
+every block of K consecutive registrations each variant is dealt exactly
+once - usage stays balanced without counters - while the choice looks random
+and differs from slot to slot. Competitions without a ready pool keep the
+live generation path.
+"""
+import random
+import secrets
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Competition, CompetitionQuestion
+from app.services.ai_service import ai_service, detect_programming_language
+from app.services.job_queue import job_queue, PermanentJobError
+from app.services.question_similarity import SOURCE_COMPETITION, question_index
+
+
+SCREENING_POOL_PROVISIONING = "provisioning"
+SCREENING_POOL_READY = "ready"
+SCREENING_POOL_FAILED = "failed"
+
+# Screening sections and how many questions each contributes to a test
+SCREENING_SECTIONS: Tuple[Tuple[str, int], ...] = (
+    ("brain_teaser", 4),
+    ("general_engineering", 4),
+    ("coding", 3),
+)
+SCREENING_DIFFICULTY = "mid"
+
+# Pool content per competition, keyed by competition id and invalidated by ready_at
+_pool_cache: Dict[int, Tuple[datetime, Dict[Tuple[str, int], List[Dict[str, Any]]]]] = {}
+
+
+def screening_layout(questions_count: int) -> List[Tuple[str, int, int]]:
+    """(category, section_order, slots) for a test of at most ``questions_count`` questions."""
+    layout = []
+    remaining = questions_count
+    for section_order, (category, slots) in enumerate(SCREENING_SECTIONS):
+        slots = min(slots, remaining)
+        if slots <= 0:
+            break
+        layout.append((category, section_order, slots))
+        remaining -= slots
+    return layout
+
+
+def assigned_variant(seed: str, slot_key: str, registration_id: int, variants: int) -> int:
+    """Balanced, pseudo-random variant for one registration and slot (see module docstring)."""
+    block, position = divmod(registration_id, variants)
+    order = random.Random(f"{seed}:{slot_key}:{block}").sample(range(variants), variants)
+    return order[position]
+
+
+async def _load_pool(db: AsyncSession, competition: Competition) -> Dict[Tuple[str, int], List[Dict[str, Any]]]:
+    cached = _pool_cache.get(competition.id)
+    if cached and cached[0] == competition.screening_pool_ready_at:
+        return cached[1]
+
+    result = await db.execute(
+        select(CompetitionQuestion)
+        .where(CompetitionQuestion.competition_id == competition.id)
+        .order_by(CompetitionQuestion.category, CompetitionQuestion.slot, CompetitionQuestion.variant)
+    )
+    pool: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for row in result.scalars().all():
+        pool.setdefault((row.category, row.slot), []).append({
+            "question_text": row.question_text,
+            "question_code": row.question_code,
+            "expected_answer": row.expected_answer,
+            "hints": row.hints,
+            "language": row.language,
+            "fingerprint_id": row.fingerprint_id,
+        })
+    _pool_cache[competition.id] = (competition.screening_pool_ready_at, pool)
+    return pool
+
+
+async def deal_screening_questions(
+    db: AsyncSession,
+    competition: Competition,
+    registration_id: int,
+) -> Optional[List[Dict[str, Any]]]:
+    """Questions for one registrant's screening test from the ready pool.
+
+    Returns dicts with category, section_order, question_order and the
+    question fields, or None when the pool is not ready or incomplete.
+    """
+    if competition.screening_pool_status != SCREENING_POOL_READY:
+        return None
+
+    pool = await _load_pool(db, competition)
+    seed = competition.screening_pool_seed or str(competition.id)
+    dealt = []
+    for category, section_order, slots in screening_layout(competition.questions_count):
+        for slot in range(slots):
+            variants = pool.get((category, slot))
+            if not variants:
+                return None
+            choice = assigned_variant(seed, f"{category}:{slot}", registration_id, len(variants))
+            dealt.append({
+                **variants[choice],
+                "category": category,
+                "section_order": section_order,
+                "question_order": slot,
+            })
+    return dealt
+
+
+async def pool_sections(db: AsyncSession, competition: Competition) -> List[Dict[str, Any]]:
+    """Per-section progress of the competition's pool."""
+    result = await db.execute(
+        select(CompetitionQuestion.category, func.count(CompetitionQuestion.id))
+        .where(CompetitionQuestion.competition_id == competition.id)
+        .group_by(CompetitionQuestion.category)
+    )
+    counts = dict(result.all())
+    return [
+        {"category": category, "section_order": section_order, "slots": slots, "questions_ready": counts.get(category, 0)}
+        for category, section_order, slots in screening_layout(competition.questions_count)
+    ]
+
+
+async def request_provisioning(db: AsyncSession, competition: Competition, variants: int, rebuild: bool = False):
+    """Mark the pool provisioning and queue its generation (committed by the caller)."""
+    if rebuild or competition.screening_pool_variants != variants:
+        await db.execute(delete(CompetitionQuestion).where(CompetitionQuestion.competition_id == competition.id))
+        competition.screening_pool_seed = secrets.token_hex(16)
+    competition.screening_pool_seed = competition.screening_pool_seed or secrets.token_hex(16)
+    competition.screening_pool_variants = variants
+    competition.screening_pool_status = SCREENING_POOL_PROVISIONING
+    competition.screening_pool_ready_at = None
+    job, _ = await job_queue.enqueue(
+        db, "provision_screening_pool", {"competition_id": competition.id},
+        dedup_key=f"provision_screening_pool:{competition.id}",
+    )
+    return job
+
+
+async def _mark_provisioning_failed(payload: Dict[str, Any], error: str):
+    async with async_session_maker() as db:
+        competition = await db.get(Competition, payload["competition_id"])
+        if competition and competition.screening_pool_status == SCREENING_POOL_PROVISIONING:
+            competition.screening_pool_status = SCREENING_POOL_FAILED
+            await db.commit()
+
+
+@job_queue.handler("provision_screening_pool", on_failure=_mark_provisioning_failed)
+async def _provision_screening_pool_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate every missing variant, section by section; resumable after a retry."""
+    competition_id = payload["competition_id"]
+    batch_size = max(1, settings.QUESTION_POOL_BATCH_SIZE)
+
+    async with async_session_maker() as db:
+        competition = await db.get(Competition, competition_id)
+        if not competition:
+            raise PermanentJobError(f"Competition {competition_id} not found")
+        variants = competition.screening_pool_variants or settings.SCREENING_POOL_VARIANTS
+        layout = screening_layout(competition.questions_count)
+        await db.commit()
+
+    generated = 0
+    for category, section_order, slots in layout:
+        needed = slots * variants
+        # Bounded: near-duplicate rejection can keep batches short
+        for _ in range(needed // batch_size + 6):
+            async with async_session_maker() as db:
+                result = await db.execute(
+                    select(func.count(CompetitionQuestion.id)).where(
+                        CompetitionQuestion.competition_id == competition_id,
+                        CompetitionQuestion.category == category,
+                    )
+                )
+                have = result.scalar() or 0
+                await db.commit()
+            if have >= needed:
+                break
+
+            questions = await ai_service.generate_pool_questions(
+                category, SCREENING_DIFFICULTY, None, min(batch_size, needed - have)
+            )
+            if not questions:
+                raise RuntimeError(f"No {category} questions generated for competition {competition_id}")
+            questions = await question_index.accept(questions, SOURCE_COMPETITION)
+
+            stored = questions[:needed - have]
+            async with async_session_maker() as db:
+                for index, q in enumerate(stored, start=have):
+                    # Fill slot by slot so an interrupted run still covers every slot evenly
+                    slot, variant = index % slots, index // slots
+                    language = None
+                    if category in ["coding", "code_review"]:
+                        language = detect_programming_language(
+                            text=q["question_text"], code=q.get("question_code"), category=category
+                        )
+                    db.add(CompetitionQuestion(
+                        competition_id=competition_id,
+                        category=category,
+                        section_order=section_order,
+                        slot=slot,
+                        variant=variant,
+                        question_text=q["question_text"],
+                        question_code=q.get("question_code"),
+                        expected_answer=q.get("expected_answer"),
+                        hints=q.get("hints"),
+                        language=language,
+                        fingerprint_id=q.get("fingerprint_id"),
+                    ))
+                await db.commit()
+            have += len(stored)
+            generated += len(stored)
+        if have < needed:
+            # A retry resumes from what has been stored so far
+            raise RuntimeError(f"Could not generate enough distinct {category} questions for competition {competition_id}")
+
+    async with async_session_maker() as db:
+        competition = await db.get(Competition, competition_id)
+        if competition:
+            competition.screening_pool_status = SCREENING_POOL_READY
+            competition.screening_pool_ready_at = datetime.utcnow()
+            await db.commit()
+
+    print(f"[ScreeningPool] Competition {competition_id}: pool ready ({variants} variants, {generated} new questions)")
+    return {"competition_id": competition_id, "variants": variants, "generated": generated}
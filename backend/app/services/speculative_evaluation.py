@@ -0,0 +1,148 @@
+"""
+Speculative evaluation of autosaved drafts.
+
+Candidates autosave through POST /answers/draft every few seconds during a
+2-8 hour test, but scoring used to start only at submit. With
+SPECULATIVE_EVALUATION_ENABLED, each draft save (re)schedules a low-priority
+job that scores the draft once it has been unchanged for
+SPECULATIVE_STABLE_SECONDS and the LLM scheduler has spare capacity. The
+evaluation is stored on the answer together with a hash of the content it
+scored; at submit, content with the same hash reuses it and no LLM call is
+made.
+
+Speculative calls run as "speculative_evaluate_answer" in the analysis lane,
+so they only use capacity that live and submit-time work leaves idle.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Answer, Question, Test
+from app.models.job import JobStatus
+from app.models.test import TestStatus
+from app.services.ai_service import ai_service
+from app.services.job_queue import job_queue, RetryJobLater
+
+
+# Claimed after every other kind of job
+SPECULATIVE_JOB_PRIORITY = 500
+
+
+def draft_content_hash(candidate_answer: Optional[str], candidate_code: Optional[str]) -> str:
+    """Hash identifying the exact content an evaluation was computed for."""
+    payload = json.dumps([candidate_answer or "", candidate_code or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def speculative_evaluation_for(
+    answer: Optional[Answer],
+    candidate_answer: Optional[str],
+    candidate_code: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """The stored speculative evaluation if it was computed for exactly this content."""
+    if not answer or not answer.speculative_hash or not answer.speculative_evaluation:
+        return None
+    if answer.speculative_hash != draft_content_hash(candidate_answer, candidate_code):
+        return None
+    return dict(answer.speculative_evaluation)
+
+
+async def schedule_speculative_evaluation(db: AsyncSession, answer: Answer):
+    """Queue (or push back) speculative scoring of ``answer``'s draft.
+
+    Called on every draft save; the job only runs once saves stop for
+    SPECULATIVE_STABLE_SECONDS. Committed by the caller.
+    """
+    if not settings.SPECULATIVE_EVALUATION_ENABLED:
+        return
+    if not (answer.candidate_answer or answer.candidate_code):
+        return
+    if answer.speculative_hash == draft_content_hash(answer.candidate_answer, answer.candidate_code):
+        return
+
+    await db.flush()
+    delay = settings.SPECULATIVE_STABLE_SECONDS
+    job, created = await job_queue.enqueue(
+        db, "speculative_evaluate_answer", {"answer_id": answer.id},
+        dedup_key=f"speculative_evaluate_answer:{answer.id}",
+        delay=delay, priority=SPECULATIVE_JOB_PRIORITY,
+    )
+    if not created and job.status == JobStatus.QUEUED.value:
+        # Debounce: the draft changed again, so wait for it to settle
+        job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+
+
+@job_queue.handler("speculative_evaluate_answer")
+async def _speculative_evaluate_answer_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    answer_id = payload["answer_id"]
+    stable_seconds = settings.SPECULATIVE_STABLE_SECONDS
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Answer)
+            .options(selectinload(Answer.question).selectinload(Question.test).selectinload(Test.candidate))
+            .where(Answer.id == answer_id)
+        )
+        answer = result.scalar_one_or_none()
+        if not answer:
+            return {"answer_id": answer_id, "skipped": "answer not found"}
+
+        question = answer.question
+        test = question.test
+        if test.status != TestStatus.IN_PROGRESS.value or test.is_disqualified:
+            return {"answer_id": answer_id, "skipped": "test not in progress"}
+        if answer.is_submitted and answer.evaluation_status is not None:
+            return {"answer_id": answer_id, "skipped": "already submitted"}
+
+        content = (answer.candidate_answer, answer.candidate_code)
+        content_hash = draft_content_hash(*content)
+        if answer.speculative_hash == content_hash:
+            return {"answer_id": answer_id, "skipped": "already scored"}
+
+        idle_for = (datetime.utcnow() - (answer.updated_at or answer.created_at)).total_seconds()
+        await db.commit()
+
+    if idle_for < stable_seconds:
+        raise RetryJobLater(stable_seconds - idle_for, "draft still changing")
+    if not ai_service.scheduler.has_spare_capacity(settings.SPECULATIVE_MIN_FREE_SLOTS):
+        raise RetryJobLater(settings.SPECULATIVE_IDLE_RETRY_SECONDS, "LLM lanes busy")
+
+    evaluation = await ai_service.evaluate_answer(
+        question_text=question.question_text,
+        question_code=question.question_code,
+        expected_answer=question.expected_answer or "",
+        candidate_answer=content[0] or "",
+        candidate_code=content[1] or "",
+        category=question.category,
+        difficulty=test.candidate.difficulty if test.candidate else "mid",
+        operation="speculative_evaluate_answer",
+    )
+    if evaluation.get("manual_review"):
+        # Never reuse a placeholder score; submit will evaluate for real
+        return {"answer_id": answer_id, "skipped": "evaluation unavailable"}
+
+    async with async_session_maker() as db:
+        answer = await db.get(Answer, answer_id)
+        if not answer:
+            return {"answer_id": answer_id, "skipped": "answer not found"}
+
+        # Stored even if the draft moved on meanwhile: the hash still lets a
+        # revert to this content (or a submit of it) reuse the score
+        answer.speculative_hash = content_hash
+        answer.speculative_evaluation = evaluation
+        answer.speculative_evaluated_at = datetime.utcnow()
+        changed = draft_content_hash(answer.candidate_answer, answer.candidate_code) != content_hash
+        await db.commit()
+
+    print(f"[Speculative] Scored draft of answer {answer_id}: {evaluation.get('score')}")
+    if changed:
+        # Edits made while we were scoring found this job running and were not queued
+        raise RetryJobLater(stable_seconds, "draft changed during evaluation")
+    return {"answer_id": answer_id, "score": evaluation.get("score")}
@@ -0,0 +1,197 @@
+"""
+Single-writer commit queue for SQLite.
+
+SQLite allows one writer at a time. Under exam-day traffic - draft autosaves
+every few seconds per candidate, anti-cheat events on every tab switch -
+request sessions used to queue up on the database lock, each taking it for
+its own small transaction, and stalled with "database is locked" once the
+lock timeout ran out.
+
+Hot-path writes now go through one writer coroutine with its own
+connection instead::
+
+    async def _save(db: AsyncSession) -> int:
+        answer = await db.get(Answer, answer_id)
+        answer.candidate_answer = text
+        return answer.version
+
+    version = await write_queue.submit(_save)
+
+The writer drains whatever has queued up (up to WRITE_QUEUE_MAX_BATCH,
+waiting at most WRITE_QUEUE_MAX_WAIT_MS for more) and runs it as one
+``BEGIN IMMEDIATE`` transaction - group commit: one lock acquisition and one
+commit for the whole batch. Each write runs in its own SAVEPOINT, so a write
+that raises (e.g. an HTTPException for a missing row) is rolled back alone
+and its exception is re-raised to its caller; the others still commit.
+Callers are resumed only after the batch has committed.
+
+Write functions receive the writer's session: they may read and write
+through it but must not commit, and must not await anything slow (LLM
+calls, other sessions) since every queued write waits on them. Return plain
+values or loaded objects; the session is closed after the batch.
+
+With WAL (SQLITE_PRODUCTION_MODE) readers never wait for the writer. On
+PostgreSQL, with WRITE_QUEUE_ENABLED off (the default; deployments turn it
+on), or when the writer is not running, ``submit`` runs the write in its own
+session and commits it directly.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker, is_postgres
+
+
+T = TypeVar("T")
+WriteFunc = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteQueue:
+    """Group-committing single writer; see module docstring."""
+
+    def __init__(self, max_batch: int = 64, max_wait_ms: float = 2.0):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {
+            "writes": 0,
+            "failed_writes": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "largest_batch": 0,
+            "commit_seconds": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the writer (called from the app lifespan)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._writer())
+        print(f"[WriteQueue] Started single writer (batches of up to {self.max_batch})")
+
+    async def stop(self):
+        """Commit what is queued, then stop the writer."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        try:
+            await asyncio.wait_for(self._task, timeout=30)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        self._task = None
+
+    async def submit(self, func: WriteFunc) -> T:
+        """Run ``func`` in the writer's transaction and return its result once committed."""
+        if not self.running:
+            async with async_session_maker() as db:
+                result = await func(db)
+                await db.commit()
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, future))
+        return await future
+
+    async def _next_batch(self) -> Tuple[List[Tuple[WriteFunc, asyncio.Future]], bool]:
+        """(writes, stop requested): blocks for the first write, then gathers briefly."""
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _writer(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._commit_batch(batch)
+        # Anything submitted while stopping still gets written
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                await self._commit_batch([item])
+
+    async def _commit_batch(self, batch: List[Tuple[WriteFunc, asyncio.Future]]):
+        started = time.monotonic()
+        outcomes: List[Tuple[bool, Any]] = []
+        try:
+            async with async_session_maker() as db:
+                # Take the write lock up front; SQLite waits busy_timeout for it
+                await db.execute(text("BEGIN IMMEDIATE"))
+                for func, future in batch:
+                    if future.cancelled():
+                        outcomes.append((False, None))
+                        continue
+                    try:
+                        async with db.begin_nested():
+                            outcomes.append((True, await func(db)))
+                    except Exception as e:
+                        outcomes.append((False, e))
+                await db.commit()
+        except Exception as e:
+            self.counters["failed_batches"] += 1
+            print(f"[WriteQueue] Batch of {len(batch)} writes failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.counters["batches"] += 1
+        self.counters["largest_batch"] = max(self.counters["largest_batch"], len(batch))
+        self.counters["commit_seconds"] += time.monotonic() - started
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                self.counters["writes"] += 1
+                future.set_result(value)
+            else:
+                self.counters["failed_writes"] += 1
+                future.set_exception(value)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self.counters["batches"]
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            **self.counters,
+            "commit_seconds": round(self.counters["commit_seconds"], 3),
+            "writes_per_batch": round(self.counters["writes"] / batches, 2) if batches else 0.0,
+        }
+
+
+write_queue = WriteQueue(
+    max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+    max_wait_ms=settings.WRITE_QUEUE_MAX_WAIT_MS,
+)
+
+
+def write_queue_wanted() -> bool:
+    """Whether the app should start the single writer."""
+    return settings.WRITE_QUEUE_ENABLED and not is_postgres
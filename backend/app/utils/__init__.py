@@ -9,6 +9,13 @@ from .timezone import (
     format_pacific_datetime,
     get_pacific_date_iso,
 )
+from .pagination import (
+    NEXT_CURSOR_HEADER,
+    Page,
+    encode_cursor,
+    decode_cursor,
+    keyset_page,
+)
 
 __all__ = [
     "PACIFIC_TZ",
@@ -18,4 +25,9 @@ __all__ = [
     "format_pacific_date",
     "format_pacific_datetime",
     "get_pacific_date_iso",
+    "NEXT_CURSOR_HEADER",
+    "Page",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_page",
 ]
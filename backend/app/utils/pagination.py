@@ -0,0 +1,111 @@
+"""Keyset (cursor) pagination for admin list endpoints.
+
+OFFSET pagination reads and discards every row before the page, so deep
+pages of 30k-row rankings get slower the further in they are. A keyset page
+instead continues after the last row of the previous one:
+
+    WHERE sort < :value OR (sort = :value AND id < :id)
+    ORDER BY sort DESC, id DESC LIMIT :limit
+
+which an index on (filter columns..., sort, id) answers by seeking straight
+to the position, at the same cost for every page.
+
+The cursor handed to clients is opaque (base64 JSON of the last row's sort
+value and id, plus the number of rows before it, which rankings use as the
+rank). Rows whose sort value is NULL come after all others, ordered by id,
+on every database - SQLite and PostgreSQL disagree on where NULLs sort, so
+they are read as a second range rather than left to ORDER BY.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# List endpoints that return a bare JSON array report the next cursor in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str]
+    offset: int  # Rows before this page
+
+
+def encode_cursor(value: Any, row_id: int, position: int) -> str:
+    if isinstance(value, datetime):
+        value = {"t": value.isoformat()}
+    payload = json.dumps({"v": value, "id": row_id, "n": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int, int]:
+    """(sort value, id, position) of the row a cursor points after; 400 if it is malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value, row_id, position = payload["v"], int(payload["id"]), int(payload["n"])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["t"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id, position
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Page:
+    """One page of ``query`` ordered by ``sort_column`` DESC, ``id_column`` DESC, NULL sort values last.
+
+    ``query`` is a select of one entity without ORDER BY/LIMIT. Without a
+    cursor the page starts at ``skip`` (OFFSET, for older clients).
+    ``next_cursor`` is None once a page comes back short.
+    """
+    limit = max(1, limit)
+    query = query.order_by(None)
+    in_nulls = False
+    if cursor:
+        value, last_id, position = decode_cursor(cursor)
+        in_nulls = value is None
+        skip = 0
+    else:
+        position = skip
+
+    # NOT NULL sort columns have no second range to read
+    nullable = getattr(sort_column.expression, "nullable", True)
+    items: List[Any] = []
+    if not in_nulls:
+        ranged = query.where(sort_column.is_not(None)) if nullable else query
+        if cursor:
+            ranged = ranged.where(sort_column <= value, or_(sort_column < value, and_(sort_column == value, id_column < last_id)))
+        ranged = ranged.order_by(sort_column.desc(), id_column.desc()).offset(skip or None).limit(limit)
+        items = list((await db.execute(ranged)).scalars().all())
+
+    if nullable and len(items) < limit:
+        nulls = query.where(sort_column.is_(None))
+        null_skip = 0
+        if in_nulls:
+            nulls = nulls.where(id_column < last_id)
+        elif skip and not items:
+            # The offset reaches past the non-NULL rows
+            counted = await db.execute(select(func.count()).select_from(query.where(sort_column.is_not(None)).subquery()))
+            null_skip = max(0, skip - (counted.scalar() or 0))
+        nulls = nulls.order_by(id_column.desc()).offset(null_skip or None).limit(limit - len(items))
+        items += (await db.execute(nulls)).scalars().all()
+
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key), position + len(items))
+    return Page(items=items, next_cursor=next_cursor, offset=position)
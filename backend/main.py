@@ -13,8 +13,15 @@ from app.config import settings
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    from app.services.job_queue import job_queue
+    await job_queue.start()
+    from app.services.write_queue import write_queue, write_queue_wanted
+    if write_queue_wanted():
+        await write_queue.start()
     yield
     # Shutdown
+    await job_queue.stop()
+    await write_queue.stop()
     from app.services.ai_service import ai_service
     await ai_service.close()
 
@@ -49,6 +56,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Location"],  # Cursor pagination, 202 job status URLs
 )
 
 # Include API routes
@@ -66,7 +74,21 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    from app.services.ai_service import ai_service
+    from app.services.write_queue import write_queue
+    breaker = ai_service.breaker.stats()
+    backends = ai_service.backends.stats()
+    degraded = breaker["state"] != "closed" or backends["healthy"] < backends["total"]
+    return {
+        # The API itself is up; AI features fall back to defaults while the breaker is open
+        "status": "degraded" if degraded else "healthy",
+        "llm": {
+            "api_url": ai_service.api_url,
+            "circuit_breaker": breaker,
+            "backends": backends,
+        },
+        "write_queue": write_queue.stats(),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN every query the read routes send and list those that scan a whole table.
+
+Builds a throwaway SQLite database (or uses --database-url), applies the
+migrations, seeds one of everything - candidate, test with questions and
+answers, report, certificate, competition with registrations, application
+with skill assessments, suggestion - then calls the GET routes below
+in-process and records each SELECT they send. Every distinct statement is
+explained with the parameters it ran with:
+
+- SQLite: EXPLAIN QUERY PLAN; a "SCAN <table>" step not using an index
+  reads the whole table.
+- PostgreSQL: EXPLAIN with enable_seqscan off, so a "Seq Scan" left in the
+  plan means no index can serve the query.
+
+SQLite plans sorts with "USE TEMP B-TREE"; those are listed as notes.
+
+    python scripts/check_query_plans.py             # exits 1 if a route query does a full scan
+    python scripts/check_query_plans.py --verbose   # also print every plan
+    python scripts/check_query_plans.py --database-url postgresql+asyncpg://...  # a scratch database
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Full scans a route cannot avoid, as "table" or "GET /path/template: table"
+ALLOWED_SCANS: set = set()
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+async def _seed() -> Dict[str, object]:
+    from app.database import async_session_maker
+    from app.utils.pagination import encode_cursor
+    from app.models import (
+        Answer, Application, BehavioralMetrics, Candidate, Certificate, Competition,
+        CompetitionRegistration, ImprovementSuggestion, Question, Report, SkillAssessment,
+        SkillCategory, SpecializationResult, Test,
+    )
+
+    async with async_session_maker() as db:
+        candidate = Candidate(name="Plan Check", email="plan-check@example.com")
+        db.add(candidate)
+        await db.flush()
+        test = Test(candidate_id=candidate.id, access_token="plan-check-test", status="in_progress",
+                    start_time=datetime.utcnow(), tab_switch_count=1)
+        db.add(test)
+        await db.flush()
+        question = Question(test_id=test.id, category="coding", question_text="Plan check question")
+        db.add(question)
+        await db.flush()
+        answer = Answer(question_id=question.id, candidate_answer="answer", is_submitted=True)
+        report = Report(test_id=test.id, overall_score=80)
+        db.add_all([answer, report])
+        await db.flush()
+        certificate = Certificate(report_id=report.id, candidate_name=candidate.name, test_date=datetime.utcnow(),
+                                  score_tier="gold", overall_score=80)
+        competition = Competition(name="Plan check", registration_count=1, completed_count=1)
+        db.add_all([certificate, competition])
+        await db.flush()
+        registration = CompetitionRegistration(competition_id=competition.id, candidate_id=candidate.id,
+                                               registration_token="plan-check-registration", test_id=test.id,
+                                               screening_completed=True, screening_score=80)
+        db.add(registration)
+        await db.flush()
+        application = Application(full_name="Plan Check", email="plan-check@example.com",
+                                  application_token="plan-check-application", candidate_id=candidate.id)
+        db.add_all([
+            BehavioralMetrics(registration_id=registration.id, test_id=test.id),
+            application,
+            ImprovementSuggestion(raw_feedback="plan check", candidate_id=candidate.id, test_id=test.id),
+            SpecializationResult(test_id=test.id, candidate_id=candidate.id, focus_area="ml"),
+        ])
+        await db.flush()
+        db.add(SkillAssessment(application_id=application.id, category=list(SkillCategory)[0], skill_name="python"))
+        await db.commit()
+
+        return {
+            "candidate_id": candidate.id,
+            "test_id": test.id,
+            "access_token": test.access_token,
+            "question_id": question.id,
+            "answer_id": answer.id,
+            "report_id": report.id,
+            "certificate_id": certificate.certificate_id,
+            "competition_id": competition.id,
+            "registration_token": registration.registration_token,
+            "application_id": application.id,
+            "application_token": application.application_token,
+            "email": application.email,
+            # Keyset pages deep into a list: past a timestamp, a score, and into the NULL-sorted tail
+            "time_cursor": encode_cursor(datetime.utcnow(), 10 ** 9, 1000),
+            "score_cursor": encode_cursor(100.0, 10 ** 9, 1000),
+            "null_cursor": encode_cursor(None, 10 ** 9, 1000),
+        }
+
+
+ROUTES = [
+    "/api/candidates",
+    "/api/candidates?cursor={time_cursor}",
+    "/api/candidates/{candidate_id}",
+    "/api/tests",
+    "/api/tests?status=completed",
+    "/api/tests?cursor={time_cursor}",
+    "/api/tests?status=completed&cursor={time_cursor}",
+    "/api/tests?cursor={null_cursor}",
+    "/api/tests/{test_id}",
+    "/api/tests/token/{access_token}",
+    "/api/questions/test/{test_id}",
+    "/api/questions/{question_id}",
+    "/api/answers/{answer_id}",
+    "/api/reports",
+    "/api/reports?cursor={time_cursor}",
+    "/api/reports/{report_id}",
+    "/api/reports/test/{test_id}",
+    "/api/reports/cheating-logs",
+    "/api/reports/cheating-logs?cursor={time_cursor}",
+    "/api/certificates",
+    "/api/certificates?cursor={time_cursor}",
+    "/api/certificates/report/{report_id}",
+    "/api/certificates/verify/{certificate_id}",
+    "/api/feedback/admin/suggestions",
+    "/api/feedback/admin/suggestions?cursor={time_cursor}",
+    "/api/feedback/admin/suggestions?status=pending&cursor={time_cursor}",
+    "/api/competitions",
+    "/api/competitions/{competition_id}",
+    "/api/competitions/{competition_id}/results/{registration_token}",
+    "/api/competitions/{competition_id}/rankings",
+    "/api/competitions/{competition_id}/rankings?cursor={score_cursor}",
+    "/api/competitions/{competition_id}/rankings?cursor={null_cursor}",
+    "/api/competitions/{competition_id}/answer-similarity",
+    "/api/applications/admin/list",
+    "/api/applications/admin/list?cursor={time_cursor}",
+    "/api/applications/admin/list?status=pending&cursor={time_cursor}",
+    "/api/applications/admin/{application_id}",
+    "/api/applications/{application_token}",
+    "/api/applications/by-email/{email}",
+    "/api/specialization/results",
+    "/api/specialization/candidate/{candidate_id}",
+    "/api/jobs/stats",
+]
+
+
+async def _capture(ids: Dict[str, object]) -> List[Tuple[str, str, tuple]]:
+    """(route, statement, parameters) for every SELECT the routes send."""
+    import httpx
+    from sqlalchemy import event
+    import main
+    from app.database import engine
+
+    captured: List[Tuple[str, str, tuple]] = []
+    current = {"route": ""}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and not executemany:
+            captured.append((current["route"], statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://plan-check") as client:
+            for template in ROUTES:
+                path = template.format(**ids)
+                current["route"] = f"GET {template.split('?')[0]}"
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    print(f"  ! {path} -> {response.status_code}")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return captured
+
+
+async def _explain(statement: str, parameters) -> Tuple[List[str], List[str], List[str]]:
+    """(plan lines, fully scanned tables, notes)."""
+    from app.database import engine, is_postgres
+
+    async with engine.connect() as conn:
+        if is_postgres:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            lines, scans = [], []
+
+            def walk(node, depth=0):
+                relation = node.get("Relation Name")
+                lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+                if node["Node Type"] == "Seq Scan" and relation:
+                    scans.append(relation)
+                for child in node.get("Plans", []):
+                    walk(child, depth + 1)
+
+            walk(plan[0]["Plan"])
+            return lines, scans, []
+
+        result = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        lines = [row[3] for row in result.all()]
+        scans = [match.group(1) for match in map(_SQLITE_FULL_SCAN.match, lines) if match]
+        notes = [line for line in lines if line.startswith("USE TEMP B-TREE")]
+        return lines, scans, notes
+
+
+async def main_async(verbose: bool) -> int:
+    from app.database import engine, init_db
+
+    await init_db()
+    ids = await _seed()
+    captured = await _capture(ids)
+
+    seen = set()
+    problems = 0
+    for route, statement, parameters in captured:
+        key = (route, statement)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        lines, scans, notes = await _explain(statement, parameters)
+        scans = [table for table in scans if table not in ALLOWED_SCANS and f"{route}: {table}" not in ALLOWED_SCANS]
+        if scans:
+            problems += 1
+        if scans or verbose:
+            print(f"{'FULL SCAN' if scans else 'ok'}  {route}  {', '.join(scans)}")
+            print("    " + " ".join(statement.split())[:300])
+            for line in lines:
+                print(f"      {line}")
+        elif notes:
+            print(f"note  {route}  {'; '.join(notes)}")
+
+    await engine.dispose()
+    print(f"\n{len(seen)} distinct route queries checked, {problems} with full table scans")
+    return 1 if problems else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--database-url", help="Scratch database to seed and explain against (default: a temporary SQLite file)")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only full scans")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DEBUG", "false")
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        path = Path(tempfile.mkdtemp()) / "plan_check.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+    sys.exit(asyncio.run(main_async(args.verbose)))
+
+
+if __name__ == "__main__":
+    main()
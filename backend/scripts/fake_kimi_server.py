@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible chat completions server for exercising the Kimi2
+endpoint pool and streaming locally without a GPU.
+
+Run a few replicas and point the backend at them:
+
+    python scripts/fake_kimi_server.py --port 8081 &
+    python scripts/fake_kimi_server.py --port 8082 --latency 2.0 &
+    python scripts/fake_kimi_server.py --port 8083 --error-rate 0.5 &
+    KIMI_API_URLS=http://localhost:8081/v1/chat/completions,http://localhost:8082/v1/chat/completions,http://localhost:8083/v1/chat/completions \\
+        uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+
+def build_app(latency: float, jitter: float, error_rate: float, name: str) -> FastAPI:
+    app = FastAPI(title=f"fake-kimi-{name}")
+    counters = {"requests": 0, "errors": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        if random.random() < error_rate:
+            counters["errors"] += 1
+            return JSONResponse(status_code=503, content={"error": f"{name} overloaded"})
+
+        # A JSON payload most AIService parsers accept, so callers exercise
+        # their success path rather than their fallbacks
+        content = json.dumps({
+            "score": 75,
+            "feedback": f"Fake evaluation from {name}",
+            "answer": f"Fake answer from {name}, streamed a few characters at a time.",
+            "strengths": ["clear"],
+            "weaknesses": [],
+            "replica": name,
+        })
+
+        if body.get("stream"):
+            async def chunks():
+                for i in range(0, len(content), 8):
+                    delta = {"choices": [{"index": 0, "delta": {"content": content[i:i + 8]}}]}
+                    yield f"data: {json.dumps(delta)}\n\n"
+                    await asyncio.sleep(0.01)
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        return {
+            "id": f"fake-{counters['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "kimi"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"name": name, **counters}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Random +/- seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    name = f"replica-{args.port}"
+    uvicorn.run(build_app(args.latency, args.jitter, args.error_rate, name), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
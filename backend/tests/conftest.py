@@ -0,0 +1,61 @@
+"""
+Shared test setup.
+
+The app configures its engine from the environment at import time, so the
+database is pointed at a scratch file before anything from ``app`` is
+imported. Tests are plain functions that drive coroutines with
+``asyncio.run``; no async test plugin is needed.
+"""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="kos-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_SCRATCH / 'test.db'}"
+os.environ["DEBUG"] = "false"
+os.environ["JOB_WORKERS"] = "0"
+os.environ["SQLITE_PRODUCTION_MODE"] = "false"  # Pooled connections cannot move between asyncio.run loops
+os.environ["LLM_CACHE_DB_PATH"] = ""
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The scratch database, migrated to head once per test run."""
+    from app.database import engine, init_db
+
+    asyncio.run(init_db())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def api_client():
+    """httpx client bound to the app in-process (no lifespan: workers and the writer stay off)."""
+    import httpx
+    import main
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+
+async def seed_test(db, questions: int = 1, status: str = "in_progress"):
+    """A candidate with one test and ``questions`` questions; returns (test, [question, ...])."""
+    import secrets
+    from app.models import Candidate, Question, Test
+
+    token = secrets.token_hex(6)
+    candidate = Candidate(name=f"Candidate {token}", email=f"{token}@example.com", difficulty="mid")
+    db.add(candidate)
+    await db.flush()
+    test = Test(candidate_id=candidate.id, access_token=token, status=status)
+    db.add(test)
+    await db.flush()
+    rows = [
+        Question(test_id=test.id, category="coding", section_order=0, question_order=i,
+                 question_text=f"Question {i}", expected_answer="42")
+        for i in range(questions)
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return test, rows
@@ -0,0 +1,407 @@
+-- Schema built by the original init_db (Base.metadata.create_all, no migrations)
+-- on SQLite, before any Alembic revision. Used by tests/test_migrations.py.
+
+CREATE TABLE answers (
+	id INTEGER NOT NULL,
+	question_id INTEGER NOT NULL,
+	candidate_answer TEXT,
+	candidate_code TEXT,
+	score FLOAT,
+	feedback TEXT,
+	ai_evaluation TEXT,
+	is_submitted BOOLEAN,
+	submitted_at DATETIME,
+	evaluated_at DATETIME,
+	version INTEGER,
+	previous_answer TEXT,
+	previous_code TEXT,
+	previous_score FLOAT,
+	edit_count INTEGER,
+	last_edited_at DATETIME,
+	time_spent_seconds INTEGER,
+	is_suspiciously_fast BOOLEAN,
+	question_opened_at DATETIME,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(question_id) REFERENCES questions (id)
+);
+
+CREATE TABLE applications (
+	id INTEGER NOT NULL,
+	full_name VARCHAR(255) NOT NULL,
+	email VARCHAR(255) NOT NULL,
+	phone VARCHAR(50),
+	location VARCHAR(255),
+	graduation_date VARCHAR(50),
+	preferred_start_date VARCHAR(100),
+	availability VARCHAR(15) NOT NULL,
+	preferred_trial_date VARCHAR(100),
+	self_description VARCHAR(255),
+	motivation TEXT,
+	admired_engineers TEXT,
+	overall_self_rating INTEGER,
+	unique_trait TEXT,
+	resume_path VARCHAR(500),
+	resume_text TEXT,
+	resume_filename VARCHAR(255),
+	application_token VARCHAR(64) NOT NULL,
+	status VARCHAR(17) NOT NULL,
+	kimi_analysis JSON,
+	suggested_position VARCHAR(255),
+	position_fit_score FLOAT,
+	candidate_id INTEGER,
+	admin_notes TEXT,
+	reviewed_by VARCHAR(255),
+	reviewed_at DATETIME,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	skills_submitted_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id)
+);
+
+CREATE TABLE behavioral_metrics (
+	id INTEGER NOT NULL,
+	registration_id INTEGER NOT NULL,
+	test_id INTEGER,
+	time_per_question JSON,
+	average_response_time FLOAT,
+	fastest_response FLOAT,
+	slowest_response FLOAT,
+	median_response_time FLOAT,
+	std_dev_response_time FLOAT,
+	suspiciously_fast_count INTEGER,
+	suspiciously_slow_count INTEGER,
+	consistency_score FLOAT,
+	anomaly_flags JSON,
+	risk_score FLOAT,
+	risk_factors JSON,
+	answer_change_count INTEGER,
+	navigation_pattern JSON,
+	idle_time_total FLOAT,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(registration_id) REFERENCES competition_registrations (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE candidates (
+	id INTEGER NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	email VARCHAR(255) NOT NULL,
+	resume_path VARCHAR(500),
+	resume_text TEXT,
+	extracted_skills JSON,
+	test_duration_hours INTEGER,
+	categories JSON,
+	difficulty VARCHAR(50),
+	track VARCHAR(50),
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE certificates (
+	id INTEGER NOT NULL,
+	report_id INTEGER NOT NULL,
+	certificate_id VARCHAR(50) NOT NULL,
+	candidate_name VARCHAR(255) NOT NULL,
+	test_date DATETIME NOT NULL,
+	track VARCHAR(100),
+	score_tier VARCHAR(50) NOT NULL,
+	overall_score INTEGER NOT NULL,
+	pdf_data BLOB,
+	pdf_filename VARCHAR(255),
+	verification_url VARCHAR(500),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (report_id),
+	FOREIGN KEY(report_id) REFERENCES reports (id)
+);
+
+CREATE TABLE challenge_submissions (
+	id INTEGER NOT NULL,
+	test_id INTEGER NOT NULL,
+	track VARCHAR(50) NOT NULL,
+	is_submitted BOOLEAN,
+	submitted_at DATETIME,
+	presentation_data JSON,
+	presentation_generated_at DATETIME,
+	overall_score FLOAT,
+	overall_feedback TEXT,
+	evaluated_at DATETIME,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (test_id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE competition_registrations (
+	id INTEGER NOT NULL,
+	competition_id INTEGER NOT NULL,
+	candidate_id INTEGER NOT NULL,
+	registration_token VARCHAR(255) NOT NULL,
+	registered_at DATETIME,
+	screening_started_at DATETIME,
+	screening_completed_at DATETIME,
+	screening_completed BOOLEAN,
+	screening_score FLOAT,
+	screening_percentile FLOAT,
+	is_qualified BOOLEAN,
+	qualified_at DATETIME,
+	qualification_rank INTEGER,
+	test_id INTEGER,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(competition_id) REFERENCES competitions (id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE competitions (
+	id INTEGER NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	description TEXT,
+	screening_start_date DATETIME,
+	screening_deadline DATETIME,
+	live_competition_date DATETIME,
+	max_participants INTEGER,
+	qualified_count INTEGER,
+	status VARCHAR(50),
+	test_duration_minutes INTEGER,
+	questions_count INTEGER,
+	passing_percentile FLOAT,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE deliverables (
+	id INTEGER NOT NULL,
+	challenge_submission_id INTEGER NOT NULL,
+	deliverable_type VARCHAR(50) NOT NULL,
+	title VARCHAR(255),
+	file_path VARCHAR(500),
+	file_name VARCHAR(255),
+	content_type VARCHAR(100),
+	inline_content TEXT,
+	file_size_bytes INTEGER,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(challenge_submission_id) REFERENCES challenge_submissions (id)
+);
+
+CREATE TABLE improvement_suggestions (
+	id INTEGER NOT NULL,
+	candidate_id INTEGER,
+	test_id INTEGER,
+	raw_feedback TEXT NOT NULL,
+	kimi2_analysis JSON,
+	claude_code_command TEXT,
+	status VARCHAR(50),
+	implemented_at DATETIME,
+	implemented_by VARCHAR(100),
+	implementation_notes TEXT,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE questions (
+	id INTEGER NOT NULL,
+	test_id INTEGER NOT NULL,
+	category VARCHAR(100) NOT NULL,
+	section_order INTEGER,
+	question_order INTEGER,
+	question_text TEXT NOT NULL,
+	question_code TEXT,
+	expected_answer TEXT,
+	hints JSON,
+	max_score INTEGER,
+	language VARCHAR(50),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE reports (
+	id INTEGER NOT NULL,
+	test_id INTEGER NOT NULL,
+	overall_score FLOAT,
+	recommendation VARCHAR(50),
+	brain_teaser_score FLOAT,
+	coding_score FLOAT,
+	code_review_score FLOAT,
+	system_design_score FLOAT,
+	signal_processing_score FLOAT,
+	general_engineering_score FLOAT,
+	strengths JSON,
+	weaknesses JSON,
+	detailed_feedback TEXT,
+	ai_summary TEXT,
+	general_score FLOAT,
+	specialization_score FLOAT,
+	specialization_track VARCHAR(50),
+	specialist_recommendation VARCHAR(50),
+	generated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE skill_assessments (
+	id INTEGER NOT NULL,
+	application_id INTEGER NOT NULL,
+	category VARCHAR(12) NOT NULL,
+	skill_name VARCHAR(255) NOT NULL,
+	self_rating INTEGER,
+	kimi_rating INTEGER,
+	kimi_confidence FLOAT,
+	kimi_evidence TEXT,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(application_id) REFERENCES applications (id) ON DELETE CASCADE
+);
+
+CREATE TABLE specialization_results (
+	id INTEGER NOT NULL,
+	test_id INTEGER NOT NULL,
+	candidate_id INTEGER NOT NULL,
+	focus_area VARCHAR(100) NOT NULL,
+	primary_specialty VARCHAR(255),
+	specialty_score FLOAT,
+	confidence FLOAT,
+	sub_specialties JSON,
+	recommended_tasks JSON,
+	team_fit_analysis TEXT,
+	raw_analysis JSON,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id) ON DELETE CASCADE,
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id) ON DELETE CASCADE
+);
+
+CREATE TABLE task_responses (
+	id INTEGER NOT NULL,
+	challenge_submission_id INTEGER NOT NULL,
+	task_id VARCHAR(50) NOT NULL,
+	response_text TEXT,
+	response_code TEXT,
+	is_submitted BOOLEAN,
+	submitted_at DATETIME,
+	score FLOAT,
+	feedback TEXT,
+	ai_evaluation JSON,
+	evaluated_at DATETIME,
+	version INTEGER,
+	previous_response TEXT,
+	previous_code TEXT,
+	previous_score FLOAT,
+	edit_count INTEGER,
+	last_edited_at DATETIME,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(challenge_submission_id) REFERENCES challenge_submissions (id)
+);
+
+CREATE TABLE tests (
+	id INTEGER NOT NULL,
+	candidate_id INTEGER NOT NULL,
+	access_token VARCHAR(255) NOT NULL,
+	test_type VARCHAR(50),
+	specialization_focus VARCHAR(100),
+	parent_test_id INTEGER,
+	start_time DATETIME,
+	end_time DATETIME,
+	duration_hours INTEGER,
+	status VARCHAR(50),
+	current_section VARCHAR(100),
+	total_break_time_seconds INTEGER,
+	used_break_time_seconds INTEGER,
+	break_count INTEGER,
+	current_break_start DATETIME,
+	break_history JSON,
+	tab_switch_count INTEGER,
+	tab_switch_timestamps JSON,
+	paste_attempt_count INTEGER,
+	copy_attempt_count INTEGER,
+	right_click_count INTEGER,
+	dev_tools_open_count INTEGER,
+	focus_loss_count INTEGER,
+	violation_events JSON,
+	warning_count INTEGER,
+	is_disqualified BOOLEAN,
+	disqualified_at DATETIME,
+	disqualification_reason VARCHAR(500),
+	nda_signed_at DATETIME,
+	nda_signature VARCHAR(255),
+	nda_ip_address VARCHAR(45),
+	integrity_agreed BOOLEAN,
+	integrity_agreed_at DATETIME,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id),
+	FOREIGN KEY(parent_test_id) REFERENCES tests (id)
+);
+
+CREATE INDEX ix_answers_id ON answers (id);
+
+CREATE UNIQUE INDEX ix_applications_application_token ON applications (application_token);
+
+CREATE INDEX ix_applications_email ON applications (email);
+
+CREATE INDEX ix_applications_id ON applications (id);
+
+CREATE INDEX ix_applications_status ON applications (status);
+
+CREATE INDEX ix_behavioral_metrics_id ON behavioral_metrics (id);
+
+CREATE UNIQUE INDEX ix_candidates_email ON candidates (email);
+
+CREATE INDEX ix_candidates_id ON candidates (id);
+
+CREATE UNIQUE INDEX ix_certificates_certificate_id ON certificates (certificate_id);
+
+CREATE INDEX ix_certificates_id ON certificates (id);
+
+CREATE INDEX ix_challenge_submissions_id ON challenge_submissions (id);
+
+CREATE INDEX ix_competition_registrations_id ON competition_registrations (id);
+
+CREATE UNIQUE INDEX ix_competition_registrations_registration_token ON competition_registrations (registration_token);
+
+CREATE INDEX ix_competitions_id ON competitions (id);
+
+CREATE INDEX ix_deliverables_id ON deliverables (id);
+
+CREATE INDEX ix_improvement_suggestions_id ON improvement_suggestions (id);
+
+CREATE INDEX ix_questions_id ON questions (id);
+
+CREATE INDEX ix_reports_id ON reports (id);
+
+CREATE INDEX ix_skill_assessments_application_id ON skill_assessments (application_id);
+
+CREATE INDEX ix_skill_assessments_id ON skill_assessments (id);
+
+CREATE INDEX ix_specialization_results_candidate_id ON specialization_results (candidate_id);
+
+CREATE INDEX ix_specialization_results_id ON specialization_results (id);
+
+CREATE INDEX ix_specialization_results_test_id ON specialization_results (test_id);
+
+CREATE INDEX ix_task_responses_id ON task_responses (id);
+
+CREATE UNIQUE INDEX ix_tests_access_token ON tests (access_token);
+
+CREATE INDEX ix_tests_id ON tests (id);
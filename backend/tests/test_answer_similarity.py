@@ -0,0 +1,177 @@
+import asyncio
+import secrets
+
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import (
+    Answer, AnswerSignature, BehavioralMetrics, Candidate, Competition, CompetitionRegistration, Question, Test,
+)
+from app.services.answer_similarity import FLAG_TYPE, AnswerSimilarityIndex
+
+
+COPY_QUESTION = "Explain how you would find the median of a stream of integers."
+COMMON_QUESTION = "Write a function that reverses a singly linked list."
+
+COPIED = (
+    "Keep two heaps, a max heap for the lower half and a min heap for the upper half, rebalance after "
+    "every insert so their sizes differ by at most one, and read the median from the tops in constant time."
+)
+SHARED = (
+    "I would buffer every number in a sorted array using binary search to find the insertion point, which "
+    "makes each insert linear but keeps the lookup of the middle element trivial for small streams."
+)
+ALONE = (
+    "With a bounded value range a counting array of frequencies works well: increment the bucket for each "
+    "value and walk the cumulative counts until half of the total has been passed to locate the median."
+)
+OTHER = (
+    "An order statistic tree such as an augmented red black tree stores subtree sizes at each node so the "
+    "k-th smallest element, and therefore the median, can be selected in logarithmic time after each update."
+)
+REWRITTEN = (
+    "Sampling a reservoir of recent values gives an approximate answer cheaply; for exact results I would "
+    "fall back to quickselect over the retained window whenever the caller explicitly asks for precision."
+)
+OBVIOUS = (
+    "def reverse(head):\n    prev = None\n    while head:\n        nxt = head.next\n        head.next = prev\n"
+    "        prev = head\n        head = nxt\n    return prev"
+)
+
+# Answers to COPY_QUESTION per registration; everyone gives the obvious answer to COMMON_QUESTION
+ANSWERS = [COPIED, COPIED, COPIED, SHARED, SHARED, ALONE, OTHER]
+
+
+async def _competition() -> tuple:
+    """A screened competition; returns (competition id, [registration id, ...], {registration id: copy answer id})."""
+    async with async_session_maker() as db:
+        competition = Competition(name=f"Similarity {secrets.token_hex(4)}")
+        db.add(competition)
+        await db.flush()
+        registration_ids, copy_answers = [], {}
+        for answer_text in ANSWERS:
+            token = secrets.token_hex(6)
+            candidate = Candidate(name=f"Candidate {token}", email=f"{token}@example.com")
+            db.add(candidate)
+            await db.flush()
+            test = Test(candidate_id=candidate.id, access_token=token, status="completed")
+            db.add(test)
+            await db.flush()
+            registration = CompetitionRegistration(
+                competition_id=competition.id, candidate_id=candidate.id, registration_token=token,
+                test_id=test.id, screening_completed=True,
+            )
+            db.add(registration)
+            await db.flush()
+            db.add(BehavioralMetrics(
+                registration_id=registration.id, test_id=test.id,
+                anomaly_flags=[{"type": "tab_switch", "count": 3}], risk_score=10.0,
+            ))
+            answers = []
+            for order, (question_text, text) in enumerate(((COPY_QUESTION, answer_text), (COMMON_QUESTION, OBVIOUS))):
+                question = Question(
+                    test_id=test.id, category="general", section_order=0, question_order=order,
+                    question_text=question_text,
+                )
+                db.add(question)
+                await db.flush()
+                answer = Answer(question_id=question.id, candidate_answer=text, is_submitted=True)
+                db.add(answer)
+                answers.append(answer)
+            await db.flush()
+            registration_ids.append(registration.id)
+            copy_answers[registration.id] = answers[0].id
+        await db.commit()
+    return competition.id, registration_ids, copy_answers
+
+
+async def _clusters(competition_id: int) -> set:
+    """Clusters as sets of registration ids, one set per (question template, cluster)."""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(AnswerSignature.template_key, AnswerSignature.cluster_id, AnswerSignature.registration_id)
+            .where(AnswerSignature.competition_id == competition_id, AnswerSignature.cluster_id.isnot(None))
+        )
+        clusters = {}
+        for template, cluster_id, registration_id in result.all():
+            clusters.setdefault((template, cluster_id), set()).add(registration_id)
+        return {frozenset(members) for members in clusters.values()}
+
+
+async def _flags(registration_ids: list) -> dict:
+    """registration id -> (similar_answer_count, [cluster size of each similarity flag], other flag types)."""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(BehavioralMetrics).where(BehavioralMetrics.registration_id.in_(registration_ids))
+        )
+        return {
+            metrics.registration_id: (
+                metrics.similar_answer_count or 0,
+                sorted(flag["cluster_size"] for flag in metrics.anomaly_flags if flag["type"] == FLAG_TYPE),
+                [flag["type"] for flag in metrics.anomaly_flags if flag["type"] != FLAG_TYPE],
+            )
+            for metrics in result.scalars().all()
+        }
+
+
+def test_common_answers_are_not_copying():
+    index = AnswerSimilarityIndex(common_share=0.05)
+    # Small clusters are always suspicious, however few answers the question has
+    assert not index.is_common(5, 6)
+    assert index.is_common(6, 6)
+    # On a large question a cluster must cover more than the common share
+    assert not index.is_common(100, 2000)
+    assert index.is_common(101, 2000)
+
+
+def test_incremental_and_batch_indexing_find_the_same_clusters(database):
+    index = AnswerSimilarityIndex(threshold=0.8, min_tokens=20, common_share=0.05)
+
+    async def scenario():
+        competition_id, registrations, _ = await _competition()
+        for registration_id in registrations:
+            await index.index_registration(registration_id)
+        incremental_clusters, incremental_flags = await _clusters(competition_id), await _flags(registrations)
+
+        result = await index.scan_competition(competition_id)
+        assert result["indexed"] == 2 * len(registrations)
+        assert await _clusters(competition_id) == incremental_clusters
+        assert await _flags(registrations) == incremental_flags
+
+        copied, shared, common = set(registrations[:3]), set(registrations[3:5]), set(registrations)
+        assert incremental_clusters == {frozenset(copied), frozenset(shared), frozenset(common)}
+
+        # The answer everyone gave is common and not flagged; other anomaly flags are kept
+        for registration_id in registrations:
+            size = 3 if registration_id in copied else 2 if registration_id in shared else None
+            expected = (1, [size], ["tab_switch"]) if size else (0, [], ["tab_switch"])
+            assert incremental_flags[registration_id] == expected
+
+    asyncio.run(scenario())
+
+
+def test_refresh_clears_flags_once_the_match_is_gone(database):
+    index = AnswerSimilarityIndex(threshold=0.8, min_tokens=20, common_share=0.05)
+
+    async def scenario():
+        competition_id, registrations, copy_answers = await _competition()
+        await index.scan_competition(competition_id)
+        assert (await _flags(registrations[3:5]))[registrations[3]][0] == 1
+
+        async with async_session_maker() as db:
+            answer = await db.get(Answer, copy_answers[registrations[4]])
+            answer.candidate_answer = REWRITTEN
+            await db.commit()
+        await index.scan_competition(competition_id)
+
+        flags = await _flags(registrations)
+        assert flags[registrations[3]] == (0, [], ["tab_switch"])
+        assert flags[registrations[4]] == (0, [], ["tab_switch"])
+        assert flags[registrations[0]] == (1, [3], ["tab_switch"])
+        async with async_session_maker() as db:
+            metrics = (await db.execute(
+                select(BehavioralMetrics).where(BehavioralMetrics.registration_id == registrations[3])
+            )).scalar_one()
+            assert metrics.risk_score == 10.0
+
+    asyncio.run(scenario())
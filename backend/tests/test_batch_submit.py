@@ -0,0 +1,105 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Answer, Test
+from app.services.ai_service import ai_service
+from conftest import api_client, seed_test
+
+
+def test_draft_saved_during_evaluation_is_kept(database, monkeypatch):
+    async def scenario():
+        async with async_session_maker() as db:
+            _, (edited, untouched) = await seed_test(db, questions=2)
+
+        async with api_client() as client:
+            async def evaluate_while_candidate_types(items, **kwargs):
+                # The candidate's autosave lands while the LLM is scoring
+                response = await client.post("/api/answers/draft", json={
+                    "question_id": edited.id, "candidate_answer": "newer draft",
+                })
+                assert response.status_code == 200
+                return [{"score": 80, "feedback": "ok"} for _ in items]
+
+            monkeypatch.setattr(ai_service, "evaluate_answers_batch", evaluate_while_candidate_types)
+            response = await client.post("/api/answers/batch/submit", json={"answers": [
+                {"question_id": edited.id, "candidate_answer": "submitted"},
+                {"question_id": untouched.id, "candidate_answer": "submitted"},
+            ]})
+        assert response.status_code == 200
+        outcome = {item["question_id"]: item for item in response.json()["results"]}
+        assert not outcome[edited.id]["success"]
+        assert outcome[untouched.id]["success"]
+
+        async with async_session_maker() as db:
+            rows = (await db.execute(select(Answer).where(Answer.question_id.in_([edited.id, untouched.id])))).scalars()
+            answers = {a.question_id: a for a in rows}
+        assert answers[edited.id].candidate_answer == "newer draft"
+        assert answers[edited.id].score is None
+        assert answers[untouched.id].candidate_answer == "submitted"
+        assert answers[untouched.id].score == 80
+
+    asyncio.run(scenario())
+
+
+def test_test_closed_during_evaluation_gets_no_scores(database, monkeypatch):
+    async def scenario():
+        async with async_session_maker() as db:
+            test, (question,) = await seed_test(db, questions=1)
+
+        async def evaluate_while_test_is_disqualified(items, **kwargs):
+            async with async_session_maker() as db:
+                row = await db.get(Test, test.id)
+                row.is_disqualified = True
+                await db.commit()
+            return [{"score": 80, "feedback": "ok"} for _ in items]
+
+        monkeypatch.setattr(ai_service, "evaluate_answers_batch", evaluate_while_test_is_disqualified)
+        async with api_client() as client:
+            response = await client.post("/api/answers/batch/submit", json={"answers": [
+                {"question_id": question.id, "candidate_answer": "submitted"},
+            ]})
+        assert response.status_code == 200
+        (outcome,) = response.json()["results"]
+        assert not outcome["success"]
+        assert outcome["error"] == "Test has been disqualified"
+
+        async with async_session_maker() as db:
+            answer = (await db.execute(select(Answer).where(Answer.question_id == question.id))).scalar_one_or_none()
+        assert answer is None or answer.score is None
+
+    asyncio.run(scenario())
+
+
+def test_reevaluation_skips_answers_edited_meanwhile(database, monkeypatch):
+    async def scenario():
+        async with async_session_maker() as db:
+            test, (edited, untouched) = await seed_test(db, questions=2)
+            db.add_all([
+                Answer(question_id=question.id, candidate_answer="first", is_submitted=True, score=50)
+                for question in (edited, untouched)
+            ])
+            await db.commit()
+
+        async def evaluate_while_answer_is_edited(items, **kwargs):
+            async with async_session_maker() as db:
+                answer = (await db.execute(select(Answer).where(Answer.question_id == edited.id))).scalar_one()
+                answer.candidate_answer = "second"
+                answer.score = None
+                await db.commit()
+            return [{"score": 90, "feedback": "ok"} for _ in items]
+
+        monkeypatch.setattr(ai_service, "evaluate_answers_batch", evaluate_while_answer_is_edited)
+        async with api_client() as client:
+            response = await client.post(f"/api/tests/{test.id}/reevaluate")
+        assert response.status_code == 200
+        assert (response.json()["evaluated"], response.json()["skipped"]) == (1, 1)
+
+        async with async_session_maker() as db:
+            rows = (await db.execute(select(Answer).where(Answer.question_id.in_([edited.id, untouched.id])))).scalars()
+            answers = {a.question_id: a for a in rows}
+        assert (answers[edited.id].candidate_answer, answers[edited.id].score) == ("second", None)
+        assert answers[untouched.id].score == 90
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+import asyncio
+import secrets
+
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Answer, Candidate, Competition, CompetitionRegistration, Test
+from app.services.ai_service import ai_service
+from app.services.competition_counters import (
+    claim_registration_slot, counters_drift, mark_screening_completed, repair_counters,
+)
+from conftest import api_client, seed_test
+
+
+async def _candidate(db) -> Candidate:
+    token = secrets.token_hex(6)
+    candidate = Candidate(name=f"Candidate {token}", email=f"{token}@example.com")
+    db.add(candidate)
+    await db.flush()
+    return candidate
+
+
+def test_concurrent_registrations_cannot_overshoot_the_cap(database):
+    async def register(competition_id: int) -> bool:
+        async with async_session_maker() as db:
+            if not await claim_registration_slot(db, competition_id):
+                await db.rollback()
+                return False
+            candidate = await _candidate(db)
+            db.add(CompetitionRegistration(
+                competition_id=competition_id, candidate_id=candidate.id,
+                registration_token=secrets.token_urlsafe(16),
+            ))
+            await db.commit()
+            return True
+
+    async def scenario():
+        async with async_session_maker() as db:
+            competition = Competition(name="Capped", max_participants=5)
+            db.add(competition)
+            await db.commit()
+
+        outcomes = await asyncio.gather(*(register(competition.id) for _ in range(20)))
+        assert outcomes.count(True) == 5
+
+        async with async_session_maker() as db:
+            row = await db.get(Competition, competition.id)
+            assert row.registration_count == 5
+            assert await counters_drift(db, competition.id) == 0
+
+    asyncio.run(scenario())
+
+
+def test_deleting_a_candidate_recounts_their_competitions(database):
+    async def scenario():
+        async with async_session_maker() as db:
+            competition = Competition(name="Recount")
+            db.add(competition)
+            await db.flush()
+            leaving, staying = await _candidate(db), await _candidate(db)
+            db.add_all([
+                CompetitionRegistration(
+                    competition_id=competition.id, candidate_id=leaving.id, registration_token=secrets.token_urlsafe(16),
+                    screening_completed=True, is_qualified=True,
+                ),
+                CompetitionRegistration(
+                    competition_id=competition.id, candidate_id=staying.id, registration_token=secrets.token_urlsafe(16),
+                ),
+            ])
+            await db.flush()
+            await repair_counters(db, competition.id)
+            await db.commit()
+
+        async with api_client() as client:
+            assert (await client.delete(f"/api/candidates/{leaving.id}")).status_code == 200
+
+        async with async_session_maker() as db:
+            row = await db.get(Competition, competition.id)
+            assert (row.registration_count, row.completed_count, row.qualified_registration_count) == (1, 0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_losing_screening_submit_keeps_the_winners_result(database, monkeypatch):
+    async def scenario():
+        async with async_session_maker() as db:
+            competition = Competition(name="Double submit")
+            db.add(competition)
+            await db.flush()
+            test, (question,) = await seed_test(db, questions=1)
+            db.add(Answer(question_id=question.id))
+            registration = CompetitionRegistration(
+                competition_id=competition.id, candidate_id=test.candidate_id,
+                registration_token=secrets.token_urlsafe(16), test_id=test.id,
+            )
+            db.add(registration)
+            await db.commit()
+
+        async def other_submit_wins(items, **kwargs):
+            # A second submit of the same screening completes while this one is being scored
+            async with async_session_maker() as db:
+                winner = await db.get(CompetitionRegistration, registration.id)
+                assert await mark_screening_completed(db, winner)
+                winner.screening_score = 91.0
+                await db.commit()
+            return [{"score": 10, "feedback": "late"} for _ in items]
+
+        monkeypatch.setattr(ai_service, "evaluate_answers_batch", other_submit_wins)
+        async with api_client() as client:
+            response = await client.post(
+                f"/api/competitions/{competition.id}/screening/{registration.registration_token}/submit",
+                json={
+                    "answers": [{"question_id": question.id, "candidate_answer": "loser", "time_spent_seconds": 60}],
+                    "time_per_question": [],
+                },
+            )
+        assert response.status_code == 200
+        assert response.json()["screening_score"] == 91.0
+
+        async with async_session_maker() as db:
+            row = await db.get(Competition, competition.id)
+            assert row.completed_count == 1
+            assert (await db.get(CompetitionRegistration, registration.id)).screening_score == 91.0
+            assert (await db.get(Test, test.id)).status == "in_progress"
+            answer = (await db.execute(select(Answer).where(Answer.question_id == question.id))).scalar_one()
+            assert answer.candidate_answer is None and answer.score is None
+
+    asyncio.run(scenario())
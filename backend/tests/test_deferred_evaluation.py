@@ -0,0 +1,77 @@
+import asyncio
+
+from sqlalchemy import delete, select
+
+from app.database import async_session_maker
+from app.models import Answer, Job
+from app.models.job import JobStatus
+from app.services.ai_service import ai_service
+from app.services.deferred_evaluation import (
+    EVALUATION_DONE, EVALUATION_FAILED, enqueue_answer_evaluation,
+)
+from app.services.job_queue import job_queue
+from conftest import seed_test
+
+
+PLACEHOLDER = {"score": 50, "feedback": "Manual review required.", "manual_review": True}
+
+
+async def _pending_answer() -> int:
+    async with async_session_maker() as db:
+        await db.execute(delete(Job))
+        _, (question,) = await seed_test(db, questions=1)
+        answer = Answer(question_id=question.id, candidate_answer="42", is_submitted=True)
+        db.add(answer)
+        await db.flush()
+        await enqueue_answer_evaluation(db, answer)
+        await db.commit()
+        return answer.id
+
+
+async def _drain():
+    """Run the queued jobs, retries included, until none is due."""
+    while True:
+        job = await job_queue._claim()
+        if job is None:
+            return
+        await job_queue._run(job)
+
+
+def test_placeholder_evaluation_is_retried_not_stored(database, monkeypatch):
+    replies = [PLACEHOLDER, {"score": 80, "feedback": "good"}]
+
+    async def evaluate_answer(**kwargs):
+        return replies.pop(0)
+
+    monkeypatch.setattr(ai_service, "evaluate_answer", evaluate_answer)
+    monkeypatch.setattr(job_queue, "retry_delay", 0.0)
+    monkeypatch.setattr(job_queue, "retry_max_delay", 0.0)
+
+    async def scenario():
+        answer_id = await _pending_answer()
+        await _drain()
+        async with async_session_maker() as db:
+            answer = await db.get(Answer, answer_id)
+            assert answer.evaluation_status == EVALUATION_DONE and answer.score == 80
+
+    asyncio.run(scenario())
+
+
+def test_answer_is_marked_failed_once_retries_run_out(database, monkeypatch):
+    async def evaluate_answer(**kwargs):
+        return dict(PLACEHOLDER)
+
+    monkeypatch.setattr(ai_service, "evaluate_answer", evaluate_answer)
+    monkeypatch.setattr(job_queue, "retry_delay", 0.0)
+    monkeypatch.setattr(job_queue, "retry_max_delay", 0.0)
+
+    async def scenario():
+        answer_id = await _pending_answer()
+        await _drain()
+        async with async_session_maker() as db:
+            answer = await db.get(Answer, answer_id)
+            assert answer.evaluation_status == EVALUATION_FAILED and answer.score is None
+            job = (await db.execute(select(Job).where(Job.kind == "evaluate_answer"))).scalar_one()
+            assert job.status == JobStatus.FAILED.value
+
+    asyncio.run(scenario())
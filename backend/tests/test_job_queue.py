@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+
+from app.database import async_session_maker
+from app.models.job import Job, JobStatus
+from app.services.job_queue import JobQueue, PermanentJobError, RetryJobLater
+
+
+def _queue(**kwargs) -> JobQueue:
+    options = dict(workers=2, lease_seconds=60, heartbeat_seconds=60, retry_delay=0.0, retry_max_delay=0.0)
+    options.update(kwargs)
+    return JobQueue(**options)
+
+
+async def _reset():
+    async with async_session_maker() as db:
+        await db.execute(delete(Job))
+        await db.commit()
+
+
+async def _enqueue(queue: JobQueue, kind: str, **kwargs) -> Job:
+    async with async_session_maker() as db:
+        job, _ = await queue.enqueue(db, kind, kwargs.pop("payload", {}), **kwargs)
+        await db.commit()
+        return job
+
+
+async def _load(job_id: int) -> Job:
+    async with async_session_maker() as db:
+        return await db.get(Job, job_id)
+
+
+def test_enqueue_deduplicates_active_jobs(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+        async with async_session_maker() as db:
+            first, created = await queue.enqueue(db, "report", {"test_id": 1}, dedup_key="report:1")
+            await db.commit()
+            again, created_again = await queue.enqueue(db, "report", {"test_id": 1}, dedup_key="report:1")
+        assert created and not created_again
+        assert again.id == first.id
+
+    asyncio.run(scenario())
+
+
+def test_a_job_is_claimed_once_across_processes(database):
+    async def scenario():
+        await _reset()
+        job = await _enqueue(_queue(), "report")
+        claims = await asyncio.gather(*(_queue()._claim() for _ in range(4)))
+        claimed = [claim for claim in claims if claim is not None]
+        assert [claim.id for claim in claimed] == [job.id]
+        assert claimed[0].attempts == 1
+
+    asyncio.run(scenario())
+
+
+def test_lower_priority_value_is_claimed_first(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+        await _enqueue(queue, "report", priority=100)
+        urgent = await _enqueue(queue, "evaluate", priority=10)
+        assert (await queue._claim()).id == urgent.id
+
+    asyncio.run(scenario())
+
+
+def test_delayed_job_waits_for_run_after(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+        await _enqueue(queue, "report", delay=60)
+        assert await queue._claim() is None
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_reclaimed_and_the_old_outcome_dropped(database):
+    async def scenario():
+        await _reset()
+        crashed, survivor = _queue(), _queue()
+        job = await _enqueue(crashed, "report")
+        claimed = await crashed._claim()
+        assert await survivor._claim() is None  # Lease still valid
+
+        async with async_session_maker() as db:
+            await db.execute(update(Job).where(Job.id == job.id)
+                             .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+        reclaimed = await survivor._claim()
+        assert reclaimed.id == job.id and reclaimed.attempts == 2
+
+        # The first worker comes back late: its result must not overwrite the new lease
+        await crashed._finish(claimed, JobStatus.SUCCEEDED, result={"stale": True})
+        assert crashed.counters["lease_lost"] == 1
+        row = await _load(job.id)
+        assert row.status == JobStatus.RUNNING.value and row.lease_owner == survivor.owner
+
+    asyncio.run(scenario())
+
+
+def test_failures_retry_until_max_attempts_then_fail(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+        failures = []
+
+        async def on_failure(payload, error):
+            failures.append((payload, error))
+
+        @queue.handler("flaky", on_failure=on_failure)
+        async def flaky(payload):
+            raise RuntimeError("model timed out")
+
+        job = await _enqueue(queue, "flaky", payload={"n": 1}, max_attempts=2)
+        await queue._run(await queue._claim())
+        row = await _load(job.id)
+        assert row.status == JobStatus.QUEUED.value and row.attempts == 1
+        assert "model timed out" in row.error
+
+        await queue._run(await queue._claim())
+        row = await _load(job.id)
+        assert row.status == JobStatus.FAILED.value and row.attempts == 2
+        assert row.active_key is None
+        assert failures == [({"n": 1}, "RuntimeError: model timed out")]
+
+    asyncio.run(scenario())
+
+
+def test_success_stores_the_result(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+
+        @queue.handler("double")
+        async def double(payload):
+            return {"value": payload["value"] * 2}
+
+        job = await _enqueue(queue, "double", payload={"value": 21}, dedup_key="double")
+        await queue._run(await queue._claim())
+        row = await _load(job.id)
+        assert row.status == JobStatus.SUCCEEDED.value and row.result == {"value": 42}
+        assert row.active_key is None  # The dedup key is free again
+
+    asyncio.run(scenario())
+
+
+def test_permanent_error_fails_without_retry_and_postpone_keeps_the_attempt(database):
+    async def scenario():
+        await _reset()
+        queue = _queue()
+
+        @queue.handler("broken")
+        async def broken(payload):
+            raise PermanentJobError("test was deleted")
+
+        @queue.handler("not_ready")
+        async def not_ready(payload):
+            raise RetryJobLater(0)
+
+        broken_job = await _enqueue(queue, "broken", max_attempts=3)
+        await queue._run(await queue._claim())
+        row = await _load(broken_job.id)
+        assert row.status == JobStatus.FAILED.value and row.attempts == 1
+
+        waiting = await _enqueue(queue, "not_ready", max_attempts=1)
+        for _ in range(3):
+            await queue._run(await queue._claim())
+        row = await _load(waiting.id)
+        assert row.status == JobStatus.QUEUED.value and row.attempts == 0
+
+    asyncio.run(scenario())
+
+
+def test_losing_the_lease_cancels_the_handler(database):
+    async def scenario():
+        await _reset()
+        queue = _queue(heartbeat_seconds=0.05)
+        survivor = _queue()
+        stopped = asyncio.Event()
+
+        @queue.handler("slow")
+        async def slow(payload):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        job = await _enqueue(queue, "slow")
+        claimed = await queue._claim()
+        async with async_session_maker() as db:
+            await db.execute(update(Job).where(Job.id == job.id)
+                             .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+        assert (await survivor._claim()).id == job.id
+
+        await asyncio.wait_for(queue._run(claimed), timeout=5)
+        assert stopped.is_set()
+        assert queue.counters["lease_lost"] == 1
+        row = await _load(job.id)
+        assert row.status == JobStatus.RUNNING.value and row.lease_owner == survivor.owner
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+from app.services.llm_backend_pool import LLMBackendPool, LLMEndpoint, parse_endpoint_urls
+from app.services.llm_circuit_breaker import CircuitBreaker
+
+A, B, C = "http://a", "http://b", "http://c"
+
+
+def _pool(*urls, **kwargs) -> LLMBackendPool:
+    options = dict(failure_threshold=1, recovery_timeout=300.0)
+    options.update(kwargs)
+    return LLMBackendPool(urls, **options)
+
+
+def _endpoint(pool: LLMBackendPool, url: str) -> LLMEndpoint:
+    return next(endpoint for endpoint in pool.endpoints if endpoint.url == url)
+
+
+def test_parse_endpoint_urls_drops_blanks_and_duplicates():
+    assert parse_endpoint_urls(f" {A}, ,{B},{A}", C) == [A, B]
+    assert parse_endpoint_urls("", C) == [C]
+
+
+def test_latency_is_an_exponentially_weighted_moving_average():
+    endpoint = LLMEndpoint(A, CircuitBreaker())
+    endpoint.record_latency(2.0)
+    assert endpoint.ewma_latency == 2.0
+    endpoint.record_latency(4.0)
+    assert abs(endpoint.ewma_latency - (2.0 + LLMEndpoint.LATENCY_ALPHA * 2.0)) < 1e-9
+
+    # Score is the expected time to serve one more request
+    endpoint.in_flight = 2
+    assert abs(endpoint.score(default_latency=1.0) - 3 * endpoint.ewma_latency) < 1e-9
+    assert LLMEndpoint(B, CircuitBreaker()).score(default_latency=1.5) == 1.5
+
+
+def test_acquire_prefers_the_lowest_expected_wait():
+    pool = _pool(A, B)
+    _endpoint(pool, A).record_latency(3.5)
+    _endpoint(pool, B).record_latency(1.0)
+    assert pool.acquire().url == B
+
+    # Each request queued on B adds a second; B keeps winning ...
+    assert pool.acquire().url == B
+    assert pool.acquire().url == B
+    # ... until its backlog costs more than one call on the slow replica
+    assert pool.acquire().url == A
+
+
+def test_acquire_skips_already_tried_endpoints_while_others_are_healthy():
+    pool = _pool(A, B, C)
+    _endpoint(pool, A).record_latency(0.1)
+    assert pool.acquire(exclude=[A]).url in (B, C)
+    assert pool.acquire(exclude=[A, B]).url == C
+
+    # With every healthy endpoint tried, a tried one is reused rather than failing
+    pool.release(_endpoint(pool, C), success=False)
+    assert pool.acquire(exclude=[A, B]).url in (A, B)
+
+
+def test_failing_endpoint_is_ejected_until_every_replica_is_down():
+    pool = _pool(A, B)
+    first = pool.acquire(exclude=[B])
+    assert first.url == A
+    pool.release(first, success=False, latency=5.0, error=RuntimeError("boom"))
+
+    assert [endpoint.url for endpoint in pool.healthy_endpoints()] == [B]
+    assert not pool.has_healthy(exclude=[B])
+    assert all(pool.acquire().url == B for _ in range(3))
+
+    pool.release(_endpoint(pool, B), success=False)
+    assert not pool.has_healthy()
+    assert pool.acquire() is None
+    assert pool.no_endpoint_available == 1
+
+
+def test_release_tracks_in_flight_and_cancelled_requests():
+    pool = _pool(A, failure_threshold=3)
+    endpoint = pool.acquire()
+    assert endpoint.in_flight == 1 and endpoint.requests == 1
+
+    pool.release(endpoint, success=None)
+    assert endpoint.in_flight == 0
+    assert endpoint.ewma_latency is None
+    assert endpoint.breaker.consecutive_failures == 0
+
+    pool.release(pool.acquire(), success=True, latency=0.5)
+    assert endpoint.ewma_latency == 0.5
+    assert pool.stats()["in_flight"] == 0
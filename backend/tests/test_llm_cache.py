@@ -0,0 +1,188 @@
+import asyncio
+
+from app.services.ai_service import ai_service
+from app.services.llm_cache import LLMResponseCache, make_cache_key
+from app.services.llm_singleflight import SingleFlight
+
+
+MESSAGES = [{"role": "system", "content": "Score it"}, {"role": "user", "content": "Answer: 42"}]
+
+
+def test_cache_key_is_stable():
+    assert make_cache_key("kimi", MESSAGES, 0.3, "evaluate_answer", 1024) == \
+        make_cache_key("kimi", [dict(m) for m in MESSAGES], 0.3, "evaluate_answer", 1024)
+
+
+def test_cache_key_covers_everything_that_shapes_the_response():
+    base = make_cache_key("kimi", MESSAGES, 0.3, "evaluate_answer", 1024)
+    assert base != make_cache_key("other", MESSAGES, 0.3, "evaluate_answer", 1024)
+    assert base != make_cache_key("kimi", MESSAGES[:1], 0.3, "evaluate_answer", 1024)
+    assert base != make_cache_key("kimi", MESSAGES, 0.7, "evaluate_answer", 1024)
+    assert base != make_cache_key("kimi", MESSAGES, 0.3, "speculative_evaluate_answer", 1024)
+    assert base != make_cache_key("kimi", MESSAGES, 0.3, "evaluate_answer", 2048)
+
+
+def test_cache_expires_entries():
+    async def scenario():
+        cache = LLMResponseCache(max_entries=2)
+        await cache.set("a", "evaluate_answer", '{"score": 1}', ttl=-1)
+        assert await cache.get("a", "evaluate_answer") is None
+        await cache.set("b", "evaluate_answer", '{"score": 2}')
+        assert await cache.get("b", "evaluate_answer") == '{"score": 2}'
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flight.do("key", "evaluate_answer", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.stats()["coalesced_calls"] == 4
+        assert flight.stats()["in_flight"] == 0
+
+        # Once finished, the key runs again
+        assert await flight.do("key", "evaluate_answer", fetch) == "result"
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_survives_a_cancelled_caller():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", "op", fetch))
+        second = asyncio.create_task(flight.do("key", "op", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == "done"
+
+    asyncio.run(scenario())
+
+
+class _FakePost:
+    """Stands in for the HTTP call: counts requests and blocks until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, messages, temperature, operation):
+        self.calls.append(operation)
+        await self.release.wait()
+        return '{"score": %d}' % len(self.calls)
+
+
+def _with_fake_post(monkeypatch) -> _FakePost:
+    fake = _FakePost()
+    monkeypatch.setattr(ai_service, "_post_with_retry", fake)
+    monkeypatch.setattr(ai_service, "cache", LLMResponseCache(max_entries=16))
+    return fake
+
+
+def test_operations_with_the_same_prompt_do_not_share_calls(monkeypatch):
+    fake = _with_fake_post(monkeypatch)
+
+    async def scenario():
+        speculative = asyncio.create_task(ai_service._call_kimi_with_retry(
+            MESSAGES, temperature=0.3, operation="speculative_evaluate_answer"))
+        submitted = asyncio.create_task(ai_service._call_kimi_with_retry(
+            MESSAGES, temperature=0.3, operation="evaluate_answer"))
+        await asyncio.sleep(0)
+        fake.release.set()
+        await asyncio.gather(speculative, submitted)
+
+    asyncio.run(scenario())
+    assert sorted(fake.calls) == ["evaluate_answer", "speculative_evaluate_answer"]
+
+
+def test_fresh_call_bypasses_cache_and_replaces_it(monkeypatch):
+    fake = _with_fake_post(monkeypatch)
+    fake.release.set()
+
+    async def scenario():
+        first = await ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer")
+        assert await ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer") == first
+        assert len(fake.calls) == 1
+
+        fresh = await ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer", fresh=True)
+        assert fresh != first
+        assert len(fake.calls) == 2
+        assert await ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer") == fresh
+
+    asyncio.run(scenario())
+
+
+def test_fresh_call_does_not_join_an_in_flight_request(monkeypatch):
+    fake = _with_fake_post(monkeypatch)
+
+    async def scenario():
+        pending = asyncio.create_task(ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer"))
+        fresh = asyncio.create_task(ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer", fresh=True))
+        await asyncio.sleep(0)
+        fake.release.set()
+        await asyncio.gather(pending, fresh)
+
+    asyncio.run(scenario())
+    assert len(fake.calls) == 2
+
+
+def test_only_responses_the_caller_can_parse_are_cached(monkeypatch):
+    replies = ['{"score": 80, "feedback": "Cle', '{"score": 80}', '[{"id": 1, "sco', '[{"id": 1, "score": 70}]']
+
+    async def post(messages, temperature, operation):
+        return replies.pop(0)
+
+    monkeypatch.setattr(ai_service, "_post_with_retry", post)
+    monkeypatch.setattr(ai_service, "cache", LLMResponseCache(max_entries=16))
+
+    async def scenario():
+        # A truncated response is returned to the caller but requested again next time
+        single = [await ai_service._call_kimi_with_retry(MESSAGES, operation="evaluate_answer") for _ in range(3)]
+        assert single == ['{"score": 80, "feedback": "Cle', '{"score": 80}', '{"score": 80}']
+
+        batch = [
+            await ai_service._call_kimi_with_retry(
+                MESSAGES, operation="evaluate_answers_batch", validate=ai_service._parse_json_array
+            )
+            for _ in range(3)
+        ]
+        assert batch == ['[{"id": 1, "sco', '[{"id": 1, "score": 70}]', '[{"id": 1, "score": 70}]']
+        assert replies == []
+
+    asyncio.run(scenario())
+
+
+def test_an_unparseable_cached_response_is_evicted(monkeypatch):
+    fake = _with_fake_post(monkeypatch)
+    fake.release.set()
+    max_tokens = ai_service.profile_for("evaluate_answer").max_tokens
+    key = make_cache_key(ai_service.model, MESSAGES, 0.3, "evaluate_answer", max_tokens)
+
+    async def scenario():
+        await ai_service.cache.set(key, "evaluate_answer", '{"score": 8')
+        response = await ai_service._call_kimi_with_retry(MESSAGES, temperature=0.3, operation="evaluate_answer")
+        assert response == '{"score": 1}'
+        assert await ai_service.cache.get(key, "evaluate_answer") == '{"score": 1}'
+
+    asyncio.run(scenario())
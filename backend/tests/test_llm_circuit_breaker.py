@@ -0,0 +1,95 @@
+from app.services import llm_circuit_breaker
+from app.services.llm_circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+
+class _Clock:
+    """Stands in for the ``time`` module inside llm_circuit_breaker."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+def _breaker(monkeypatch, **kwargs):
+    clock = _Clock()
+    monkeypatch.setattr(llm_circuit_breaker, "time", clock)
+    options = dict(failure_threshold=3, recovery_timeout=30.0, half_open_max_calls=1)
+    options.update(kwargs)
+    return CircuitBreaker(**options), clock
+
+
+def test_opens_after_consecutive_failures_only(monkeypatch):
+    breaker, _ = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.is_open
+    assert breaker.times_opened == 1
+    assert breaker.last_failure == "RuntimeError: timeout"
+
+
+def test_open_breaker_fails_fast_until_the_recovery_timeout(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1)
+    breaker.record_failure()
+
+    assert not breaker.allow_request()
+    assert breaker.rejected_calls == 1
+    clock.now += 10
+    assert breaker.retry_after() == 20.0
+    assert breaker.state == STATE_OPEN
+
+    clock.now += 20
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.retry_after() == 0.0
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+
+    assert not breaker.is_open
+    assert breaker.allow_request()
+    # The probe is in flight - everyone else still fails fast
+    assert breaker.is_open
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_for_another_recovery_period(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.times_opened == 2
+    assert breaker.retry_after() == 30.0
+
+
+def test_cancelled_probe_frees_the_probe_slot(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_cancelled()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
@@ -0,0 +1,134 @@
+import asyncio
+
+from app.services.llm_scheduler import (
+    LANE_ANALYSIS,
+    LANE_EVALUATION,
+    LANE_GENERATION,
+    LANE_INTERACTIVE,
+    LLMScheduler,
+    lane_for_operation,
+)
+
+
+async def _settle():
+    """Let woken waiters run up to their next await."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_unknown_operations_run_in_the_analysis_lane():
+    assert lane_for_operation("live_feedback") == LANE_INTERACTIVE
+    assert lane_for_operation("evaluate_answers_batch") == LANE_EVALUATION
+    assert lane_for_operation("something_new") == LANE_ANALYSIS
+
+
+def test_freed_slots_go_to_the_highest_priority_lane_first():
+    async def scenario():
+        scheduler = LLMScheduler(total_limit=1, lane_limits={})
+        await scheduler.acquire(LANE_GENERATION)
+
+        order = []
+
+        async def call(lane):
+            async with scheduler.slot(lane):
+                order.append(lane)
+                await _settle()
+
+        # Queued lowest priority first, so FIFO order would be the reverse
+        tasks = [asyncio.create_task(call(lane)) for lane in (LANE_ANALYSIS, LANE_EVALUATION, LANE_INTERACTIVE)]
+        await _settle()
+        assert order == []
+        assert scheduler.stats(LANE_ANALYSIS)["queue_depth"] == 1
+
+        scheduler.release(LANE_GENERATION)
+        await asyncio.gather(*tasks)
+        assert order == [LANE_INTERACTIVE, LANE_EVALUATION, LANE_ANALYSIS]
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_background_lanes_leave_the_reserved_interactive_slots_free():
+    async def scenario():
+        scheduler = LLMScheduler(total_limit=3, lane_limits={}, reserved_interactive=1)
+        await scheduler.acquire(LANE_EVALUATION)
+        await scheduler.acquire(LANE_ANALYSIS)
+
+        blocked = asyncio.create_task(scheduler.acquire(LANE_EVALUATION))
+        await _settle()
+        assert not blocked.done()
+
+        # The reserved slot is still there for a candidate-facing call
+        await asyncio.wait_for(scheduler.acquire(LANE_INTERACTIVE), timeout=1)
+        assert scheduler.in_flight == 3
+
+        # Freeing the reserved slot does not let background work into it
+        scheduler.release(LANE_INTERACTIVE)
+        await _settle()
+        assert not blocked.done()
+
+        scheduler.release(LANE_ANALYSIS)
+        await asyncio.wait_for(blocked, timeout=1)
+        assert scheduler.stats(LANE_EVALUATION)["in_flight"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_each_lane_is_capped_by_its_own_limit():
+    async def scenario():
+        scheduler = LLMScheduler(total_limit=4, lane_limits={LANE_GENERATION: 1})
+        await scheduler.acquire(LANE_GENERATION)
+
+        second = asyncio.create_task(scheduler.acquire(LANE_GENERATION))
+        await _settle()
+        assert not second.done()
+        await asyncio.wait_for(scheduler.acquire(LANE_EVALUATION), timeout=1)
+
+        scheduler.release(LANE_GENERATION)
+        await asyncio.wait_for(second, timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_waiter_leaves_the_queue_without_taking_a_slot():
+    async def scenario():
+        scheduler = LLMScheduler(total_limit=1, lane_limits={})
+        await scheduler.acquire(LANE_EVALUATION)
+
+        waiter = asyncio.create_task(scheduler.acquire(LANE_ANALYSIS))
+        await _settle()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.stats(LANE_ANALYSIS)["queue_depth"] == 0
+
+        scheduler.release(LANE_EVALUATION)
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_spare_capacity_excludes_reserved_slots_and_queued_callers():
+    async def scenario():
+        scheduler = LLMScheduler(total_limit=3, lane_limits={LANE_EVALUATION: 1}, reserved_interactive=1)
+        assert scheduler.has_spare_capacity(free_slots=2)
+        assert not scheduler.has_spare_capacity(free_slots=3)
+
+        await scheduler.acquire(LANE_EVALUATION)
+        assert scheduler.has_spare_capacity()
+        assert not scheduler.has_spare_capacity(free_slots=2)
+
+        await scheduler.acquire(LANE_ANALYSIS)
+        assert not scheduler.has_spare_capacity()
+        scheduler.release(LANE_ANALYSIS)
+
+        # A slot is free, but a caller queued behind its lane limit still means no spare capacity
+        queued = asyncio.create_task(scheduler.acquire(LANE_EVALUATION))
+        await _settle()
+        assert not queued.done()
+        assert not scheduler.has_spare_capacity()
+
+        scheduler.release(LANE_EVALUATION)
+        await asyncio.wait_for(queued, timeout=1)
+        assert scheduler.has_spare_capacity()
+
+    asyncio.run(scenario())
@@ -0,0 +1,92 @@
+import sqlite3
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.database import BACKEND_DIR, Base, run_migrations
+import app.models  # noqa: F401
+
+
+BASELINE_SCHEMA = Path(__file__).parent / "fixtures" / "baseline_schema.sql"
+
+
+def _baseline_database(path: Path) -> Path:
+    """A database as the original create_all left it, with a few competition registrations."""
+    connection = sqlite3.connect(path)
+    connection.executescript(BASELINE_SCHEMA.read_text())
+    connection.executescript("""
+        INSERT INTO candidates (id, name, email) VALUES (1, 'Ada', 'ada@example.com');
+        INSERT INTO competitions (id, name, passing_percentile) VALUES (1, 'Spring', 50);
+        INSERT INTO competition_registrations (competition_id, candidate_id, registration_token, screening_completed, is_qualified)
+        VALUES (1, 1, 'r1', 1, 1), (1, 1, 'r2', 1, 0), (1, 1, 'r3', 0, 0);
+    """)
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _migrate(path: Path):
+    engine = sa.create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        run_migrations(connection)
+    return engine
+
+
+def _config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def _head() -> str:
+    return ScriptDirectory.from_config(_config()).get_current_head()
+
+
+def test_revisions_form_one_chain():
+    scripts = ScriptDirectory.from_config(_config())
+    assert len(scripts.get_heads()) == 1
+    assert list(scripts.walk_revisions())[-1].down_revision is None
+
+
+def test_baseline_database_upgrades_to_the_models(tmp_path):
+    engine = _migrate(_baseline_database(tmp_path / "baseline.db"))
+    inspector = sa.inspect(engine)
+
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert {column.name for column in table.columns} <= columns, table.name
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} == indexes, table.name
+
+    with engine.connect() as connection:
+        assert connection.execute(sa.text("SELECT version_num FROM alembic_version")).scalar() == _head()
+        counters = connection.execute(sa.text(
+            "SELECT registration_count, completed_count, qualified_registration_count FROM competitions WHERE id = 1"
+        )).one()
+    assert tuple(counters) == (3, 2, 1)
+
+
+def test_upgrade_is_idempotent_on_a_fresh_database(tmp_path):
+    path = tmp_path / "fresh.db"
+    _migrate(path)
+    engine = _migrate(path)
+    with engine.connect() as connection:
+        assert connection.execute(sa.text("SELECT version_num FROM alembic_version")).scalar() == _head()
+
+
+def test_downgrade_to_baseline_and_back(tmp_path):
+    from alembic import command
+
+    path = _baseline_database(tmp_path / "roundtrip.db")
+    engine = _migrate(path)
+    config = _config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "0001")
+    assert "generation_job_id" not in {c["name"] for c in sa.inspect(engine).get_columns("tests")}
+
+    engine = _migrate(path)
+    assert "generation_job_id" in {c["name"] for c in sa.inspect(engine).get_columns("tests")}
@@ -0,0 +1,130 @@
+import asyncio
+import secrets
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Candidate, Competition, CompetitionRegistration, Test
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+from conftest import api_client, seed_test
+
+
+SCORES = [90.0, 80.0, 80.0, 70.0, None, None, 60.0]
+
+
+async def _seed_rankings():
+    """A competition with a registration per score; returns (query, ids in page order)."""
+    async with async_session_maker() as db:
+        competition = Competition(name="Pagination")
+        db.add(competition)
+        await db.flush()
+        registrations = []
+        for score in SCORES:
+            token = secrets.token_hex(6)
+            candidate = Candidate(name=f"Candidate {token}", email=f"{token}@example.com")
+            db.add(candidate)
+            await db.flush()
+            registration = CompetitionRegistration(
+                competition_id=competition.id, candidate_id=candidate.id,
+                registration_token=token, screening_score=score,
+            )
+            db.add(registration)
+            registrations.append(registration)
+        await db.commit()
+
+    scored = sorted((r for r in registrations if r.screening_score is not None),
+                    key=lambda r: (r.screening_score, r.id), reverse=True)
+    unscored = sorted((r for r in registrations if r.screening_score is None), key=lambda r: r.id, reverse=True)
+    query = select(CompetitionRegistration).where(CompetitionRegistration.competition_id == competition.id)
+    return query, [r.id for r in scored + unscored]
+
+
+async def _page(query, limit, cursor=None, skip=0):
+    async with async_session_maker() as db:
+        return await keyset_page(
+            db, query, CompetitionRegistration.screening_score, CompetitionRegistration.id,
+            limit, cursor=cursor, skip=skip,
+        )
+
+
+def test_cursor_round_trip():
+    for value in (80.5, None, "text"):
+        cursor = encode_cursor(value, 12, 30)
+        assert decode_cursor(cursor) == (value, 12, 30)
+
+    moment = datetime(2026, 10, 16, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(moment, 7, 0)) == (moment, 7, 0)
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+def test_cursor_pages_cover_ties_and_the_null_range(database):
+    async def scenario():
+        query, expected = await _seed_rankings()
+
+        seen, offsets, cursor = [], [], None
+        while True:
+            page = await _page(query, 3, cursor=cursor)
+            seen += [r.id for r in page.items]
+            offsets.append(page.offset)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert offsets == [0, 3, 6]
+
+    asyncio.run(scenario())
+
+
+def test_skip_without_cursor_falls_back_to_offset(database):
+    async def scenario():
+        query, expected = await _seed_rankings()
+
+        for skip in (0, 2, 5, 6):
+            page = await _page(query, 3, skip=skip)
+            assert [r.id for r in page.items] == expected[skip:skip + 3]
+            assert page.offset == skip
+
+        # A cursor from an offset page carries on after it
+        page = await _page(query, 3, skip=2)
+        following = await _page(query, 3, cursor=page.next_cursor)
+        assert [r.id for r in following.items] == expected[5:8]
+        assert following.offset == 5
+
+    asyncio.run(scenario())
+
+
+def test_cheating_logs_are_paged_newest_first(database):
+    async def scenario():
+        flagged = []
+        async with async_session_maker() as db:
+            for _ in range(3):
+                test, _ = await seed_test(db, questions=0)
+                row = await db.get(Test, test.id)
+                row.tab_switch_count = 2
+                await db.commit()
+                flagged.append(test.id)
+
+        logs, cursor = [], None
+        async with api_client() as client:
+            while True:
+                params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+                response = await client.get("/api/reports/cheating-logs", params=params)
+                assert response.status_code == 200
+                body = response.json()
+                logs += body["logs"]
+                cursor = body["next_cursor"]
+                if cursor is None:
+                    break
+
+        ours = [log["test_id"] for log in logs if log["test_id"] in flagged]
+        assert ours == list(reversed(flagged))
+        assert len({log["test_id"] for log in logs}) == len(logs)
+
+    asyncio.run(scenario())
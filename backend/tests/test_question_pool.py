@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.database import async_session_maker
+from app.models import Job, PooledQuestion
+from app.services.question_pool import QuestionPool
+
+
+def _stock(count: int):
+    return [
+        PooledQuestion(category="coding", difficulty="mid", track_id=None, question_text=f"Pooled {i}")
+        for i in range(count)
+    ]
+
+
+async def _drawn_ids():
+    async with async_session_maker() as db:
+        result = await db.execute(select(PooledQuestion.id).where(PooledQuestion.drawn_at.is_not(None)))
+        return set(result.scalars().all())
+
+
+def test_pool_is_off_by_default(database):
+    async def scenario():
+        assert await QuestionPool().draw("coding", "mid", None, 2) is None
+
+    asyncio.run(scenario())
+
+
+def test_draws_not_kept_go_back_to_stock(database):
+    pool = QuestionPool(enabled=True, target=4, refill_below=0)
+
+    async def scenario():
+        async with async_session_maker() as db:
+            await db.execute(delete(PooledQuestion))
+            await db.execute(delete(Job))
+            db.add_all(_stock(4))
+            await db.commit()
+
+        # A test creation that fails after drawing uses up nothing
+        with pytest.raises(RuntimeError):
+            async with pool.draws() as draws:
+                assert len(await draws.draw("coding", "mid", None, 2)) == 2
+                assert len(await _drawn_ids()) == 2
+                raise RuntimeError("test creation failed")
+        assert await _drawn_ids() == set()
+
+        # Only the questions the test saved stay drawn
+        async with pool.draws() as draws:
+            first = await draws.draw("coding", "mid", None, 2)
+            second = await draws.draw("coding", "mid", None, 2)
+            draws.keep(first + [{"question_text": "generated live"}])
+        assert await _drawn_ids() == {q["pool_id"] for q in first}
+        assert pool.counters["released"] == 4
+        assert {q["pool_id"] for q in second}.isdisjoint(await _drawn_ids())
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+
+from app.database import async_session_maker
+from app.models import QuestionFingerprint, QuestionLSHBucket
+from app.services.minhash import LSHIndex, minhasher, shingles, similarity
+from app.services.question_similarity import QuestionIndex, SOURCE_TEST
+
+
+BASE = (
+    "Design a rate limiter for a public HTTP API that allows each client at most one hundred "
+    "requests per minute, explain how you would store the counters, and describe how the design "
+    "behaves when the service runs on several machines behind a load balancer."
+)
+PARAPHRASE = BASE.replace("one hundred", "two hundred").replace("explain how", "explain where")
+UNRELATED = (
+    "Given a binary tree, write a function that returns the values of its nodes level by level, "
+    "from left to right, and state the time and space complexity of your solution."
+)
+
+
+def _signature(text: str):
+    return minhasher.signature(shingles(text))
+
+
+def test_similarity_estimates_follow_the_threshold():
+    base, paraphrase, unrelated = _signature(BASE), _signature(PARAPHRASE), _signature(UNRELATED)
+
+    assert similarity(base, _signature(BASE.upper() + "\n\n")) == 1.0  # Case and whitespace are ignored
+    assert similarity(base, paraphrase) >= 0.7
+    assert similarity(base, unrelated) < 0.2
+
+    index = LSHIndex()
+    index.add("base", base)
+    index.add("unrelated", unrelated)
+    assert index.query(paraphrase, threshold=0.7) == ["base"]
+    assert index.query(_signature("Something else entirely, about databases."), threshold=0.7) == []
+
+
+def test_dedup_only_rejects_recently_accepted_questions(database):
+    question_index = QuestionIndex(threshold=0.7, window_days=30)
+
+    async def scenario():
+        async with async_session_maker() as db:
+            await db.execute(delete(QuestionLSHBucket))
+            await db.execute(delete(QuestionFingerprint))
+            await db.commit()
+
+        accepted = await question_index.accept([{"question_text": BASE}, {"question_text": PARAPHRASE}], SOURCE_TEST)
+        assert [q["question_text"] for q in accepted] == [BASE]  # Same batch: the paraphrase is a duplicate
+        assert await question_index.accept([{"question_text": PARAPHRASE}], SOURCE_TEST) == []
+
+        # Once the question is older than the window it no longer blocks new ones
+        async with async_session_maker() as db:
+            await db.execute(
+                update(QuestionFingerprint).values(accepted_at=datetime.utcnow() - timedelta(days=31))
+            )
+            await db.commit()
+        again = await question_index.accept([{"question_text": BASE}], SOURCE_TEST)
+        assert again == [{"question_text": BASE, "fingerprint_id": accepted[0]["fingerprint_id"]}]
+        assert await question_index.accept([{"question_text": PARAPHRASE}], SOURCE_TEST) == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,221 @@
+import asyncio
+import secrets
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Candidate, Competition, CompetitionQuestion, CompetitionRegistration, Test
+from app.services import screening_pool
+from app.services.ai_service import ai_service
+from app.services.question_similarity import question_index
+from app.services.screening_pool import (
+    SCREENING_POOL_READY, _provision_screening_pool_job, assigned_variant, deal_screening_questions,
+)
+from conftest import api_client
+
+
+def test_each_variant_is_dealt_once_per_block():
+    variants = 7
+    for slot_key in ("coding:0", "coding:1", "brain_teaser:3"):
+        for block in range(20):
+            dealt = [assigned_variant("seed", slot_key, block * variants + offset, variants) for offset in range(variants)]
+            assert sorted(dealt) == list(range(variants))
+
+    # The permutation changes from slot to slot and block to block
+    first = [assigned_variant("seed", "coding:0", r, variants) for r in range(variants * 4)]
+    assert first != [assigned_variant("seed", "coding:1", r, variants) for r in range(variants * 4)]
+    assert len({tuple(first[start:start + variants]) for start in range(0, len(first), variants)}) > 1
+
+
+async def _ready_competition(questions_count: int, variants: int) -> Competition:
+    async with async_session_maker() as db:
+        competition = Competition(
+            name=f"Pool {secrets.token_hex(4)}", questions_count=questions_count,
+            screening_pool_status=SCREENING_POOL_READY, screening_pool_variants=variants,
+            screening_pool_seed=secrets.token_hex(8), screening_pool_ready_at=datetime.utcnow(),
+        )
+        db.add(competition)
+        await db.flush()
+        for category, section_order, slots in screening_pool.screening_layout(questions_count):
+            db.add_all([
+                CompetitionQuestion(
+                    competition_id=competition.id, category=category, section_order=section_order,
+                    slot=slot, variant=variant, question_text=f"{category} slot {slot} variant {variant}",
+                )
+                for slot in range(slots)
+                for variant in range(variants)
+            ])
+        await db.commit()
+        return competition
+
+
+def test_a_block_of_registrations_sees_every_variant_of_every_slot(database):
+    variants = 3
+
+    async def scenario():
+        competition = await _ready_competition(questions_count=6, variants=variants)
+        async with async_session_maker() as db:
+            dealt = [await deal_screening_questions(db, competition, registration_id) for registration_id in range(30, 33)]
+
+        layout = [(category, slot) for category, _, slots in screening_pool.screening_layout(6) for slot in range(slots)]
+        assert [[(q["category"], q["question_order"]) for q in test] for test in dealt] == [layout] * variants
+        for position, (category, slot) in enumerate(layout):
+            texts = sorted(test[position]["question_text"] for test in dealt)
+            assert texts == [f"{category} slot {slot} variant {variant}" for variant in range(variants)]
+
+    asyncio.run(scenario())
+
+
+def test_no_deal_without_a_ready_and_complete_pool(database):
+    async def scenario():
+        competition = await _ready_competition(questions_count=2, variants=2)
+        async with async_session_maker() as db:
+            assert await deal_screening_questions(db, competition, 1) is not None
+
+            competition.screening_pool_status = "provisioning"
+            assert await deal_screening_questions(db, competition, 1) is None
+
+        async with async_session_maker() as db:
+            incomplete = await _ready_competition(questions_count=2, variants=2)
+            incomplete.questions_count = 5  # Layout now has slots the pool never generated
+            assert await deal_screening_questions(db, incomplete, 1) is None
+
+    asyncio.run(scenario())
+
+
+def test_a_section_filled_on_the_last_attempt_is_ready(database, monkeypatch):
+    monkeypatch.setattr(settings, "QUESTION_POOL_BATCH_SIZE", 1)
+    calls = []
+
+    async def generate(category, difficulty, track_id, count):
+        calls.append(category)
+        return [{"question_text": f"{category} question {len(calls)}"}]
+
+    async def accept(questions, source):
+        # Every batch but the last two is rejected as a near-duplicate
+        return questions if len(calls) > 6 else []
+
+    monkeypatch.setattr(ai_service, "generate_pool_questions", generate)
+    monkeypatch.setattr(question_index, "accept", accept)
+
+    async def scenario():
+        async with async_session_maker() as db:
+            competition = Competition(
+                name=f"Pool {secrets.token_hex(4)}", questions_count=1,
+                screening_pool_status="provisioning", screening_pool_variants=2,
+            )
+            db.add(competition)
+            await db.commit()
+
+        # needed = 2 variants of 1 slot: the bound is 2 + 6 = 8 attempts, the 8th stores the 2nd question
+        result = await _provision_screening_pool_job({"competition_id": competition.id})
+        assert len(calls) == 8
+        assert result["generated"] == 2
+
+        async with async_session_maker() as db:
+            row = await db.get(Competition, competition.id)
+            assert row.screening_pool_status == SCREENING_POOL_READY
+            stored = await db.execute(
+                select(CompetitionQuestion.variant).where(CompetitionQuestion.competition_id == competition.id)
+            )
+            assert sorted(stored.scalars().all()) == [0, 1]
+
+    asyncio.run(scenario())
+
+
+async def _registration() -> CompetitionRegistration:
+    """A registration for an open competition that has no screening pool."""
+    async with async_session_maker() as db:
+        token = secrets.token_hex(6)
+        competition = Competition(name=f"Live {token}", status="screening_active", questions_count=2)
+        candidate = Candidate(name=f"Candidate {token}", email=f"{token}@example.com")
+        db.add_all([competition, candidate])
+        await db.flush()
+        registration = CompetitionRegistration(
+            competition_id=competition.id, candidate_id=candidate.id, registration_token=token,
+        )
+        db.add(registration)
+        await db.commit()
+        return registration
+
+
+async def _linked_test_id(registration_id: int):
+    async with async_session_maker() as db:
+        return (await db.get(CompetitionRegistration, registration_id)).test_id
+
+
+def test_live_generation_runs_after_the_test_row_is_committed(database, monkeypatch):
+    async def scenario():
+        registration = await _registration()
+        seen_during_generation = []
+
+        async def generate(categories, **kwargs):
+            # Read from another connection: only committed rows are visible
+            seen_during_generation.append(await _linked_test_id(registration.id))
+            return {"brain_teaser": [{"question_text": "Q1"}, {"question_text": "Q2"}]}
+
+        monkeypatch.setattr(ai_service, "generate_test_questions", generate)
+        async with api_client() as client:
+            response = await client.get(
+                f"/api/competitions/{registration.competition_id}/screening/{registration.registration_token}"
+            )
+        assert response.status_code == 200
+        assert seen_during_generation == [response.json()["test_id"]]
+
+    asyncio.run(scenario())
+
+
+def test_failed_live_generation_leaves_no_empty_test(database, monkeypatch):
+    async def generate(categories, **kwargs):
+        raise RuntimeError("model down")
+
+    monkeypatch.setattr(ai_service, "generate_test_questions", generate)
+
+    async def scenario():
+        registration = await _registration()
+        async with api_client() as client:
+            with pytest.raises(RuntimeError):
+                await client.get(
+                    f"/api/competitions/{registration.competition_id}/screening/{registration.registration_token}"
+                )
+
+        assert await _linked_test_id(registration.id) is None
+        async with async_session_maker() as db:
+            tests = await db.execute(select(Test.id).where(Test.candidate_id == registration.candidate_id))
+            assert tests.scalars().all() == []
+
+    asyncio.run(scenario())
+
+
+def test_a_screening_test_cannot_start_while_its_questions_are_generated(database, monkeypatch):
+    async def scenario():
+        registration = await _registration()
+        screening = f"/api/competitions/{registration.competition_id}/screening/{registration.registration_token}"
+        during_generation = []
+
+        async def generate(categories, **kwargs):
+            async with async_session_maker() as db:
+                test = await db.get(Test, await _linked_test_id(registration.id))
+            assert test.generation_status == "generating"
+            async with api_client() as client:
+                during_generation.append((await client.get(screening)).json()["generation_status"])
+                during_generation.append((await client.post(f"/api/tests/token/{test.access_token}/start")).status_code)
+                during_generation.append((await client.post(f"{screening}/start")).status_code)
+            return {"brain_teaser": [{"question_text": "Q1"}, {"question_text": "Q2"}]}
+
+        monkeypatch.setattr(ai_service, "generate_test_questions", generate)
+        async with api_client() as client:
+            response = await client.get(screening)
+            assert response.json()["generation_status"] == "ready"
+            assert during_generation == ["generating", 409, 409]
+            assert (await client.post(f"{screening}/start")).status_code == 200
+
+        async with async_session_maker() as db:
+            test = await db.get(Test, response.json()["test_id"])
+            # Brain teasers filled the test, so the later sections are ready with nothing to ask
+            assert [(s["status"], s["questions"]) for s in test.generation_progress][:2] == [("ready", 2), ("ready", 0)]
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import asyncio
+
+from sqlalchemy import delete
+
+from app.database import async_session_maker
+from app.models import Job, Test
+from app.api.routes.tests import _generate_test_questions_failed, _generate_test_questions_job
+from app.services.ai_service import ai_service
+from conftest import api_client, seed_test
+
+
+PROGRESS = [
+    {"category": "brain_teaser", "section_order": 0, "status": "ready", "questions": 3},
+    {"category": "coding", "section_order": 1, "status": "pending", "questions": 0},
+]
+
+
+def test_failed_generation_is_reported_and_can_be_regenerated(database):
+    async def scenario():
+        async with async_session_maker() as db:
+            await db.execute(delete(Job))
+            test, _ = await seed_test(db, questions=0, status="pending")
+            row = await db.get(Test, test.id)
+            row.generation_progress = [dict(section) for section in PROGRESS]
+            await db.commit()
+
+        async with api_client() as client:
+            candidate_view = (await client.get(f"/api/tests/token/{test.access_token}")).json()
+            assert candidate_view["generation_status"] == "generating"
+
+            await _generate_test_questions_failed({"test_id": test.id}, "RuntimeError: boom")
+
+            candidate_view = (await client.get(f"/api/tests/token/{test.access_token}")).json()
+            assert candidate_view["generation_status"] == "failed"
+            assert [s["status"] for s in candidate_view["generation_progress"]] == ["ready", "failed"]
+            started = await client.post(f"/api/tests/token/{test.access_token}/start")
+            assert started.status_code == 409 and "could not be prepared" in started.json()["detail"]
+
+            regenerated = await client.post(f"/api/tests/{test.id}/regenerate-questions")
+            assert regenerated.status_code == 202
+            assert regenerated.json()["generation_status"] == "generating"
+            again = await client.post(f"/api/tests/{test.id}/regenerate-questions")
+            assert again.status_code == 409  # Already queued
+
+        async with async_session_maker() as db:
+            row = await db.get(Test, test.id)
+            assert [s["status"] for s in row.generation_progress] == ["ready", "pending"]
+            job = await db.get(Job, row.generation_job_id)
+            assert job.kind == "generate_test_questions" and job.payload == {"test_id": test.id}
+
+    asyncio.run(scenario())
+
+
+def test_an_empty_section_is_failed_not_ready(database, monkeypatch):
+    async def generate(categories, on_category=None, **kwargs):
+        await on_category("coding", [])
+        return {"coding": []}
+
+    monkeypatch.setattr(ai_service, "generate_test_questions", generate)
+
+    async def scenario():
+        async with async_session_maker() as db:
+            test, _ = await seed_test(db, questions=0, status="pending")
+            row = await db.get(Test, test.id)
+            row.generation_progress = [dict(section) for section in PROGRESS]
+            await db.commit()
+
+        result = await _generate_test_questions_job({"test_id": test.id})
+        assert result["questions_generated"] == 3
+
+        async with async_session_maker() as db:
+            row = await db.get(Test, test.id)
+            assert [s["status"] for s in row.generation_progress] == ["ready", "failed"]
+            assert row.generation_status == "failed"
+
+    asyncio.run(scenario())
@@ -0,0 +1,118 @@
+import asyncio
+import secrets
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Candidate
+from app.services.write_queue import WriteQueue
+
+
+def _add_candidate(email: str, fail: bool = False):
+    async def write(db):
+        candidate = Candidate(name="Writer", email=email)
+        db.add(candidate)
+        await db.flush()
+        if fail:
+            raise HTTPException(status_code=404, detail="Not found")
+        return candidate.id
+
+    return write
+
+
+async def _stored(emails: list) -> set:
+    async with async_session_maker() as db:
+        result = await db.execute(select(Candidate.email).where(Candidate.email.in_(emails)))
+        return set(result.scalars().all())
+
+
+def _emails(count: int) -> list:
+    token = secrets.token_hex(4)
+    return [f"{token}-{i}@example.com" for i in range(count)]
+
+
+def test_concurrent_writes_commit_in_one_batch(database):
+    async def scenario():
+        queue = WriteQueue(max_batch=16, max_wait_ms=50)
+        await queue.start()
+        emails = _emails(5)
+        try:
+            ids = await asyncio.gather(*(queue.submit(_add_candidate(email)) for email in emails))
+        finally:
+            await queue.stop()
+
+        assert len(set(ids)) == 5
+        assert await _stored(emails) == set(emails)
+        assert (queue.counters["batches"], queue.counters["largest_batch"], queue.counters["writes"]) == (1, 5, 5)
+
+    asyncio.run(scenario())
+
+
+def test_a_failed_write_is_rolled_back_alone(database):
+    async def scenario():
+        queue = WriteQueue(max_batch=16, max_wait_ms=50)
+        await queue.start()
+        emails = _emails(3)
+        try:
+            results = await asyncio.gather(
+                *(queue.submit(_add_candidate(email, fail=i == 1)) for i, email in enumerate(emails)),
+                return_exceptions=True,
+            )
+        finally:
+            await queue.stop()
+
+        assert isinstance(results[1], HTTPException) and results[1].status_code == 404
+        assert all(isinstance(result, int) for result in (results[0], results[2]))
+        assert await _stored(emails) == {emails[0], emails[2]}
+        assert (queue.counters["batches"], queue.counters["failed_writes"]) == (1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_submit_without_a_running_writer_commits_directly(database):
+    async def scenario():
+        queue = WriteQueue()
+        (email,) = _emails(1)
+        assert not queue.running
+        assert isinstance(await queue.submit(_add_candidate(email)), int)
+        assert await _stored([email]) == {email}
+        assert queue.counters["batches"] == 0
+
+        with pytest.raises(HTTPException):
+            await queue.submit(_add_candidate(f"failed-{email}", fail=True))
+        assert await _stored([f"failed-{email}"]) == set()
+
+    asyncio.run(scenario())
+
+
+def test_stop_commits_writes_already_queued(database):
+    async def scenario():
+        queue = WriteQueue(max_batch=16, max_wait_ms=1)
+        await queue.start()
+        first, *queued = _emails(4)
+        release = asyncio.Event()
+        blocking = _add_candidate(first)
+
+        async def slow_write(db):
+            # Holds the writer so the other writes are still queued when stop() is called
+            await release.wait()
+            return await blocking(db)
+
+        writes = [asyncio.create_task(queue.submit(slow_write))]
+        await asyncio.sleep(0.01)
+        writes += [asyncio.create_task(queue.submit(_add_candidate(email))) for email in queued]
+        await asyncio.sleep(0)
+        assert queue.stats()["queued"] == len(queued)
+
+        stopping = asyncio.create_task(queue.stop())
+        await asyncio.sleep(0)
+        release.set()
+        await stopping
+
+        assert not queue.running
+        assert all(isinstance(result, int) for result in await asyncio.gather(*writes))
+        assert await _stored([first, *queued]) == {first, *queued}
+
+    asyncio.run(scenario())
@@ -394,6 +394,16 @@ export default function TestPage() {
     fetchTest();
   }, [fetchTest]);
 
+  // Questions are generated in the background: poll until they are ready
+  // (slowly after a failure, to notice when an administrator regenerates them)
+  const isGenerating = test?.status === "pending" && test?.generation_status === "generating";
+  const generationFailed = test?.status === "pending" && test?.generation_status === "failed";
+  useEffect(() => {
+    if (!isGenerating && !generationFailed) return;
+    const interval = setInterval(fetchTest, isGenerating ? 3000 : 15000);
+    return () => clearInterval(interval);
+  }, [isGenerating, generationFailed, fetchTest]);
+
   // Beforeunload warning for unsaved changes
   useEffect(() => {
     const handleBeforeUnload = (e: BeforeUnloadEvent) => {
@@ -1004,17 +1014,33 @@ export default function TestPage() {
                 </div>
               </div>
 
+              {generationFailed && (
+                <div className="p-4 rounded-lg border border-red-500/50 bg-red-500/10 flex items-start gap-3">
+                  <AlertTriangle className="w-5 h-5 text-red-400 shrink-0 mt-0.5" />
+                  <p className="text-sm text-red-400">
+                    Your trials could not be prepared. Please contact the assessment administrator;
+                    this page updates by itself once they have been prepared again.
+                  </p>
+                </div>
+              )}
+
               <Button
                 className="w-full bg-gradient-to-r from-amber-500 to-amber-600 hover:from-amber-600 hover:to-amber-700 text-slate-900 font-semibold"
                 size="lg"
                 onClick={handleStartTest}
-                disabled={isStarting}
+                disabled={isStarting || isGenerating || generationFailed}
               >
                 {isStarting ? (
                   <>
                     <Loader2 className="w-5 h-5 mr-2 animate-spin" />
                     Preparing the Arena...
                   </>
+                ) : isGenerating ? (
+                  <>
+                    <Loader2 className="w-5 h-5 mr-2 animate-spin" />
+                    Forging your trials... ({test.generation_progress?.filter((s) => s.status === "ready").length ?? 0}/
+                    {test.generation_progress?.length ?? 0} ready)
+                  </>
                 ) : (
                   <>
                     <Swords className="w-5 h-5 mr-2" />
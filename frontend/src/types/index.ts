@@ -48,6 +48,13 @@ export interface BreakHistoryEntry {
   duration_seconds: number;
 }
 
+export interface SectionGenerationProgress {
+  category: string;
+  section_order: number;
+  status: "pending" | "ready" | "failed";
+  questions: number;
+}
+
 export interface TestWithQuestions extends Test {
   candidate_name: string;
   candidate_email: string;
@@ -71,6 +78,9 @@ export interface TestWithQuestions extends Test {
   nda_signature?: string | null;
   nda_signed_at?: string | null;
   integrity_agreed?: boolean;
+  // Questions are generated in the background after the test is created
+  generation_status?: "generating" | "ready" | "failed";
+  generation_progress?: SectionGenerationProgress[] | null;
 }
 
 export interface Question {